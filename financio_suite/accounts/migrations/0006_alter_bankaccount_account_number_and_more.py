@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-19 15:49
+
+import core.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_debitcard'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='bankaccount',
+            name='account_number',
+            field=core.fields.LazyEncryptedCharField(blank=True, help_text='Full account number (encrypted)', null=True),
+        ),
+        migrations.AlterField(
+            model_name='debitcard',
+            name='card_number',
+            field=core.fields.LazyEncryptedCharField(help_text='Full card number (encrypted)'),
+        ),
+        migrations.AlterField(
+            model_name='debitcard',
+            name='cvv',
+            field=core.fields.LazyEncryptedCharField(blank=True, help_text='Card CVV/CVV2 (encrypted)', null=True),
+        ),
+    ]
@@ -2,8 +2,8 @@ import re
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
-from encrypted_model_fields.fields import EncryptedCharField
-from core.models import BaseAccount
+from core.fields import LazyEncryptedCharField
+from core.models import AccountQuerySet, BaseAccount, EncryptedQuerySet
 
 
 class BankAccount(BaseAccount):
@@ -56,7 +56,7 @@ class BankAccount(BaseAccount):
     )
 
     # Account Identifiers (Encrypted)
-    account_number = EncryptedCharField(
+    account_number = LazyEncryptedCharField(
         max_length=100,
         null=True,
         blank=True,
@@ -70,6 +70,8 @@ class BankAccount(BaseAccount):
         help_text="Last 4 digits of account number (for display)"
     )
 
+    objects = AccountQuerySet.as_manager()
+
     class Meta:
         db_table = 'bank_accounts'
         verbose_name = 'Bank Account'
@@ -147,47 +149,22 @@ class BankAccount(BaseAccount):
 
     def can_delete(self):
         """
-        Check if account can be safely deleted.
+        Check if the account can be safely deleted.
 
-        An account can only be deleted if it has no associated transactions
-        or transfers. This prevents orphaning financial records.
+        An account can only be deleted if no live transactions or transfers
+        reference it. Uses the has_transactions/has_transfers annotations
+        when the instance came from BankAccount.objects.with_activity_flags(),
+        otherwise runs that query for this account alone.
 
         Returns:
-            bool: True if account can be deleted, False if it has dependencies
-
-        Note:
-            Only checks non-deleted (active) transactions and transfers.
-            Uses GenericForeignKey to check both transaction and transfer tables.
+            bool: True if the account can be deleted, False if it has dependencies
         """
-        from django.contrib.contenttypes.models import ContentType
-        from transactions.models import Transaction
-        from transfers.models import Transfer
-        from django.db.models import Q
-
-        # Get ContentType for this account
-        account_content_type = ContentType.objects.get_for_model(BankAccount)
-
-        # Check if account has any non-deleted transactions
-        has_transactions = Transaction.objects.filter(
-            account_content_type=account_content_type,
-            account_object_id=self.id,
-            deleted_at__isnull=True
-        ).exists()
-
-        if has_transactions:
-            return False
-
-        # Check if account has any non-deleted transfers (either as from or to account)
-        has_transfers = Transfer.objects.filter(
-            Q(from_account_content_type=account_content_type, from_account_object_id=self.id) |
-            Q(to_account_content_type=account_content_type, to_account_object_id=self.id),
-            deleted_at__isnull=True
-        ).exists()
-
-        if has_transfers:
-            return False
-
-        return True
+        if hasattr(self, 'has_transactions'):
+            return not (self.has_transactions or self.has_transfers)
+        flags = BankAccount.objects.with_activity_flags().values(
+            'has_transactions', 'has_transfers'
+        ).get(pk=self.pk)
+        return not (flags['has_transactions'] or flags['has_transfers'])
 
 
 class BankAccountBalance(models.Model):
@@ -255,7 +232,7 @@ class DebitCard(BaseAccount):
         help_text="Type of card"
     )
 
-    card_number = EncryptedCharField(
+    card_number = LazyEncryptedCharField(
         max_length=100,
         help_text="Full card number (encrypted)"
     )
@@ -266,7 +243,7 @@ class DebitCard(BaseAccount):
         help_text="Last 4 digits of card number (for display)"
     )
 
-    cvv = EncryptedCharField(
+    cvv = LazyEncryptedCharField(
         max_length=10,
         null=True,
         blank=True,
@@ -277,6 +254,8 @@ class DebitCard(BaseAccount):
         help_text="Card expiry date"
     )
 
+    objects = EncryptedQuerySet.as_manager()
+
     class Meta:
         db_table = 'debit_cards'
         verbose_name = 'Debit Card'
@@ -1,16 +1,12 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Sum, Q
-from django.core.paginator import Paginator
-from django.contrib.contenttypes.models import ContentType
 from django.db.models.deletion import ProtectedError
-from decimal import Decimal
 from .models import BankAccount, BankAccountBalance, DebitCard
 from .forms import BankAccountForm, DebitCardForm
 from creditcards.models import CreditCard, CreditCardBalance
-from transactions.models import Transaction
-from transfers.models import Transfer
+from core.services import AccountStatusService
+from core.timeline import AccountActivityPaginator
 
 
 @login_required
@@ -20,8 +16,9 @@ def account_list(request):
 
     Features:
     - Separate sections for bank accounts and credit cards
-    - Bank stats: Total balance (using get_current_balance() for robustness)
+    - Bank stats: Total balance (materialized balance, or opening balance if missing)
     - Credit card stats: Total limit, available credit, amount owed
+    - Stats computed in SQL (AccountQuerySet.status_totals())
     - Active/archived count for each type
     - Responsive grid layout with emoji indicators
 
@@ -44,42 +41,24 @@ def account_list(request):
         user=request.user
     ).select_related('balance').order_by('status', '-created_at')
 
-    # Calculate bank account stats
-    active_banks = bank_accounts.filter(status='active')
-    # Use get_current_balance() to handle cases where balance record doesn't exist
-    total_bank_balance = sum(
-        account.get_current_balance()
-        for account in active_banks
-    )
-
-    # Calculate credit card stats
-    active_cards = credit_cards.filter(status='active')
-    total_credit_limit = active_cards.aggregate(
-        total=Sum('credit_limit')
-    )['total'] or Decimal('0.00')
-
-    # Calculate total available credit and amount owed
-    total_available_credit = Decimal('0.00')
-    total_amount_owed = Decimal('0.00')
-
-    for card in active_cards:
-        total_available_credit += card.available_credit()
-        total_amount_owed += card.amount_owed()
+    # Counts and totals: one conditional-aggregation query per model
+    bank_stats = bank_accounts.status_totals()
+    card_stats = credit_cards.card_totals()
 
     context = {
-        # Bank accounts
-        'bank_accounts': bank_accounts,
-        'active_banks_count': active_banks.count(),
-        'archived_banks_count': bank_accounts.filter(status='archived').count(),
-        'total_bank_balance': total_bank_balance,
+        # Bank accounts (annotated so delete buttons need no per-account queries)
+        'bank_accounts': bank_accounts.with_activity_flags(),
+        'active_banks_count': bank_stats['active_count'],
+        'archived_banks_count': bank_stats['archived_count'],
+        'total_bank_balance': bank_stats['total_balance'],
 
         # Credit cards
-        'credit_cards': credit_cards,
-        'active_cards_count': active_cards.count(),
-        'archived_cards_count': credit_cards.filter(status='archived').count(),
-        'total_credit_limit': total_credit_limit,
-        'total_available_credit': total_available_credit,
-        'total_amount_owed': total_amount_owed,
+        'credit_cards': credit_cards.with_activity_flags(),
+        'active_cards_count': card_stats['active_count'],
+        'archived_cards_count': card_stats['archived_count'],
+        'total_credit_limit': card_stats['total_credit_limit'],
+        'total_available_credit': card_stats['total_available_credit'],
+        'total_amount_owed': card_stats['total_amount_owed'],
     }
     return render(request, 'accounts/account_list.html', context)
 
@@ -141,7 +120,7 @@ def account_edit(request, pk):
         GET: Rendered account form template with existing data
         POST: Redirect to account_list on success, or re-render form with errors
     """
-    account = get_object_or_404(BankAccount, pk=pk, user=request.user)
+    account = get_object_or_404(BankAccount.objects.with_encrypted(), pk=pk, user=request.user)
 
     if request.method == 'POST':
         # Store old opening balance to check if it changed
@@ -186,43 +165,16 @@ def account_edit(request, pk):
 @login_required
 def account_detail(request, pk):
     """View bank account details with transaction history."""
-    account = get_object_or_404(BankAccount, pk=pk, user=request.user)
+    account = get_object_or_404(BankAccount.objects.with_encrypted(), pk=pk, user=request.user)
 
-    # Get ContentType for this account
-    account_content_type = ContentType.objects.get_for_model(BankAccount)
-
-    # Get transactions for this account (filtered by GenericForeignKey)
-    transactions = Transaction.objects.filter(
-        user=request.user,
-        account_content_type=account_content_type,
-        account_object_id=account.id,
-        deleted_at__isnull=True
-    ).select_related('category').order_by('-datetime_ist')
-
-    # Get transfers involving this account (either from or to)
-    transfers = Transfer.objects.filter(
-        user=request.user,
-        deleted_at__isnull=True
-    ).filter(
-        Q(from_account_content_type=account_content_type, from_account_object_id=account.id) |
-        Q(to_account_content_type=account_content_type, to_account_object_id=account.id)
-    ).order_by('-datetime_ist')
-
-    # Pagination for transactions
-    transactions_paginator = Paginator(transactions, 20)
-    transactions_page_number = request.GET.get('transactions_page', 1)
-    transactions_page = transactions_paginator.get_page(transactions_page_number)
-
-    # Pagination for transfers
-    transfers_paginator = Paginator(transfers, 20)
-    transfers_page_number = request.GET.get('transfers_page', 1)
-    transfers_page = transfers_paginator.get_page(transfers_page_number)
+    # Unified activity feed (transactions + transfers) with running balance, one query per page
+    activity_page = AccountActivityPaginator(account, 20, cursor_param='activity_cursor').get_page(request.GET)
 
     context = {
         'account': account,
         'full_account_number': str(account.account_number) if account.account_number else None,
-        'transactions': transactions_page,
-        'transfers': transfers_page,
+        'activity': activity_page,
+        'history_account': f'{account.pk}|bankaccount',
     }
     return render(request, 'accounts/account_detail.html', context)
 
@@ -230,7 +182,7 @@ def account_detail(request, pk):
 @login_required
 def account_delete(request, pk):
     """Delete a bank account."""
-    account = get_object_or_404(BankAccount, pk=pk, user=request.user)
+    account = get_object_or_404(BankAccount.objects.with_activity_flags(), pk=pk, user=request.user)
 
     if request.method == 'POST':
         name = account.name
@@ -258,15 +210,25 @@ def account_delete(request, pk):
 
 @login_required
 def account_toggle_status(request, pk):
-    """Toggle bank account status between active and archived."""
-    account = get_object_or_404(BankAccount, pk=pk, user=request.user)
+    """
+    Toggle bank account status between active and archived.
 
-    if account.status == 'active':
-        account.archive()
-        messages.success(request, f'Account "{account.name}" archived.')
+    Goes through the same checks as the bulk status endpoint; archiving
+    also archives the account's active debit cards.
+    """
+    account = get_object_or_404(BankAccount, pk=pk, user=request.user)
+    action = 'archive' if account.status == 'active' else 'activate'
+    [result] = AccountStatusService.change_status(request.user, action, [('bankaccount', account.pk)])
+
+    if result['outcome'] == 'blocked':
+        messages.error(request, f'Cannot {action} "{account.name}": {" ".join(result["reasons"])}')
+    elif result['cascaded']:
+        count = len(result['cascaded'])
+        messages.success(
+            request, f'Account "{account.name}" archived along with {count} debit card{"s" if count != 1 else ""}.'
+        )
     else:
-        account.activate()
-        messages.success(request, f'Account "{account.name}" activated.')
+        messages.success(request, f'Account "{account.name}" {result["outcome"]}.')
 
     return redirect('account_list')
 
@@ -307,7 +269,7 @@ def debit_card_create(request):
 @login_required
 def debit_card_edit(request, pk):
     """Edit an existing debit card."""
-    card = get_object_or_404(DebitCard, pk=pk, user=request.user)
+    card = get_object_or_404(DebitCard.objects.with_encrypted(), pk=pk, user=request.user)
 
     if request.method == 'POST':
         form = DebitCardForm(request.POST, request.FILES, instance=card, user=request.user)
@@ -2,6 +2,19 @@ from django.contrib.contenttypes.models import ContentType
 from .models import ActivityLog
 
 
+def _request_metadata(request):
+    """Return (ip_address, user_agent) of a request, or (None, None) without one."""
+    if not request:
+        return None, None
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        ip_address = x_forwarded_for.split(',')[0].strip()
+    else:
+        ip_address = request.META.get('REMOTE_ADDR')
+    user_agent = request.META.get('HTTP_USER_AGENT', '')[:500]  # Limit length
+    return ip_address, user_agent
+
+
 def log_activity(user, action, obj, changes=None, request=None):
     """
     Helper function to log user activity.
@@ -17,17 +30,7 @@ def log_activity(user, action, obj, changes=None, request=None):
         ActivityLog instance
     """
     content_type = ContentType.objects.get_for_model(obj)
-    
-    # Get IP address from request
-    ip_address = None
-    user_agent = None
-    if request:
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip_address = x_forwarded_for.split(',')[0].strip()
-        else:
-            ip_address = request.META.get('REMOTE_ADDR')
-        user_agent = request.META.get('HTTP_USER_AGENT', '')[:500]  # Limit length
+    ip_address, user_agent = _request_metadata(request)
     
     activity_log = ActivityLog.objects.create(
         user=user,
@@ -43,6 +46,35 @@ def log_activity(user, action, obj, changes=None, request=None):
     return activity_log
 
 
+def log_activity_bulk(user, action, entries, request=None):
+    """
+    Log the same action on many objects with a single INSERT.
+    
+    Args:
+        user: User instance
+        action: 'create', 'update', 'delete', 'archive', 'activate'
+        entries: Iterable of (obj, changes) pairs; changes may be None
+        request: HttpRequest object for IP/user agent (optional)
+    
+    Returns:
+        List of ActivityLog instances
+    """
+    ip_address, user_agent = _request_metadata(request)
+    return ActivityLog.objects.bulk_create([
+        ActivityLog(
+            user=user,
+            action=action,
+            content_type=ContentType.objects.get_for_model(obj),
+            object_id=obj.pk,
+            object_repr=str(obj)[:200],
+            changes=changes,
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+        for obj, changes in entries
+    ])
+
+
 def track_model_changes(old_instance, new_instance, fields_to_track):
     """
     Compare two model instances and return dict of changes.
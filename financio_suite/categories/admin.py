@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Category
+from .models import Category, CategoryRule
 
 
 @admin.register(Category)
@@ -65,3 +65,18 @@ class CategoryAdmin(admin.ModelAdmin):
         css = {
             'all': ('admin/css/category_admin.css',)
         }
+
+
+@admin.register(CategoryRule)
+class CategoryRuleAdmin(admin.ModelAdmin):
+    """Admin interface for CategoryRule model"""
+
+    list_display = ['pattern', 'match_type', 'category', 'min_amount', 'max_amount', 'priority', 'user', 'is_active']
+    list_filter = ['match_type', 'is_active', 'created_at']
+    search_fields = ['pattern', 'category__name', 'user__username']
+    readonly_fields = ['created_at', 'updated_at']
+
+    def get_queryset(self, request):
+        """Optimize queryset with select_related"""
+        qs = super().get_queryset(request)
+        return qs.select_related('user', 'category')
@@ -1,6 +1,8 @@
 from django import forms
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
-from .models import Category
+from core.utils import get_account_choices_for_form, get_account_from_compound_value
+from .models import Category, CategoryRule
 
 
 class CategoryForm(forms.ModelForm):
@@ -66,3 +68,91 @@ class CategoryForm(forms.ModelForm):
                     raise ValidationError('Maximum category depth is 3 levels.')
         
         return cleaned_data
+
+
+INPUT_CLASSES = 'w-full h-14 px-4 rounded-lg bg-white dark:bg-dark-surface border border-gray-200 dark:border-gray-700 text-gray-900 dark:text-white placeholder-gray-400 dark:placeholder-gray-500 focus:outline-none focus:ring-2 focus:ring-primary focus:border-transparent'
+
+
+class CategoryRuleForm(forms.ModelForm):
+    """
+    Form for creating and editing auto-categorization rules.
+
+    The optional account uses the same compound "id|modelname" values as
+    TransactionForm.
+    """
+
+    account = forms.ChoiceField(
+        required=False,
+        widget=forms.Select(attrs={'class': INPUT_CLASSES}),
+        help_text="Only apply to transactions on this account"
+    )
+
+    class Meta:
+        model = CategoryRule
+        fields = ['category', 'match_type', 'pattern', 'min_amount', 'max_amount', 'priority', 'is_active']
+        widgets = {
+            'category': forms.Select(attrs={'class': INPUT_CLASSES}),
+            'match_type': forms.Select(attrs={'class': INPUT_CLASSES}),
+            'pattern': forms.TextInput(attrs={
+                'class': INPUT_CLASSES,
+                'placeholder': 'e.g. SWIGGY'
+            }),
+            'min_amount': forms.NumberInput(attrs={
+                'class': INPUT_CLASSES,
+                'placeholder': 'Any',
+                'step': '0.01',
+                'min': '0'
+            }),
+            'max_amount': forms.NumberInput(attrs={
+                'class': INPUT_CLASSES,
+                'placeholder': 'Any',
+                'step': '0.01',
+                'min': '0'
+            }),
+            'priority': forms.NumberInput(attrs={'class': INPUT_CLASSES, 'min': '0'}),
+            'is_active': forms.CheckboxInput(attrs={
+                'class': 'h-4 w-4 rounded border-gray-300 dark:border-gray-600 text-primary focus:ring-primary'
+            }),
+        }
+
+    def __init__(self, *args, **kwargs):
+        self.user = kwargs.pop('user', None)
+        super().__init__(*args, **kwargs)
+
+        # Rules categorize transactions, so only income and expense categories apply
+        if self.user:
+            self.fields['category'].queryset = Category.objects.filter(
+                user=self.user,
+                is_active=True,
+                type__in=['income', 'expense']
+            ).order_by('type', 'name')
+
+        account_choices = [('', 'Any account')]
+        if self.user:
+            account_choices.extend(get_account_choices_for_form(self.user))
+        self.fields['account'].choices = account_choices
+
+        if self.instance.pk and self.instance.account_object_id:
+            self.fields['account'].initial = (
+                f"{self.instance.account_object_id}|{self.instance.account_content_type.model}"
+            )
+
+    def clean_account(self):
+        """Extract actual account object from compound value."""
+        account_value = self.cleaned_data.get('account')
+        if not account_value:
+            return None
+        try:
+            return get_account_from_compound_value(account_value, self.user)
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+    def _post_clean(self):
+        # Model validation needs the owner and account, which aren't form fields
+        if self.user:
+            self.instance.user = self.user
+        if 'account' in self.cleaned_data:
+            account = self.cleaned_data['account']
+            self.instance.account_content_type = ContentType.objects.get_for_model(account) if account else None
+            self.instance.account_object_id = account.pk if account else None
+        super()._post_clean()
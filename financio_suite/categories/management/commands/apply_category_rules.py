@@ -0,0 +1,126 @@
+"""
+Management command to categorize existing transactions with CategoryRules.
+
+Rules run automatically when a transaction is created or imported; this
+command applies them to history, for example after adding a new rule.
+Transactions are read in id-ordered chunks (keyset pagination, so every
+chunk is an index range scan), matched in memory with the user's compiled
+RuleMatcher and written back with one UPDATE per category per chunk.
+
+Usage:
+    # Preview how many transactions would be categorized
+    python manage.py apply_category_rules --dry-run
+
+    # Categorize uncategorized transactions of every user
+    python manage.py apply_category_rules
+
+    # Only one user, also replacing categories that are already set
+    python manage.py apply_category_rules --user alice --overwrite
+"""
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from categories.models import CategoryRule
+from categories.rules import RuleMatcher
+from transactions.models import Transaction
+
+
+class Command(BaseCommand):
+    help = 'Apply category rules to existing transactions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count matches without changing anything',
+        )
+        parser.add_argument(
+            '--user',
+            help='Only categorize this username',
+        )
+        parser.add_argument(
+            '--overwrite',
+            action='store_true',
+            help='Also recategorize transactions that already have a category',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Transactions read and updated per query (default: 5000)',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        chunk_size = options['chunk_size']
+        if chunk_size < 1:
+            raise CommandError('--chunk-size must be at least 1')
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - No changes will be saved'))
+
+        users = User.objects.filter(
+            id__in=CategoryRule.objects.filter(is_active=True).values('user_id')
+        ).order_by('id')
+        if options['user']:
+            if not User.objects.filter(username=options['user']).exists():
+                raise CommandError(f"User '{options['user']}' does not exist")
+            users = users.filter(username=options['user'])
+
+        total_scanned = total_changed = 0
+        started = time.perf_counter()
+        for user in users:
+            scanned, changed = self._apply(user, chunk_size, options['overwrite'], dry_run)
+            total_scanned += scanned
+            total_changed += changed
+            self.stdout.write(f'  {user.username}: {changed} of {scanned} transactions categorized')
+
+        elapsed = time.perf_counter() - started
+        rate = total_scanned / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'\nCategorized {total_changed} of {total_scanned} transactions '
+            f'in {elapsed:.1f}s ({rate:,.0f} transactions/s)'
+        ))
+
+    def _apply(self, user, chunk_size, overwrite, dry_run):
+        """Categorize one user's transactions; returns (scanned, changed)."""
+        matcher = RuleMatcher.for_user(user)
+        if not len(matcher):
+            return 0, 0
+
+        queryset = Transaction.objects.filter(user=user, deleted_at__isnull=True)
+        if not overwrite:
+            queryset = queryset.filter(category__isnull=True)
+        queryset = queryset.order_by('id').values_list(
+            'id', 'purpose', 'amount', 'transaction_type',
+            'account_content_type_id', 'account_object_id', 'category_id',
+        )
+
+        scanned = changed = 0
+        last_id = 0
+        while True:
+            rows = list(queryset.filter(id__gt=last_id)[:chunk_size])
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            scanned += len(rows)
+
+            # {category_id: [transaction ids]}
+            updates = {}
+            for txn_id, purpose, amount, transaction_type, content_type_id, object_id, category_id in rows:
+                category = matcher.match(purpose, amount, transaction_type, content_type_id, object_id)
+                if category is not None and category.pk != category_id:
+                    updates.setdefault(category.pk, []).append(txn_id)
+            changed += sum(len(ids) for ids in updates.values())
+
+            if updates and not dry_run:
+                now = timezone.now()
+                with transaction.atomic():
+                    for category_id, ids in updates.items():
+                        Transaction.objects.filter(id__in=ids).update(category_id=category_id, updated_at=now)
+
+        return scanned, changed
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.8 on 2026-10-19 15:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0002_category_description_category_icon'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('match_type', models.CharField(choices=[('contains', 'Description contains'), ('regex', 'Description matches regex')], default='contains', help_text='How the pattern is compared with the description', max_length=20)),
+                ('pattern', models.CharField(blank=True, help_text='Text or regular expression to look for (case-insensitive); blank matches any description', max_length=255)),
+                ('min_amount', models.DecimalField(blank=True, decimal_places=2, help_text='Only match amounts of at least this much', max_digits=15, null=True)),
+                ('max_amount', models.DecimalField(blank=True, decimal_places=2, help_text='Only match amounts of at most this much', max_digits=15, null=True)),
+                ('account_object_id', models.PositiveIntegerField(blank=True, help_text='ID of the account the rule is limited to', null=True)),
+                ('priority', models.PositiveIntegerField(default=100, help_text='Rules with lower numbers are tried first')),
+                ('is_active', models.BooleanField(default=True, help_text='Inactive rules are ignored')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when rule was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when rule was last updated')),
+                ('account_content_type', models.ForeignKey(blank=True, help_text='Type of account the rule is limited to', null=True, on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+                ('category', models.ForeignKey(help_text='Category assigned to matching transactions', on_delete=django.db.models.deletion.CASCADE, related_name='rules', to='categories.category')),
+                ('user', models.ForeignKey(help_text='Owner of the rule', on_delete=django.db.models.deletion.CASCADE, related_name='category_rules', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Category Rule',
+                'verbose_name_plural': 'Category Rules',
+                'db_table': 'category_rules',
+                'ordering': ['priority', 'id'],
+                'indexes': [models.Index(fields=['user', 'is_active'], name='idx_cat_rule_user_active')],
+            },
+        ),
+    ]
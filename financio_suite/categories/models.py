@@ -1,5 +1,9 @@
+import re
+
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
 
 
@@ -181,3 +185,206 @@ class Category(models.Model):
     def get_depth(self):
         """Public method to get depth in hierarchy"""
         return self._get_depth()
+
+
+# Regex rules run on every imported description, so patterns that can
+# backtrack exponentially (ReDoS) are refused when a rule is saved
+REGEX_MAX_LENGTH = 100
+
+# A quantifier at the start of the remaining pattern
+QUANTIFIER_RE = re.compile(r'[*+]|\{(\d*)(,(\d*))?\}')
+
+
+def _repeats(pattern, position):
+    """
+    Length of the quantifier at position and whether it repeats more than once.
+
+    Returns (0, False) when no quantifier starts there. '?' (at most once)
+    and lazy/possessive suffixes are not counted as repeating.
+    """
+    found = QUANTIFIER_RE.match(pattern, position)
+    if found is None:
+        return 0, False
+    if found.group(0) in ('*', '+'):
+        return 1, True
+    low, comma, high = found.group(1), found.group(2), found.group(3)
+    if comma is None:
+        return len(found.group(0)), int(low or 0) > 1
+    return len(found.group(0)), not high or int(high) > 1
+
+
+def unsafe_regex_reason(pattern):
+    """
+    Why a regex rule's pattern is unsafe to run, or None if it is not.
+
+    Refuses patterns longer than REGEX_MAX_LENGTH, back-references and
+    nested quantifiers such as (a+)+ or (\\w+\\s?)*, whose backtracking
+    grows exponentially with the length of a non-matching description.
+    """
+    if len(pattern) > REGEX_MAX_LENGTH:
+        return f"Regular expressions are limited to {REGEX_MAX_LENGTH} characters"
+
+    # One flag per open group: whether something inside it repeats
+    groups = [False]
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            if pattern[i + 1:i + 2] in set('123456789'):
+                return "Back-references are not allowed in regular expressions"
+            i += 2
+        elif char == '[':
+            # Skip the character class; a leading ']' is a literal
+            i += 1
+            if pattern[i:i + 1] == '^':
+                i += 1
+            if pattern[i:i + 1] == ']':
+                i += 1
+            while i < len(pattern) and pattern[i] != ']':
+                i += 2 if pattern[i] == '\\' else 1
+            i += 1
+        elif char == '(':
+            if pattern.startswith('(?P=', i):
+                return "Back-references are not allowed in regular expressions"
+            groups.append(False)
+            # '(?' starts an extension, not a quantifier
+            i += 2 if pattern[i + 1:i + 2] == '?' else 1
+        elif char == ')':
+            inner = groups.pop() if len(groups) > 1 else False
+            length, repeats = _repeats(pattern, i + 1)
+            if inner and repeats:
+                return "Nested quantifiers such as (a+)+ are not allowed in regular expressions"
+            groups[-1] = groups[-1] or inner or repeats
+            i += 1 + length
+        else:
+            length, repeats = _repeats(pattern, i)
+            groups[-1] = groups[-1] or repeats
+            i += length or 1
+    return None
+
+
+class CategoryRule(models.Model):
+    """
+    User-defined rule that assigns a category to new transactions.
+
+    A rule matches when every condition it sets holds: the description
+    contains the pattern (or matches it as a regular expression), the
+    amount lies within min/max, the transaction is on the given account,
+    and its type equals the category type. When several rules match, the
+    lowest priority number wins. Matching is done by
+    categories.rules.RuleMatcher, which compiles all of a user's rules
+    into one regular expression.
+    """
+
+    MATCH_TYPE_CHOICES = [
+        ('contains', 'Description contains'),
+        ('regex', 'Description matches regex'),
+    ]
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='category_rules',
+        help_text="Owner of the rule"
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name='rules',
+        help_text="Category assigned to matching transactions"
+    )
+    match_type = models.CharField(
+        max_length=20,
+        choices=MATCH_TYPE_CHOICES,
+        default='contains',
+        help_text="How the pattern is compared with the description"
+    )
+    pattern = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Text or regular expression to look for (case-insensitive); blank matches any description"
+    )
+    min_amount = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text="Only match amounts of at least this much"
+    )
+    max_amount = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text="Only match amounts of at most this much"
+    )
+    account_content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        help_text="Type of account the rule is limited to"
+    )
+    account_object_id = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="ID of the account the rule is limited to"
+    )
+    account = GenericForeignKey('account_content_type', 'account_object_id')
+    priority = models.PositiveIntegerField(
+        default=100,
+        help_text="Rules with lower numbers are tried first"
+    )
+    is_active = models.BooleanField(
+        default=True,
+        help_text="Inactive rules are ignored"
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        help_text="Timestamp when rule was created"
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text="Timestamp when rule was last updated"
+    )
+
+    class Meta:
+        db_table = 'category_rules'
+        verbose_name = 'Category Rule'
+        verbose_name_plural = 'Category Rules'
+        ordering = ['priority', 'id']
+        indexes = [
+            models.Index(fields=['user', 'is_active'], name='idx_cat_rule_user_active'),
+        ]
+
+    def __str__(self):
+        condition = self.pattern or 'any description'
+        return f"{condition} → {self.category.name}"
+
+    def clean(self):
+        """Validate the pattern and amount range"""
+        if self.match_type == 'regex':
+            if not self.pattern:
+                raise ValidationError("A regex rule needs a pattern")
+            try:
+                re.compile(self.pattern)
+            except re.error as e:
+                raise ValidationError(f"Invalid regular expression: {e}")
+            reason = unsafe_regex_reason(self.pattern)
+            if reason:
+                raise ValidationError(reason)
+
+        if self.min_amount is not None and self.max_amount is not None and self.min_amount > self.max_amount:
+            raise ValidationError("Minimum amount cannot be greater than maximum amount")
+
+        if not self.pattern and self.min_amount is None and self.max_amount is None and not self.account_object_id:
+            raise ValidationError("A rule needs a pattern, an amount range or an account")
+
+        if self.category_id and self.user_id and self.category.user_id != self.user_id:
+            raise ValidationError("Category not found")
+
+    def save(self, *args, **kwargs):
+        """Override save to run validation"""
+        self.pattern = self.pattern.strip()
+        self.full_clean()
+        super().save(*args, **kwargs)
@@ -0,0 +1,261 @@
+"""
+Auto-categorization: a user's CategoryRules compiled into one matcher.
+
+Matching a description against every rule one by one gets slow as rules
+accumulate, so a user's rules are compiled once into two scanners that
+each read the description a single time:
+
+* "contains" patterns (the usual "SWIGGY", "AMAZON PAY" rules) go into an
+  Aho-Corasick automaton. Each state knows the highest priority pattern
+  ending there, so one pass over the lower-cased text yields the best rule
+  whose text occurs.
+* regex patterns are joined into one case-insensitive expression of
+  zero-width lookaheads, one named alternative per rule in priority order:
+
+      (?=(?:(?P<r3>uber\\s*trip)|(?P<r7>^neft.*salary)))
+
+  At every position finditer() reports the first (highest priority) rule
+  matching there, so the smallest reported index is the best regex rule.
+
+The amount, account and type conditions are then checked on the best
+rule only; rules behind it are searched one by one only when it fails
+them. Regex patterns that cannot share a combined expression (named
+groups, conditionals, inline flags) are searched on their own.
+
+Matchers are cached per user and process, keyed by a version read with one
+aggregate query, so editing, adding or deleting a rule (or its category)
+rebuilds the matcher on the next lookup. The cache keeps the
+MAX_CACHED_MATCHERS most recently used users.
+
+Regex rules saved before CategoryRule.clean() refused unsafe patterns
+(see unsafe_regex_reason()) are left out of the matcher.
+"""
+import re
+from collections import OrderedDict, deque
+
+from django.db.models import Count, Max
+
+from .models import CategoryRule, unsafe_regex_reason
+
+# Patterns that would change meaning or fail inside the combined expression
+STANDALONE_PATTERN_RE = re.compile(r'\\\d|\(\?P[<=]|\(\?\(|\(\?[aiLmsux-]')
+
+MAX_CACHED_MATCHERS = 256
+
+# {user_id: (version, RuleMatcher)}, least recently used first
+_matchers = OrderedDict()
+
+
+class _CompiledRule:
+    """One rule's conditions, flattened for fast matching."""
+
+    __slots__ = (
+        'category', 'category_type', 'literal', 'regex', 'combined',
+        'min_amount', 'max_amount', 'account',
+    )
+
+    def __init__(self, rule):
+        self.category = rule.category
+        self.category_type = rule.category.type
+        self.min_amount = rule.min_amount
+        self.max_amount = rule.max_amount
+        self.account = (
+            (rule.account_content_type_id, rule.account_object_id)
+            if rule.account_object_id else None
+        )
+
+        # Exactly one of literal/regex is set for rules with a pattern
+        self.literal = None
+        self.regex = None
+        if rule.pattern and rule.match_type == 'regex':
+            self.regex = re.compile(rule.pattern, re.IGNORECASE)
+        elif rule.pattern:
+            self.literal = rule.pattern.lower()
+        # Whether the scanners account for this rule (set by RuleMatcher)
+        self.combined = False
+
+    def text_matches(self, text, lowered):
+        """Search the description for this rule's pattern on its own."""
+        if self.literal is not None:
+            return self.literal in lowered
+        if self.regex is not None:
+            return self.regex.search(text) is not None
+        return True
+
+    def accepts(self, amount, transaction_type, account):
+        """Check the non-text conditions."""
+        if transaction_type != self.category_type:
+            return False
+        if self.account is not None and account != self.account:
+            return False
+        if self.min_amount is not None and amount < self.min_amount:
+            return False
+        if self.max_amount is not None and amount > self.max_amount:
+            return False
+        return True
+
+
+class _LiteralAutomaton:
+    """
+    Aho-Corasick automaton over lower-cased literal patterns.
+
+    Transitions are completed into a DFA (every state maps each character
+    of the pattern alphabet to its next state), so a scan is one dict
+    lookup per character of the text.
+    """
+
+    def __init__(self, patterns, none):
+        """
+        Args:
+            patterns: (rule_index, lower-cased pattern) pairs
+            none: Value meaning "no rule" (larger than every rule index)
+        """
+        goto = [{}]
+        best = [none]
+        for index, pattern in patterns:
+            state = 0
+            for char in pattern:
+                if char not in goto[state]:
+                    goto.append({})
+                    best.append(none)
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            best[state] = min(best[state], index)
+
+        # Breadth-first: a state's fallback (longest proper suffix that is
+        # also a pattern prefix) is complete before the state itself
+        delta = [None] * len(goto)
+        delta[0] = dict(goto[0])
+        queue = deque((state, 0) for state in goto[0].values())
+        while queue:
+            state, fallback = queue.popleft()
+            best[state] = min(best[state], best[fallback])
+            delta[state] = {**delta[fallback], **goto[state]}
+            for char, child in goto[state].items():
+                queue.append((child, delta[fallback].get(char, 0)))
+
+        self.delta = delta
+        self.best = best
+        self.none = none
+
+    def first(self, lowered):
+        """Smallest rule index whose pattern occurs in the lower-cased text."""
+        delta = self.delta
+        best = self.best
+        found = self.none
+        state = 0
+        for char in lowered:
+            state = delta[state].get(char, 0)
+            if best[state] < found:
+                found = best[state]
+        return found
+
+
+class RuleMatcher:
+    """
+    Picks the category for a transaction from a user's active rules.
+
+    Usage:
+        matcher = RuleMatcher.for_user(user)
+        category = matcher.match(purpose, amount, 'expense', content_type_id, account_id)
+    """
+
+    def __init__(self, rules):
+        self.rules = [
+            _CompiledRule(rule) for rule in rules
+            if rule.match_type != 'regex' or unsafe_regex_reason(rule.pattern) is None
+        ]
+
+        literals = [(index, rule.literal) for index, rule in enumerate(self.rules) if rule.literal]
+        self.automaton = _LiteralAutomaton(literals, len(self.rules)) if literals else None
+        for index, _ in literals:
+            self.rules[index].combined = True
+
+        self.combined_regex = None
+        combinable = [
+            index for index, rule in enumerate(self.rules)
+            if rule.regex is not None and not STANDALONE_PATTERN_RE.search(rule.regex.pattern)
+        ]
+        if combinable:
+            alternatives = [f'(?P<r{index}>{self.rules[index].regex.pattern})' for index in combinable]
+            try:
+                self.combined_regex = re.compile('(?=(?:' + '|'.join(alternatives) + '))', re.IGNORECASE)
+            except (re.error, RecursionError, OverflowError):
+                # Leave every regex rule to be searched on its own
+                combinable = []
+            for index in combinable:
+                self.rules[index].combined = True
+
+    def __len__(self):
+        return len(self.rules)
+
+    @classmethod
+    def for_user(cls, user):
+        """Return the user's matcher, rebuilding it if their rules changed."""
+        user_id = getattr(user, 'pk', user)
+        version = CategoryRule.objects.filter(user_id=user_id).aggregate(
+            count=Count('id'),
+            rules_changed=Max('updated_at'),
+            categories_changed=Max('category__updated_at'),
+        )
+        version = (version['count'], version['rules_changed'], version['categories_changed'])
+
+        cached = _matchers.get(user_id)
+        if cached is not None and cached[0] == version:
+            _matchers.move_to_end(user_id)
+            return cached[1]
+
+        matcher = cls(
+            CategoryRule.objects.filter(user_id=user_id, is_active=True, category__is_active=True)
+            .select_related('category')
+            .order_by('priority', 'id')
+        )
+        _matchers[user_id] = (version, matcher)
+        _matchers.move_to_end(user_id)
+        while len(_matchers) > MAX_CACHED_MATCHERS:
+            _matchers.popitem(last=False)
+        return matcher
+
+    def _first_text_match(self, text, lowered):
+        """Index of the highest priority combined rule whose pattern occurs in text."""
+        first = len(self.rules)
+        if self.automaton is not None:
+            first = self.automaton.first(lowered)
+        if self.combined_regex is not None:
+            for found in self.combined_regex.finditer(text):
+                index = int(found.lastgroup[1:])
+                if index < first:
+                    first = index
+        return first
+
+    def match(self, text, amount, transaction_type, account_content_type_id=None, account_object_id=None):
+        """
+        Return the category of the first rule matching the transaction, or None.
+
+        Args:
+            text: Description (purpose) of the transaction
+            amount: Decimal amount (positive)
+            transaction_type: 'income' or 'expense'
+            account_content_type_id: ContentType id of the account
+            account_object_id: ID of the account
+        """
+        if not self.rules:
+            return None
+        text = text or ''
+        lowered = text.lower()
+        account = (account_content_type_id, account_object_id)
+        first = self._first_text_match(text, lowered)
+
+        for index, rule in enumerate(self.rules):
+            if rule.combined:
+                # No combined rule ahead of `first` occurs in the text, and
+                # only rules after it need a search of their own
+                if index < first:
+                    continue
+                if index > first and not rule.text_matches(text, lowered):
+                    continue
+            elif not rule.text_matches(text, lowered):
+                continue
+            if rule.accepts(amount, transaction_type, account):
+                return rule.category
+        return None
@@ -6,4 +6,8 @@ urlpatterns = [
     path('create/', views.category_create, name='category_create'),
     path('<int:pk>/edit/', views.category_edit, name='category_edit'),
     path('<int:pk>/delete/', views.category_delete, name='category_delete'),
+    path('rules/', views.category_rule_list, name='category_rule_list'),
+    path('rules/create/', views.category_rule_create, name='category_rule_create'),
+    path('rules/<int:pk>/edit/', views.category_rule_edit, name='category_rule_edit'),
+    path('rules/<int:pk>/delete/', views.category_rule_delete, name='category_rule_delete'),
 ]
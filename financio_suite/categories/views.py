@@ -3,8 +3,9 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.db.models import Count
 from django.db.models.deletion import ProtectedError
-from .models import Category
-from .forms import CategoryForm
+from core.utils import resolve_generic_accounts
+from .models import Category, CategoryRule
+from .forms import CategoryForm, CategoryRuleForm
 
 
 @login_required
@@ -97,3 +98,71 @@ def category_delete(request, pk):
         'category': category,
     }
     return render(request, 'categories/category_confirm_delete.html', context)
+
+
+@login_required
+def category_rule_list(request):
+    """Display the user's auto-categorization rules in the order they are tried."""
+    rules = resolve_generic_accounts(
+        CategoryRule.objects.filter(user=request.user).select_related('category').order_by('priority', 'id')
+    )
+
+    context = {
+        'rules': rules,
+    }
+    return render(request, 'categories/category_rule_list.html', context)
+
+
+@login_required
+def category_rule_create(request):
+    """Create a new auto-categorization rule."""
+    if request.method == 'POST':
+        form = CategoryRuleForm(request.POST, user=request.user)
+        if form.is_valid():
+            rule = form.save()
+            messages.success(request, f'Rule for "{rule.category.name.title()}" created successfully!')
+            return redirect('category_rule_list')
+    else:
+        form = CategoryRuleForm(user=request.user)
+
+    context = {
+        'form': form,
+        'title': 'Create Rule',
+        'button_text': 'Create Rule',
+    }
+    return render(request, 'categories/category_rule_form.html', context)
+
+
+@login_required
+def category_rule_edit(request, pk):
+    """Edit an existing auto-categorization rule."""
+    rule = get_object_or_404(CategoryRule, pk=pk, user=request.user)
+
+    if request.method == 'POST':
+        form = CategoryRuleForm(request.POST, instance=rule, user=request.user)
+        if form.is_valid():
+            form.save()
+            messages.success(request, f'Rule for "{rule.category.name.title()}" updated successfully!')
+            return redirect('category_rule_list')
+    else:
+        form = CategoryRuleForm(instance=rule, user=request.user)
+
+    context = {
+        'form': form,
+        'rule': rule,
+        'title': 'Edit Rule',
+        'button_text': 'Update Rule',
+    }
+    return render(request, 'categories/category_rule_form.html', context)
+
+
+@login_required
+def category_rule_delete(request, pk):
+    """Delete an auto-categorization rule (POST from the rule list)."""
+    rule = get_object_or_404(CategoryRule, pk=pk, user=request.user)
+    if request.method != 'POST':
+        return redirect('category_rule_list')
+
+    rule.delete()
+    messages.success(request, 'Rule deleted successfully!')
+    return redirect('category_rule_list')
@@ -0,0 +1,112 @@
+"""
+Per-user choice lists for the account, debit card and category dropdowns.
+
+The transaction, transfer, rule and import forms and the transaction list
+filters all render the user's active accounts, and the transaction form
+also lists debit cards and categories. Building those lists costs a query
+per model on every GET and every failed POST, so the finished lists are
+kept in Django's cache, one entry per user.
+
+core.signals deletes a user's entry whenever one of their bank accounts,
+credit cards, debit cards or categories is saved (including archive() and
+activate()) or deleted, so the next request rebuilds it. Changes made with
+queryset.update() bypass the signals and must call invalidate_form_choices().
+
+The cache (settings.CACHES) is local memory, so invalidation only reaches
+the process that made the change: the app runs a single gunicorn worker,
+but a management command or a second worker saving an account leaves the
+other processes' entries stale. CACHE_TIMEOUT bounds that to a few
+minutes; with a shared cache backend it can go back up to hours.
+
+The lists only decide what is rendered: forms still validate submitted
+values against the database.
+"""
+from django.core.cache import cache
+from django.db import transaction
+
+# Bump when the cached structure changes
+CACHE_VERSION = 1
+# Kept short: the cache is per process (see above)
+CACHE_TIMEOUT = 60 * 5
+
+
+def _cache_key(user_id):
+    return f'form_choices:{user_id}'
+
+
+def _build(user_id):
+    from accounts.models import DebitCard
+    from categories.models import Category
+
+    from .utils import get_all_accounts_with_emoji
+
+    return {
+        'accounts': [
+            (compound_value, display_name)
+            for _, display_name, compound_value in get_all_accounts_with_emoji(user_id)
+        ],
+        'debit_cards': [
+            (card.pk, str(card))
+            for card in DebitCard.objects.filter(user_id=user_id, status='active')
+        ],
+        'categories': [
+            {
+                'id': category.pk,
+                'name': category.name,
+                'type': category.type,
+                'type_display': category.get_type_display(),
+                'is_active': category.is_active,
+            }
+            for category in Category.objects.filter(user_id=user_id).order_by('name')
+        ],
+    }
+
+
+def get_form_choices(user):
+    """
+    The user's cached choice lists, built on a cache miss.
+
+    Args:
+        user: User or user id
+
+    Returns:
+        dict:
+            accounts: [(compound_value, display_name)] of active bank
+                accounts and credit cards, sorted by display name
+            debit_cards: [(id, label)] of active debit cards
+            categories: [{id, name, type, type_display, is_active}] of all
+                categories, sorted by name
+    """
+    user_id = getattr(user, 'pk', user)
+    choices = cache.get(_cache_key(user_id), version=CACHE_VERSION)
+    if choices is None:
+        choices = _build(user_id)
+        cache.set(_cache_key(user_id), choices, CACHE_TIMEOUT, version=CACHE_VERSION)
+    return choices
+
+
+def get_debit_card_choices(user):
+    """[(id, label)] of the user's active debit cards."""
+    return list(get_form_choices(user)['debit_cards'])
+
+
+def get_category_choices(user, types=('income', 'expense')):
+    """[(id, "Type: name")] of the user's active categories of the given types, by type and name."""
+    categories = sorted(
+        (category for category in get_form_choices(user)['categories']
+         if category['is_active'] and category['type'] in types),
+        key=lambda category: (category['type'], category['name']),
+    )
+    return [(category['id'], f"{category['type_display']}: {category['name']}") for category in categories]
+
+
+def invalidate_form_choices(user_id):
+    """
+    Drop the user's cached choices.
+
+    Deleted again once the surrounding transaction commits, in case a
+    concurrent request cached the lists from the data before the change.
+    """
+    key = _cache_key(user_id)
+    cache.delete(key, version=CACHE_VERSION)
+    transaction.on_commit(lambda: cache.delete(key, version=CACHE_VERSION))
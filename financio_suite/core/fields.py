@@ -0,0 +1,156 @@
+"""
+Encrypted model fields that decrypt on attribute access instead of on load.
+
+encrypted_model_fields decrypts every encrypted column as each row is read,
+so a list of 100 accounts pays 100+ Fernet decryptions even though the
+templates only show the *_last4 columns. LazyEncryptedCharField keeps the
+ciphertext as an EncryptedValue when the row is loaded and decrypts it the
+first time the attribute is read, caching the plaintext on the value.
+
+An encrypted value that was never changed is written back as the same
+ciphertext on save(), so saving an instance for an unrelated change neither
+decrypts nor re-encrypts it. Ciphertext that is not under the first
+FIELD_ENCRYPTION_KEY is re-encrypted instead: an instance loaded before a
+key rotation (rotate_encryption_key) and saved after it must not put back a
+token of the key about to be removed.
+
+The stored format is the one of EncryptedCharField, so switching a field
+over needs no data migration.
+"""
+import functools
+
+import cryptography.fernet
+from django.conf import settings
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+from encrypted_model_fields.fields import EncryptedCharField, decrypt_str
+
+
+@functools.lru_cache(maxsize=4)
+def _fernet(key):
+    return cryptography.fernet.Fernet(key)
+
+
+def is_primary_token(token):
+    """Whether token is encrypted with the first FIELD_ENCRYPTION_KEY (checks the signature only)."""
+    keys = settings.FIELD_ENCRYPTION_KEY
+    key = keys if isinstance(keys, str) else keys[0]
+    try:
+        _fernet(key).extract_timestamp(token.encode('utf-8'))
+    except cryptography.fernet.InvalidToken:
+        return False
+    return True
+
+
+class EncryptedValue:
+    """
+    Ciphertext read from the database, decrypted on first use.
+
+    Model instances never hand this out (the field's descriptor returns the
+    plaintext), but values() and values_list() rows contain it. It converts
+    with str() and compares, hashes and measures like its plaintext.
+    """
+
+    __slots__ = ('token', '_plaintext')
+
+    def __init__(self, token):
+        self.token = token
+        self._plaintext = None
+
+    @property
+    def plaintext(self):
+        if self._plaintext is None:
+            try:
+                self._plaintext = decrypt_str(self.token)
+            except cryptography.fernet.InvalidToken:
+                # Same as EncryptedCharField: values stored before the
+                # column was encrypted are returned as they are
+                self._plaintext = self.token
+        return self._plaintext
+
+    def __str__(self):
+        return self.plaintext
+
+    def __repr__(self):
+        return '<EncryptedValue>'
+
+    def __eq__(self, other):
+        if isinstance(other, EncryptedValue):
+            other = other.plaintext
+        return self.plaintext == other
+
+    def __hash__(self):
+        return hash(self.plaintext)
+
+    def __len__(self):
+        return len(self.plaintext)
+
+    def __bool__(self):
+        return bool(self.plaintext)
+
+    def __reduce__(self):
+        # Pickle (e.g. into the cache) without the plaintext
+        return (EncryptedValue, (self.token,))
+
+
+class DecryptOnAccessAttribute(DeferredAttribute):
+    """
+    Descriptor returning the plaintext of an EncryptedValue (loading deferred columns as usual).
+
+    Unlike DeferredAttribute it is a data descriptor, so it is consulted even
+    though the value lives in the instance __dict__.
+    """
+
+    def __get__(self, instance, cls=None):
+        value = super().__get__(instance, cls)
+        if isinstance(value, EncryptedValue):
+            return value.plaintext
+        return value
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+
+class LazyEncryptedCharField(EncryptedCharField):
+    """EncryptedCharField that decrypts on attribute access, once per instance."""
+
+    descriptor_class = DecryptOnAccessAttribute
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return EncryptedValue(value)
+
+    def to_python(self, value):
+        if isinstance(value, EncryptedValue):
+            return models.CharField.to_python(self, value.plaintext)
+        return super().to_python(value)
+
+    def clean(self, value, model_instance):
+        """Keep the loaded ciphertext when full_clean() leaves the value unchanged."""
+        cleaned = super().clean(value, model_instance)
+        stored = model_instance.__dict__.get(self.attname) if model_instance is not None else None
+        if isinstance(stored, EncryptedValue) and stored.plaintext == cleaned:
+            return stored
+        return cleaned
+
+    def pre_save(self, model_instance, add):
+        # Read the raw value: the descriptor would decrypt it
+        if self.attname in model_instance.__dict__:
+            return model_instance.__dict__[self.attname]
+        return super().pre_save(model_instance, add)
+
+    def get_db_prep_save(self, value, connection):
+        if isinstance(value, EncryptedValue):
+            if is_primary_token(value.token):
+                return value.token
+            value = value.plaintext
+        return super().get_db_prep_save(value, connection)
+
+
+def encrypted_field_names(model):
+    """Names of a model's LazyEncryptedCharFields."""
+    return [
+        field.attname for field in model._meta.concrete_fields
+        if isinstance(field, LazyEncryptedCharField)
+    ]
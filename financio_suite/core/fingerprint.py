@@ -0,0 +1,140 @@
+"""
+Content fingerprints for duplicate detection.
+
+A fingerprint is the SHA-1 of what identifies a money movement to a
+person reading a statement: the account(s), the calendar date, the
+signed amount and the description with case, punctuation and spacing
+normalized away. "SWIGGY  Order #42" on 1 Apr and "swiggy order 42"
+later that day produce the same fingerprint.
+
+Fingerprints are stored on Transaction and Transfer and indexed per user
+on live rows, so an exact duplicate is found with one index lookup and a
+whole batch of statement lines with one `fingerprint__in` query.
+
+Near duplicates (same account and amount a few days apart, whatever the
+description says) are grouped by find_near_duplicates() in a single
+window-function query.
+"""
+import hashlib
+import re
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+
+# Words made of ASCII letters/digits; everything else is dropped
+FINGERPRINT_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def normalize_text(text):
+    """Lower-case text and keep only its words: 'UPI/DR - Swiggy ' -> 'upi dr swiggy'."""
+    return ' '.join(FINGERPRINT_TOKEN_RE.findall((text or '').lower()))
+
+
+def _digest(*parts):
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _day(occurred_at):
+    return occurred_at.date().isoformat() if hasattr(occurred_at, 'date') else occurred_at.isoformat()
+
+
+def _money(amount):
+    return Decimal(amount).quantize(Decimal('0.01'))
+
+
+def transaction_fingerprint(account_content_type_id, account_object_id, occurred_at,
+                            transaction_type, amount, purpose):
+    """
+    Fingerprint of an income/expense transaction.
+
+    The amount is signed (expenses negative) so an income and an expense of
+    the same value on the same day never collide.
+    """
+    signed = _money(amount) if transaction_type == 'income' else -_money(amount)
+    return _digest(
+        'txn', account_content_type_id, account_object_id, _day(occurred_at), signed, normalize_text(purpose),
+    )
+
+
+def transfer_fingerprint(from_content_type_id, from_object_id, to_content_type_id, to_object_id,
+                         occurred_at, amount, memo):
+    """Fingerprint of a transfer between two accounts."""
+    return _digest(
+        'transfer', from_content_type_id, from_object_id, to_content_type_id, to_object_id,
+        _day(occurred_at), _money(amount), normalize_text(memo),
+    )
+
+
+NEAR_DUPLICATE_SQL = """
+WITH live AS (
+    SELECT id, datetime_ist, {partition},
+           CASE WHEN datetime_ist - LAG(datetime_ist) OVER same_key <= %(window)s
+                THEN 0 ELSE 1 END AS starts_group
+    FROM {table}
+    WHERE user_id = %(user_id)s AND deleted_at IS NULL
+    WINDOW same_key AS (PARTITION BY {partition} ORDER BY datetime_ist, id)
+),
+grouped AS (
+    SELECT id, datetime_ist, {partition},
+           SUM(starts_group) OVER (PARTITION BY {partition} ORDER BY datetime_ist, id) AS group_no
+    FROM live
+),
+sized AS (
+    SELECT id, datetime_ist,
+           DENSE_RANK() OVER (ORDER BY {partition}, group_no) AS group_id,
+           COUNT(*) OVER (PARTITION BY {partition}, group_no) AS group_size,
+           MAX(datetime_ist) OVER (PARTITION BY {partition}, group_no) AS latest
+    FROM grouped
+),
+ranked AS (
+    SELECT id, datetime_ist,
+           DENSE_RANK() OVER (ORDER BY latest DESC, group_id) AS group_rank
+    FROM sized
+    WHERE group_size > 1
+)
+SELECT id, group_rank
+FROM ranked
+WHERE group_rank <= %(max_groups)s
+ORDER BY group_rank, datetime_ist, id
+"""
+
+
+def find_near_duplicates(queryset, user, fields, days=3, max_groups=50):
+    """
+    Group a user's live rows that look like one payment recorded more than once.
+
+    Rows fall in one group when they share every column in fields (for
+    example account, type and amount) and each is at most `days` after the
+    previous one. Grouping happens in a single SQL query using window
+    functions; the grouped rows are then loaded with one more query.
+
+    Args:
+        queryset: Queryset used to load the rows (e.g. with select_related);
+            its model must have user, datetime_ist and deleted_at fields
+        user: User whose rows are searched
+        fields: Model field names that must be equal within a group
+        days: Maximum gap between consecutive rows of a group
+        max_groups: Newest groups to return
+
+    Returns:
+        list[list[Model]]: Groups, newest first; rows oldest first within a group
+    """
+    model = queryset.model
+    quote = connection.ops.quote_name
+    partition = ', '.join(quote(model._meta.get_field(name).column) for name in fields)
+    sql = NEAR_DUPLICATE_SQL.format(table=quote(model._meta.db_table), partition=partition)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, {
+            'user_id': user.pk,
+            'window': timedelta(days=days),
+            'max_groups': max_groups,
+        })
+        rows = cursor.fetchall()
+
+    objects = queryset.in_bulk([row_id for row_id, _ in rows])
+    groups = {}
+    for row_id, group_rank in rows:
+        if row_id in objects:
+            groups.setdefault(group_rank, []).append(objects[row_id])
+    return [group for group in groups.values() if len(group) > 1]
@@ -0,0 +1,97 @@
+"""
+Management command to benchmark loading account lists with encrypted columns.
+
+Creates a throwaway user with N bank accounts and N credit cards inside a
+database transaction, then measures the CPU time of loading them three ways:
+
+* eager: every encrypted column fetched and decrypted on load (what
+  encrypted_model_fields' EncryptedCharField does for every row)
+* lazy: columns fetched but only decrypted when read (with_encrypted())
+* deferred: the default managers, which leave the encrypted columns out
+
+followed by get_all_accounts_with_emoji(), the account dropdown builder.
+Everything is rolled back at the end.
+
+Usage:
+    python manage.py benchmark_account_lists
+
+    # More accounts, more runs
+    python manage.py benchmark_account_lists --accounts 500 --runs 20
+"""
+import statistics
+import time
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.models import BankAccount
+from core.fields import encrypted_field_names
+from core.utils import get_all_accounts_with_emoji
+from creditcards.models import CreditCard
+
+
+class Command(BaseCommand):
+    help = 'Benchmark account list loading with eager, lazy and deferred decryption (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--accounts', type=int, default=150, help='Bank accounts and credit cards to create (each)')
+        parser.add_argument('--runs', type=int, default=10, help='Timed runs per variant')
+
+    def handle(self, *args, **options):
+        count = options['accounts']
+
+        with transaction.atomic():
+            user = User.objects.create_user(username=f'benchmark_{int(time.time())}')
+            self._generate(user, count)
+            self.stdout.write(f'{count:,} bank accounts and {count:,} credit cards\n')
+
+            def load(eager=False, deferred=False):
+                for model in (BankAccount, CreditCard):
+                    queryset = model.objects.filter(user=user)
+                    if not deferred:
+                        queryset = queryset.with_encrypted()
+                    names = encrypted_field_names(model)
+                    for account in queryset:
+                        if eager:
+                            for name in names:
+                                getattr(account, name)
+
+            self._time('Eager decryption (previous behaviour)', lambda: load(eager=True), options['runs'])
+            self._time('Lazy decryption', load, options['runs'])
+            self._time('Deferred columns (default managers)', lambda: load(deferred=True), options['runs'])
+            self._time('get_all_accounts_with_emoji()', lambda: get_all_accounts_with_emoji(user), options['runs'])
+
+            # Discard the synthetic data
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('\n✓ Benchmark finished, synthetic data rolled back'))
+
+    def _generate(self, user, count):
+        """Create the accounts through save() so the values are encrypted as usual."""
+        for i in range(count):
+            BankAccount.objects.create(
+                user=user, name=f'Bank {i}', institution='Benchmark Bank',
+                account_number=f'{50100000000000 + i}', opening_balance=Decimal('1000.00'),
+            )
+            CreditCard.objects.create(
+                user=user, name=f'Card {i}', institution='Benchmark Bank',
+                card_number=f'{4111111100000000 + i}', cvv='123', credit_limit=Decimal('100000.00'),
+                billing_day=1, due_day=20, expiry_date=date(date.today().year + 3, 12, 31),
+            )
+
+    def _time(self, label, func, runs):
+        """Report median CPU (process) time and wall time over runs."""
+        cpu, wall = [], []
+        for _ in range(runs):
+            cpu_started = time.process_time()
+            wall_started = time.perf_counter()
+            func()
+            cpu.append((time.process_time() - cpu_started) * 1000)
+            wall.append((time.perf_counter() - wall_started) * 1000)
+        self.stdout.write(
+            f'{label}: median CPU {statistics.median(cpu):.1f} ms, '
+            f'wall {statistics.median(wall):.1f} ms (min {min(wall):.1f} ms, max {max(wall):.1f} ms)'
+        )
@@ -0,0 +1,81 @@
+"""
+Management command to create thumbnails of existing account pictures.
+
+Pictures uploaded before thumbnails existed are copied to their content
+hash name (account_pictures/<hash>.<ext>) and the account is pointed at
+the copy; the original file is left in place. Missing thumbnails of every
+picture are then written. Accounts are updated with queryset.update(), so
+their save() logic doesn't run.
+
+Safe to re-run: pictures that already have all their thumbnails are skipped.
+
+Usage:
+    python manage.py generate_account_thumbnails
+
+    # Rewrite thumbnails that already exist (e.g. after changing the sizes)
+    python manage.py generate_account_thumbnails --force
+"""
+import time
+from pathlib import PurePosixPath
+
+from django.core.management.base import BaseCommand
+
+from accounts.models import BankAccount, DebitCard
+from core.thumbnails import PICTURE_DIR, content_hash, is_hashed, write_thumbnails
+from creditcards.models import CreditCard
+
+
+class Command(BaseCommand):
+    help = 'Create thumbnails for existing account pictures'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rewrite thumbnails that already exist',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        counts = {'pictures': 0, 'renamed': 0, 'missing': 0}
+        original_bytes = thumbnail_bytes = 0
+
+        for model in (BankAccount, DebitCard, CreditCard):
+            accounts = model.objects.exclude(picture='').exclude(picture__isnull=True).only('pk', 'picture')
+            for account in accounts.iterator():
+                picture = account.picture
+                storage = picture.storage
+                if not storage.exists(picture.name):
+                    counts['missing'] += 1
+                    self.stdout.write(self.style.WARNING(
+                        f'  {model._meta.label} {account.pk}: {picture.name} not found'
+                    ))
+                    continue
+
+                with storage.open(picture.name, 'rb') as file:
+                    name = picture.name
+                    if not is_hashed(name):
+                        name = f'{PICTURE_DIR}/{content_hash(file)}{PurePosixPath(name).suffix.lower()}'
+                        if not storage.exists(name):
+                            name = storage.save(name, file)
+                        model.objects.filter(pk=account.pk).update(picture=name)
+                        counts['renamed'] += 1
+                    written = write_thumbnails(name, file, storage, overwrite=options['force'])
+
+                counts['pictures'] += 1
+                if written:
+                    original_bytes += storage.size(name)
+                    thumbnail_bytes += written
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Processed {counts['pictures']} pictures in {elapsed:.1f}s "
+            f"({counts['renamed']} renamed to their content hash)"
+        ))
+        if thumbnail_bytes:
+            self.stdout.write(
+                f'Originals: {original_bytes / 1024:,.0f} KB, '
+                f'thumbnails written: {thumbnail_bytes / 1024:,.0f} KB'
+            )
+        if counts['missing']:
+            self.stdout.write(self.style.WARNING(f"{counts['missing']} picture files were missing and skipped"))
@@ -0,0 +1,289 @@
+"""
+Management command to re-encrypt every encrypted column with the current key.
+
+FIELD_ENCRYPTION_KEY is a comma separated list: the first key encrypts new
+values and every key can decrypt, so a key is rotated in three steps:
+
+1. Put the new key first and keep the old one after it
+   (FIELD_ENCRYPTION_KEY=new,old) and restart the app. Everything stays
+   readable and new writes use the new key.
+2. Run this command to re-encrypt the existing values with the new key.
+3. Remove the old key from FIELD_ENCRYPTION_KEY.
+
+Each model with encrypted fields is streamed in primary key order
+(keyset pagination, one index range scan per chunk) with raw SQL, so
+values are never decrypted through the ORM. Tokens are re-encrypted on a
+process pool and every chunk is written and committed in its own short
+transaction. The UPDATEs are compare-and-set on the ciphertext that was
+read: they only lock the rows they change, never a whole table, and a value
+saved by the app in the meantime (already under the new key) is left alone.
+
+Values already encrypted with the new key are skipped, so the command can be
+re-run safely. Progress is saved to a checkpoint file after every chunk; an
+interrupted run resumes from it, and the file is removed once everything is
+rotated.
+
+Usage:
+    # Re-encrypt everything with the first FIELD_ENCRYPTION_KEY
+    python manage.py rotate_encryption_key
+
+    # Bigger chunks, more workers, ignore an earlier checkpoint
+    python manage.py rotate_encryption_key --chunk-size 5000 --workers 8 --restart
+"""
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import cryptography.fernet
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from encrypted_model_fields.fields import EncryptedMixin
+
+# Set in every worker (and in this process when running without a pool)
+_crypter = None
+_primary = None
+
+
+def _init_crypter(keys):
+    global _crypter, _primary
+    fernets = [cryptography.fernet.Fernet(key) for key in keys]
+    _crypter = cryptography.fernet.MultiFernet(fernets)
+    _primary = fernets[0]
+
+
+def _rotate_tokens(tokens):
+    """
+    Re-encrypt tokens with the primary key.
+
+    Returns:
+        list: One entry per token: the new token, None when it is already
+            encrypted with the primary key, or False when no configured key
+            can decrypt it
+    """
+    rotated = []
+    for token in tokens:
+        data = token.encode('utf-8')
+        try:
+            # Verifies the signature only, without decrypting
+            _primary.extract_timestamp(data)
+            rotated.append(None)
+            continue
+        except cryptography.fernet.InvalidToken:
+            pass
+        try:
+            rotated.append(_crypter.rotate(data).decode('utf-8'))
+        except cryptography.fernet.InvalidToken:
+            rotated.append(False)
+    return rotated
+
+
+def encrypted_models():
+    """(model, [encrypted fields]) for every installed model with encrypted columns."""
+    found = []
+    for model in apps.get_models():
+        if model._meta.proxy or not model._meta.managed:
+            continue
+        fields = [field for field in model._meta.concrete_fields if isinstance(field, EncryptedMixin)]
+        if fields:
+            found.append((model, fields))
+    return found
+
+
+class Command(BaseCommand):
+    help = 'Re-encrypt encrypted columns with the first FIELD_ENCRYPTION_KEY'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Rows read, re-encrypted and committed together (default: 1000)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=min(4, os.cpu_count() or 1),
+            help='Re-encryption processes; 1 runs in this process (default: up to 4)',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            default=str(Path(settings.BASE_DIR) / '.rotate_encryption_key.json'),
+            help='Progress file used to resume an interrupted run',
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Ignore an existing checkpoint and start from the beginning',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        workers = options['workers']
+        self.verbosity = options['verbosity']
+        if chunk_size < 1:
+            raise CommandError('--chunk-size must be at least 1')
+        if workers < 1:
+            raise CommandError('--workers must be at least 1')
+
+        keys = settings.FIELD_ENCRYPTION_KEY
+        if isinstance(keys, str):
+            keys = [keys]
+        try:
+            _init_crypter(keys)
+        except (TypeError, ValueError) as e:
+            raise CommandError(f'FIELD_ENCRYPTION_KEY defined incorrectly: {e}')
+
+        checkpoint_path = Path(options['checkpoint'])
+        key_id = hashlib.sha256(str(keys[0]).encode()).hexdigest()[:16]
+        checkpoint = self._load_checkpoint(checkpoint_path, key_id, options['restart'])
+        if checkpoint['models']:
+            self.stdout.write(f'Resuming from {checkpoint_path}')
+
+        pool = ProcessPoolExecutor(workers, initializer=_init_crypter, initargs=(keys,)) if workers > 1 else None
+        totals = {'rows': 0, 'rotated': 0, 'current': 0, 'unreadable': 0, 'conflicts': 0}
+        started = time.perf_counter()
+        try:
+            for model, fields in encrypted_models():
+                label = model._meta.label
+                progress = checkpoint['models'].setdefault(label, {'last_pk': None, 'done': False})
+                if progress['done']:
+                    self.stdout.write(f'  {label}: already rotated')
+                    continue
+
+                counts = self._rotate_model(model, fields, chunk_size, workers, pool, progress, checkpoint, checkpoint_path)
+                for name, count in counts.items():
+                    totals[name] += count
+                progress['done'] = True
+                self._save_checkpoint(checkpoint_path, checkpoint)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        checkpoint_path.unlink(missing_ok=True)
+        elapsed = time.perf_counter() - started
+        rate = totals['rows'] / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"\nRe-encrypted {totals['rotated']} values in {totals['rows']} rows "
+            f"in {elapsed:.1f}s ({rate:,.0f} rows/s); "
+            f"{totals['current']} already current, {totals['conflicts']} changed meanwhile"
+        ))
+        if totals['unreadable']:
+            self.stdout.write(self.style.WARNING(
+                f"{totals['unreadable']} values could not be decrypted with any configured key and were left as they are"
+            ))
+
+    def _rotate_model(self, model, fields, chunk_size, workers, pool, progress, checkpoint, checkpoint_path):
+        """Rotate one model's encrypted columns chunk by chunk; returns counts."""
+        quote = connection.ops.quote_name
+        table = quote(model._meta.db_table)
+        pk = quote(model._meta.pk.column)
+        columns = [field.column for field in fields]
+        select = (
+            f"SELECT {pk}, {', '.join(quote(column) for column in columns)} FROM {table} "
+            f"WHERE {pk} > %s ORDER BY {pk} LIMIT %s"
+        )
+        first_select = select.replace(f'WHERE {pk} > %s ', '')
+
+        counts = {'rows': 0, 'rotated': 0, 'current': 0, 'unreadable': 0, 'conflicts': 0}
+        started = time.perf_counter()
+        while True:
+            with connection.cursor() as cursor:
+                if progress['last_pk'] is None:
+                    cursor.execute(first_select, [chunk_size])
+                else:
+                    cursor.execute(select, [progress['last_pk'], chunk_size])
+                rows = cursor.fetchall()
+            if not rows:
+                break
+
+            # (pk, column index, token) of every non-empty value in the chunk
+            values = [
+                (row[0], index, token)
+                for row in rows
+                for index, token in enumerate(row[1:])
+                if token
+            ]
+            tokens = [token for _, _, token in values]
+            if pool is not None:
+                size = -(-len(tokens) // workers)
+                batches = [tokens[i:i + size] for i in range(0, len(tokens), size)] if tokens else []
+                rotated = [token for batch in pool.map(_rotate_tokens, batches) for token in batch]
+            else:
+                rotated = _rotate_tokens(tokens)
+
+            # {column index: [(pk, old token, new token)]}
+            updates = {}
+            for (row_pk, index, old), new in zip(values, rotated):
+                if new is None:
+                    counts['current'] += 1
+                elif new is False:
+                    counts['unreadable'] += 1
+                else:
+                    updates.setdefault(index, []).append((row_pk, old, new))
+
+            with transaction.atomic():
+                for index, changes in updates.items():
+                    written = self._write(table, pk, quote(columns[index]), changes)
+                    counts['rotated'] += written
+                    counts['conflicts'] += len(changes) - written
+
+            counts['rows'] += len(rows)
+            progress['last_pk'] = rows[-1][0]
+            self._save_checkpoint(checkpoint_path, checkpoint)
+
+            if self.verbosity >= 2:
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"    {model._meta.label}: {counts['rows']} rows "
+                    f"({counts['rows'] / elapsed if elapsed else 0:,.0f} rows/s)"
+                )
+
+        elapsed = time.perf_counter() - started
+        rate = counts['rows'] / elapsed if elapsed else 0
+        self.stdout.write(
+            f"  {model._meta.label}: {counts['rotated']} values re-encrypted in "
+            f"{counts['rows']} rows ({rate:,.0f} rows/s)"
+        )
+        return counts
+
+    @staticmethod
+    def _write(table, pk, column, changes):
+        """
+        Set column to the new tokens where it still holds the old ones.
+
+        Returns the number of rows updated.
+        """
+        placeholders = ', '.join(['(%s, %s, %s)'] * len(changes))
+        params = [value for change in changes for value in change]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} AS t SET {column} = v.new_token "
+                f"FROM (VALUES {placeholders}) AS v(id, old_token, new_token) "
+                f"WHERE t.{pk} = v.id AND t.{column} = v.old_token",
+                params,
+            )
+            return cursor.rowcount
+
+    @staticmethod
+    def _load_checkpoint(path, key_id, restart):
+        """Checkpoint of an interrupted run with the same primary key, or a fresh one."""
+        if not restart and path.exists():
+            try:
+                checkpoint = json.loads(path.read_text())
+            except ValueError:
+                raise CommandError(f'Unreadable checkpoint {path}; use --restart to ignore it')
+            if checkpoint.get('key_id') == key_id:
+                return checkpoint
+        return {'key_id': key_id, 'models': {}}
+
+    @staticmethod
+    def _save_checkpoint(path, checkpoint):
+        """Write the checkpoint atomically (rename over the previous file)."""
+        tmp_path = path.with_name(path.name + '.tmp')
+        tmp_path.write_text(json.dumps(checkpoint))
+        os.replace(tmp_path, path)
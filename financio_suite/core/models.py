@@ -4,9 +4,143 @@ from django.db import models
 Core models - Base classes for all account types
 """
 import re
+from decimal import Decimal
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
+from django.db.models import Count, Exists, ExpressionWrapper, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .fields import encrypted_field_names
+from .thumbnails import store_picture
+
+
+class DeferEncryptedManager(models.Manager):
+    """
+    Manager that leaves a model's encrypted columns out of its queries.
+
+    List pages and account dropdowns only show the *_last4 columns, so the
+    ciphertext isn't even fetched. Reading an encrypted attribute of such an
+    instance loads the column with one extra query; use with_encrypted()
+    where the full values are needed (detail and edit pages).
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        encrypted = encrypted_field_names(self.model)
+        return queryset.defer(*encrypted) if encrypted else queryset
+
+
+class EncryptedQuerySet(models.QuerySet):
+    """QuerySet whose as_manager() builds a DeferEncryptedManager."""
+
+    def as_manager(cls):
+        manager = DeferEncryptedManager.from_queryset(cls)()
+        manager._built_with_as_manager = True
+        return manager
+
+    as_manager.queryset_only = True
+    as_manager = classmethod(as_manager)
+
+    def with_encrypted(self):
+        """Load the encrypted columns too (still decrypted only when read). Clears other deferrals."""
+        return self.defer(None)
+
+
+class AccountQuerySet(EncryptedQuerySet):
+    """QuerySet for accounts referenced by transactions and transfers through GenericForeignKeys."""
+
+    def with_activity_flags(self):
+        """
+        Annotate each account with its ledger activity, in the same query.
+
+        Annotations:
+            has_transactions: Any live transaction on the account
+            has_transfers: Any live transfer from or to the account
+            txn_count: Number of live transactions
+            last_activity_at: Latest live transaction or transfer datetime (None if neither)
+
+        Each annotation is a correlated subquery on one (content type,
+        object id) column pair, so every lookup is an index scan
+        (idx_txn_account, idx_transfer_from_account, idx_transfer_to_account).
+        Transfers from and to the account are separate EXISTS checks rather
+        than one OR'd filter, which could use neither index.
+        """
+        from django.contrib.contenttypes.models import ContentType
+        from transactions.models import Transaction
+        from transfers.models import Transfer
+
+        content_type = ContentType.objects.get_for_model(self.model)
+        transactions = Transaction.objects.filter(
+            account_content_type=content_type,
+            account_object_id=OuterRef('pk'),
+            deleted_at__isnull=True,
+        ).order_by()
+        transfers_from = Transfer.objects.filter(
+            from_account_content_type=content_type,
+            from_account_object_id=OuterRef('pk'),
+            deleted_at__isnull=True,
+        ).order_by()
+        transfers_to = Transfer.objects.filter(
+            to_account_content_type=content_type,
+            to_account_object_id=OuterRef('pk'),
+            deleted_at__isnull=True,
+        ).order_by()
+
+        def latest(queryset):
+            return Subquery(queryset.order_by('-datetime_ist').values('datetime_ist')[:1])
+
+        return self.annotate(
+            has_transactions=Exists(transactions),
+            has_transfers=ExpressionWrapper(
+                Q(Exists(transfers_from)) | Q(Exists(transfers_to)),
+                output_field=models.BooleanField(),
+            ),
+            txn_count=Coalesce(
+                Subquery(
+                    transactions.values('account_object_id').annotate(count=Count('id')).values('count'),
+                    output_field=models.IntegerField(),
+                ),
+                0,
+            ),
+            # GREATEST ignores NULLs on PostgreSQL
+            last_activity_at=Greatest(latest(transactions), latest(transfers_from), latest(transfers_to)),
+        )
+
+    def with_current_balance(self):
+        """
+        Annotate current_balance from the materialized balance row (joined).
+
+        Falls back to opening_balance when the balance row is missing, like
+        get_current_balance().
+        """
+        return self.annotate(
+            current_balance=Coalesce('balance__balance_amount', 'opening_balance'),
+        )
+
+    def status_totals(self, **totals):
+        """
+        Counts by status and totals over active accounts, in one aggregate query.
+
+        Args:
+            **totals: Extra expressions to sum over active accounts; they may
+                refer to current_balance
+
+        Returns:
+            dict: active_count, archived_count, total_balance and one entry
+                per extra expression (Decimal, 0.00 when there are none)
+        """
+        active = Q(status='active')
+        zero = Value(Decimal('0.00'), output_field=models.DecimalField())
+        sums = {'total_balance': 'current_balance', **totals}
+        return self.with_current_balance().aggregate(
+            active_count=Count('id', filter=active),
+            archived_count=Count('id', filter=Q(status='archived')),
+            **{
+                name: Coalesce(Sum(expression, filter=active, output_field=models.DecimalField()), zero)
+                for name, expression in sums.items()
+            },
+        )
 
 
 class BaseAccount(models.Model):
@@ -108,6 +242,12 @@ class BaseAccount(models.Model):
                 'color': 'Color must be a valid hex code (e.g., #3B82F6)'
             })
 
+    def save(self, *args, **kwargs):
+        """Store a newly uploaded picture under its content hash, with thumbnails"""
+        if self.picture and not self.picture._committed:
+            store_picture(self.picture)
+        super().save(*args, **kwargs)
+
     def archive(self):
         """Archive the account (soft delete)"""
         self.status = 'archived'
@@ -0,0 +1,231 @@
+"""
+Keyset (cursor) pagination for long, time-ordered lists.
+
+Django's Paginator issues COUNT(*) over the whole filtered set and fetches
+pages with OFFSET, so deep pages get slower the further back a user goes.
+KeysetPaginator instead remembers the (datetime_ist, id) of the last row
+shown and asks for rows strictly after it, which uses the index and costs
+the same on page 500 as on page 1. Totals are optional: by default an
+estimate from the query planner is used instead of an exact count.
+"""
+import base64
+import json
+from datetime import datetime
+
+from django.db import connection
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded."""
+
+
+def encode_cursor(direction, key):
+    """
+    Encode a direction ('next', 'prev' or 'last') and (value, id) key as an opaque token.
+
+    The value is the ordering column: a datetime, or a number such as a
+    search rank.
+    """
+    payload = [direction]
+    if key is not None:
+        value = key[0]
+        if isinstance(value, datetime):
+            payload += ['dt', value.isoformat(), key[1]]
+        else:
+            payload += ['num', float(value), key[1]]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Inverse of encode_cursor(). Returns (direction, key or None)."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+        direction = payload[0]
+        if direction not in ('next', 'prev', 'last'):
+            raise ValueError(direction)
+        if direction == 'last':
+            return direction, None
+        kind, value, pk = payload[1:4]
+        if kind == 'dt':
+            value = datetime.fromisoformat(value)
+        elif kind == 'num':
+            value = float(value)
+        else:
+            raise ValueError(kind)
+        return direction, (value, int(pk))
+    except (ValueError, TypeError, IndexError, json.JSONDecodeError) as e:
+        raise InvalidCursor(str(e)) from e
+
+
+class KeysetPage:
+    """
+    One page of a KeysetPaginator.
+
+    Iterates like a list and exposes has_next/has_previous plus ready-made
+    query strings (next_query, previous_query, first_query, last_query)
+    that keep the rest of the request's GET parameters.
+    """
+
+    def __init__(self, object_list, paginator, has_next, has_previous, params):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.has_next_page = has_next
+        self.has_previous_page = has_previous
+        self._params = params
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.has_next_page
+
+    def has_previous(self):
+        return self.has_previous_page
+
+    def has_other_pages(self):
+        return self.has_next_page or self.has_previous_page
+
+    @property
+    def count(self):
+        return self.paginator.count
+
+    @property
+    def count_is_estimate(self):
+        return self.paginator.count_is_estimate
+
+    def _query(self, token):
+        params = self._params.copy()
+        params.pop(self.paginator.cursor_param, None)
+        if token:
+            params[self.paginator.cursor_param] = token
+        return params.urlencode()
+
+    @property
+    def next_query(self):
+        if not self.object_list:
+            return self._query(None)
+        return self._query(encode_cursor('next', self.paginator.key_of(self.object_list[-1])))
+
+    @property
+    def previous_query(self):
+        if not self.object_list:
+            return self._query(None)
+        return self._query(encode_cursor('prev', self.paginator.key_of(self.object_list[0])))
+
+    @property
+    def first_query(self):
+        return self._query(None)
+
+    @property
+    def last_query(self):
+        return self._query(encode_cursor('last', None))
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset newest-first on (datetime_ist, id).
+
+    Any other descending column can be used as the key through order_field,
+    e.g. the `search_rank` annotation for relevance-ordered search results.
+
+    Args:
+        queryset: Unordered or ordered queryset; ordering is replaced
+        per_page: Rows per page
+        cursor_param: GET parameter holding the cursor
+        count: 'estimate' (planner estimate unless the result fits in one
+            page), 'exact' (COUNT(*)) or None (no total)
+        order_field: Field or annotation to order by (descending)
+    """
+
+    def __init__(self, queryset, per_page=20, cursor_param='cursor', count='estimate',
+                 order_field='datetime_ist'):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.cursor_param = cursor_param
+        self.count_mode = count
+        self.order_field = order_field
+        self._first_page_complete = None
+
+    def key_of(self, obj):
+        return getattr(obj, self.order_field), obj.pk
+
+    def _after(self, key):
+        """Rows older than key (further down a newest-first list)."""
+        field = self.order_field
+        return Q(**{f'{field}__lt': key[0]}) | Q(**{field: key[0], 'pk__lt': key[1]})
+
+    def _before(self, key):
+        """Rows newer than key."""
+        field = self.order_field
+        return Q(**{f'{field}__gt': key[0]}) | Q(**{field: key[0], 'pk__gt': key[1]})
+
+    def get_page(self, params):
+        """
+        Return the page selected by the cursor in params (a QueryDict).
+
+        A missing or malformed cursor yields the first page.
+        """
+        field = self.order_field
+        newest_first = (f'-{field}', '-pk')
+        oldest_first = (field, 'pk')
+
+        token = params.get(self.cursor_param)
+        try:
+            direction, key = decode_cursor(token) if token else (None, None)
+        except InvalidCursor:
+            direction, key = None, None
+
+        if direction == 'next':
+            rows = list(self.queryset.filter(self._after(key)).order_by(*newest_first)[:self.per_page + 1])
+            has_next, has_previous = len(rows) > self.per_page, True
+            rows = rows[:self.per_page]
+        elif direction in ('prev', 'last'):
+            queryset = self.queryset.filter(self._before(key)) if key else self.queryset
+            rows = list(queryset.order_by(*oldest_first)[:self.per_page + 1])
+            has_previous = len(rows) > self.per_page
+            has_next = direction == 'prev'
+            rows = rows[:self.per_page][::-1]
+        else:
+            rows = list(self.queryset.order_by(*newest_first)[:self.per_page + 1])
+            has_next, has_previous = len(rows) > self.per_page, False
+            rows = rows[:self.per_page]
+            if not has_next:
+                self._first_page_complete = len(rows)
+
+        return KeysetPage(rows, self, has_next, has_previous, params)
+
+    @property
+    def count_is_estimate(self):
+        return self.count_mode == 'estimate' and self._first_page_complete is None
+
+    @cached_property
+    def count(self):
+        """
+        Total number of rows, or None when counting is disabled.
+
+        In 'estimate' mode this is exact when the first page already holds
+        every row, otherwise the planner's row estimate (PostgreSQL), which
+        avoids scanning the whole result set.
+        """
+        if self.count_mode is None:
+            return None
+        if self._first_page_complete is not None:
+            return self._first_page_complete
+        queryset = self.queryset.order_by()
+        if self.count_mode == 'estimate' and connection.vendor == 'postgresql':
+            plan = json.loads(queryset.explain(format='json'))
+            return int(plan[0]['Plan']['Plan Rows'])
+        return queryset.count()
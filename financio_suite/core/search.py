@@ -0,0 +1,66 @@
+"""
+Ranked text search over transaction purposes and transfer memos.
+
+Matching combines three index-backed strategies:
+- Full-text: the generated `search_vector` column (GIN) with prefix
+  matching, so results appear while the user is still typing a word.
+- Substring: ILIKE '%term%', served by the pg_trgm GIN index.
+- Fuzzy: trigram word similarity, which tolerates typos ("swigy" → "Swiggy").
+
+Results are annotated with `search_rank` (full-text rank + trigram
+similarity) so callers can order by relevance. The rank is a double
+precision value, so a Python float holds it exactly and keyset cursors
+can compare against it.
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import Cast, Coalesce
+
+# Words made of letters/digits; everything else is treated as a separator
+SEARCH_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def build_prefix_query(text):
+    """
+    Build a tsquery matching every word of text as a prefix ("swig din" → swig:* & din:*).
+
+    Returns:
+        SearchQuery or None when text contains no searchable words
+    """
+    tokens = SEARCH_TOKEN_RE.findall(text.lower())
+    if not tokens:
+        return None
+    return SearchQuery(' & '.join(f'{token}:*' for token in tokens), search_type='raw', config='simple')
+
+
+def apply_text_search(queryset, text, field, extra_q=None):
+    """
+    Filter queryset to rows whose text field matches, annotated with search_rank.
+
+    Args:
+        queryset: Transaction or Transfer queryset with a `search_vector` field
+        text: User's search input
+        field: Name of the text column (e.g. 'purpose', 'memo')
+        extra_q: Optional Q OR-ed into the match (e.g. category name matches)
+
+    Returns:
+        QuerySet: Matching rows with a `search_rank` annotation (higher is better)
+    """
+    text = text.strip()
+    if not text:
+        return queryset
+
+    query = build_prefix_query(text)
+    match = Q(**{f'{field}__icontains': text}) | Q(**{f'{field}__trigram_word_similar': text})
+    rank = TrigramWordSimilarity(text, field)
+    if query is not None:
+        match |= Q(search_vector=query)
+        rank = rank + Coalesce(SearchRank(F('search_vector'), query), 0.0)
+    if extra_q is not None:
+        match |= extra_q
+
+    # SearchRank and similarity are float4: cast so the value survives a
+    # round trip through a Python float (the pagination cursor)
+    return queryset.filter(match).annotate(search_rank=Cast(rank, FloatField()))
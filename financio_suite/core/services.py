@@ -0,0 +1,217 @@
+"""
+Archive and reactivate accounts in bulk.
+"""
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
+from django.db.models import Count, Exists, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from accounts.models import BankAccount, DebitCard
+from creditcards.models import CreditCard
+from fds.models import FixedDeposit
+from imports.models import StatementImport
+from investments.models import Broker, Investment
+from reports.models import UserFinancialSummary
+
+from .choices import invalidate_form_choices
+
+
+class AccountStatusService:
+    """
+    Archive or reactivate bank accounts, credit cards, debit cards, fixed
+    deposits and brokers, many at a time.
+
+    Each requested model is read in one locked query, annotated with what
+    the checks need, so the number of queries doesn't grow with the number
+    of items. Items that pass are updated with one UPDATE per model.
+
+    Checks:
+        - A bank account or credit card with a staged statement import
+          cannot be archived: committing the import would post to it.
+        - A broker with active investments cannot be archived.
+        - A debit card cannot be reactivated while its bank account is
+          archived (unless the same request reactivates the bank account).
+        - A matured (archived) fixed deposit cannot be reactivated.
+
+    Archiving a bank account also archives its active debit cards.
+    Archiving an account with a balance is allowed but reported, since
+    archived accounts are left out of net worth.
+    """
+
+    # "id|model" name -> model, in the order items are processed
+    ITEM_MODELS = {
+        'bankaccount': BankAccount,
+        'creditcard': CreditCard,
+        'debitcard': DebitCard,
+        'fixeddeposit': FixedDeposit,
+        'broker': Broker,
+    }
+
+    # action -> (status before, status after)
+    ACTIONS = {
+        'archive': ('active', 'archived'),
+        'activate': ('archived', 'active'),
+    }
+
+    # Model -> UserFinancialSummary section its status feeds
+    SUMMARY_SECTIONS = {
+        BankAccount: 'banks',
+        CreditCard: 'cards',
+        FixedDeposit: 'fds',
+    }
+
+    # Models in the cached form choices (core.choices)
+    CHOICE_MODELS = (BankAccount, CreditCard, DebitCard)
+
+    @staticmethod
+    def _count(queryset, field):
+        """Subquery counting the rows of queryset per OuterRef('pk') in field."""
+        return Coalesce(
+            Subquery(
+                queryset.filter(**{field: OuterRef('pk')}).order_by()
+                .values(field).annotate(count=Count('id')).values('count'),
+                output_field=models.IntegerField(),
+            ),
+            0,
+        )
+
+    @staticmethod
+    def _checked(model, user, ids):
+        """The user's items of model among ids, locked and annotated for the checks."""
+        queryset = model.objects.filter(user=user, pk__in=ids)
+        if model in (BankAccount, CreditCard):
+            staged_imports = StatementImport.objects.filter(
+                status='staged',
+                account_content_type=ContentType.objects.get_for_model(model),
+                account_object_id=OuterRef('pk'),
+            )
+            queryset = queryset.with_current_balance().annotate(has_staged_import=Exists(staged_imports))
+        if model is BankAccount:
+            queryset = queryset.annotate(active_debit_cards=AccountStatusService._count(
+                DebitCard.objects.filter(status='active'), 'bank_account'
+            ))
+        elif model is DebitCard:
+            queryset = queryset.annotate(bank_account_status=F('bank_account__status'))
+        elif model is Broker:
+            queryset = queryset.annotate(active_investments=AccountStatusService._count(
+                Investment.objects.filter(status='active'), 'broker'
+            ))
+        # The balance join is nullable: lock the items' own rows only
+        return queryset.select_for_update(of=('self',))
+
+    @staticmethod
+    def _blockers(item, action, activated_banks):
+        """Reasons the action cannot be applied to item."""
+        reasons = []
+        if action == 'archive':
+            if getattr(item, 'has_staged_import', False):
+                reasons.append('It has a staged statement import; commit or cancel it first.')
+            if getattr(item, 'active_investments', 0):
+                reasons.append(
+                    f'It has {item.active_investments} active investment(s); archive them first.'
+                )
+        else:
+            if isinstance(item, FixedDeposit):
+                reasons.append('Matured fixed deposits cannot be reactivated.')
+            if (getattr(item, 'bank_account_status', 'active') != 'active'
+                    and item.bank_account_id not in activated_banks):
+                reasons.append('Its bank account is archived; activate the bank account first.')
+        return reasons
+
+    @staticmethod
+    @transaction.atomic
+    def change_status(user, action, items):
+        """
+        Archive or reactivate many items at once.
+
+        Args:
+            user: Owner of the items
+            action: 'archive' or 'activate'
+            items: (model name, pk) pairs, model name one of ITEM_MODELS
+
+        Returns:
+            list: One dict per item, in the order of items:
+                item: "pk|model name"
+                object: The instance (None when not found)
+                outcome: 'archived', 'activated', 'unchanged', 'blocked'
+                    or 'not_found'
+                reasons: Why the item was blocked
+                warnings: Notes on an applied change
+                cascaded: Debit cards archived along with a bank account
+
+        Raises:
+            ValueError: If the action or a model name is unknown
+        """
+        if action not in AccountStatusService.ACTIONS:
+            raise ValueError(f"Unsupported action: {action}")
+        unknown = {name for name, _ in items} - set(AccountStatusService.ITEM_MODELS)
+        if unknown:
+            raise ValueError(f"Unsupported models: {', '.join(sorted(unknown))}")
+        before, after = AccountStatusService.ACTIONS[action]
+
+        ids_by_model = {}
+        for name, pk in items:
+            ids_by_model.setdefault(name, set()).add(pk)
+
+        outcomes = {}
+        changed = {}
+        for name, model in AccountStatusService.ITEM_MODELS.items():
+            if name not in ids_by_model:
+                continue
+            found = {item.pk: item for item in AccountStatusService._checked(model, user, ids_by_model[name])}
+            activated_banks = changed.get(BankAccount, set()) if action == 'activate' else set()
+            for pk in ids_by_model[name]:
+                item = found.get(pk)
+                outcome = {
+                    'item': f'{pk}|{name}', 'object': item, 'outcome': 'not_found',
+                    'reasons': [], 'warnings': [], 'cascaded': [],
+                }
+                outcomes[(name, pk)] = outcome
+                if item is None:
+                    continue
+                if item.status == after:
+                    outcome['outcome'] = 'unchanged'
+                    continue
+                outcome['reasons'] = AccountStatusService._blockers(item, action, activated_banks)
+                if outcome['reasons']:
+                    outcome['outcome'] = 'blocked'
+                    continue
+
+                outcome['outcome'] = f'{action}d'
+                if action == 'archive' and getattr(item, 'current_balance', 0):
+                    outcome['warnings'].append(
+                        f'Its balance of ₹{item.current_balance:,.2f} is left out of net worth while archived.'
+                    )
+                changed.setdefault(model, set()).add(pk)
+
+        if not changed:
+            return [outcomes[(name, pk)] for name, pk in items]
+
+        now = timezone.now()
+        for model, pks in changed.items():
+            model.objects.filter(pk__in=pks).update(status=after, updated_at=now)
+        for outcome in outcomes.values():
+            if outcome['outcome'] == f'{action}d':
+                outcome['object'].status = after
+
+        if action == 'archive' and changed.get(BankAccount):
+            cards = list(
+                DebitCard.objects.select_for_update()
+                .filter(bank_account_id__in=changed[BankAccount], status=before)
+                .exclude(pk__in=changed.get(DebitCard, set()))
+            )
+            DebitCard.objects.filter(pk__in=[card.pk for card in cards]).update(status=after, updated_at=now)
+            for card in cards:
+                card.status = after
+                outcomes[('bankaccount', card.bank_account_id)]['cascaded'].append(card)
+
+        # QuerySet.update() sends no post_save signals
+        sections = {AccountStatusService.SUMMARY_SECTIONS[model] for model in changed
+                    if model in AccountStatusService.SUMMARY_SECTIONS}
+        if sections:
+            UserFinancialSummary.refresh(user.pk, sections=sorted(sections))
+        if any(model in AccountStatusService.CHOICE_MODELS for model in changed):
+            invalidate_form_choices(user.pk)
+
+        return [outcomes[(name, pk)] for name, pk in items]
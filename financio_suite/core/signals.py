@@ -0,0 +1,26 @@
+"""
+Drop a user's cached form choices (core.choices) when the models they list change.
+"""
+from django.db.models.signals import post_delete, post_save
+
+from accounts.models import BankAccount, DebitCard
+from categories.models import Category
+from creditcards.models import CreditCard
+
+from .choices import invalidate_form_choices
+
+# Models whose rows appear in the cached choice lists
+CHOICE_SOURCES = (BankAccount, CreditCard, DebitCard, Category)
+
+
+def invalidate_choices(sender, instance, **kwargs):
+    """Invalidate the cached choices of the saved/deleted instance's owner."""
+    if kwargs.get('raw'):
+        return
+    invalidate_form_choices(instance.user_id)
+
+
+def connect_signals():
+    for model in CHOICE_SOURCES:
+        post_save.connect(invalidate_choices, sender=model, dispatch_uid=f'choices_save_{model.__name__}')
+        post_delete.connect(invalidate_choices, sender=model, dispatch_uid=f'choices_delete_{model.__name__}')
@@ -0,0 +1,49 @@
+"""
+Template tag rendering account pictures from their thumbnails.
+"""
+from django import template
+from django.utils.html import format_html
+
+from core.thumbnails import THUMBNAIL_SIZES, fallback_extension, is_hashed, thumbnail_name
+
+register = template.Library()
+
+
+@register.simple_tag
+def account_picture(account, size='sm', css_class=''):
+    """
+    Render an account's picture as a thumbnail.
+
+    Renders a <picture> with the WebP thumbnail and a JPEG/PNG fallback;
+    pictures without thumbnails yet are rendered full size. Renders nothing
+    when the account has no picture.
+
+    Args:
+        account: Account with a picture field
+        size: Thumbnail size name (see THUMBNAIL_SIZES)
+        css_class: Classes of the <img>
+
+    Example:
+        {% account_picture account 'sm' 'w-12 h-12 rounded-lg object-cover' %}
+    """
+    picture = account.picture
+    if not picture:
+        return ''
+    if not is_hashed(picture.name):
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="lazy">',
+            picture.url, account.name, css_class,
+        )
+
+    storage = picture.storage
+    edge = THUMBNAIL_SIZES[size]
+    # display: contents keeps the <img> the flex item of the caller's layout
+    return format_html(
+        '<picture style="display: contents">'
+        '<source srcset="{}" type="image/webp">'
+        '<img src="{}" alt="{}" class="{}" width="{}" height="{}" loading="lazy" decoding="async">'
+        '</picture>',
+        storage.url(thumbnail_name(picture.name, size, 'webp')),
+        storage.url(thumbnail_name(picture.name, size, fallback_extension(picture.name))),
+        account.name, css_class, edge, edge,
+    )
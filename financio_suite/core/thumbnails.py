@@ -0,0 +1,167 @@
+"""
+Thumbnails of account pictures.
+
+Account lists show pictures as 48px icons (64px on detail pages), but the
+originals are whatever the user uploaded, often multi-megabyte photos. When
+a picture is saved, it is stored under a name derived from its content
+(account_pictures/<hash>.<ext>), and square thumbnails are written next to
+it in account_thumbnails/ in every size, as WebP plus a JPEG (or PNG for
+images with transparency) fallback:
+
+    account_thumbnails/<hash>-96.webp
+    account_thumbnails/<hash>-96.jpg
+
+The thumbnail names follow from the picture name alone, so templates build
+their URLs without touching the storage. Equal names mean equal content,
+so the files never change and can be served with a one year, immutable
+Cache-Control (see nginx/default.conf and serve_thumbnail()). Pictures
+uploaded before thumbnails existed keep their names and are shown full
+size until generate_account_thumbnails processes them.
+"""
+import hashlib
+import io
+import re
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+PICTURE_DIR = 'account_pictures'
+THUMBNAIL_DIR = 'account_thumbnails'
+
+# Square edge in pixels: twice the CSS size, for high density screens
+THUMBNAIL_SIZES = {
+    'sm': 96,   # w-12 icons in lists
+    'md': 128,  # w-16 pictures on detail pages
+}
+
+WEBP_QUALITY = 80
+JPEG_QUALITY = 85
+
+# Source formats whose images may be transparent
+ALPHA_EXTENSIONS = {'.png', '.gif', '.webp'}
+
+HASH_LENGTH = 20
+HASHED_NAME_RE = re.compile(rf'^[0-9a-f]{{{HASH_LENGTH}}}$')
+
+
+def content_hash(file):
+    """Hex digest identifying the file's content."""
+    digest = hashlib.sha256()
+    file.seek(0)
+    for chunk in iter(lambda: file.read(64 * 1024), b''):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def is_hashed(picture_name):
+    """Whether the picture was stored under its content hash (and so has thumbnails)."""
+    return bool(picture_name) and bool(HASHED_NAME_RE.match(PurePosixPath(picture_name).stem))
+
+
+def fallback_extension(picture_name):
+    """Extension of the non-WebP thumbnails: png when the source may be transparent."""
+    return 'png' if PurePosixPath(picture_name).suffix.lower() in ALPHA_EXTENSIONS else 'jpg'
+
+
+def thumbnail_name(picture_name, size, extension):
+    """Storage name of a thumbnail of a hashed picture."""
+    stem = PurePosixPath(picture_name).stem
+    return f'{THUMBNAIL_DIR}/{stem}-{THUMBNAIL_SIZES[size]}.{extension}'
+
+
+def thumbnail_names(picture_name):
+    """Every thumbnail name of a hashed picture."""
+    extensions = ('webp', fallback_extension(picture_name))
+    return [
+        thumbnail_name(picture_name, size, extension)
+        for size in THUMBNAIL_SIZES
+        for extension in extensions
+    ]
+
+
+def _encode(image, extension):
+    buffer = io.BytesIO()
+    if extension == 'webp':
+        image.save(buffer, 'WEBP', quality=WEBP_QUALITY, method=6)
+    elif extension == 'png':
+        image.save(buffer, 'PNG', optimize=True)
+    else:
+        if image.mode != 'RGB':
+            # Flatten transparency onto white
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel('A') if 'A' in image.getbands() else None)
+            image = background
+        image.save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def write_thumbnails(picture_name, file, storage, overwrite=False):
+    """
+    Write the thumbnails of a hashed picture.
+
+    Args:
+        picture_name: Storage name of the picture (account_pictures/<hash>.<ext>)
+        file: Open file with the picture's content
+        storage: Storage to write to
+        overwrite: Rewrite thumbnails that already exist
+
+    Returns:
+        int: Total size in bytes of the thumbnails written
+    """
+    extensions = ('webp', fallback_extension(picture_name))
+    pending = {
+        size: [
+            (extension, name)
+            for extension in extensions
+            for name in [thumbnail_name(picture_name, size, extension)]
+            if overwrite or not storage.exists(name)
+        ]
+        for size in THUMBNAIL_SIZES
+    }
+    if not any(pending.values()):
+        return 0
+
+    file.seek(0)
+    written = 0
+    with Image.open(file) as source:
+        source = ImageOps.exif_transpose(source)
+        mode = 'RGBA' if 'A' in source.getbands() or 'transparency' in source.info else 'RGB'
+        source = source.convert(mode)
+        for size, targets in pending.items():
+            if not targets:
+                continue
+            # Centre crop, like the object-cover the templates use
+            edge = THUMBNAIL_SIZES[size]
+            image = ImageOps.fit(source, (edge, edge), Image.Resampling.LANCZOS)
+            for extension, name in targets:
+                content = _encode(image, extension)
+                if storage.exists(name):
+                    storage.delete(name)
+                storage.save(name, ContentFile(content))
+                written += len(content)
+    file.seek(0)
+    return written
+
+
+def store_picture(picture):
+    """
+    Save an uploaded picture under its content hash and write its thumbnails.
+
+    Args:
+        picture: Uncommitted ImageFieldFile of an account; it is committed,
+            but the account itself is not saved
+    """
+    file = picture.file
+    extension = PurePosixPath(picture.name).suffix.lower()
+    name = f'{PICTURE_DIR}/{content_hash(file)}{extension}'
+    storage = picture.storage
+
+    if storage.exists(name):
+        # Same content uploaded before: reuse the stored file
+        picture.name = name
+        picture._committed = True
+    else:
+        picture.save(PurePosixPath(name).name, file, save=False)
+    write_thumbnails(picture.name, file, storage)
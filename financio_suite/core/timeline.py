@@ -0,0 +1,257 @@
+"""
+Unified activity feed for a single bank account or credit card.
+
+Transactions and transfers touching the account are merged with one
+UNION ALL query. Each row carries the signed amount it moved and the
+account balance right after it.
+
+Pages are keyset-paginated on (datetime_ist, sort_id), where
+sort_id = id * 2 + (0 for transactions, 1 for transfers). That keeps the
+key a single integer even though ids repeat across the two tables, so
+core.pagination's cursors and KeysetPage are reused unchanged. The key
+predicate and the LIMIT are applied inside each branch of the UNION, so a
+page reads only its own rows however deep it is.
+
+The running balance is a window function over the page's rows only,
+anchored to the materialized balance row in the same query: the first
+page starts from it, and any other page from it minus the deltas of the
+rows newer than the page (one aggregate per table over an index range).
+Cursors only hold (datetime_ist, sort_id), so editing an older row never
+leaves a bookmarked page showing stale balances.
+"""
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+
+from accounts.models import BankAccount, BankAccountBalance
+from categories.models import Category
+from creditcards.models import CreditCard, CreditCardBalance
+from transactions.models import Transaction
+from transfers.models import Transfer
+
+from .pagination import InvalidCursor, KeysetPage, decode_cursor
+from .utils import ACCOUNT_EMOJI
+
+
+TRANSACTION_FILTER = """t.user_id = %(user_id)s AND t.deleted_at IS NULL
+      AND t.account_content_type_id = %(content_type_id)s AND t.account_object_id = %(account_id)s"""
+
+TRANSACTION_DELTA = "CASE WHEN t.transaction_type = 'income' THEN t.amount ELSE -t.amount END"
+
+TRANSFER_FILTER = """tr.user_id = %(user_id)s AND tr.deleted_at IS NULL
+      AND ((tr.from_account_content_type_id = %(content_type_id)s AND tr.from_account_object_id = %(account_id)s)
+        OR (tr.to_account_content_type_id = %(content_type_id)s AND tr.to_account_object_id = %(account_id)s))"""
+
+TRANSFER_DELTA = """CASE WHEN tr.from_account_content_type_id = %(content_type_id)s
+                 AND tr.from_account_object_id = %(account_id)s THEN -tr.amount ELSE tr.amount END"""
+
+CURRENT_BALANCE_SQL = """COALESCE(
+               (SELECT balance_amount FROM {balances} WHERE account_id = %(account_id)s),
+               %(opening_balance)s
+           )"""
+
+# Balance before the rows matched by the newer_* conditions: the current
+# balance minus their deltas
+EARLIER_BALANCE_SQL = CURRENT_BALANCE_SQL + f"""
+           - (SELECT COALESCE(SUM({TRANSACTION_DELTA}), 0) FROM {{transactions}} t
+              WHERE {TRANSACTION_FILTER} {{newer_transactions}})
+           - (SELECT COALESCE(SUM({TRANSFER_DELTA}), 0) FROM {{transfers}} tr
+              WHERE {TRANSFER_FILTER} {{newer_transfers}})"""
+
+ACTIVITY_SQL = f"""
+WITH activity AS (
+    (SELECT 'transaction' AS kind, t.id, t.id * 2 AS sort_id, t.datetime_ist,
+           t.transaction_type AS entry_type, t.method_type, t.purpose AS description,
+           t.amount,
+           {TRANSACTION_DELTA} AS delta,
+           c.name AS category_name, c.color AS category_color,
+           NULL::integer AS counterparty_content_type_id, NULL::integer AS counterparty_id
+    FROM {{transactions}} t
+    LEFT JOIN {{categories}} c ON c.id = t.category_id
+    WHERE {TRANSACTION_FILTER}
+      {{transaction_key}}
+    ORDER BY t.datetime_ist {{direction}}, t.id {{direction}}
+    LIMIT %(limit)s)
+
+    UNION ALL
+
+    (SELECT 'transfer', tr.id, tr.id * 2 + 1, tr.datetime_ist,
+           CASE WHEN tr.from_account_content_type_id = %(content_type_id)s
+                 AND tr.from_account_object_id = %(account_id)s THEN 'outgoing' ELSE 'incoming' END,
+           tr.method_type, tr.memo,
+           tr.amount,
+           {TRANSFER_DELTA},
+           NULL, NULL,
+           CASE WHEN tr.from_account_content_type_id = %(content_type_id)s
+                 AND tr.from_account_object_id = %(account_id)s
+                THEN tr.to_account_content_type_id ELSE tr.from_account_content_type_id END,
+           CASE WHEN tr.from_account_content_type_id = %(content_type_id)s
+                 AND tr.from_account_object_id = %(account_id)s
+                THEN tr.to_account_object_id ELSE tr.from_account_object_id END
+    FROM {{transfers}} tr
+    WHERE {TRANSFER_FILTER}
+      {{transfer_key}}
+    ORDER BY tr.datetime_ist {{direction}}, tr.id {{direction}}
+    LIMIT %(limit)s)
+),
+page AS (
+    SELECT * FROM activity
+    ORDER BY datetime_ist {{direction}}, sort_id {{direction}}
+    LIMIT %(limit)s
+),
+ledger AS (
+    SELECT page.*,
+           {{anchor}} {{sign}} COALESCE(SUM(delta) OVER (
+               ORDER BY datetime_ist {{direction}}, sort_id {{direction}}
+               ROWS BETWEEN UNBOUNDED PRECEDING AND {{frame_end}}
+           ), 0) AS balance_after
+    FROM page
+)
+SELECT ledger.*,
+       COALESCE(ba.name, cc.name) AS counterparty_name,
+       CASE WHEN ba.id IS NOT NULL THEN 'bankaccount'
+            WHEN cc.id IS NOT NULL THEN 'creditcard' END AS counterparty_model
+FROM ledger
+LEFT JOIN {{bank_accounts}} ba
+       ON ledger.counterparty_content_type_id = %(bank_content_type_id)s AND ba.id = ledger.counterparty_id
+LEFT JOIN {{credit_cards}} cc
+       ON ledger.counterparty_content_type_id = %(card_content_type_id)s AND cc.id = ledger.counterparty_id
+ORDER BY datetime_ist {{direction}}, sort_id {{direction}}
+"""
+
+BALANCE_MODELS = {
+    BankAccount: BankAccountBalance,
+    CreditCard: CreditCardBalance,
+}
+
+
+class AccountActivityPaginator:
+    """
+    Keyset-paginated activity feed (transactions + transfers) for one account.
+
+    Every page is one SQL query. Rows are dicts with: kind ('transaction'
+    or 'transfer'), id, datetime_ist, entry_type ('income'/'expense' or
+    'outgoing'/'incoming'), method_type, description, amount, delta
+    (signed effect on the account), balance_after, category_name,
+    category_color and counterparty_display (transfers only).
+
+    Args:
+        account: BankAccount or CreditCard instance
+        per_page: Rows per page
+        cursor_param: GET parameter holding the cursor
+    """
+
+    # KeysetPage reads these; the feed never counts its rows
+    count = None
+    count_is_estimate = False
+
+    def __init__(self, account, per_page=20, cursor_param='cursor'):
+        self.account = account
+        self.per_page = per_page
+        self.cursor_param = cursor_param
+
+    def key_of(self, entry):
+        return entry['datetime_ist'], entry['sort_id']
+
+    def _fetch(self, key=None, newer=False, limit=None):
+        """
+        Run the feed query.
+
+        Without a key this is the newest page, or with newer=True the
+        oldest. A key restricts rows to before it, or with newer=True to
+        after it.
+        """
+        account_model = type(self.account)
+        bank_ct = ContentType.objects.get_for_model(BankAccount)
+        card_ct = ContentType.objects.get_for_model(CreditCard)
+        params = {
+            'user_id': self.account.user_id,
+            'account_id': self.account.pk,
+            'content_type_id': (bank_ct if account_model is BankAccount else card_ct).pk,
+            'opening_balance': self.account.opening_balance,
+            'bank_content_type_id': bank_ct.pk,
+            'card_content_type_id': card_ct.pk,
+            'limit': limit,
+        }
+        tables = {
+            'transactions': Transaction._meta.db_table,
+            'transfers': Transfer._meta.db_table,
+            'balances': BALANCE_MODELS[account_model]._meta.db_table,
+        }
+
+        def key_conditions(operator):
+            """Rows on the given side of the key, per branch."""
+            # The bare datetime_ist bound lets the account's datetime index narrow the scan
+            bound = '>=' if '>' in operator else '<='
+            return (
+                f'AND t.datetime_ist {bound} %(key_time)s '
+                f'AND (t.datetime_ist, t.id * 2) {operator} (%(key_time)s, %(key_id)s)',
+                f'AND tr.datetime_ist {bound} %(key_time)s '
+                f'AND (tr.datetime_ist, tr.id * 2 + 1) {operator} (%(key_time)s, %(key_id)s)',
+            )
+
+        transaction_key = transfer_key = ''
+        if key is not None:
+            params['key_time'], params['key_id'] = key
+            transaction_key, transfer_key = key_conditions('>' if newer else '<')
+            # Older pages start below the key row, newer ones right after it
+            newer_transactions, newer_transfers = key_conditions('>' if newer else '>=')
+            anchor = EARLIER_BALANCE_SQL.format(
+                newer_transactions=newer_transactions, newer_transfers=newer_transfers, **tables
+            )
+        elif newer:
+            anchor = EARLIER_BALANCE_SQL.format(newer_transactions='', newer_transfers='', **tables)
+        else:
+            anchor = CURRENT_BALANCE_SQL.format(**tables)
+
+        sql = ACTIVITY_SQL.format(
+            categories=Category._meta.db_table,
+            bank_accounts=BankAccount._meta.db_table,
+            credit_cards=CreditCard._meta.db_table,
+            transaction_key=transaction_key,
+            transfer_key=transfer_key,
+            anchor=anchor,
+            # Newest first, each row ends where the newer one started; oldest first, it adds its delta
+            sign='+' if newer else '-',
+            frame_end='CURRENT ROW' if newer else '1 PRECEDING',
+            direction='ASC' if newer else 'DESC',
+            **tables,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            columns = [col[0] for col in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+        for row in rows:
+            row['counterparty_display'] = None
+            if row['counterparty_name'] is not None:
+                emoji = ACCOUNT_EMOJI.get(row['counterparty_model'], '')
+                row['counterparty_display'] = f"{emoji} {row['counterparty_name']}".strip()
+        return rows
+
+    def get_page(self, params):
+        """
+        Return the page selected by the cursor in params (a QueryDict).
+
+        A missing or malformed cursor yields the first (newest) page.
+        """
+        token = params.get(self.cursor_param)
+        try:
+            direction, key = decode_cursor(token) if token else (None, None)
+        except InvalidCursor:
+            direction, key = None, None
+
+        if direction == 'next':
+            rows = self._fetch(key, limit=self.per_page + 1)
+            has_next, has_previous = len(rows) > self.per_page, True
+            rows = rows[:self.per_page]
+        elif direction in ('prev', 'last'):
+            rows = self._fetch(key, newer=True, limit=self.per_page + 1)
+            has_previous = len(rows) > self.per_page
+            has_next = direction == 'prev'
+            rows = rows[:self.per_page][::-1]
+        else:
+            rows = self._fetch(limit=self.per_page + 1)
+            has_next, has_previous = len(rows) > self.per_page, False
+            rows = rows[:self.per_page]
+
+        return KeysetPage(rows, self, has_next, has_previous, params)
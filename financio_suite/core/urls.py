@@ -3,4 +3,5 @@ from . import views
 
 urlpatterns = [
     path('', views.dashboard, name='dashboard'),
+    path('bulk-status/', views.bulk_status, name='bulk_status'),
 ]
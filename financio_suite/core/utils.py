@@ -1,6 +1,8 @@
 """
 Utility functions for the core app.
 """
+from datetime import datetime, timedelta
+
 from django.contrib.contenttypes.models import ContentType
 
 
@@ -118,6 +120,9 @@ def get_account_choices_for_form(user):
     """
     Returns choices list formatted for Django form Select widget.
 
+    Served from the user's cached choice lists (core.choices), so a warm
+    cache costs no queries.
+
     Args:
         user: User object to filter accounts by
 
@@ -125,6 +130,118 @@ def get_account_choices_for_form(user):
         List of tuples: [(compound_value, display_string), ...]
         Suitable for use in forms.ChoiceField or forms.Select widget
     """
-    accounts = get_all_accounts_with_emoji(user)
-    # Return as (value, label) tuples for form choices
-    return [(compound_value, display_name) for _, display_name, compound_value in accounts]
+    from .choices import get_form_choices
+
+    return list(get_form_choices(user)['accounts'])
+
+
+# Emoji prefix per account model (ContentType.model)
+ACCOUNT_EMOJI = {
+    'bankaccount': '🏦',
+    'creditcard': '💳',
+}
+
+
+def format_account_display(account):
+    """
+    Returns the display string for an account with its emoji indicator.
+
+    Args:
+        account: BankAccount/CreditCard instance or None
+
+    Returns:
+        str: e.g. "🏦 HDFC Savings", or "Unknown" when account is None
+    """
+    if account is None:
+        return "Unknown"
+    account_name = account.name if hasattr(account, 'name') else str(account)
+    emoji = ACCOUNT_EMOJI.get(account._meta.model_name, '')
+    return f"{emoji} {account_name}" if emoji else account_name
+
+
+def resolve_generic_accounts(items, fields=('account',)):
+    """
+    Resolves GenericForeignKey accounts for many rows with one query per account model.
+
+    Rows are grouped by content type, each model is fetched once with
+    pk__in, and the result is stored in the GenericForeignKey cache so that
+    `item.account` (or `item.from_account`, ...) no longer queries. A
+    `<field>_display` attribute with the emoji-prefixed name is attached
+    for templates and exports.
+
+    Args:
+        items: Iterable of Transaction/Transfer instances (evaluated once)
+        fields: Names of the GenericForeignKey fields to resolve,
+            e.g. ('account',) or ('from_account', 'to_account')
+
+    Returns:
+        list: The items, in their original order
+    """
+    items = list(items)
+    if not items:
+        return items
+
+    model = type(items[0])
+    gfks = [model._meta.get_field(name) for name in fields]
+
+    # Group object ids by content type across every requested field
+    ids_by_content_type = {}
+    for item in items:
+        for gfk in gfks:
+            content_type_id = getattr(item, f'{gfk.ct_field}_id')
+            object_id = getattr(item, gfk.fk_field)
+            if content_type_id and object_id:
+                ids_by_content_type.setdefault(content_type_id, set()).add(object_id)
+
+    # One query per account model
+    objects = {}
+    for content_type_id, object_ids in ids_by_content_type.items():
+        account_model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if account_model is None:
+            continue
+        for obj in account_model._base_manager.filter(pk__in=object_ids):
+            objects[(content_type_id, obj.pk)] = obj
+
+    for item in items:
+        for gfk in gfks:
+            account = objects.get(
+                (getattr(item, f'{gfk.ct_field}_id'), getattr(item, gfk.fk_field))
+            )
+            gfk.set_cached_value(item, account)
+            setattr(item, f'{gfk.name}_display', format_account_display(account))
+
+    return items
+
+
+def filter_date_range(queryset, field, date_from='', date_to='', date_format='%Y-%m-%d'):
+    """
+    Filters a datetime field to the calendar days date_from..date_to (inclusive).
+
+    The range is applied half-open on the raw column
+    (field >= date_from 00:00 AND field < date_to + 1 day 00:00) instead of
+    casting the column with __date, so (user, field) indexes can serve it.
+    Blank or malformed bounds are ignored.
+
+    Args:
+        queryset: QuerySet to filter
+        field: Name of the datetime field, e.g. 'datetime_ist'
+        date_from: First day as a string in date_format, or ''
+        date_to: Last day as a string in date_format, or ''
+
+    Returns:
+        QuerySet: The filtered queryset
+    """
+    try:
+        start = datetime.strptime(date_from.strip(), date_format) if date_from.strip() else None
+    except ValueError:
+        start = None
+    try:
+        end = datetime.strptime(date_to.strip(), date_format) if date_to.strip() else None
+    except ValueError:
+        end = None
+
+    if start is not None:
+        queryset = queryset.filter(**{f'{field}__gte': start})
+    if end is not None:
+        queryset = queryset.filter(**{f'{field}__lt': end + timedelta(days=1)})
+    return queryset
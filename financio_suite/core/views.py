@@ -1,15 +1,22 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.http import JsonResponse
 from django.shortcuts import render
+from django.views.decorators.http import require_POST
+from django.views.static import serve
 from django.contrib.auth.decorators import login_required
-from django.db.models import Sum
-from django.utils import timezone
-from datetime import datetime
 from accounts.models import BankAccount
-from creditcards.models import CreditCard
-from fds.models import FixedDeposit
-from investments.models import Investment
-from categories.models import Category
+from activity.utils import log_activity_bulk
 from transactions.models import Transaction
-from reports.services import ReportService
+from reports.context_processors import get_financial_summary
+from core.services import AccountStatusService
+from core.thumbnails import THUMBNAIL_DIR
+from core.utils import resolve_generic_accounts
+
+# Most items one bulk status change may touch
+BULK_STATUS_LIMIT = 200
 
 
 @login_required
@@ -23,8 +30,11 @@ def dashboard(request):
     - Month-to-date Income and Expense
     - Recent transactions (last 10 across all account types)
 
-    Note: Uses get_current_balance() method for graceful handling of missing
-    balance records (falls back to opening_balance).
+    Charts are not computed here; the template fetches them from the
+    reports JSON endpoints after the page has rendered.
+
+    Note: Stats are a single read of the user's UserFinancialSummary row,
+    which is kept up to date as balances, accounts, FDs and investments change.
 
     Args:
         request: HttpRequest object
@@ -41,79 +51,101 @@ def dashboard(request):
         status='active'
     ).select_related('balance').order_by('-created_at')
 
-    # Calculate Net Worth (Bank balances only - excludes credit card debt)
-    # Per user specification: Net Worth = Bank balances + Investments (no debt subtraction)
-    # Use get_current_balance() to handle cases where balance record doesn't exist
-    net_worth = sum(
-        account.get_current_balance()
-        for account in BankAccount.objects.filter(user=request.user, status='active')
-    )
-
-    # Get first day of current month for MTD calculations
-    now = timezone.now()
-    first_day_of_month = datetime(now.year, now.month, 1)
-
-    # Calculate month-to-date income and expense
-    monthly_income = Transaction.objects.filter(
-        user=request.user,
-        transaction_type='income',
-        datetime_ist__gte=first_day_of_month,
-        deleted_at__isnull=True
-    ).aggregate(total=Sum('amount'))['total'] or 0
-
-    monthly_expense = Transaction.objects.filter(
-        user=request.user,
-        transaction_type='expense',
-        datetime_ist__gte=first_day_of_month,
-    deleted_at__isnull=True
-    ).aggregate(total=Sum('amount'))['total'] or 0
+    # Net worth, counts and MTD totals from the materialized summary row
+    # Per user specification: Net Worth = Bank balances + FDs + Investments (no debt subtraction)
+    stats = get_financial_summary(request).as_stats()
 
     # Get recent transactions (last 10)
-    recent_transactions = Transaction.objects.filter(
-        user=request.user,
-        deleted_at__isnull=True
-    ).select_related('category').prefetch_related('account_content_type').order_by('-datetime_ist')[:10]
-
-    # Count banks, credit cards, FDs, and Investments separately
-    total_banks = BankAccount.objects.filter(user=request.user, status='active').count()
-    total_cards = CreditCard.objects.filter(user=request.user, status='active').count()
-    total_fds = FixedDeposit.objects.filter(user=request.user, status='active').count()
-    total_investments = Investment.objects.filter(user=request.user, status='active').count()
-
-    # Calculate total FD value (sum of maturity amounts for active FDs)
-    total_fd_value = FixedDeposit.objects.filter(
-        user=request.user, 
-        status='active'
-    ).aggregate(total=Sum('maturity_amount'))['total'] or 0
-
-    # Calculate total Investment value
-    # Since current_value is a property, we have to sum it in Python
-    # Or we can annotate it if we move calculation to DB (but it depends on transactions)
-    # For now, iterating is fine as number of investments is likely small
-    active_investments = Investment.objects.filter(user=request.user, status='active')
-    total_investment_value = sum(inv.current_value for inv in active_investments)
-
-    # Add FD and Investment value to net worth
-    net_worth += total_fd_value + total_investment_value
-
-    stats = {
-        'net_worth': net_worth,  # Bank + FD + Investments
-        'total_banks': total_banks,
-        'total_cards': total_cards,
-        'total_fds': total_fds,
-        'total_investments': total_investments,
-        'total_categories': Category.objects.filter(user=request.user).count(),
-        'monthly_income': monthly_income,
-        'monthly_expense': monthly_expense,
-    }
+    recent_transactions = resolve_generic_accounts(
+        Transaction.objects.filter(
+            user=request.user,
+            deleted_at__isnull=True
+        ).select_related('category', 'account_content_type').order_by('-datetime_ist')[:10]
+    )
 
     context = {
         'accounts': accounts[:5],  # Show first 5 accounts
         'stats': stats,
         'recent_transactions': recent_transactions,
-        'cashflow_data': ReportService.get_monthly_cashflow(request.user),
-        'expense_breakdown': ReportService.get_expense_breakdown(request.user),
-        'net_worth_trend': ReportService.get_net_worth_trend(request.user),
     }
 
     return render(request, 'dashboard/dashboard.html', context)
+
+
+def serve_thumbnail(request, path):
+    """
+    Serve an account picture thumbnail in development, cached for a year.
+
+    Thumbnail names are content hashes, so a cached copy never goes stale.
+    In production nginx serves them with the same header.
+    """
+    response = serve(request, path, document_root=Path(settings.MEDIA_ROOT) / THUMBNAIL_DIR)
+    response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+
+@login_required
+@require_POST
+def bulk_status(request):
+    """
+    Archive or reactivate many accounts, cards, FDs and brokers in one request.
+
+    POST fields: action ('archive' or 'activate') and items (repeated
+    "id|model", model one of bankaccount, creditcard, debitcard,
+    fixeddeposit and broker). All items change in one transaction; items
+    failing their checks are left as they are (see AccountStatusService).
+    The activity log entries are written in the same transaction.
+
+    Returns:
+        JsonResponse: {action, counts: {outcome: number of items}, results:
+        [{item, name, outcome, reasons, warnings, cascaded}]}, or a 400
+        with an error for a bad action or item
+    """
+    action = request.POST.get('action', '')
+    if action not in AccountStatusService.ACTIONS:
+        return JsonResponse({'error': "action must be 'archive' or 'activate'"}, status=400)
+
+    items = []
+    for value in request.POST.getlist('items'):
+        pk, _, name = value.partition('|')
+        if not pk.isdigit() or name not in AccountStatusService.ITEM_MODELS:
+            return JsonResponse({'error': f'Invalid item: {value!r}'}, status=400)
+        items.append((name, int(pk)))
+    items = list(dict.fromkeys(items))
+    if not items:
+        return JsonResponse({'error': 'Select at least one item.'}, status=400)
+    if len(items) > BULK_STATUS_LIMIT:
+        return JsonResponse({'error': f'Select at most {BULK_STATUS_LIMIT} items at a time.'}, status=400)
+
+    before, after = AccountStatusService.ACTIONS[action]
+    status_change = {'status': {'before': before, 'after': after}}
+    with transaction.atomic():
+        results = AccountStatusService.change_status(request.user, action, items)
+        log_activity_bulk(
+            request.user, action,
+            [
+                (obj, status_change)
+                for result in results if result['outcome'] == f'{action}d'
+                for obj in [result['object'], *result['cascaded']]
+            ],
+            request=request,
+        )
+
+    counts = {}
+    for result in results:
+        counts[result['outcome']] = counts.get(result['outcome'], 0) + 1
+    return JsonResponse({
+        'action': action,
+        'counts': counts,
+        'results': [
+            {
+                'item': result['item'],
+                'name': result['object'].name if result['object'] is not None else None,
+                'outcome': result['outcome'],
+                'reasons': result['reasons'],
+                'warnings': result['warnings'],
+                'cascaded': [f'{card.pk}|debitcard' for card in result['cascaded']],
+            }
+            for result in results
+        ],
+    })
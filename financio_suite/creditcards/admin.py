@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import CreditCard, CreditCardBalance
+from .models import CreditCard, CreditCardBalance, CreditCardStatement
 
 
 @admin.register(CreditCard)
@@ -89,8 +89,8 @@ class CreditCardAdmin(admin.ModelAdmin):
 class CreditCardBalanceAdmin(admin.ModelAdmin):
     """Admin interface for CreditCardBalance model"""
 
-    list_display = ['account', 'balance_amount', 'last_posting_id', 'updated_at']
-    readonly_fields = ['account', 'balance_amount', 'last_posting_id', 'updated_at']
+    list_display = ['account', 'balance_amount', 'last_posting_id', 'statements_stale_from', 'updated_at']
+    readonly_fields = ['account', 'balance_amount', 'last_posting_id', 'statements_stale_from', 'updated_at']
     search_fields = ['account__name', 'account__user__username']
 
     def has_add_permission(self, request):
@@ -100,3 +100,20 @@ class CreditCardBalanceAdmin(admin.ModelAdmin):
     def has_delete_permission(self, request, obj=None):
         """Prevent manual deletion"""
         return False
+
+
+@admin.register(CreditCardStatement)
+class CreditCardStatementAdmin(admin.ModelAdmin):
+    """Admin interface for CreditCardStatement model (read-only, maintained by StatementService)"""
+
+    list_display = ['card', 'period_start', 'period_end', 'due_date', 'purchases', 'payments', 'closing_balance', 'minimum_due']
+    list_filter = ['period_end']
+    search_fields = ['card__name', 'card__user__username']
+    list_select_related = ['card']
+
+    def has_add_permission(self, request):
+        """Statements are calculated, not entered"""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,60 @@
+"""
+Management command to (re)build credit card statements from the ledger.
+
+Statements are maintained incrementally as card postings are applied; this
+command builds them for history, e.g. right after deploying statements or
+after fixing ledger data by hand. Every statement of each selected card is
+recalculated from its live postings with StatementService.refresh().
+
+Usage:
+    # Every credit card
+    python manage.py backfill_card_statements
+
+    # One user's cards, or one card
+    python manage.py backfill_card_statements --user alice
+    python manage.py backfill_card_statements --card 12
+"""
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from creditcards.models import CreditCard
+from creditcards.services import StatementService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild credit card statements from ledger postings'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            help='Only rebuild this username\'s cards',
+        )
+        parser.add_argument(
+            '--card',
+            type=int,
+            help='Only rebuild the credit card with this id',
+        )
+
+    def handle(self, *args, **options):
+        cards = CreditCard.objects.select_related('user').order_by('id')
+        if options['user']:
+            if not User.objects.filter(username=options['user']).exists():
+                raise CommandError(f"User '{options['user']}' does not exist")
+            cards = cards.filter(user__username=options['user'])
+        if options['card']:
+            cards = cards.filter(pk=options['card'])
+
+        total_cards = total_statements = 0
+        started = time.perf_counter()
+        for card in cards:
+            written = StatementService.refresh(card)
+            total_cards += 1
+            total_statements += written
+            self.stdout.write(f'  {card.user.username} / {card.name}: {written} statements')
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'\nBuilt {total_statements} statements for {total_cards} cards in {elapsed:.1f}s'
+        ))
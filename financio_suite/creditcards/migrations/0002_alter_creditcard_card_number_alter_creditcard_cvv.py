@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-19 15:49
+
+import core.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('creditcards', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='creditcard',
+            name='card_number',
+            field=core.fields.LazyEncryptedCharField(help_text='Full card number (encrypted)'),
+        ),
+        migrations.AlterField(
+            model_name='creditcard',
+            name='cvv',
+            field=core.fields.LazyEncryptedCharField(help_text='Card CVV/CVV2 (encrypted)'),
+        ),
+    ]
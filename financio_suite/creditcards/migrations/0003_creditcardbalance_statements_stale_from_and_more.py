@@ -0,0 +1,43 @@
+# Generated by Django 5.2.8 on 2026-10-19 15:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('creditcards', '0002_alter_creditcard_card_number_alter_creditcard_cvv'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='creditcardbalance',
+            name='statements_stale_from',
+            field=models.DateField(blank=True, help_text='Earliest date whose statement needs recalculating (None = statements are current)', null=True),
+        ),
+        migrations.CreateModel(
+            name='CreditCardStatement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period_start', models.DateField(help_text='First day of the billing cycle')),
+                ('period_end', models.DateField(help_text='Statement date (last day of the billing cycle)')),
+                ('due_date', models.DateField(help_text='Payment due date')),
+                ('opening_balance', models.DecimalField(decimal_places=2, help_text='Balance at the start of the cycle (negative = owed)', max_digits=18)),
+                ('purchases', models.DecimalField(decimal_places=2, default=0, help_text='Total charged to the card during the cycle', max_digits=18)),
+                ('payments', models.DecimalField(decimal_places=2, default=0, help_text='Total paid or refunded to the card during the cycle', max_digits=18)),
+                ('closing_balance', models.DecimalField(decimal_places=2, help_text='Balance on the statement date (negative = owed)', max_digits=18)),
+                ('minimum_due', models.DecimalField(decimal_places=2, default=0, help_text='Minimum payment due by the due date', max_digits=18)),
+                ('transaction_count', models.PositiveIntegerField(default=0, help_text='Postings in the cycle')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When the statement was last recalculated')),
+                ('card', models.ForeignKey(help_text='Credit card', on_delete=django.db.models.deletion.CASCADE, related_name='statements', to='creditcards.creditcard')),
+            ],
+            options={
+                'verbose_name': 'Credit Card Statement',
+                'verbose_name_plural': 'Credit Card Statements',
+                'db_table': 'credit_card_statements',
+                'ordering': ['-period_start'],
+                'unique_together': {('card', 'period_start')},
+            },
+        ),
+    ]
@@ -2,9 +2,31 @@ import re
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
-from encrypted_model_fields.fields import EncryptedCharField
-from core.models import BaseAccount
+from core.fields import LazyEncryptedCharField
+from core.models import AccountQuerySet, BaseAccount
 from datetime import date
+from decimal import Decimal
+
+
+class CreditCardQuerySet(AccountQuerySet):
+    """AccountQuerySet with credit card totals."""
+
+    def card_totals(self):
+        """
+        status_totals() plus credit figures over active cards, in one query.
+
+        Adds total_credit_limit, total_available_credit and total_amount_owed,
+        computed like available_credit() and amount_owed() for each card.
+        """
+        return self.status_totals(
+            total_credit_limit=models.F('credit_limit'),
+            total_available_credit=models.F('credit_limit') + models.F('current_balance'),
+            total_amount_owed=models.Case(
+                models.When(current_balance__lt=0, then=-models.F('current_balance')),
+                default=models.Value(Decimal('0.00')),
+                output_field=models.DecimalField(),
+            ),
+        )
 
 
 class CreditCard(BaseAccount):
@@ -28,7 +50,7 @@ class CreditCard(BaseAccount):
     )
 
     # Card Identifiers (Encrypted)
-    card_number = EncryptedCharField(
+    card_number = LazyEncryptedCharField(
         max_length=100,
         help_text="Full card number (encrypted)"
     )
@@ -37,7 +59,7 @@ class CreditCard(BaseAccount):
         editable=False,
         help_text="Last 4 digits of card number (for display)"
     )
-    cvv = EncryptedCharField(
+    cvv = LazyEncryptedCharField(
         max_length=10,
         help_text="Card CVV/CVV2 (encrypted)"
     )
@@ -67,6 +89,8 @@ class CreditCard(BaseAccount):
         help_text="Card expiry date (MM/YY)"
     )
 
+    objects = CreditCardQuerySet.as_manager()
+
     class Meta:
         db_table = 'credit_cards'
         verbose_name = 'Credit Card'
@@ -151,8 +175,25 @@ class CreditCard(BaseAccount):
 
         # Run validations
         self.full_clean()
+
+        # Statements depend on the billing cycle and the opening balance
+        cycle_changed = False
+        if self.pk:
+            previous = CreditCard._base_manager.filter(pk=self.pk).values(
+                'billing_day', 'due_day', 'opening_balance'
+            ).first()
+            cycle_changed = previous is not None and previous != {
+                'billing_day': self.billing_day,
+                'due_day': self.due_day,
+                'opening_balance': self.opening_balance,
+            }
+
         super().save(*args, **kwargs)
 
+        if cycle_changed:
+            # Rebuilt from scratch on the next read
+            self.statements.all().delete()
+
     def get_masked_card_number(self):
         """Returns masked card number (e.g., '****1234')"""
         if self.card_number_last4:
@@ -214,36 +255,23 @@ class CreditCard(BaseAccount):
         return abs(min(current_balance, 0))
 
     def can_delete(self):
-        """Check if credit card can be deleted (no transactions or transfers)"""
-        from django.contrib.contenttypes.models import ContentType
-        from transactions.models import Transaction
-        from transfers.models import Transfer
-        from django.db.models import Q
-
-        # Get ContentType for this credit card
-        account_content_type = ContentType.objects.get_for_model(CreditCard)
-
-        # Check if card has any non-deleted transactions
-        has_transactions = Transaction.objects.filter(
-            account_content_type=account_content_type,
-            account_object_id=self.id,
-            deleted_at__isnull=True
-        ).exists()
-
-        if has_transactions:
-            return False
-
-        # Check if card has any non-deleted transfers (either as from or to account)
-        has_transfers = Transfer.objects.filter(
-            Q(from_account_content_type=account_content_type, from_account_object_id=self.id) |
-            Q(to_account_content_type=account_content_type, to_account_object_id=self.id),
-            deleted_at__isnull=True
-        ).exists()
+        """
+        Check if the credit card can be safely deleted.
 
-        if has_transfers:
-            return False
+        A credit card can only be deleted if no live transactions or transfers
+        reference it. Uses the has_transactions/has_transfers annotations
+        when the instance came from CreditCard.objects.with_activity_flags(),
+        otherwise runs that query for this credit card alone.
 
-        return True
+        Returns:
+            bool: True if the credit card can be deleted, False if it has dependencies
+        """
+        if hasattr(self, 'has_transactions'):
+            return not (self.has_transactions or self.has_transfers)
+        flags = CreditCard.objects.with_activity_flags().values(
+            'has_transactions', 'has_transfers'
+        ).get(pk=self.pk)
+        return not (flags['has_transactions'] or flags['has_transfers'])
 
 
 class CreditCardBalance(models.Model):
@@ -274,6 +302,11 @@ class CreditCardBalance(models.Model):
         blank=True,
         help_text="ID of last posting that updated this balance"
     )
+    statements_stale_from = models.DateField(
+        null=True,
+        blank=True,
+        help_text="Earliest date whose statement needs recalculating (None = statements are current)"
+    )
     updated_at = models.DateTimeField(
         auto_now=True,
         help_text="Timestamp of last balance update"
@@ -286,3 +319,83 @@ class CreditCardBalance(models.Model):
 
     def __str__(self):
         return f"{self.account.name}: {self.balance_amount} {self.account.currency}"
+
+
+class CreditCardStatement(models.Model):
+    """
+    One billing cycle of a credit card, materialized from its ledger postings.
+
+    Cycles start on the card's billing_day and end the day before the next
+    one (the statement date). Rows are maintained by
+    creditcards.services.StatementService: every balance change marks the
+    card's statements stale from the posting's date and only the cycles from
+    there on are recalculated. Amounts use the balance sign convention
+    (negative = owed).
+    """
+
+    card = models.ForeignKey(
+        CreditCard,
+        on_delete=models.CASCADE,
+        related_name='statements',
+        help_text="Credit card"
+    )
+    period_start = models.DateField(
+        help_text="First day of the billing cycle"
+    )
+    period_end = models.DateField(
+        help_text="Statement date (last day of the billing cycle)"
+    )
+    due_date = models.DateField(
+        help_text="Payment due date"
+    )
+    opening_balance = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        help_text="Balance at the start of the cycle (negative = owed)"
+    )
+    purchases = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        default=0,
+        help_text="Total charged to the card during the cycle"
+    )
+    payments = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        default=0,
+        help_text="Total paid or refunded to the card during the cycle"
+    )
+    closing_balance = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        help_text="Balance on the statement date (negative = owed)"
+    )
+    minimum_due = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        default=0,
+        help_text="Minimum payment due by the due date"
+    )
+    transaction_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Postings in the cycle"
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text="When the statement was last recalculated"
+    )
+
+    class Meta:
+        db_table = 'credit_card_statements'
+        verbose_name = 'Credit Card Statement'
+        verbose_name_plural = 'Credit Card Statements'
+        ordering = ['-period_start']
+        # Also the index for "statement covering a date" lookups
+        unique_together = [['card', 'period_start']]
+
+    def __str__(self):
+        return f"{self.card.name}: {self.period_start} to {self.period_end}"
+
+    def amount_due(self):
+        """Total amount due for the cycle (0 when nothing is owed)."""
+        return max(-self.closing_balance, Decimal('0.00'))
@@ -0,0 +1,237 @@
+import calendar
+from datetime import date, datetime, time, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, Sum
+from django.db.models.functions import TruncDate
+
+from ledger.models import Posting
+
+from .models import CreditCard, CreditCardBalance, CreditCardStatement
+
+
+class StatementService:
+    """
+    Billing-cycle statements of credit cards, materialized incrementally.
+
+    LedgerService._update_account_balance() marks a card's statements stale
+    from the date of the posting it applies (CreditCardBalance.
+    statements_stale_from, under the balance row lock) and refreshes them
+    once the database transaction commits. Reads refresh a card whose
+    statements are still stale or end before today, so lookups always see
+    every committed posting.
+
+    A refresh only recalculates the cycles from the stale date on: one
+    aggregate query sums the card's live postings per day over that range,
+    the days are bucketed into cycles, and the rows from there on are
+    replaced. Postings count when their journal entry belongs to a live
+    transaction or transfer, like LedgerService.recalculate_user_balances().
+    """
+
+    # Minimum due: this share of the amount due, but at least the floor
+    MINIMUM_DUE_RATE = Decimal('0.05')
+    MINIMUM_DUE_FLOOR = Decimal('200.00')
+
+    @staticmethod
+    def _day_in_month(year, month, day):
+        """date(year, month, day), clamped to the last day of shorter months."""
+        return date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+    @staticmethod
+    def _add_month(year, month, months=1):
+        month += months
+        return year + (month - 1) // 12, (month - 1) % 12 + 1
+
+    @staticmethod
+    def cycle_start(card, day):
+        """First day of the card's billing cycle containing day."""
+        start = StatementService._day_in_month(day.year, day.month, card.billing_day)
+        if start <= day:
+            return start
+        year, month = StatementService._add_month(day.year, day.month, -1)
+        return StatementService._day_in_month(year, month, card.billing_day)
+
+    @staticmethod
+    def next_cycle_start(card, start):
+        """First day of the cycle after the one starting on start."""
+        year, month = StatementService._add_month(start.year, start.month)
+        return StatementService._day_in_month(year, month, card.billing_day)
+
+    @staticmethod
+    def due_date(card, period_end):
+        """First due_day after the statement date."""
+        due = StatementService._day_in_month(period_end.year, period_end.month, card.due_day)
+        if due > period_end:
+            return due
+        year, month = StatementService._add_month(period_end.year, period_end.month)
+        return StatementService._day_in_month(year, month, card.due_day)
+
+    @staticmethod
+    def minimum_due(closing_balance):
+        """Minimum payment for a statement closing at closing_balance."""
+        amount_due = max(-closing_balance, Decimal('0.00'))
+        if amount_due <= StatementService.MINIMUM_DUE_FLOOR:
+            return amount_due
+        minimum = (amount_due * StatementService.MINIMUM_DUE_RATE).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+        return max(minimum, StatementService.MINIMUM_DUE_FLOOR)
+
+    @staticmethod
+    def live_postings(card):
+        """Postings on the card whose journal entry belongs to a live transaction or transfer."""
+        return Posting.objects.for_account(card).live()
+
+    @staticmethod
+    def mark_stale(balance, day):
+        """
+        Lower balance.statements_stale_from to day (not saved).
+
+        Args:
+            balance: Locked CreditCardBalance row
+            day: Date of the posting being applied; None when unknown, which
+                recalculates every statement
+        """
+        day = day or date.min
+        if balance.statements_stale_from is None or day < balance.statements_stale_from:
+            balance.statements_stale_from = day
+
+    @staticmethod
+    @transaction.atomic
+    def refresh(card, since=None):
+        """
+        Recalculate the card's statements from the cycle containing since.
+
+        Args:
+            card: CreditCard instance
+            since: Earliest changed date; None rebuilds every statement
+
+        Returns:
+            int: Number of statements written
+        """
+        # Serializes with balance updates and other refreshes of the card
+        balance = CreditCardBalance.objects.select_for_update().filter(account=card).first()
+
+        postings = StatementService.live_postings(card)
+        bounds = postings.aggregate(
+            first=Min('journal_entry__occurred_at'), last=Max('journal_entry__occurred_at')
+        )
+        today = date.today()
+
+        # Never start before the first activity or the first existing statement
+        floors = [StatementService.cycle_start(card, today)]
+        if bounds['first'] is not None:
+            floors.append(StatementService.cycle_start(card, bounds['first'].date()))
+        first_statement = card.statements.aggregate(first=Min('period_start'))['first']
+        if first_statement is not None:
+            floors.append(first_statement)
+        floor = min(floors)
+        start = StatementService.cycle_start(card, max(since or date.min, floor))
+        last_day = max(today, bounds['last'].date()) if bounds['last'] is not None else today
+
+        previous = card.statements.filter(period_end=start - timedelta(days=1)).first()
+        if previous is not None:
+            running = previous.closing_balance
+        else:
+            before = postings.filter(
+                journal_entry__occurred_at__lt=datetime.combine(start, time.min)
+            ).aggregate(total=Sum('amount'))['total']
+            running = Decimal(card.opening_balance) + (before or Decimal('0.00'))
+
+        daily = (
+            postings.filter(journal_entry__occurred_at__gte=datetime.combine(start, time.min))
+            .annotate(day=TruncDate('journal_entry__occurred_at'))
+            .values('day')
+            .annotate(
+                charges=Sum('amount', filter=Q(amount__lt=0)),
+                credits=Sum('amount', filter=Q(amount__gt=0)),
+                count=Count('id'),
+            )
+            .order_by('day')
+        )
+        daily = list(daily)
+
+        statements = []
+        index = 0
+        period_start = start
+        while period_start <= last_day:
+            next_start = StatementService.next_cycle_start(card, period_start)
+            purchases = payments = Decimal('0.00')
+            count = 0
+            while index < len(daily) and daily[index]['day'] < next_start:
+                purchases -= daily[index]['charges'] or 0
+                payments += daily[index]['credits'] or 0
+                count += daily[index]['count']
+                index += 1
+
+            period_end = next_start - timedelta(days=1)
+            closing = running - purchases + payments
+            statements.append(CreditCardStatement(
+                card=card,
+                period_start=period_start,
+                period_end=period_end,
+                due_date=StatementService.due_date(card, period_end),
+                opening_balance=running,
+                purchases=purchases,
+                payments=payments,
+                closing_balance=closing,
+                minimum_due=StatementService.minimum_due(closing),
+                transaction_count=count,
+            ))
+            running = closing
+            period_start = next_start
+
+        card.statements.filter(period_start__gte=start).delete()
+        CreditCardStatement.objects.bulk_create(statements)
+        if balance is not None and balance.statements_stale_from is not None:
+            balance.statements_stale_from = None
+            balance.save(update_fields=['statements_stale_from'])
+        return len(statements)
+
+    @staticmethod
+    def refresh_stale(card_id):
+        """Refresh a card's statements if a balance change marked them stale."""
+        stale_from = CreditCardBalance.objects.filter(account_id=card_id).values_list(
+            'statements_stale_from', flat=True
+        ).first()
+        if stale_from is None:
+            return
+        card = CreditCard._base_manager.filter(pk=card_id).first()
+        if card is not None:
+            StatementService.refresh(card, stale_from)
+
+    @staticmethod
+    def ensure_current(card):
+        """Refresh the card's statements if they are stale or end before today."""
+        stale_from = CreditCardBalance.objects.filter(account=card).values_list(
+            'statements_stale_from', flat=True
+        ).first()
+        latest_end = card.statements.aggregate(latest=Max('period_end'))['latest']
+        if latest_end is None:
+            StatementService.refresh(card)
+        elif stale_from is not None:
+            StatementService.refresh(card, stale_from)
+        elif latest_end < date.today():
+            StatementService.refresh(card, latest_end + timedelta(days=1))
+
+    @staticmethod
+    def get_statements(card, limit=None):
+        """
+        The card's statements, newest first (the first one is the current cycle).
+
+        Args:
+            card: CreditCard instance
+            limit: Optional number of statements to return
+        """
+        StatementService.ensure_current(card)
+        statements = card.statements.order_by('-period_start')
+        return statements[:limit] if limit else statements
+
+    @staticmethod
+    def get_statement(card, day=None):
+        """
+        The statement of the cycle containing day (default: today), or None
+        if day is before the card's first statement.
+        """
+        StatementService.ensure_current(card)
+        day = day or date.today()
+        return card.statements.filter(period_start__lte=day, period_end__gte=day).first()
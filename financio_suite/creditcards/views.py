@@ -1,14 +1,13 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Sum, Q
-from django.core.paginator import Paginator
-from django.contrib.contenttypes.models import ContentType
+from django.db.models import Sum
 from django.db.models.deletion import ProtectedError
 from .models import CreditCard, CreditCardBalance
 from .forms import CreditCardForm
-from transactions.models import Transaction
-from transfers.models import Transfer
+from .services import StatementService
+from core.services import AccountStatusService
+from core.timeline import AccountActivityPaginator
 
 
 @login_required
@@ -18,26 +17,17 @@ def creditcard_list(request):
         user=request.user
     ).select_related('balance').order_by('status', '-created_at')
 
-    # Calculate totals
-    active_cards = creditcards.filter(status='active')
-
-    # Total amount owed (sum of negative balances)
-    total_owed = 0
-    total_credit_limit = 0
-    total_available_credit = 0
-
-    for card in active_cards:
-        total_owed += card.amount_owed()
-        total_credit_limit += card.credit_limit
-        total_available_credit += card.available_credit()
+    # Counts and totals in one conditional-aggregation query
+    stats = creditcards.card_totals()
 
     context = {
-        'creditcards': creditcards,
-        'active_count': active_cards.count(),
-        'archived_count': creditcards.filter(status='archived').count(),
-        'total_owed': total_owed,
-        'total_credit_limit': total_credit_limit,
-        'total_available_credit': total_available_credit,
+        # Annotated so delete buttons need no per-card queries
+        'creditcards': creditcards.with_activity_flags(),
+        'active_count': stats['active_count'],
+        'archived_count': stats['archived_count'],
+        'total_owed': stats['total_amount_owed'],
+        'total_credit_limit': stats['total_credit_limit'],
+        'total_available_credit': stats['total_available_credit'],
     }
     return render(request, 'creditcards/creditcard_list.html', context)
 
@@ -74,7 +64,7 @@ def creditcard_create(request):
 @login_required
 def creditcard_edit(request, pk):
     """Edit an existing credit card."""
-    creditcard = get_object_or_404(CreditCard, pk=pk, user=request.user)
+    creditcard = get_object_or_404(CreditCard.objects.with_encrypted(), pk=pk, user=request.user)
 
     if request.method == 'POST':
         # Store old opening balance to check if it changed
@@ -117,44 +107,18 @@ def creditcard_edit(request, pk):
 @login_required
 def creditcard_detail(request, pk):
     """View credit card details with transaction history."""
-    creditcard = get_object_or_404(CreditCard, pk=pk, user=request.user)
+    creditcard = get_object_or_404(CreditCard.objects.with_encrypted(), pk=pk, user=request.user)
 
-    # Get ContentType for this credit card
-    account_content_type = ContentType.objects.get_for_model(CreditCard)
-
-    # Get transactions for this card (filtered by GenericForeignKey)
-    transactions = Transaction.objects.filter(
-        user=request.user,
-        account_content_type=account_content_type,
-        account_object_id=creditcard.id,
-        deleted_at__isnull=True
-    ).select_related('category').order_by('-datetime_ist')
-
-    # Get transfers involving this card (either from or to)
-    transfers = Transfer.objects.filter(
-        user=request.user,
-        deleted_at__isnull=True
-    ).filter(
-        Q(from_account_content_type=account_content_type, from_account_object_id=creditcard.id) |
-        Q(to_account_content_type=account_content_type, to_account_object_id=creditcard.id)
-    ).order_by('-datetime_ist')
-
-    # Pagination for transactions
-    transactions_paginator = Paginator(transactions, 20)
-    transactions_page_number = request.GET.get('transactions_page', 1)
-    transactions_page = transactions_paginator.get_page(transactions_page_number)
-
-    # Pagination for transfers
-    transfers_paginator = Paginator(transfers, 20)
-    transfers_page_number = request.GET.get('transfers_page', 1)
-    transfers_page = transfers_paginator.get_page(transfers_page_number)
+    # Unified activity feed (transactions + transfers) with running balance, one query per page
+    activity_page = AccountActivityPaginator(creditcard, 20, cursor_param='activity_cursor').get_page(request.GET)
 
     context = {
         'creditcard': creditcard,
         'full_card_number': str(creditcard.card_number) if creditcard.card_number else None,
         'full_cvv': str(creditcard.cvv) if creditcard.cvv else None,
-        'transactions': transactions_page,
-        'transfers': transfers_page,
+        'activity': activity_page,
+        'statements': StatementService.get_statements(creditcard, limit=12),
+        'history_account': f'{creditcard.pk}|creditcard',
     }
     return render(request, 'creditcards/creditcard_detail.html', context)
 
@@ -162,7 +126,7 @@ def creditcard_detail(request, pk):
 @login_required
 def creditcard_delete(request, pk):
     """Delete a credit card."""
-    creditcard = get_object_or_404(CreditCard, pk=pk, user=request.user)
+    creditcard = get_object_or_404(CreditCard.objects.with_activity_flags(), pk=pk, user=request.user)
 
     if request.method == 'POST':
         name = creditcard.name
@@ -190,14 +154,14 @@ def creditcard_delete(request, pk):
 
 @login_required
 def creditcard_toggle_status(request, pk):
-    """Toggle credit card status between active and archived."""
+    """Toggle credit card status between active and archived, with the bulk status checks."""
     creditcard = get_object_or_404(CreditCard, pk=pk, user=request.user)
+    action = 'archive' if creditcard.status == 'active' else 'activate'
+    [result] = AccountStatusService.change_status(request.user, action, [('creditcard', creditcard.pk)])
 
-    if creditcard.status == 'active':
-        creditcard.archive()
-        messages.success(request, f'Credit Card "{creditcard.name}" archived.')
+    if result['outcome'] == 'blocked':
+        messages.error(request, f'Cannot {action} "{creditcard.name}": {" ".join(result["reasons"])}')
     else:
-        creditcard.activate()
-        messages.success(request, f'Credit Card "{creditcard.name}" activated.')
+        messages.success(request, f'Credit Card "{creditcard.name}" {result["outcome"]}.')
 
     return redirect('creditcard_list')
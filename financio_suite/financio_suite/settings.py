@@ -34,9 +34,10 @@ if os.path.exists(env_file):
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = env('SECRET_KEY', default='django-insecure-d3y_o(o5at&4g2+6@z*^*xxc7hj*ri8=@t3d__uz3fma=o1r-=')
 
-# Encryption key for sensitive fields (account numbers, etc.)
+# Encryption keys for sensitive fields (account numbers, etc.), comma separated.
+# The first key encrypts; every key can decrypt (see rotate_encryption_key).
 # Generate new key with: python -c "from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())"
-FIELD_ENCRYPTION_KEY = env('FIELD_ENCRYPTION_KEY', default='FBl4F9WAupbGwRtP8HpQ2Gg1SGFe7l4YsCXPdSnKn18=')
+FIELD_ENCRYPTION_KEY = env.list('FIELD_ENCRYPTION_KEY', default=['FBl4F9WAupbGwRtP8HpQ2Gg1SGFe7l4YsCXPdSnKn18='])
 
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = env('DEBUG')
@@ -55,6 +56,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.humanize',  # For number formatting (intcomma filter)
+    'django.contrib.postgres',  # Full-text and trigram search
     
     # Core and utilities
     'core',
@@ -72,6 +74,7 @@ INSTALLED_APPS = [
     'investments',
     'fds',
     'loans',
+    'imports',
     
     # Reporting and analytics
     'reports',
@@ -107,6 +110,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'reports.context_processors.financial_summary',
             ],
         },
     },
@@ -129,6 +133,19 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/#local-memory-caching
+# Per process: every gunicorn worker and management command has its own.
+# core.choices keeps a short timeout for that reason; switch to a shared
+# backend (Redis or the database cache) before running several workers.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'financio',
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
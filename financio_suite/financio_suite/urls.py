@@ -14,10 +14,13 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
 
+from core.thumbnails import THUMBNAIL_DIR
+from core.views import serve_thumbnail
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('auth/', include('authn.urls')),
@@ -28,9 +31,14 @@ urlpatterns = [
     path('investments/', include('investments.urls')),
     path('transactions/', include('transactions.urls')),
     path('transfers/', include('transfers.urls')),
+    path('imports/', include('imports.urls')),
+    path('reports/', include('reports.urls')),
     path('', include('core.urls')),
 ]
 
 # Serve media files in development
 if settings.DEBUG:
+    urlpatterns += [
+        re_path(rf'^{settings.MEDIA_URL.lstrip("/")}{THUMBNAIL_DIR}/(?P<path>.*)$', serve_thumbnail),
+    ]
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,22 @@
+from django.contrib import admin
+from .models import StatementImport, StatementImportRow
+
+
+@admin.register(StatementImport)
+class StatementImportAdmin(admin.ModelAdmin):
+    """Admin interface for statement imports"""
+
+    list_display = ['original_filename', 'parser', 'status', 'row_count', 'committed_count', 'user', 'created_at']
+    list_filter = ['status', 'parser', 'created_at']
+    search_fields = ['original_filename', 'user__username']
+    readonly_fields = ['created_at', 'committed_at']
+
+
+@admin.register(StatementImportRow)
+class StatementImportRowAdmin(admin.ModelAdmin):
+    """Admin interface for staged statement rows"""
+
+    list_display = ['statement_import', 'line_number', 'datetime_ist', 'transaction_type', 'amount', 'include']
+    list_filter = ['transaction_type', 'include', 'is_duplicate']
+    search_fields = ['description', 'reference']
+    raw_id_fields = ['statement_import', 'category', 'transaction']
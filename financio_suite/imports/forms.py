@@ -0,0 +1,60 @@
+from django import forms
+from django.core.exceptions import ValidationError
+
+from core.utils import get_account_choices_for_form, get_account_from_compound_value
+from .parsers import PARSER_CHOICES
+
+
+INPUT_CLASSES = 'w-full h-14 px-4 rounded-lg bg-white dark:bg-dark-surface border border-gray-200 dark:border-gray-700 text-gray-900 dark:text-white focus:outline-none focus:ring-2 focus:ring-primary focus:border-transparent'
+
+# Largest statement accepted (bytes)
+MAX_STATEMENT_SIZE = 20 * 1024 * 1024
+
+
+class StatementUploadForm(forms.Form):
+    """
+    Upload a bank or credit card statement for import.
+
+    The account uses the same compound "id|modelname" values as
+    TransactionForm. The layout defaults to auto-detection from the
+    file's header.
+    """
+
+    account = forms.ChoiceField(
+        widget=forms.Select(attrs={'class': INPUT_CLASSES}),
+        help_text="Account the statement belongs to"
+    )
+    statement_file = forms.FileField(
+        widget=forms.ClearableFileInput(attrs={
+            'accept': '.csv,.ofx,.qfx,.txt',
+            'class': 'block w-full text-sm text-gray-900 dark:text-white'
+        }),
+        help_text="CSV or OFX/QFX export from your bank (max 20 MB)"
+    )
+    parser = forms.ChoiceField(
+        required=False,
+        choices=[('', 'Detect automatically')] + PARSER_CHOICES,
+        widget=forms.Select(attrs={'class': INPUT_CLASSES}),
+        help_text="Statement layout"
+    )
+
+    def __init__(self, *args, **kwargs):
+        self.user = kwargs.pop('user', None)
+        super().__init__(*args, **kwargs)
+        account_choices = [('', 'Choose an account')]
+        if self.user:
+            account_choices.extend(get_account_choices_for_form(self.user))
+        self.fields['account'].choices = account_choices
+
+    def clean_account(self):
+        """Extract actual account object from compound value."""
+        try:
+            return get_account_from_compound_value(self.cleaned_data.get('account'), self.user)
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+    def clean_statement_file(self):
+        statement_file = self.cleaned_data.get('statement_file')
+        if statement_file and statement_file.size > MAX_STATEMENT_SIZE:
+            raise ValidationError("Statement files must be 20 MB or smaller.")
+        return statement_file
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.8 on 2026-10-19 15:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('categories', '0002_category_description_category_icon'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('transactions', '0008_remove_transaction_idx_txn_user_time_id_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatementImport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('account_object_id', models.PositiveIntegerField(help_text='ID of the account')),
+                ('original_filename', models.CharField(help_text='Name of the uploaded file', max_length=255)),
+                ('parser', models.CharField(help_text='Parser used to read the file (see imports.parsers.PARSERS)', max_length=30)),
+                ('status', models.CharField(choices=[('staged', 'Staged for Review'), ('committed', 'Committed'), ('cancelled', 'Cancelled')], db_index=True, default='staged', help_text='Pipeline status', max_length=20)),
+                ('row_count', models.PositiveIntegerField(default=0, help_text='Rows staged from the file')),
+                ('committed_count', models.PositiveIntegerField(default=0, help_text='Transactions created on commit')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When the file was uploaded')),
+                ('committed_at', models.DateTimeField(blank=True, help_text='When the import was committed', null=True)),
+                ('account_content_type', models.ForeignKey(help_text='Type of account the statement belongs to', on_delete=django.db.models.deletion.PROTECT, to='contenttypes.contenttype')),
+                ('user', models.ForeignKey(help_text='User who uploaded the statement', on_delete=django.db.models.deletion.CASCADE, related_name='statement_imports', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Statement Import',
+                'verbose_name_plural': 'Statement Imports',
+                'db_table': 'statement_imports',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StatementImportRow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('line_number', models.PositiveIntegerField(help_text='Line in the source file (1-based)')),
+                ('datetime_ist', models.DateTimeField(help_text='Transaction date (IST)')),
+                ('transaction_type', models.CharField(choices=[('income', 'Income'), ('expense', 'Expense')], help_text='Income for credits to the account, expense for debits', max_length=10)),
+                ('amount', models.DecimalField(decimal_places=2, help_text='Amount (always positive)', max_digits=15)),
+                ('description', models.TextField(help_text='Narration from the statement')),
+                ('reference', models.CharField(blank=True, default='', help_text='Cheque/reference number or OFX FITID', max_length=100)),
+                ('include', models.BooleanField(default=True, help_text='Commit this row as a transaction')),
+                ('category', models.ForeignKey(blank=True, help_text='Category to assign on commit', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='categories.category')),
+                ('statement_import', models.ForeignKey(help_text='Import this row belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='rows', to='imports.statementimport')),
+                ('transaction', models.OneToOneField(blank=True, help_text='Transaction created from this row', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='import_row', to='transactions.transaction')),
+            ],
+            options={
+                'verbose_name': 'Statement Import Row',
+                'verbose_name_plural': 'Statement Import Rows',
+                'db_table': 'statement_import_rows',
+                'ordering': ['statement_import', 'line_number'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='statementimport',
+            index=models.Index(fields=['user', 'created_at'], name='idx_import_user_created'),
+        ),
+        migrations.AddIndex(
+            model_name='statementimportrow',
+            index=models.Index(fields=['statement_import', 'line_number'], name='idx_import_row_line'),
+        ),
+    ]
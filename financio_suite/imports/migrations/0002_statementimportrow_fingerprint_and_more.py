@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-19 15:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('imports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='statementimportrow',
+            name='fingerprint',
+            field=models.CharField(blank=True, default='', help_text='Fingerprint of the transaction this row would create (core.fingerprint)', max_length=40),
+        ),
+        migrations.AddField(
+            model_name='statementimportrow',
+            name='is_duplicate',
+            field=models.BooleanField(default=False, help_text='An identical transaction was already in the ledger when staged'),
+        ),
+    ]
@@ -0,0 +1,185 @@
+from django.db import models
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+
+
+class StatementImport(models.Model):
+    """
+    One uploaded bank/card statement moving through the import pipeline.
+
+    Lifecycle: the file is parsed into StatementImportRow records
+    (status 'staged'), the user reviews and excludes/categorizes rows,
+    then the import is committed as transactions with one batched ledger
+    write ('committed') or discarded ('cancelled').
+    """
+
+    STATUS_CHOICES = [
+        ('staged', 'Staged for Review'),
+        ('committed', 'Committed'),
+        ('cancelled', 'Cancelled'),
+    ]
+
+    # Owner
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='statement_imports',
+        help_text="User who uploaded the statement"
+    )
+
+    # Target account (BankAccount or CreditCard)
+    account_content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.PROTECT,
+        help_text="Type of account the statement belongs to"
+    )
+    account_object_id = models.PositiveIntegerField(
+        help_text="ID of the account"
+    )
+    account = GenericForeignKey('account_content_type', 'account_object_id')
+
+    # Source file
+    original_filename = models.CharField(
+        max_length=255,
+        help_text="Name of the uploaded file"
+    )
+    parser = models.CharField(
+        max_length=30,
+        help_text="Parser used to read the file (see imports.parsers.PARSERS)"
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='staged',
+        db_index=True,
+        help_text="Pipeline status"
+    )
+    row_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Rows staged from the file"
+    )
+    committed_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Transactions created on commit"
+    )
+
+    # Timestamps
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        help_text="When the file was uploaded"
+    )
+    committed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the import was committed"
+    )
+
+    class Meta:
+        db_table = 'statement_imports'
+        verbose_name = 'Statement Import'
+        verbose_name_plural = 'Statement Imports'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='idx_import_user_created'),
+        ]
+
+    def __str__(self):
+        return f"{self.original_filename} ({self.get_status_display()})"
+
+
+class StatementImportRow(models.Model):
+    """
+    A parsed statement line awaiting review.
+
+    Rows are created in bulk while the file is parsed and turned into
+    Transaction records when the import is committed. Excluded rows are
+    kept for reference but never committed. Rows already in the ledger
+    are staged as duplicates and excluded by default.
+    """
+
+    TRANSACTION_TYPE_CHOICES = [
+        ('income', 'Income'),
+        ('expense', 'Expense'),
+    ]
+
+    statement_import = models.ForeignKey(
+        StatementImport,
+        on_delete=models.CASCADE,
+        related_name='rows',
+        help_text="Import this row belongs to"
+    )
+    line_number = models.PositiveIntegerField(
+        help_text="Line in the source file (1-based)"
+    )
+
+    # Parsed values
+    datetime_ist = models.DateTimeField(
+        help_text="Transaction date (IST)"
+    )
+    transaction_type = models.CharField(
+        max_length=10,
+        choices=TRANSACTION_TYPE_CHOICES,
+        help_text="Income for credits to the account, expense for debits"
+    )
+    amount = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        help_text="Amount (always positive)"
+    )
+    description = models.TextField(
+        help_text="Narration from the statement"
+    )
+    reference = models.CharField(
+        max_length=100,
+        blank=True,
+        default='',
+        help_text="Cheque/reference number or OFX FITID"
+    )
+    fingerprint = models.CharField(
+        max_length=40,
+        blank=True,
+        default='',
+        help_text="Fingerprint of the transaction this row would create (core.fingerprint)"
+    )
+    is_duplicate = models.BooleanField(
+        default=False,
+        help_text="An identical transaction was already in the ledger when staged"
+    )
+
+    # Review choices
+    include = models.BooleanField(
+        default=True,
+        help_text="Commit this row as a transaction"
+    )
+    category = models.ForeignKey(
+        'categories.Category',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text="Category to assign on commit"
+    )
+
+    # Result
+    transaction = models.OneToOneField(
+        'transactions.Transaction',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='import_row',
+        help_text="Transaction created from this row"
+    )
+
+    class Meta:
+        db_table = 'statement_import_rows'
+        verbose_name = 'Statement Import Row'
+        verbose_name_plural = 'Statement Import Rows'
+        ordering = ['statement_import', 'line_number']
+        indexes = [
+            models.Index(fields=['statement_import', 'line_number'], name='idx_import_row_line'),
+        ]
+
+    def __str__(self):
+        return f"Line {self.line_number}: {self.amount} {self.transaction_type}"
@@ -0,0 +1,328 @@
+"""
+Statement parsers for the import pipeline.
+
+Each parser reads a text stream line by line and yields one dict per
+statement line, so a file is never loaded into memory as a whole:
+
+    {
+        'line_number': 12,
+        'datetime_ist': datetime(2025, 4, 1, 0, 0),
+        'transaction_type': 'expense',   # debit to the account
+        'amount': Decimal('450.00'),      # always positive
+        'description': 'UPI/DR/12345/SWIGGY',
+        'reference': '12345',
+    }
+
+Parsers are registered in PARSERS by key. CSV layouts are described by
+the header names of their columns; add a CsvStatementParser entry to
+support another bank.
+"""
+import csv
+import io
+import re
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.core.exceptions import ValidationError
+
+
+# Formats seen in Indian bank exports, tried in order
+DATE_FORMATS = [
+    '%d/%m/%Y', '%d/%m/%y', '%d-%m-%Y', '%d-%m-%y', '%d.%m.%Y',
+    '%d %b %Y', '%d-%b-%Y', '%d-%b-%y', '%d %B %Y', '%Y-%m-%d',
+]
+
+# Header rows are searched for within the first lines (banks prepend account details)
+HEADER_SEARCH_LINES = 50
+
+# Bytes read from the upload to detect its format
+DETECT_BYTES = 16 * 1024
+
+# Narration keywords -> Transaction.method_type
+METHOD_KEYWORDS = [
+    ('upi', 'upi'),
+    ('neft', 'imps_neft_rtgs'),
+    ('imps', 'imps_neft_rtgs'),
+    ('rtgs', 'imps_neft_rtgs'),
+    ('pos', 'card'),
+    ('atm', 'cash'),
+    ('chq', 'cheque'),
+    ('cheque', 'cheque'),
+]
+
+
+def normalize_header(value):
+    """Lower-case a header cell and collapse punctuation: 'Withdrawal Amt.' -> 'withdrawal amt'."""
+    return ' '.join(re.findall(r'[a-z0-9]+', value.lower()))
+
+
+def parse_amount(value):
+    """Parse '1,23,456.78', '₹ 450', '(120.00)' or '' into a Decimal (None when blank)."""
+    value = (value or '').strip()
+    negative = value.startswith('(') and value.endswith(')')
+    cleaned = re.sub(r'[^0-9.\-]', '', value)
+    if not cleaned or cleaned in ('-', '.'):
+        return None
+    try:
+        amount = Decimal(cleaned)
+    except InvalidOperation:
+        return None
+    return -amount if negative else amount
+
+
+def parse_date(value):
+    """Parse a statement date into a naive IST datetime at midnight (None if unparseable)."""
+    value = (value or '').strip()
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def guess_method_type(description):
+    """Guess Transaction.method_type from a narration, or None."""
+    words = set(re.findall(r'[a-z]+', description.lower()))
+    for keyword, method_type in METHOD_KEYWORDS:
+        if keyword in words:
+            return method_type
+    return None
+
+
+class CsvStatementParser:
+    """
+    CSV statement layout identified by its header row.
+
+    Column arguments are lists of accepted (normalized) header names.
+    Amounts come either from separate debit/credit columns, or from one
+    amount column that is signed or paired with a Dr/Cr indicator column.
+    """
+
+    format = 'csv'
+
+    def __init__(self, key, label, date, description, debit=None, credit=None,
+                 amount=None, indicator=None, reference=None):
+        self.key = key
+        self.label = label
+        self.columns = {
+            'date': date,
+            'description': description,
+            'debit': debit,
+            'credit': credit,
+            'amount': amount,
+            'indicator': indicator,
+            'reference': reference,
+        }
+
+    def _locate(self, header):
+        """Map column roles to indexes in header, or None if the layout doesn't match."""
+        normalized = [normalize_header(cell) for cell in header]
+        positions = {}
+        for role, names in self.columns.items():
+            if not names:
+                continue
+            for index, cell in enumerate(normalized):
+                if cell in names:
+                    positions[role] = index
+                    break
+        has_amounts = ('debit' in positions and 'credit' in positions) or 'amount' in positions
+        if 'date' not in positions or 'description' not in positions or not has_amounts:
+            return None
+        if self.columns['indicator'] and 'indicator' not in positions:
+            return None
+        return positions
+
+    def matches(self, lines):
+        """True if one of the first lines is this layout's header row."""
+        return any(self._locate(row) for row in csv.reader(lines[:HEADER_SEARCH_LINES]))
+
+    def parse(self, stream):
+        positions = None
+        for line_number, row in enumerate(csv.reader(stream), start=1):
+            if positions is None:
+                if line_number > HEADER_SEARCH_LINES:
+                    raise ValidationError(f"No {self.label} header row found in the file.")
+                positions = self._locate(row)
+                continue
+
+            def cell(role):
+                index = positions.get(role)
+                return row[index] if index is not None and index < len(row) else ''
+
+            # Separator, summary and footer lines have no parseable date
+            occurred_at = parse_date(cell('date'))
+            if occurred_at is None:
+                continue
+
+            if 'amount' in positions:
+                amount = parse_amount(cell('amount'))
+                if amount is None:
+                    continue
+                if 'indicator' in positions:
+                    is_debit = cell('indicator').strip().lower().startswith('d')
+                else:
+                    is_debit = amount < 0
+            else:
+                debit = parse_amount(cell('debit')) or Decimal('0')
+                credit = parse_amount(cell('credit')) or Decimal('0')
+                is_debit = debit != 0
+                amount = debit if is_debit else credit
+
+            amount = abs(amount)
+            if amount == 0:
+                continue
+
+            yield {
+                'line_number': line_number,
+                'datetime_ist': occurred_at,
+                'transaction_type': 'expense' if is_debit else 'income',
+                'amount': amount,
+                'description': ' '.join(cell('description').split()),
+                'reference': cell('reference').strip()[:100],
+            }
+
+        if positions is None:
+            raise ValidationError(f"No {self.label} header row found in the file.")
+
+
+class OfxStatementParser:
+    """
+    OFX 1.x (SGML) and 2.x (XML) statements.
+
+    Tags are tokenized line by line; each <STMTTRN> aggregate becomes a row.
+    Leaf values need no closing tag, as in SGML OFX.
+    """
+
+    key = 'ofx'
+    label = 'OFX / QFX'
+    format = 'ofx'
+
+    TOKEN_RE = re.compile(r'<(/?)([A-Za-z0-9.]+)>([^<\r\n]*)')
+
+    def matches(self, lines):
+        head = '\n'.join(lines[:HEADER_SEARCH_LINES]).upper()
+        return 'OFXHEADER' in head or '<OFX>' in head
+
+    @staticmethod
+    def _parse_ofx_date(value):
+        """YYYYMMDD[HHMMSS[.XXX]][[gmt offset:tz]] -> naive datetime."""
+        digits = re.match(r'\d{8,14}', value.strip())
+        if not digits:
+            return None
+        digits = digits.group().ljust(14, '0')
+        try:
+            return datetime.strptime(digits, '%Y%m%d%H%M%S')
+        except ValueError:
+            return None
+
+    def _row(self, line_number, fields):
+        occurred_at = self._parse_ofx_date(fields.get('DTPOSTED', ''))
+        amount = parse_amount(fields.get('TRNAMT'))
+        if occurred_at is None or not amount:
+            return None
+        description = ' '.join(
+            part for part in (fields.get('NAME', ''), fields.get('MEMO', '')) if part
+        )
+        return {
+            'line_number': line_number,
+            'datetime_ist': occurred_at,
+            'transaction_type': 'expense' if amount < 0 else 'income',
+            'amount': abs(amount),
+            'description': ' '.join(description.split()),
+            'reference': (fields.get('FITID') or fields.get('CHECKNUM') or '')[:100],
+        }
+
+    def parse(self, stream):
+        fields = None
+        start_line = 0
+        for line_number, line in enumerate(stream, start=1):
+            for closing, tag, value in self.TOKEN_RE.findall(line):
+                tag = tag.upper()
+                if tag == 'STMTTRN':
+                    if fields is not None:
+                        row = self._row(start_line, fields)
+                        if row:
+                            yield row
+                    fields = None if closing else {}
+                    start_line = line_number
+                elif fields is not None and not closing:
+                    fields[tag] = value.strip()
+        if fields is not None:
+            row = self._row(start_line, fields)
+            if row:
+                yield row
+
+
+PARSERS = {
+    parser.key: parser
+    for parser in [
+        CsvStatementParser(
+            'hdfc', 'HDFC Bank (CSV)',
+            date=['date'], description=['narration'],
+            debit=['withdrawal amt'], credit=['deposit amt'],
+            reference=['chq ref no'],
+        ),
+        CsvStatementParser(
+            'icici', 'ICICI Bank (CSV)',
+            date=['transaction date', 'value date'], description=['transaction remarks'],
+            debit=['withdrawal amount inr', 'withdrawal amount'],
+            credit=['deposit amount inr', 'deposit amount'],
+            reference=['cheque number'],
+        ),
+        CsvStatementParser(
+            'sbi', 'State Bank of India (CSV)',
+            date=['txn date'], description=['description'],
+            debit=['debit'], credit=['credit'],
+            reference=['ref no cheque no'],
+        ),
+        CsvStatementParser(
+            'axis', 'Axis Bank (CSV)',
+            date=['tran date'], description=['particulars'],
+            debit=['dr'], credit=['cr'],
+            reference=['chqno'],
+        ),
+        CsvStatementParser(
+            'kotak', 'Kotak Mahindra Bank (CSV)',
+            date=['transaction date'], description=['description'],
+            amount=['amount'], indicator=['dr cr'],
+            reference=['chq ref no'],
+        ),
+        # Fallback for simple exports: Date, Description, Amount (signed) or Debit/Credit
+        CsvStatementParser(
+            'generic', 'Generic CSV (Date, Description, Amount or Debit/Credit)',
+            date=['date', 'transaction date', 'txn date', 'value date'],
+            description=['description', 'narration', 'particulars', 'remarks', 'details'],
+            debit=['debit', 'withdrawal', 'dr'], credit=['credit', 'deposit', 'cr'],
+            amount=['amount'], reference=['reference', 'ref no', 'cheque no'],
+        ),
+        OfxStatementParser(),
+    ]
+}
+
+PARSER_CHOICES = [(key, parser.label) for key, parser in PARSERS.items()]
+
+
+def open_text_stream(uploaded_file):
+    """Wrap an uploaded file in a text stream (UTF-8, BOM and bad bytes tolerated)."""
+    uploaded_file.seek(0)
+    return io.TextIOWrapper(uploaded_file.file, encoding='utf-8-sig', errors='replace', newline='')
+
+
+def detect_parser(uploaded_file):
+    """
+    Pick the parser for an uploaded statement from its first bytes.
+
+    Raises:
+        ValidationError: If no registered layout recognizes the file
+    """
+    uploaded_file.seek(0)
+    head = uploaded_file.read(DETECT_BYTES).decode('utf-8-sig', errors='replace')
+    uploaded_file.seek(0)
+    lines = head.splitlines()
+    # OFX first: its SGML header would otherwise be read as CSV
+    ordered = [PARSERS['ofx']] + [parser for key, parser in PARSERS.items() if key != 'ofx']
+    for parser in ordered:
+        if parser.matches(lines):
+            return parser
+    raise ValidationError("Could not recognize the statement format. Please choose the bank layout.")
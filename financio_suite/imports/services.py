@@ -0,0 +1,214 @@
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from categories.rules import RuleMatcher
+from core.fingerprint import transaction_fingerprint
+from ledger.services import LedgerService
+from reports.models import UserFinancialSummary
+from transactions.models import Transaction
+
+from .models import StatementImport, StatementImportRow
+from .parsers import PARSERS, detect_parser, guess_method_type, open_text_stream
+
+
+class ImportService:
+    """
+    Stage and commit bank/card statement imports.
+
+    Staging streams the file through its parser and bulk-inserts rows in
+    batches, excluding lines already in the ledger (matched by fingerprint
+    with one query per batch) and categorizing rows with the user's
+    CategoryRules; committing turns the included rows into
+    transactions with one batched ledger write and a single balance update
+    per account.
+    """
+
+    # Rows per INSERT/UPDATE statement
+    BATCH_SIZE = 1000
+
+    # Purpose given to rows whose statement line has no narration
+    DEFAULT_PURPOSE = 'Imported transaction'
+
+    @staticmethod
+    def _mark_duplicates(user, rows, remaining):
+        """
+        Exclude rows whose transaction is already in the ledger.
+
+        One query per batch counts the live transactions sharing each new
+        fingerprint. `remaining` carries those counts across batches, so a
+        line that legitimately repeats in the statement is only skipped as
+        many times as it already appears in the ledger.
+        """
+        unseen = {row.fingerprint for row in rows} - remaining.keys()
+        if unseen:
+            remaining.update(dict.fromkeys(unseen, 0))
+            remaining.update(
+                Transaction.objects.filter(user=user, deleted_at__isnull=True, fingerprint__in=unseen)
+                .order_by()
+                .values('fingerprint')
+                .annotate(count=Count('id'))
+                .values_list('fingerprint', 'count')
+            )
+        for row in rows:
+            if remaining[row.fingerprint]:
+                remaining[row.fingerprint] -= 1
+                row.is_duplicate = True
+                row.include = False
+
+    @staticmethod
+    @transaction.atomic
+    def stage(user, account, uploaded_file, parser_key=None):
+        """
+        Parse an uploaded statement into StatementImportRow records for review.
+
+        Args:
+            user: User instance
+            account: BankAccount or CreditCard the statement belongs to
+            uploaded_file: Django UploadedFile (CSV or OFX)
+            parser_key: Key in imports.parsers.PARSERS, or None to auto-detect
+
+        Returns:
+            StatementImport: The staged import
+
+        Raises:
+            ValidationError: If the format is not recognized or no rows are found
+        """
+        parser = PARSERS[parser_key] if parser_key else detect_parser(uploaded_file)
+
+        content_type = ContentType.objects.get_for_model(account)
+        statement_import = StatementImport.objects.create(
+            user=user,
+            account_content_type=content_type,
+            account_object_id=account.pk,
+            original_filename=uploaded_file.name[:255],
+            parser=parser.key,
+        )
+
+        matcher = RuleMatcher.for_user(user)
+        stream = open_text_stream(uploaded_file)
+        batch = []
+        row_count = 0
+        # Ledger copies of each fingerprint not yet matched to a row
+        remaining = {}
+        try:
+            for parsed in parser.parse(stream):
+                row = StatementImportRow(statement_import=statement_import, **parsed)
+                row.fingerprint = transaction_fingerprint(
+                    content_type.id, account.pk, row.datetime_ist, row.transaction_type, row.amount,
+                    row.description or ImportService.DEFAULT_PURPOSE,
+                )
+                if row.category is None:
+                    row.category = matcher.match(
+                        row.description, row.amount, row.transaction_type, content_type.id, account.pk
+                    )
+                batch.append(row)
+                if len(batch) >= ImportService.BATCH_SIZE:
+                    ImportService._mark_duplicates(user, batch, remaining)
+                    StatementImportRow.objects.bulk_create(batch)
+                    row_count += len(batch)
+                    batch = []
+        finally:
+            # Leave the underlying upload open for Django to clean up
+            stream.detach()
+        if batch:
+            ImportService._mark_duplicates(user, batch, remaining)
+            StatementImportRow.objects.bulk_create(batch)
+            row_count += len(batch)
+
+        if row_count == 0:
+            raise ValidationError("No transactions were found in the statement.")
+
+        statement_import.row_count = row_count
+        statement_import.save(update_fields=['row_count'])
+        return statement_import
+
+    @staticmethod
+    @transaction.atomic
+    def commit(statement_import):
+        """
+        Create transactions for every included row of a staged import.
+
+        All journal entries, postings and transactions are bulk-inserted and
+        the account balance is updated once (LedgerService.create_simple_entries_bulk).
+
+        Returns:
+            StatementImport: The committed import
+
+        Raises:
+            ValidationError: If the import is not staged or its account is gone
+        """
+        statement_import = StatementImport.objects.select_for_update().get(pk=statement_import.pk)
+        if statement_import.status != 'staged':
+            raise ValidationError("This import has already been committed or cancelled.")
+        account = statement_import.account
+        if account is None:
+            raise ValidationError("The account for this import no longer exists.")
+
+        rows = list(
+            statement_import.rows.filter(include=True)
+            .select_related('category')
+            .order_by('line_number')
+        )
+
+        journal_entries = LedgerService.create_simple_entries_bulk(
+            statement_import.user,
+            account,
+            [
+                {
+                    'transaction_type': row.transaction_type,
+                    'amount': row.amount,
+                    'occurred_at': row.datetime_ist,
+                    'memo': f"{row.get_transaction_type_display()}: {row.description[:100]}",
+                    'category': row.category,
+                }
+                for row in rows
+            ],
+        )
+
+        transactions = Transaction.objects.bulk_create(
+            [
+                Transaction(
+                    user_id=statement_import.user_id,
+                    datetime_ist=row.datetime_ist,
+                    transaction_type=row.transaction_type,
+                    amount=row.amount,
+                    account_content_type_id=statement_import.account_content_type_id,
+                    account_object_id=statement_import.account_object_id,
+                    method_type=guess_method_type(row.description),
+                    purpose=row.description or ImportService.DEFAULT_PURPOSE,
+                    category=row.category,
+                    journal_entry=journal_entry,
+                    fingerprint=row.fingerprint,
+                )
+                for row, journal_entry in zip(rows, journal_entries)
+            ],
+            batch_size=ImportService.BATCH_SIZE,
+        )
+
+        for row, created in zip(rows, transactions):
+            row.transaction = created
+        StatementImportRow.objects.bulk_update(rows, ['transaction'], batch_size=ImportService.BATCH_SIZE)
+
+        statement_import.status = 'committed'
+        statement_import.committed_count = len(transactions)
+        statement_import.committed_at = timezone.now()
+        statement_import.save(update_fields=['status', 'committed_count', 'committed_at'])
+
+        # bulk_create sends no post_save signals, so refresh the monthly totals here
+        UserFinancialSummary.refresh(statement_import.user_id, sections=['monthly'])
+
+        return statement_import
+
+    @staticmethod
+    @transaction.atomic
+    def cancel(statement_import):
+        """Discard a staged import and its rows."""
+        if statement_import.status != 'staged':
+            raise ValidationError("Only staged imports can be cancelled.")
+        statement_import.rows.all().delete()
+        statement_import.status = 'cancelled'
+        statement_import.save(update_fields=['status'])
+        return statement_import
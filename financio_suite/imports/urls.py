@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+app_name = 'imports'
+
+urlpatterns = [
+    path('', views.import_upload, name='import_upload'),
+    path('<int:pk>/review/', views.import_review, name='import_review'),
+]
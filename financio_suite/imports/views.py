@@ -0,0 +1,129 @@
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.shortcuts import get_object_or_404, redirect, render
+
+from activity.utils import log_activity
+from categories.models import Category
+from .forms import StatementUploadForm
+from .models import StatementImport, StatementImportRow
+from .services import ImportService
+
+
+# Staged rows shown per review page
+REVIEW_PAGE_SIZE = 100
+
+
+@login_required
+def import_upload(request):
+    """Upload a statement and stage its rows for review; lists recent imports."""
+    if request.method == 'POST':
+        form = StatementUploadForm(request.POST, request.FILES, user=request.user)
+        if form.is_valid():
+            try:
+                statement_import = ImportService.stage(
+                    request.user,
+                    form.cleaned_data['account'],
+                    form.cleaned_data['statement_file'],
+                    form.cleaned_data['parser'] or None,
+                )
+            except ValidationError as e:
+                form.add_error('statement_file', e)
+            else:
+                messages.success(
+                    request,
+                    f'{statement_import.row_count} rows read from "{statement_import.original_filename}". '
+                    f'Review them before importing.'
+                )
+                return redirect('imports:import_review', pk=statement_import.pk)
+    else:
+        form = StatementUploadForm(user=request.user)
+
+    context = {
+        'form': form,
+        'imports': StatementImport.objects.filter(user=request.user)[:20],
+    }
+    return render(request, 'imports/import_upload.html', context)
+
+
+@login_required
+def import_review(request, pk):
+    """
+    Review staged rows: include/exclude and categorize, then commit or cancel.
+
+    POST actions:
+        save: Store include/category choices for the rows on this page
+        commit: Save this page, then create transactions for all included rows
+        cancel: Discard the import
+    """
+    statement_import = get_object_or_404(StatementImport, pk=pk, user=request.user)
+    rows = statement_import.rows.select_related('category').order_by('line_number')
+
+    if request.method == 'POST' and statement_import.status == 'staged':
+        action = request.POST.get('action')
+
+        if action == 'cancel':
+            ImportService.cancel(statement_import)
+            messages.success(request, 'Import cancelled.')
+            return redirect('imports:import_upload')
+
+        _save_review_choices(request, statement_import)
+
+        if action == 'commit':
+            try:
+                statement_import = ImportService.commit(statement_import)
+            except ValidationError as e:
+                messages.error(request, ' '.join(e.messages))
+                return redirect('imports:import_review', pk=statement_import.pk)
+            log_activity(
+                user=request.user,
+                action='create',
+                obj=statement_import,
+                changes={
+                    'file': statement_import.original_filename,
+                    'account': str(statement_import.account),
+                    'transactions': statement_import.committed_count,
+                },
+                request=request
+            )
+            messages.success(
+                request,
+                f'{statement_import.committed_count} transactions imported. Balance updated.'
+            )
+            return redirect('transactions:transaction_list')
+
+        messages.success(request, 'Changes saved.')
+        return redirect(f"{request.path}?page={request.POST.get('page', 1)}")
+
+    page_obj = Paginator(rows, REVIEW_PAGE_SIZE).get_page(request.GET.get('page'))
+    categories = Category.objects.filter(
+        user=request.user,
+        is_active=True,
+        type__in=['income', 'expense']
+    ).order_by('type', 'name')
+
+    context = {
+        'statement_import': statement_import,
+        'page_obj': page_obj,
+        'categories': categories,
+        'included_count': rows.filter(include=True).count(),
+        'duplicate_count': rows.filter(is_duplicate=True).count(),
+    }
+    return render(request, 'imports/import_review.html', context)
+
+
+def _save_review_choices(request, statement_import):
+    """Apply the include checkboxes and category selects posted for one review page."""
+    row_ids = [int(row_id) for row_id in request.POST.getlist('row_ids') if row_id.isdigit()]
+    if not row_ids:
+        return
+    category_ids = set(
+        Category.objects.filter(user=request.user).values_list('id', flat=True)
+    )
+    rows = list(StatementImportRow.objects.filter(statement_import=statement_import, id__in=row_ids))
+    for row in rows:
+        row.include = f'include_{row.id}' in request.POST
+        category_id = request.POST.get(f'category_{row.id}', '')
+        row.category_id = int(category_id) if category_id.isdigit() and int(category_id) in category_ids else None
+    StatementImportRow.objects.bulk_update(rows, ['include', 'category'])
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Investment, InvestmentTransaction, Broker
+from .models import Investment, InvestmentHolding, InvestmentTransaction, InvestmentPrice, Broker
 
 class InvestmentTransactionInline(admin.TabularInline):
     model = InvestmentTransaction
@@ -16,8 +16,16 @@ class InvestmentAdmin(admin.ModelAdmin):
     list_display = ('name', 'symbol', 'broker', 'investment_type', 'total_quantity', 'current_price', 'current_value', 'status')
     list_filter = ('investment_type', 'status', 'user', 'broker')
     search_fields = ('name', 'symbol', 'broker__name')
+    list_select_related = ('broker', 'holding')
     inlines = [InvestmentTransactionInline]
-    readonly_fields = ('total_quantity', 'average_buy_price', 'total_invested', 'current_value', 'unrealized_pnl')
+    readonly_fields = ('total_quantity', 'average_buy_price', 'total_invested', 'current_value', 'unrealized_pnl', 'realized_pnl')
+
+@admin.register(InvestmentHolding)
+class InvestmentHoldingAdmin(admin.ModelAdmin):
+    list_display = ('investment', 'quantity', 'cost_basis', 'realized_pnl', 'last_transaction_id', 'updated_at')
+    list_select_related = ('investment__broker',)
+    search_fields = ('investment__name', 'investment__symbol')
+    readonly_fields = ('investment', 'quantity', 'cost_basis', 'realized_pnl', 'last_transaction_id', 'updated_at')
 
 @admin.register(InvestmentTransaction)
 class InvestmentTransactionAdmin(admin.ModelAdmin):
@@ -25,3 +33,9 @@ class InvestmentTransactionAdmin(admin.ModelAdmin):
     list_filter = ('transaction_type', 'date', 'investment__user')
     search_fields = ('investment__name', 'investment__symbol')
     date_hierarchy = 'date'
+
+@admin.register(InvestmentPrice)
+class InvestmentPriceAdmin(admin.ModelAdmin):
+    list_display = ('symbol', 'date', 'price')
+    search_fields = ('symbol',)
+    date_hierarchy = 'date'
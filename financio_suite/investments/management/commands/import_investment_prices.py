@@ -0,0 +1,105 @@
+"""
+Management command to bulk import historical investment prices from CSV.
+
+Expected CSV columns (header row required, extra columns ignored):
+    symbol,date,price
+
+Dates may be YYYY-MM-DD or DD/MM/YYYY. Existing prices for the same
+symbol and date are overwritten, so re-importing a file is safe.
+
+Usage:
+    python manage.py import_investment_prices prices.csv
+
+    # Validate the file without writing anything
+    python manage.py import_investment_prices prices.csv --dry-run
+"""
+import csv
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from investments.models import InvestmentPrice
+
+
+DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y')
+
+
+def parse_date(value):
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value.strip(), fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognised date '{value}'")
+
+
+class Command(BaseCommand):
+    help = 'Bulk import historical investment prices (symbol,date,price) from a CSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path', help='Path to the CSV file')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Rows per INSERT statement (default: 5000)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate the file without saving prices',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - No changes will be saved'))
+
+        prices = {}
+        errors = 0
+        try:
+            with open(options['csv_path'], newline='', encoding='utf-8-sig') as f:
+                reader = csv.DictReader(f)
+                missing = {'symbol', 'date', 'price'} - {name.strip().lower() for name in reader.fieldnames or []}
+                if missing:
+                    raise CommandError(f"CSV is missing columns: {', '.join(sorted(missing))}")
+
+                for line_number, row in enumerate(reader, start=2):
+                    row = {key.strip().lower(): (value or '') for key, value in row.items() if key}
+                    try:
+                        symbol = row['symbol'].strip().upper()
+                        if not symbol:
+                            raise ValueError('Symbol is required')
+                        price = Decimal(row['price'].strip().replace(',', ''))
+                        if price < 0:
+                            raise ValueError('Price cannot be negative')
+                        # Later rows for the same symbol/date win
+                        prices[(symbol, parse_date(row['date']))] = price.quantize(Decimal('0.01'))
+                    except (ValueError, InvalidOperation) as e:
+                        errors += 1
+                        self.stdout.write(self.style.ERROR(f'  Line {line_number}: {e}'))
+        except FileNotFoundError:
+            raise CommandError(f"File not found: {options['csv_path']}")
+
+        self.stdout.write(f'Parsed {len(prices)} prices ({errors} rows skipped)')
+
+        if dry_run or not prices:
+            return
+
+        rows = [
+            InvestmentPrice(symbol=symbol, date=date, price=price)
+            for (symbol, date), price in prices.items()
+        ]
+        with transaction.atomic():
+            InvestmentPrice.objects.bulk_create(
+                rows,
+                batch_size=options['batch_size'],
+                update_conflicts=True,
+                unique_fields=['symbol', 'date'],
+                update_fields=['price'],
+            )
+
+        self.stdout.write(self.style.SUCCESS(f'✓ Imported {len(rows)} prices'))
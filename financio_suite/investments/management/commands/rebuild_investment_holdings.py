@@ -0,0 +1,62 @@
+"""
+Management command to rebuild the materialized investment holdings.
+
+Replays every investment's transactions into its InvestmentHolding row.
+Rows are kept up to date as transactions are saved and deleted, so this
+is only needed after loading data with queryset or raw SQL writes, or to
+check the rows: positions that changed are listed.
+
+Safe to re-run.
+
+Usage:
+    python manage.py rebuild_investment_holdings
+
+    # Only one user's investments
+    python manage.py rebuild_investment_holdings --user alice
+"""
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from investments.models import Investment, InvestmentHolding
+
+
+class Command(BaseCommand):
+    help = 'Rebuild investment holdings from their transactions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            type=str,
+            help='Only rebuild the holdings of this username',
+        )
+
+    def handle(self, *args, **options):
+        username = options.get('user')
+        investments = Investment.objects.select_related('holding').order_by('id')
+        if username:
+            if not User.objects.filter(username=username).exists():
+                raise CommandError(f"User '{username}' does not exist")
+            investments = investments.filter(user__username=username)
+
+        started = time.perf_counter()
+        count = changed = 0
+        for investment in investments.iterator():
+            try:
+                before = investment.holding.as_holdings_data()
+            except InvestmentHolding.DoesNotExist:
+                before = None
+            after = InvestmentHolding.rebuild(investment).as_holdings_data()
+            count += 1
+            if before is not None and before != after:
+                changed += 1
+                self.stdout.write(
+                    f"  {investment.name} (#{investment.pk}): quantity {before['quantity']} -> {after['quantity']}, "
+                    f"invested {before['invested_amount']:.2f} -> {after['invested_amount']:.2f}"
+                )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {count} holdings in {elapsed:.1f}s ({changed} changed)'
+        ))
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investments', '0003_alter_investmenttransaction_quantity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InvestmentPrice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('symbol', models.CharField(help_text='Ticker symbol, matched against Investment.symbol', max_length=20)),
+                ('date', models.DateField(help_text='Price date')),
+                ('price', models.DecimalField(decimal_places=2, help_text='Closing price per unit on this date', max_digits=18)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Investment Price',
+                'verbose_name_plural': 'Investment Prices',
+                'db_table': 'investment_prices',
+                'ordering': ['symbol', '-date'],
+                'constraints': [models.UniqueConstraint(fields=('symbol', 'date'), name='uniq_inv_price_symbol_date')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-19 15:49
+
+import core.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investments', '0004_investmentprice'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='broker',
+            name='demat_account_number',
+            field=core.fields.LazyEncryptedCharField(blank=True, help_text='Demat account number (encrypted)', null=True),
+        ),
+    ]
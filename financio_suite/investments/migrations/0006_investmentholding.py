@@ -0,0 +1,70 @@
+# Generated by Django 5.2.8 on 2026-10-19 16:26
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+# Frozen copy of InvestmentHolding.apply() at the time of this migration
+COST_PLACES = Decimal('0.000001')
+
+
+def backfill_holdings(apps, schema_editor):
+    Investment = apps.get_model('investments', 'Investment')
+    InvestmentHolding = apps.get_model('investments', 'InvestmentHolding')
+    InvestmentTransaction = apps.get_model('investments', 'InvestmentTransaction')
+
+    holdings = []
+    for investment_id in Investment.objects.values_list('pk', flat=True).iterator():
+        quantity = Decimal('0.00')
+        cost_basis = realized_pnl = Decimal('0')
+        last_transaction_id = None
+        transactions = InvestmentTransaction.objects.filter(investment_id=investment_id).order_by(
+            'date', 'created_at'
+        ).values_list('pk', 'transaction_type', 'quantity', 'total_amount')
+        for pk, transaction_type, txn_quantity, total_amount in transactions:
+            if transaction_type == 'buy':
+                quantity += txn_quantity
+                cost_basis += total_amount
+            elif transaction_type == 'sell' and quantity > 0:
+                cost_before = cost_basis
+                cost_removed = (cost_basis / quantity * txn_quantity).quantize(COST_PLACES)
+                quantity -= txn_quantity
+                cost_basis -= cost_removed
+                if quantity <= 0:
+                    quantity = Decimal('0.00')
+                    cost_basis = Decimal('0')
+                realized_pnl += total_amount - (cost_before - cost_basis)
+            last_transaction_id = pk
+        holdings.append(InvestmentHolding(
+            investment_id=investment_id, quantity=quantity, cost_basis=cost_basis,
+            realized_pnl=realized_pnl, last_transaction_id=last_transaction_id,
+        ))
+    InvestmentHolding.objects.bulk_create(holdings, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investments', '0005_alter_broker_demat_account_number'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InvestmentHolding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Units held', max_digits=18)),
+                ('cost_basis', models.DecimalField(decimal_places=6, default=Decimal('0'), help_text='Average cost of the units held, fees included', max_digits=24)),
+                ('realized_pnl', models.DecimalField(decimal_places=6, default=Decimal('0'), help_text='Sale proceeds (net of fees) minus the average cost of the units sold', max_digits=24)),
+                ('last_transaction_id', models.BigIntegerField(blank=True, help_text='ID of the last transaction applied to this position', null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp of last update')),
+                ('investment', models.OneToOneField(help_text='Investment this position is for', on_delete=django.db.models.deletion.CASCADE, related_name='holding', to='investments.investment')),
+            ],
+            options={
+                'verbose_name': 'Investment Holding',
+                'verbose_name_plural': 'Investment Holdings',
+                'db_table': 'investment_holdings',
+            },
+        ),
+        migrations.RunPython(backfill_holdings, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,13 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from decimal import Decimal
 
 
-from encrypted_model_fields.fields import EncryptedCharField
+from core.fields import LazyEncryptedCharField
+from core.models import EncryptedQuerySet
 
 class Broker(models.Model):
     """
@@ -27,7 +29,7 @@ class Broker(models.Model):
         blank=True,
         help_text="User ID/Client ID with the broker (alphanumeric)"
     )
-    demat_account_number = EncryptedCharField(
+    demat_account_number = LazyEncryptedCharField(
         max_length=100,
         null=True,
         blank=True,
@@ -56,6 +58,8 @@ class Broker(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = EncryptedQuerySet.as_manager()
+
     class Meta:
         db_table = 'brokers'
         verbose_name = 'Broker'
@@ -194,43 +198,44 @@ class Investment(models.Model):
 
     def get_holdings_data(self):
         """
-        Calculate current holdings based on transactions.
-        Returns a dictionary with quantity, average_price, invested_amount.
+        Current holdings, read from the materialized InvestmentHolding row.
+
+        Returns a dictionary with quantity, average_price, invested_amount
+        and realized_pnl. Investments without a row yet (no transactions)
+        are replayed without saving one.
         """
-        transactions = self.transactions.all().order_by('date', 'created_at')
-        
-        total_quantity = Decimal('0')
-        total_cost = Decimal('0')
-        
-        for txn in transactions:
-            if txn.transaction_type == 'buy':
-                total_quantity += txn.quantity
-                # Add cost: (price * qty) + fees
-                total_cost += txn.total_amount
-            elif txn.transaction_type == 'sell':
-                if total_quantity > 0:
-                    # Calculate proportional cost to remove
-                    # Average cost per unit before this sell
-                    avg_cost = total_cost / total_quantity
-                    cost_removed = avg_cost * txn.quantity
-                    
-                    total_quantity -= txn.quantity
-                    total_cost -= cost_removed
-                    
-                    # Ensure we don't go negative due to rounding
-                    if total_quantity <= 0:
-                        total_quantity = Decimal('0')
-                        total_cost = Decimal('0')
+        try:
+            holding = self.holding
+        except InvestmentHolding.DoesNotExist:
+            holding = InvestmentHolding.replay(self)
+            self.holding = holding
+        return holding.as_holdings_data()
+
+    @classmethod
+    def bulk_holdings_data(cls, investments):
+        """
+        Holdings of many investments with a single query.
 
-        average_price = Decimal('0')
-        if total_quantity > 0:
-            average_price = total_cost / total_quantity
+        Attaches each InvestmentHolding row to its investment, so that
+        total_quantity, current_value, etc. do not query again. Rows that
+        don't exist yet are replayed without being saved.
 
-        return {
-            'quantity': total_quantity,
-            'average_price': average_price,
-            'invested_amount': total_cost
+        Args:
+            investments: Iterable of Investment instances
+
+        Returns:
+            dict: {investment_id: holdings dict as returned by get_holdings_data()}
+        """
+        investments = list(investments)
+        rows = {
+            holding.investment_id: holding
+            for holding in InvestmentHolding.objects.filter(investment__in=investments)
         }
+        holdings = {}
+        for inv in investments:
+            inv.holding = rows.get(inv.pk) or InvestmentHolding.replay(inv)
+            holdings[inv.pk] = inv.holding.as_holdings_data()
+        return holdings
 
     @property
     def total_quantity(self):
@@ -244,6 +249,10 @@ class Investment(models.Model):
     def total_invested(self):
         return self.get_holdings_data()['invested_amount']
 
+    @property
+    def realized_pnl(self):
+        return self.get_holdings_data()['realized_pnl']
+
     @property
     def current_value(self):
         return self.total_quantity * self.current_price
@@ -378,4 +387,246 @@ class InvestmentTransaction(models.Model):
             self.total_amount = total.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
         
         self.full_clean()
-        super().save(*args, **kwargs)
+        created = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            InvestmentHolding.record(self, created)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            InvestmentHolding.rebuild(self.investment)
+        return result
+
+
+class InvestmentHolding(models.Model):
+    """
+    Current position in an investment, materialized from its transactions.
+
+    Holdings use average cost: a buy adds its total amount (fees included)
+    to the cost basis, a sell removes the average cost of the units sold
+    and books the rest of its proceeds as realized P&L.
+
+    InvestmentTransaction.save() and delete() keep the row up to date. A
+    new transaction dated after all others is applied to the row; any
+    other change (an edit, a delete or a backdated transaction) replays
+    the investment's transactions, since average cost depends on their
+    order. The rebuild_investment_holdings command recalculates every row.
+
+    UserFinancialSummary follows saves of this row (reports.signals),
+    not of the transactions, so it always reads the updated position.
+    Reads never write rows: an investment without one is replayed in
+    memory.
+    """
+
+    # Cost basis and realized P&L keep fractions of a paisa, so that
+    # applying transactions one by one matches a replay
+    COST_PLACES = Decimal('0.000001')
+
+    investment = models.OneToOneField(
+        Investment,
+        on_delete=models.CASCADE,
+        related_name='holding',
+        help_text="Investment this position is for"
+    )
+    quantity = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        help_text="Units held"
+    )
+    cost_basis = models.DecimalField(
+        max_digits=24,
+        decimal_places=6,
+        default=Decimal('0'),
+        help_text="Average cost of the units held, fees included"
+    )
+    realized_pnl = models.DecimalField(
+        max_digits=24,
+        decimal_places=6,
+        default=Decimal('0'),
+        help_text="Sale proceeds (net of fees) minus the average cost of the units sold"
+    )
+    last_transaction_id = models.BigIntegerField(
+        null=True,
+        blank=True,
+        help_text="ID of the last transaction applied to this position"
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text="Timestamp of last update"
+    )
+
+    class Meta:
+        db_table = 'investment_holdings'
+        verbose_name = 'Investment Holding'
+        verbose_name_plural = 'Investment Holdings'
+
+    def __str__(self):
+        return f"{self.investment.name}: {self.quantity} units"
+
+    def as_holdings_data(self):
+        """The position in Investment.get_holdings_data() format."""
+        average_price = Decimal('0')
+        if self.quantity > 0:
+            average_price = self.cost_basis / self.quantity
+        return {
+            'quantity': self.quantity,
+            'average_price': average_price,
+            'invested_amount': self.cost_basis,
+            'realized_pnl': self.realized_pnl,
+        }
+
+    def apply(self, txn):
+        """Apply a transaction dated after every transaction already applied (not saved)."""
+        if txn.transaction_type == 'buy':
+            self.quantity += txn.quantity
+            self.cost_basis += txn.total_amount
+        elif txn.transaction_type == 'sell' and self.quantity > 0:
+            cost_before = self.cost_basis
+            # Average cost per unit before this sell
+            cost_removed = (self.cost_basis / self.quantity * txn.quantity).quantize(self.COST_PLACES)
+            self.quantity -= txn.quantity
+            self.cost_basis -= cost_removed
+            # Ensure we don't go negative due to rounding
+            if self.quantity <= 0:
+                self.quantity = Decimal('0.00')
+                self.cost_basis = Decimal('0')
+            self.realized_pnl += txn.total_amount - (cost_before - self.cost_basis)
+        self.last_transaction_id = txn.pk
+
+    @staticmethod
+    def _lock(investment_id):
+        """Lock the investment row, which serializes changes to its holding."""
+        Investment.objects.select_for_update().filter(pk=investment_id).values_list('pk', flat=True).first()
+
+    @classmethod
+    def replay(cls, investment):
+        """The position from the investment's transactions, not saved."""
+        holding = cls(investment=investment)
+        transactions = InvestmentTransaction.objects.filter(investment_id=investment.pk).order_by(
+            'date', 'created_at'
+        ).only('transaction_type', 'quantity', 'total_amount')
+        for txn in transactions:
+            holding.apply(txn)
+        return holding
+
+    @classmethod
+    @transaction.atomic
+    def rebuild(cls, investment):
+        """
+        Recalculate the position by replaying the investment's transactions.
+
+        Returns:
+            InvestmentHolding: The saved row, also cached on the investment
+        """
+        cls._lock(investment.pk)
+        holding = cls.replay(investment)
+        holding, _ = cls.objects.update_or_create(investment=investment, defaults={
+            'quantity': holding.quantity,
+            'cost_basis': holding.cost_basis,
+            'realized_pnl': holding.realized_pnl,
+            'last_transaction_id': holding.last_transaction_id,
+        })
+        investment.holding = holding
+        return holding
+
+    @classmethod
+    @transaction.atomic
+    def record(cls, txn, created):
+        """Update the position after txn was saved; does nothing if txn was already applied."""
+        cls._lock(txn.investment_id)
+        holding = cls.objects.filter(investment_id=txn.investment_id).first()
+        if created and holding is not None and holding.last_transaction_id == txn.pk:
+            txn.investment.holding = holding
+            return
+        later = InvestmentTransaction.objects.filter(investment_id=txn.investment_id).filter(
+            Q(date__gt=txn.date) | Q(date=txn.date, created_at__gt=txn.created_at)
+        ).exclude(pk=txn.pk)
+        if holding is None or not created or later.exists():
+            cls.rebuild(txn.investment)
+            return
+
+        holding.apply(txn)
+        holding.save()
+        txn.investment.holding = holding
+
+
+class InvestmentPrice(models.Model):
+    """
+    Historical closing price of a symbol on a date.
+
+    Shared across users (market prices are not user data). Used to value
+    holdings at past month ends; rows are loaded in bulk with the
+    import_investment_prices management command.
+    """
+
+    symbol = models.CharField(
+        max_length=20,
+        help_text="Ticker symbol, matched against Investment.symbol"
+    )
+    date = models.DateField(
+        help_text="Price date"
+    )
+    price = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        help_text="Closing price per unit on this date"
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'investment_prices'
+        verbose_name = 'Investment Price'
+        verbose_name_plural = 'Investment Prices'
+        ordering = ['symbol', '-date']
+        constraints = [
+            models.UniqueConstraint(fields=['symbol', 'date'], name='uniq_inv_price_symbol_date'),
+        ]
+
+    def __str__(self):
+        return f"{self.symbol} {self.date}: {self.price}"
+
+    @classmethod
+    def prices_for_month_ends(cls, symbols, month_ends):
+        """
+        Latest known price on or before each month end, for many symbols at once.
+
+        Two queries regardless of the number of symbols or months: the last
+        price before the window for each symbol, and every price inside it.
+
+        Args:
+            symbols: Iterable of ticker symbols
+            month_ends: Sorted list of dates
+
+        Returns:
+            dict: {(SYMBOL, month_end): Decimal} for combinations with a known
+            price; symbols are matched and returned upper-cased
+        """
+        symbols = {symbol.strip().upper() for symbol in symbols if symbol and symbol.strip()}
+        if not symbols or not month_ends:
+            return {}
+
+        window_start = month_ends[0].replace(day=1)
+        # Latest price before the window, per symbol (PostgreSQL DISTINCT ON)
+        seed = cls.objects.filter(
+            symbol__in=symbols, date__lt=window_start
+        ).order_by('symbol', '-date').distinct('symbol').values_list('symbol', 'date', 'price')
+        in_window = cls.objects.filter(
+            symbol__in=symbols, date__gte=window_start, date__lte=month_ends[-1]
+        ).order_by('date').values_list('symbol', 'date', 'price')
+
+        # Sweep prices in date order, sampling the latest price at each month end
+        rows = sorted(list(seed) + list(in_window), key=lambda row: row[1])
+        latest = {}
+        result = {}
+        index = 0
+        for month_end in month_ends:
+            while index < len(rows) and rows[index][1] <= month_end:
+                symbol, _, price = rows[index]
+                latest[symbol] = price
+                index += 1
+            for symbol, price in latest.items():
+                result[(symbol, month_end)] = price
+        return result
@@ -28,7 +28,7 @@ def broker_list(request):
 @login_required
 def broker_archive(request, pk):
     """Archive a broker."""
-    broker = get_object_or_404(Broker, pk=pk, user=request.user)
+    broker = get_object_or_404(Broker.objects.with_encrypted(), pk=pk, user=request.user)
     
     if request.method == 'POST':
         # Check if broker has any active investments
@@ -52,7 +52,7 @@ def broker_archive(request, pk):
 @login_required
 def broker_unarchive(request, pk):
     """Unarchive a broker."""
-    broker = get_object_or_404(Broker, pk=pk, user=request.user, status='archived')
+    broker = get_object_or_404(Broker.objects.with_encrypted(), pk=pk, user=request.user, status='archived')
     
     if request.method == 'POST':
         broker.status = 'active'
@@ -85,7 +85,7 @@ def broker_create(request):
 @login_required
 def broker_edit(request, pk):
     """Edit an existing broker."""
-    broker = get_object_or_404(Broker, pk=pk, user=request.user)
+    broker = get_object_or_404(Broker.objects.with_encrypted(), pk=pk, user=request.user)
     
     if request.method == 'POST':
         form = BrokerForm(request.POST, instance=broker)
@@ -146,12 +146,12 @@ def investment_list(request):
         investments = Investment.objects.filter(
             user=request.user, 
             status='archived'
-        ).select_related('broker').order_by('broker__name', 'name')
+        ).select_related('broker', 'holding').order_by('broker__name', 'name')
     else:
         investments = Investment.objects.filter(
             user=request.user, 
             status='active'
-        ).select_related('broker').order_by('broker__name', 'name')
+        ).select_related('broker', 'holding').order_by('broker__name', 'name')
     
     # Apply broker filter if specified
     if broker_filter:
@@ -223,7 +223,7 @@ def investment_create(request):
 @login_required
 def investment_detail(request, pk):
     """Show investment details and transaction history."""
-    investment = get_object_or_404(Investment, pk=pk, user=request.user)
+    investment = get_object_or_404(Investment.objects.select_related('holding'), pk=pk, user=request.user)
     transactions = investment.transactions.all().order_by('-date', '-created_at')
     
     context = {
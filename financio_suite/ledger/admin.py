@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ControlAccount, JournalEntry, Posting
+from .models import AccountDailyBalance, ControlAccount, JournalEntry, Posting
 
 
 @admin.register(ControlAccount)
@@ -51,3 +51,21 @@ class PostingAdmin(admin.ModelAdmin):
 
     def has_change_permission(self, request, obj=None):
         return False
+
+
+@admin.register(AccountDailyBalance)
+class AccountDailyBalanceAdmin(admin.ModelAdmin):
+    list_display = ['id', 'account_info', 'date', 'closing_balance']
+    list_filter = ['account_content_type']
+    readonly_fields = ['account_content_type', 'account_object_id', 'date', 'closing_balance']
+    date_hierarchy = 'date'
+
+    def account_info(self, obj):
+        return f"{obj.account_content_type.model} #{obj.account_object_id}"
+    account_info.short_description = 'Account'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,58 @@
+"""
+Management command to build the daily balance history of accounts.
+
+Rebuilds account_daily_balances for every bank account and credit card (or
+one user's) from the live ledger postings: one aggregate query and one bulk
+insert per account. Once built, the history is kept up to date as postings
+are applied, so this is only needed once after deploying the table, or to
+repair it.
+
+Usage:
+    # Every account
+    python manage.py backfill_balance_history
+
+    # One user's accounts
+    python manage.py backfill_balance_history --user alice
+"""
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import BankAccount
+from creditcards.models import CreditCard
+from ledger.services import BalanceHistoryService
+
+
+class Command(BaseCommand):
+    help = 'Build the daily balance history of bank accounts and credit cards from ledger postings'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            help='Only rebuild this username\'s accounts',
+        )
+
+    def handle(self, *args, **options):
+        querysets = [
+            model.objects.select_related('user').order_by('id')
+            for model in (BankAccount, CreditCard)
+        ]
+        if options['user']:
+            if not User.objects.filter(username=options['user']).exists():
+                raise CommandError(f"User '{options['user']}' does not exist")
+            querysets = [queryset.filter(user__username=options['user']) for queryset in querysets]
+
+        total_accounts = total_rows = 0
+        started = time.perf_counter()
+        for queryset in querysets:
+            for account in queryset:
+                written = BalanceHistoryService.rebuild(account)
+                total_accounts += 1
+                total_rows += written
+                self.stdout.write(f'  {account.user.username} / {account.name}: {written} days')
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'\nBuilt {total_rows} daily balances for {total_accounts} accounts in {elapsed:.1f}s'
+        ))
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-19 16:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('ledger', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountDailyBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('account_object_id', models.PositiveIntegerField(help_text='ID of the account')),
+                ('date', models.DateField(help_text='Day the balance closes')),
+                ('closing_balance', models.DecimalField(decimal_places=2, help_text='Balance at the end of the day (same sign convention as the materialized balance)', max_digits=18)),
+                ('account_content_type', models.ForeignKey(help_text='Type of account (BankAccount or CreditCard)', on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'verbose_name': 'Account Daily Balance',
+                'verbose_name_plural': 'Account Daily Balances',
+                'db_table': 'account_daily_balances',
+                'ordering': ['account_content_type', 'account_object_id', 'date'],
+                'unique_together': {('account_content_type', 'account_object_id', 'date')},
+            },
+        ),
+    ]
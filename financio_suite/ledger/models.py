@@ -113,6 +113,36 @@ class JournalEntry(models.Model):
         ).aggregate(total=models.Sum('amount'))['total'] or Decimal('0.00'))
 
 
+class AccountQuerySetMixin:
+    """Filtering of rows that reference an account through account_content_type/account_object_id."""
+
+    def for_account(self, account):
+        return self.filter(
+            account_content_type=ContentType.objects.get_for_model(account),
+            account_object_id=account.pk,
+        )
+
+
+class PostingQuerySet(AccountQuerySetMixin, models.QuerySet):
+
+    def live(self):
+        """
+        Postings whose journal entry belongs to a live (not soft-deleted)
+        transaction or transfer, like LedgerService.recalculate_user_balances().
+        """
+        from transactions.models import Transaction
+        from transfers.models import Transfer
+
+        return self.filter(
+            models.Exists(Transaction.objects.filter(
+                journal_entry=models.OuterRef('journal_entry_id'), deleted_at__isnull=True
+            ))
+            | models.Exists(Transfer.objects.filter(
+                journal_entry=models.OuterRef('journal_entry_id'), deleted_at__isnull=True
+            ))
+        )
+
+
 class Posting(models.Model):
     """
     Posting - individual debit or credit entry within a journal entry.
@@ -179,6 +209,8 @@ class Posting(models.Model):
         help_text="When posting was created (IST)"
     )
 
+    objects = PostingQuerySet.as_manager()
+
     class Meta:
         db_table = 'postings'
         verbose_name = 'Posting'
@@ -216,3 +248,50 @@ class Posting(models.Model):
         # Run validation
         self.full_clean()
         super().save(*args, **kwargs)
+
+
+class AccountDailyBalanceQuerySet(AccountQuerySetMixin, models.QuerySet):
+    pass
+
+
+class AccountDailyBalance(models.Model):
+    """
+    Closing balance of a bank account or credit card on each day with activity.
+
+    Days without a row are implied: the balance is that of the latest earlier
+    row (or the account's opening balance before the first one). Maintained
+    incrementally from postings by BalanceHistoryService, so balance charts
+    read a few hundred rows instead of replaying the ledger.
+    """
+
+    account_content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        help_text="Type of account (BankAccount or CreditCard)"
+    )
+    account_object_id = models.PositiveIntegerField(
+        help_text="ID of the account"
+    )
+    account = GenericForeignKey('account_content_type', 'account_object_id')
+
+    date = models.DateField(
+        help_text="Day the balance closes"
+    )
+    closing_balance = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        help_text="Balance at the end of the day (same sign convention as the materialized balance)"
+    )
+
+    objects = AccountDailyBalanceQuerySet.as_manager()
+
+    class Meta:
+        db_table = 'account_daily_balances'
+        verbose_name = 'Account Daily Balance'
+        verbose_name_plural = 'Account Daily Balances'
+        ordering = ['account_content_type', 'account_object_id', 'date']
+        # Also the index for per-account date range scans
+        unique_together = [['account_content_type', 'account_object_id', 'date']]
+
+    def __str__(self):
+        return f"CT#{self.account_content_type_id}/ID#{self.account_object_id} {self.date}: {self.closing_balance}"
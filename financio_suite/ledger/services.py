@@ -1,10 +1,15 @@
+from datetime import datetime, timedelta
 from decimal import Decimal
+from functools import partial
 from django.db import transaction
+from django.db.models import F, Sum
+from django.db.models.functions import TruncDate
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
-from .models import JournalEntry, Posting, ControlAccount
+from .models import AccountDailyBalance, JournalEntry, Posting, ControlAccount
 from accounts.models import BankAccount, BankAccountBalance
 from creditcards.models import CreditCard, CreditCardBalance
+from creditcards.services import StatementService
 from transactions.models import Transaction
 from transfers.models import Transfer
 
@@ -88,7 +93,8 @@ class LedgerService:
             new_balance = LedgerService._update_account_balance(
                 account,
                 Decimal(str(amount)),
-                user_posting.id
+                user_posting.id,
+                occurred_at
             )
 
         else:  # expense
@@ -125,7 +131,8 @@ class LedgerService:
             new_balance = LedgerService._update_account_balance(
                 account,
                 -Decimal(str(amount)),
-                user_posting.id
+                user_posting.id,
+                occurred_at
             )
 
         # Validate that postings sum to zero
@@ -196,12 +203,14 @@ class LedgerService:
         from_balance = LedgerService._update_account_balance(
             from_account,
             -Decimal(str(amount)),
-            from_posting.id
+            from_posting.id,
+            occurred_at
         )
         to_balance = LedgerService._update_account_balance(
             to_account,
             Decimal(str(amount)),
-            to_posting.id
+            to_posting.id,
+            occurred_at
         )
 
         # Validate
@@ -209,6 +218,92 @@ class LedgerService:
 
         return journal_entry, from_balance, to_balance
 
+    @staticmethod
+    @transaction.atomic
+    def create_simple_entries_bulk(user, account, entries):
+        """
+        Create many simple journal entries for one account in a fixed number of queries.
+
+        Journal entries and postings are inserted with bulk_create and the
+        account balance is updated once with the net delta, instead of once
+        per entry as create_simple_entry() does. Used by statement imports.
+
+        Args:
+            user: User instance
+            account: Account instance (BankAccount or CreditCard)
+            entries: List of dicts with transaction_type, amount, occurred_at,
+                memo and optional category
+
+        Returns:
+            list: Created JournalEntry instances, in the order of entries
+
+        Raises:
+            ValidationError: If any amount <= 0
+        """
+        if not entries:
+            return []
+        if any(entry['amount'] <= 0 for entry in entries):
+            raise ValidationError("Amount must be greater than zero")
+
+        account_content_type = ContentType.objects.get_for_model(account)
+        control_account_ct = ContentType.objects.get_for_model(ControlAccount)
+        controls = {
+            control.account_type: control
+            for control in ControlAccount.objects.filter(account_type__in=['income', 'expense'])
+        }
+
+        journal_entries = JournalEntry.objects.bulk_create([
+            JournalEntry(user=user, occurred_at=entry['occurred_at'], memo=entry['memo'])
+            for entry in entries
+        ])
+
+        postings = []
+        net_delta = Decimal('0.00')
+        daily_deltas = {}
+        for journal_entry, entry in zip(journal_entries, entries):
+            amount = Decimal(str(entry['amount']))
+            category = entry.get('category')
+            category_name = category.name if category else "Uncategorized"
+            # Same debit/credit pairs as create_simple_entry()
+            if entry['transaction_type'] == 'income':
+                memo = f"Income: {category_name}"
+                user_amount, user_type = amount, 'debit'
+                control = controls['income']
+            else:
+                memo = f"Expense: {category_name}"
+                user_amount, user_type = -amount, 'credit'
+                control = controls['expense']
+            postings.append(Posting(
+                journal_entry=journal_entry,
+                account_content_type=control_account_ct,
+                account_object_id=control.pk,
+                amount=-user_amount,
+                posting_type='credit' if user_type == 'debit' else 'debit',
+                currency='INR',
+                memo=memo
+            ))
+            postings.append(Posting(
+                journal_entry=journal_entry,
+                account_content_type=account_content_type,
+                account_object_id=account.pk,
+                amount=user_amount,
+                posting_type=user_type,
+                currency='INR',
+                memo=memo
+            ))
+            net_delta += user_amount
+            day = entry['occurred_at'].date() if isinstance(entry['occurred_at'], datetime) else entry['occurred_at']
+            daily_deltas[day] = daily_deltas.get(day, Decimal('0.00')) + user_amount
+
+        postings = Posting.objects.bulk_create(postings)
+
+        # One balance update for the whole batch
+        LedgerService._update_account_balance(
+            account, net_delta, postings[-1].id, min(daily_deltas), daily_deltas
+        )
+
+        return journal_entries
+
     @staticmethod
     def _create_postings_for_simple_entry(journal_entry, transaction_type, account, amount):
         """
@@ -275,15 +370,24 @@ class LedgerService:
             )
 
     @staticmethod
-    def _update_account_balance(account, delta, posting_id):
+    def _update_account_balance(account, delta, posting_id, occurred_at=None, daily_deltas=None):
         """
         Update account balance atomically.
         Supports both BankAccount and CreditCard account types.
 
+        The change is also applied to the account's daily balance history
+        (BalanceHistoryService). Credit card statements are marked stale
+        from the date of the change and refreshed once the database
+        transaction commits (see StatementService).
+
         Args:
             account: Account instance (BankAccount or CreditCard)
             delta: Decimal amount to add/subtract
             posting_id: ID of posting that caused this update
+            occurred_at: Earliest date/datetime the change affects; looked up
+                from the posting's journal entry when not given
+            daily_deltas: {date: delta} breakdown of a delta spread over
+                several days; by default all of it falls on occurred_at
 
         Returns:
             Decimal: New balance amount
@@ -291,6 +395,15 @@ class LedgerService:
         # Get account type to determine which balance table to update
         account_type = account.__class__.__name__
 
+        if occurred_at is None:
+            occurred_at = Posting.objects.filter(pk=posting_id).values_list(
+                'journal_entry__occurred_at', flat=True
+            ).first()
+        if isinstance(occurred_at, datetime):
+            occurred_at = occurred_at.date()
+        if daily_deltas is None and occurred_at is not None:
+            daily_deltas = {occurred_at: delta}
+
         if account_type == 'BankAccount':
             # Use select_for_update() to prevent race conditions in concurrent transactions
             # get_or_create ensures balance record exists (fallback to opening_balance)
@@ -302,6 +415,7 @@ class LedgerService:
             balance.balance_amount += delta
             balance.last_posting_id = posting_id
             balance.save(update_fields=['balance_amount', 'last_posting_id', 'updated_at'])
+            BalanceHistoryService.apply_changes(account, daily_deltas)
 
             return balance.balance_amount
 
@@ -315,7 +429,10 @@ class LedgerService:
 
             balance.balance_amount += delta
             balance.last_posting_id = posting_id
-            balance.save(update_fields=['balance_amount', 'last_posting_id', 'updated_at'])
+            StatementService.mark_stale(balance, occurred_at)
+            balance.save(update_fields=['balance_amount', 'last_posting_id', 'statements_stale_from', 'updated_at'])
+            transaction.on_commit(partial(StatementService.refresh_stale, account.pk))
+            BalanceHistoryService.apply_changes(account, daily_deltas)
 
             return balance.balance_amount
 
@@ -330,6 +447,8 @@ class LedgerService:
         Recalculate all account balances for a specific user from ledger postings.
         Ported from the recalculate_balances management command.
 
+        The daily balance history of every processed account is rebuilt too.
+
         Returns:
             dict: Summary of changes made
         """
@@ -435,4 +554,170 @@ class LedgerService:
                     f"Fixed Card '{credit_card.name}': ₹{old_balance:,.2f} → ₹{expected_balance:,.2f}"
                 )
 
+        # 5. Rebuild the balance history from the same postings
+        for account in [
+            *BankAccount.objects.filter(user=user, status='active'),
+            *CreditCard.objects.filter(user=user, status='active'),
+        ]:
+            BalanceHistoryService.rebuild(account)
+
         return results
+
+
+class BalanceHistoryService:
+    """
+    Daily closing balances of bank accounts and credit cards (AccountDailyBalance).
+
+    LedgerService._update_account_balance() passes every balance change on
+    as {day: delta}, under the same balance row lock: the rows of the
+    changed days and every later row are shifted, and rows are added for
+    changed days that had none. A change dated today touches one row.
+    Rows are never removed: a day whose postings were all deleted or moved
+    keeps a row with the closing balance of the day before.
+
+    An account's history is built from its live postings the first time
+    it is needed: after the commit of a change to an account without
+    history rows, and when a series is read. The backfill command
+    (backfill_balance_history) builds it for every account at once.
+    """
+
+    BALANCE_MODELS = {
+        BankAccount: BankAccountBalance,
+        CreditCard: CreditCardBalance,
+    }
+
+    @staticmethod
+    def _lock(account):
+        """Lock the account's balance row, which serializes history changes."""
+        balance_model = BalanceHistoryService.BALANCE_MODELS[type(account)]
+        balance_model.objects.select_for_update().filter(account=account).first()
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild(account):
+        """
+        Recalculate the account's history from its live postings.
+
+        Returns:
+            int: Number of rows written
+        """
+        BalanceHistoryService._lock(account)
+        daily = (
+            Posting.objects.for_account(account).live()
+            .annotate(day=TruncDate('journal_entry__occurred_at'))
+            .values('day')
+            .annotate(total=Sum('amount'))
+            .order_by('day')
+        )
+        running = Decimal(account.opening_balance)
+        rows = []
+        for row in daily:
+            running += row['total']
+            rows.append(AccountDailyBalance(account=account, date=row['day'], closing_balance=running))
+
+        AccountDailyBalance.objects.for_account(account).delete()
+        AccountDailyBalance.objects.bulk_create(rows)
+        return len(rows)
+
+    @staticmethod
+    def ensure_built(account):
+        """Build the account's history if it has none yet."""
+        if not AccountDailyBalance.objects.for_account(account).exists():
+            BalanceHistoryService.rebuild(account)
+
+    @staticmethod
+    def build_missing(account_model, account_id):
+        """on_commit callback of apply_changes() for accounts without history."""
+        account = account_model._base_manager.filter(pk=account_id).first()
+        if account is not None:
+            BalanceHistoryService.ensure_built(account)
+
+    @staticmethod
+    def apply_changes(account, changes):
+        """
+        Apply balance changes to the account's history.
+
+        Must run with the account's balance row locked (as in
+        LedgerService._update_account_balance()).
+
+        Args:
+            account: BankAccount or CreditCard
+            changes: {date: delta} of the change; None when the dates are
+                unknown, which rebuilds the history after commit
+        """
+        rows = AccountDailyBalance.objects.for_account(account)
+        rebuild_later = partial(BalanceHistoryService.build_missing, type(account), account.pk)
+        if changes is None:
+            rows.delete()
+            transaction.on_commit(rebuild_later)
+            return
+        changes = {day: delta for day, delta in changes.items() if delta}
+        if not changes:
+            return
+
+        days = sorted(changes)
+        first_day, last_day = days[0], days[-1]
+        before = rows.filter(date__lt=first_day).order_by('-date').values_list('closing_balance', flat=True).first()
+        existing = list(rows.filter(date__gte=first_day, date__lte=last_day).order_by('date'))
+        if before is None and not existing and not rows.exists():
+            # Not built yet: build it from the committed postings instead
+            transaction.on_commit(rebuild_later)
+            return
+
+        # Walk the changed days and existing rows in date order; closing is
+        # the balance before the change on the latest day passed
+        closing = Decimal(account.opening_balance) if before is None else before
+        shift = Decimal('0.00')
+        to_create = []
+        index = 0
+        for day in days:
+            while index < len(existing) and existing[index].date < day:
+                closing = existing[index].closing_balance
+                existing[index].closing_balance = closing + shift
+                index += 1
+            shift += changes[day]
+            if index < len(existing) and existing[index].date == day:
+                closing = existing[index].closing_balance
+                existing[index].closing_balance = closing + shift
+                index += 1
+            else:
+                to_create.append(AccountDailyBalance(account=account, date=day, closing_balance=closing + shift))
+
+        AccountDailyBalance.objects.bulk_update(existing, ['closing_balance'])
+        AccountDailyBalance.objects.bulk_create(to_create)
+        rows.filter(date__gt=last_day).update(closing_balance=F('closing_balance') + shift)
+
+    @staticmethod
+    def get_series(account, start, end, points=None):
+        """
+        Closing balance of every day from start to end, or of evenly spaced days.
+
+        Args:
+            account: BankAccount or CreditCard
+            start, end: Date range (inclusive)
+            points: Maximum number of samples; None for one per day. The
+                last sample is always end.
+
+        Returns:
+            list: (date, Decimal closing balance) pairs in date order
+        """
+        BalanceHistoryService.ensure_built(account)
+        rows = AccountDailyBalance.objects.for_account(account)
+        before = rows.filter(date__lt=start).order_by('-date').values_list('closing_balance', flat=True).first()
+        balance = Decimal(account.opening_balance) if before is None else before
+        changes = list(
+            rows.filter(date__gte=start, date__lte=end).order_by('date').values_list('date', 'closing_balance')
+        )
+
+        days = (end - start).days + 1
+        step = 1 if not points or points >= days else -(-days // points)
+        series = []
+        index = 0
+        # Offsets, not a running date: stepping past end could overflow date.max
+        for offset in range((days - 1) % step, days, step):
+            day = start + timedelta(days=offset)
+            while index < len(changes) and changes[index][0] <= day:
+                balance = changes[index][1]
+                index += 1
+            series.append((day, balance))
+        return series
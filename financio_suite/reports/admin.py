@@ -1,3 +1,24 @@
 from django.contrib import admin
+from .models import UserFinancialSummary
 
-# Register your models here.
+
+@admin.register(UserFinancialSummary)
+class UserFinancialSummaryAdmin(admin.ModelAdmin):
+    """Admin interface for UserFinancialSummary model (read-only, maintained automatically)"""
+
+    list_display = [
+        'user',
+        'net_worth',
+        'total_banks',
+        'total_cards',
+        'total_fds',
+        'total_investments',
+        'mtd_month',
+        'version',
+        'updated_at'
+    ]
+    search_fields = ['user__username', 'user__email']
+    readonly_fields = [field.name for field in UserFinancialSummary._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
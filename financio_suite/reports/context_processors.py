@@ -0,0 +1,24 @@
+from django.utils.functional import SimpleLazyObject
+
+from .models import UserFinancialSummary
+
+
+def get_financial_summary(request):
+    """
+    Return the current user's UserFinancialSummary, read once per request.
+    """
+    if not hasattr(request, '_financial_summary'):
+        request._financial_summary = UserFinancialSummary.for_user(request.user)
+    return request._financial_summary
+
+
+def financial_summary(request):
+    """
+    Expose the user's summary row to templates for header stats and sidebar badges.
+
+    Lazy, so pages that never render the header or sidebar do not query it.
+    """
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return {}
+    return {'financial_summary': SimpleLazyObject(lambda: get_financial_summary(request))}
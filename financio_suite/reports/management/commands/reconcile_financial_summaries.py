@@ -0,0 +1,86 @@
+"""
+Management command to reconcile materialized financial summaries.
+
+UserFinancialSummary rows are maintained incrementally as data changes. Bulk
+updates (QuerySet.update(), raw SQL, manual fixes in the database) bypass
+that maintenance and can leave a summary out of date. This command
+recalculates every user's summary from the source tables, reports any
+drift and rewrites rows that differ.
+
+Usage:
+    # Preview drift without fixing it
+    python manage.py reconcile_financial_summaries --dry-run
+
+    # Fix drift for all users
+    python manage.py reconcile_financial_summaries
+
+    # Only one user
+    python manage.py reconcile_financial_summaries --user alice
+"""
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from reports.models import UserFinancialSummary
+from reports.services import ReportService
+
+
+class Command(BaseCommand):
+    help = 'Recalculate user financial summaries and fix any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show drift without changing anything',
+        )
+        parser.add_argument(
+            '--user',
+            help='Only reconcile this username',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - No changes will be saved'))
+
+        users = User.objects.order_by('id')
+        if options['user']:
+            users = users.filter(username=options['user'])
+            if not users.exists():
+                raise CommandError(f"User '{options['user']}' does not exist")
+
+        summaries = UserFinancialSummary.objects.in_bulk(
+            users.values_list('id', flat=True)
+        )
+
+        checked = drifted = 0
+        for user in users.iterator():
+            checked += 1
+            expected = ReportService.get_summary_values(user)
+            summary = summaries.get(user.id)
+
+            if summary is None:
+                differences = ['missing']
+            else:
+                differences = [
+                    f'{field}: {getattr(summary, field)} → {value}'
+                    for field, value in expected.items()
+                    if getattr(summary, field) != value
+                ]
+
+            if not differences:
+                continue
+
+            drifted += 1
+            self.stdout.write(f'  {user.username}:')
+            for difference in differences:
+                self.stdout.write(f'     {difference}')
+
+            if not dry_run:
+                UserFinancialSummary.refresh(user)
+                self.stdout.write(self.style.SUCCESS('     ✓ Fixed'))
+
+        self.stdout.write(
+            self.style.SUCCESS(f'\nChecked {checked} users, {drifted} with drift')
+        )
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserFinancialSummary',
+            fields=[
+                ('user', models.OneToOneField(help_text='Owner of the summary', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='financial_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('bank_balance', models.DecimalField(decimal_places=2, default=0, help_text='Sum of active bank account balances', max_digits=18)),
+                ('total_banks', models.PositiveIntegerField(default=0, help_text='Active bank accounts')),
+                ('total_cards', models.PositiveIntegerField(default=0, help_text='Active credit cards')),
+                ('fd_value', models.DecimalField(decimal_places=2, default=0, help_text='Sum of active FD maturity amounts', max_digits=18)),
+                ('total_fds', models.PositiveIntegerField(default=0, help_text='Active fixed deposits')),
+                ('investment_value', models.DecimalField(decimal_places=2, default=0, help_text='Current value of active investments', max_digits=18)),
+                ('total_investments', models.PositiveIntegerField(default=0, help_text='Active investments')),
+                ('total_categories', models.PositiveIntegerField(default=0, help_text='Categories')),
+                ('mtd_month', models.DateField(blank=True, help_text='First day of the month the MTD totals belong to', null=True)),
+                ('monthly_income', models.DecimalField(decimal_places=2, default=0, help_text='Income since the start of mtd_month', max_digits=18)),
+                ('monthly_expense', models.DecimalField(decimal_places=2, default=0, help_text='Expense since the start of mtd_month', max_digits=18)),
+                ('version', models.PositiveIntegerField(default=0, help_text='Incremented on every refresh')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp of last refresh')),
+            ],
+            options={
+                'verbose_name': 'User Financial Summary',
+                'verbose_name_plural': 'User Financial Summaries',
+                'db_table': 'user_financial_summaries',
+            },
+        ),
+    ]
@@ -1,3 +1,153 @@
-from django.db import models
+from django.db import models, transaction
+from django.contrib.auth.models import User
+from django.utils import timezone
 
-# Create your models here.
+
+class UserFinancialSummary(models.Model):
+    """
+    Materialized dashboard headline numbers, one row per user.
+
+    Kept up to date by reports.signals whenever balances, accounts, FDs,
+    investments, categories or transactions change, inside the same
+    database transaction as the change. Only the affected section is
+    recalculated. Drift can be detected and fixed with the
+    reconcile_financial_summaries management command.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='financial_summary',
+        help_text="Owner of the summary"
+    )
+
+    # Banks
+    bank_balance = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        default=0,
+        help_text="Sum of active bank account balances"
+    )
+    total_banks = models.PositiveIntegerField(default=0, help_text="Active bank accounts")
+
+    # Credit cards
+    total_cards = models.PositiveIntegerField(default=0, help_text="Active credit cards")
+
+    # Fixed deposits
+    fd_value = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        default=0,
+        help_text="Sum of active FD maturity amounts"
+    )
+    total_fds = models.PositiveIntegerField(default=0, help_text="Active fixed deposits")
+
+    # Investments
+    investment_value = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        default=0,
+        help_text="Current value of active investments"
+    )
+    total_investments = models.PositiveIntegerField(default=0, help_text="Active investments")
+
+    # Categories
+    total_categories = models.PositiveIntegerField(default=0, help_text="Categories")
+
+    # Month-to-date
+    mtd_month = models.DateField(
+        null=True,
+        blank=True,
+        help_text="First day of the month the MTD totals belong to"
+    )
+    monthly_income = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        default=0,
+        help_text="Income since the start of mtd_month"
+    )
+    monthly_expense = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        default=0,
+        help_text="Expense since the start of mtd_month"
+    )
+
+    version = models.PositiveIntegerField(
+        default=0,
+        help_text="Incremented on every refresh"
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text="Timestamp of last refresh"
+    )
+
+    class Meta:
+        db_table = 'user_financial_summaries'
+        verbose_name = 'User Financial Summary'
+        verbose_name_plural = 'User Financial Summaries'
+
+    def __str__(self):
+        return f"Summary for {self.user_id} (v{self.version})"
+
+    @property
+    def net_worth(self):
+        """Bank balances + FDs + investments (credit card debt is not subtracted)."""
+        return self.bank_balance + self.fd_value + self.investment_value
+
+    def as_stats(self):
+        """Dashboard stats dict, same shape as ReportService.get_dashboard_stats()."""
+        return {
+            'net_worth': self.net_worth,
+            'total_banks': self.total_banks,
+            'total_cards': self.total_cards,
+            'total_fds': self.total_fds,
+            'total_investments': self.total_investments,
+            'total_categories': self.total_categories,
+            'monthly_income': self.monthly_income,
+            'monthly_expense': self.monthly_expense,
+        }
+
+    @classmethod
+    def refresh(cls, user, sections=None):
+        """
+        Recalculate the given sections of a user's summary.
+
+        A missing row is created with every section calculated. The row is
+        locked for the update, so concurrent refreshes serialize.
+
+        Args:
+            user: User instance or user id
+            sections: Iterable of ReportService.SUMMARY_SECTIONS names (default: all)
+
+        Returns:
+            UserFinancialSummary: The refreshed row
+        """
+        from .services import ReportService
+
+        user_id = getattr(user, 'pk', user)
+        with transaction.atomic():
+            summary, created = cls.objects.select_for_update().get_or_create(user_id=user_id)
+            values = ReportService.get_summary_values(user_id, None if created else sections)
+            for field, value in values.items():
+                setattr(summary, field, value)
+            summary.version += 1
+            summary.save()
+        return summary
+
+    @classmethod
+    def for_user(cls, user):
+        """
+        Read a user's summary with a single primary-key lookup.
+
+        Builds the row on first access and rolls the MTD totals over when
+        the stored month is no longer the current one.
+        """
+        summary = cls.objects.filter(pk=user.pk).first()
+        if summary is None:
+            return cls.refresh(user)
+        now = timezone.now()
+        if summary.mtd_month is None or (summary.mtd_month.year, summary.mtd_month.month) != (now.year, now.month):
+            return cls.refresh(user, sections=['monthly'])
+        return summary
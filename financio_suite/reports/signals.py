@@ -0,0 +1,59 @@
+"""
+Keep UserFinancialSummary in step with the tables it summarizes.
+
+Each receiver recalculates only the section of the summary its model feeds,
+synchronously, so the refresh commits or rolls back together with the change
+that triggered it. Deletes cascading from a User are ignored since the
+summary row is deleted along with the user.
+"""
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+
+from accounts.models import BankAccount, BankAccountBalance
+from categories.models import Category
+from creditcards.models import CreditCard
+from fds.models import FixedDeposit
+from investments.models import Investment, InvestmentHolding
+from transactions.models import Transaction
+
+from .models import UserFinancialSummary
+
+
+def _user_id(instance):
+    if isinstance(instance, BankAccountBalance):
+        return instance.account.user_id
+    if isinstance(instance, InvestmentHolding):
+        return instance.investment.user_id
+    return instance.user_id
+
+
+# Model -> summary section it feeds
+SUMMARY_SOURCES = {
+    BankAccount: 'banks',
+    BankAccountBalance: 'banks',
+    CreditCard: 'cards',
+    FixedDeposit: 'fds',
+    Investment: 'investments',
+    # Not InvestmentTransaction: its post_save runs before the holding is updated
+    InvestmentHolding: 'investments',
+    Category: 'categories',
+    Transaction: 'monthly',
+}
+
+
+def refresh_summary(sender, instance, **kwargs):
+    """Recalculate the summary section fed by the saved/deleted instance."""
+    if kwargs.get('raw'):
+        return
+    if isinstance(kwargs.get('origin'), User):
+        return
+    if isinstance(instance, InvestmentHolding) and isinstance(kwargs.get('origin'), Investment):
+        # The investment's own post_delete refreshes the section
+        return
+    UserFinancialSummary.refresh(_user_id(instance), sections=[SUMMARY_SOURCES[sender]])
+
+
+def connect_signals():
+    for model in SUMMARY_SOURCES:
+        post_save.connect(refresh_summary, sender=model, dispatch_uid=f'summary_save_{model.__name__}')
+        post_delete.connect(refresh_summary, sender=model, dispatch_uid=f'summary_delete_{model.__name__}')
@@ -0,0 +1,12 @@
+from django.urls import path
+from . import views
+
+app_name = 'reports'
+
+urlpatterns = [
+    path('api/cashflow/', views.cashflow_api, name='cashflow_api'),
+    path('api/expense-breakdown/', views.expense_breakdown_api, name='expense_breakdown_api'),
+    path('api/category-rollup/', views.category_rollup_api, name='category_rollup_api'),
+    path('api/net-worth-trend/', views.net_worth_trend_api, name='net_worth_trend_api'),
+    path('api/balance-history/', views.balance_history_api, name='balance_history_api'),
+]
@@ -1,3 +1,198 @@
-from django.shortcuts import render
+import hashlib
+from datetime import date, timedelta
 
-# Create your views here.
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET
+
+from accounts.models import BankAccount
+from categories.models import Category
+from creditcards.models import CreditCard
+from ledger.services import BalanceHistoryService
+
+from .services import DEFAULT_CHART_COLORS, ReportService
+
+# Account models selectable by the "id|model" values of the account dropdowns
+HISTORY_ACCOUNT_MODELS = {
+    'bankaccount': BankAccount,
+    'creditcard': CreditCard,
+}
+
+# Longest range one balance history request may cover (ten years)
+BALANCE_HISTORY_MAX_DAYS = 3653
+
+
+def _report_etag(request, *args, **kwargs):
+    """
+    Weak ETag for a report endpoint.
+
+    Combines the user's data version with the full request path so each
+    endpoint (and each set of query parameters) gets its own validator.
+    """
+    if not request.user.is_authenticated:
+        return None
+    version = ReportService.get_data_version(request.user)
+    digest = hashlib.md5(f'{version}:{request.get_full_path()}'.encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _months_param(request, default=6):
+    """Read ?months=N, clamped to 1..24."""
+    try:
+        months = int(request.GET.get('months', default))
+    except (TypeError, ValueError):
+        months = default
+    return max(1, min(months, 24))
+
+
+def _find_node(nodes, category_id):
+    """The node of category_id in a get_category_rollup() tree, or None."""
+    for node in nodes:
+        if node['id'] == category_id:
+            return node
+        found = _find_node(node['children'], category_id)
+        if found is not None:
+            return found
+    return None
+
+
+def report_endpoint(view_func):
+    """
+    Decorator stack shared by the chart JSON endpoints.
+
+    Responses are private to the user and must be revalidated on every use;
+    unchanged data is answered with 304 Not Modified based on the ETag.
+    """
+    view_func = condition(etag_func=_report_etag)(view_func)
+    view_func = cache_control(private=True, no_cache=True)(view_func)
+    view_func = require_GET(view_func)
+    return login_required(view_func)
+
+
+@report_endpoint
+def cashflow_api(request):
+    """Monthly income vs expense for the dashboard bar chart."""
+    data = ReportService.get_monthly_cashflow(request.user, months_count=_months_param(request))
+    return JsonResponse(data)
+
+
+@report_endpoint
+def expense_breakdown_api(request):
+    """Current month expenses by category for the dashboard doughnut chart."""
+    return JsonResponse(ReportService.get_expense_breakdown(request.user))
+
+
+@report_endpoint
+def category_rollup_api(request):
+    """
+    Current month totals per category, rolled up through the hierarchy, for drill-down charts.
+
+    Query parameters:
+        type: 'expense' (default) or 'income'
+        category: Id of the category to drill into; its children are
+            returned (default: the top-level categories)
+
+    Every slice carries the category id and whether it has children to
+    drill into. Amounts booked on the category itself, next to its
+    children, get their own slice, as does uncategorized spending at the
+    top level. parent_id points one level up (None at the top level).
+    """
+    transaction_type = request.GET.get('type', 'expense')
+    if transaction_type not in ('expense', 'income'):
+        return JsonResponse({'error': "type must be 'expense' or 'income'"}, status=400)
+    category_id = request.GET.get('category', '')
+    if category_id and not category_id.isdigit():
+        return JsonResponse({'error': 'category must be a category id'}, status=400)
+
+    rollup = ReportService.get_category_rollup(request.user, transaction_type=transaction_type)
+    category = None
+    nodes = rollup['tree']
+    if category_id:
+        category = get_object_or_404(Category, pk=int(category_id), user=request.user)
+        # A category without transactions this month has no node
+        node = _find_node(nodes, category.pk) or {'children': [], 'own_total': 0.0}
+        nodes = node['children']
+
+    slices = [
+        {'id': child['id'], 'label': child['name'], 'total': child['total'],
+         'color': child['color'], 'drillable': bool(child['children'])}
+        for child in nodes
+    ]
+    if category is None and rollup['uncategorized']:
+        slices.append({'id': None, 'label': 'Uncategorized', 'total': rollup['uncategorized'],
+                       'color': None, 'drillable': False})
+    elif category is not None and node['own_total']:
+        slices.append({'id': None, 'label': f'{category.name.title()} (other)', 'total': node['own_total'],
+                       'color': category.color, 'drillable': False})
+
+    return JsonResponse({
+        'category': {'id': category.pk, 'name': category.name.title()} if category else None,
+        'parent_id': category.parent_id if category else None,
+        'ids': [item['id'] for item in slices],
+        'labels': [item['label'] for item in slices],
+        'data': [item['total'] for item in slices],
+        'colors': [
+            item['color'] or DEFAULT_CHART_COLORS[i % len(DEFAULT_CHART_COLORS)]
+            for i, item in enumerate(slices)
+        ],
+        'drillable': [item['drillable'] for item in slices],
+        'total': sum(item['total'] for item in slices),
+    })
+
+
+@report_endpoint
+def net_worth_trend_api(request):
+    """Month-end net worth for the dashboard line chart."""
+    data = ReportService.get_net_worth_trend(request.user, months_count=_months_param(request))
+    return JsonResponse(data)
+
+
+@report_endpoint
+def balance_history_api(request):
+    """
+    Daily closing balance of one account over a date range, for balance charts.
+
+    Query parameters:
+        account: "id|bankaccount" or "id|creditcard" (archived accounts too)
+        start, end: ISO dates (default: the year up to today), at most
+            BALANCE_HISTORY_MAX_DAYS days apart
+        points: Maximum number of samples, 2..1000 (default 365); longer
+            ranges are downsampled to evenly spaced days ending on end
+
+    Served from the pre-computed account_daily_balances rows: a three year
+    range reads at most one row per day with activity.
+    """
+    account_id, _, model_name = request.GET.get('account', '').partition('|')
+    model = HISTORY_ACCOUNT_MODELS.get(model_name.lower())
+    if model is None or not account_id.isdigit():
+        return JsonResponse({'error': "account must be 'id|bankaccount' or 'id|creditcard'"}, status=400)
+    account = get_object_or_404(model, pk=int(account_id), user=request.user)
+
+    try:
+        end = date.fromisoformat(request.GET['end']) if request.GET.get('end') else date.today()
+        if request.GET.get('start'):
+            start = date.fromisoformat(request.GET['start'])
+        else:
+            # Stops at date.min instead of overflowing
+            start = end - timedelta(days=min(364, (end - date.min).days))
+    except ValueError:
+        return JsonResponse({'error': 'start and end must be YYYY-MM-DD dates'}, status=400)
+    if start > end:
+        return JsonResponse({'error': 'start must not be after end'}, status=400)
+    if (end - start).days >= BALANCE_HISTORY_MAX_DAYS:
+        return JsonResponse({'error': f'The range may span at most {BALANCE_HISTORY_MAX_DAYS} days'}, status=400)
+    try:
+        points = int(request.GET.get('points', 365))
+    except ValueError:
+        points = 365
+    points = max(2, min(points, 1000))
+
+    series = BalanceHistoryService.get_series(account, start, end, points=points)
+    return JsonResponse({
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'labels': [day.isoformat() for day, _ in series],
+        'data': [float(balance) for _, balance in series],
+    })
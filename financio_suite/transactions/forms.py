@@ -4,6 +4,8 @@ from django.utils import timezone
 from .models import Transaction
 from categories.models import Category
 from accounts.models import BankAccount
+from core.choices import get_category_choices, get_debit_card_choices, get_form_choices
+from core.fingerprint import transaction_fingerprint
 from core.utils import get_account_choices_for_form, get_account_from_compound_value
 
 
@@ -70,6 +72,8 @@ class TransactionForm(forms.ModelForm):
     - Credit cards: No balance validation (can go more negative)
     - Category type must match transaction type (income/expense)
     - Amount must be > 0
+    - Exact duplicates (same account, date, amount and purpose) are rejected
+      unless allow_duplicate is ticked
     """
 
     # Custom fields for better UX
@@ -81,6 +85,15 @@ class TransactionForm(forms.ModelForm):
         help_text="Transaction date"
     )
 
+    # Shown only after a duplicate was detected
+    allow_duplicate = forms.BooleanField(
+        required=False,
+        widget=forms.CheckboxInput(attrs={
+            'class': 'h-4 w-4 rounded border-gray-300 dark:border-gray-600 text-primary focus:ring-primary'
+        }),
+        help_text="Save even though an identical transaction exists"
+    )
+
     class Meta:
         model = Transaction
         fields = ['transaction_type', 'amount', 'method_type', 'debit_card', 'purpose', 'category']
@@ -113,6 +126,8 @@ class TransactionForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         self.user = kwargs.pop('user', None)
         super().__init__(*args, **kwargs)
+        # Existing transaction this one duplicates (set by clean())
+        self.duplicate_of = None
 
         # Filter payment method choices
         filtered_methods = [
@@ -133,7 +148,11 @@ class TransactionForm(forms.ModelForm):
             self.fields['debit_card'].queryset = DebitCard.objects.filter(
                 user=self.user,
                 status='active'
-            ).select_related('bank_account')
+            )
+            # Rendered from the cached choices; the queryset only validates the submitted card
+            self.fields['debit_card'].choices = (
+                [('', self.fields['debit_card'].empty_label)] + get_debit_card_choices(self.user)
+            )
 
         # Add custom account field with emoji indicators
         account_choices = [('', 'Choose an account')]  # Empty choice first
@@ -156,9 +175,12 @@ class TransactionForm(forms.ModelForm):
                 is_active=True,
                 type__in=['income', 'expense']  # Only show income and expense categories
             ).order_by('type', 'name')
+            category_choices = get_category_choices(self.user)
 
             # Build category types mapping for custom widget
-            category_types = {cat.id: cat.type for cat in categories}
+            category_types = {
+                category['id']: category['type'] for category in get_form_choices(self.user)['categories']
+            }
 
             # Replace widget with custom widget that includes data-type
             self.fields['category'].widget = CategorySelectWidget(
@@ -171,6 +193,8 @@ class TransactionForm(forms.ModelForm):
             # Now set the queryset and empty_label AFTER setting the widget
             self.fields['category'].queryset = categories
             self.fields['category'].empty_label = "Choose a category (optional)"
+            # Rendered from the cached choices; the queryset only validates the submitted category
+            self.fields['category'].choices = [('', self.fields['category'].empty_label)] + category_choices
 
         # Set initial date/time if editing
         if self.instance and self.instance.pk:
@@ -239,4 +263,24 @@ class TransactionForm(forms.ModelForm):
                         f"Please reduce the amount or use a different account."
                     )
 
+        # Reject exact duplicates with one lookup on the (user, fingerprint) index
+        purpose = cleaned_data.get('purpose')
+        if (self.user and account and date and transaction_type and amount and purpose
+                and not cleaned_data.get('allow_duplicate')):
+            fingerprint = transaction_fingerprint(
+                cleaned_data['account_content_type'].id, account.pk, date, transaction_type, amount, purpose,
+            )
+            duplicates = Transaction.objects.filter(
+                user=self.user, fingerprint=fingerprint, deleted_at__isnull=True
+            )
+            if self.instance.pk:
+                duplicates = duplicates.exclude(pk=self.instance.pk)
+            self.duplicate_of = duplicates.first()
+            if self.duplicate_of:
+                self.add_error(None,
+                    f"An identical transaction (₹{amount:,.2f}, \"{purpose[:50]}\") already exists "
+                    f"on {date:%d %b %Y} for {account.name}. "
+                    f"Tick \"Save anyway\" if this is a separate transaction."
+                )
+
         return cleaned_data
@@ -0,0 +1,112 @@
+"""
+Management command to benchmark transaction search on a synthetic dataset.
+
+Generates a throwaway user with N synthetic transactions (default one
+million) inside a database transaction, times the legacy ICONTAINS search
+against the ranked full-text/trigram search used by the transaction list,
+and rolls everything back at the end. Nothing is left in the database.
+
+Usage:
+    python manage.py benchmark_search
+
+    # Smaller dataset, different term, more runs per query
+    python manage.py benchmark_search --rows 200000 --term swigy --runs 10
+"""
+import statistics
+import time
+from datetime import datetime
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from accounts.models import BankAccount
+from core.search import apply_text_search
+from transactions.models import Transaction
+
+
+# Purposes are drawn from this vocabulary plus a running number
+VOCABULARY = [
+    'swiggy dinner', 'zomato lunch', 'big basket groceries', 'uber ride', 'ola cab',
+    'electricity bill', 'mobile recharge', 'netflix subscription', 'rent payment',
+    'salary credit', 'petrol pump', 'amazon order', 'flipkart order', 'pharmacy',
+    'movie tickets', 'gym membership', 'insurance premium', 'mutual fund sip',
+    'atm withdrawal', 'restaurant bill',
+]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark transaction search on a synthetic dataset (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help='Synthetic transactions to generate')
+        parser.add_argument('--term', default='swiggy', help='Search term to benchmark')
+        parser.add_argument('--runs', type=int, default=5, help='Timed runs per query')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        term = options['term']
+
+        with transaction.atomic():
+            user = User.objects.create_user(username=f'benchmark_{int(time.time())}')
+            account = BankAccount.objects.create(user=user, name='Benchmark Bank', opening_balance=0)
+            bank_ct = ContentType.objects.get_for_model(BankAccount)
+
+            self.stdout.write(f'Generating {rows:,} transactions...')
+            started = time.perf_counter()
+            self._generate(user.id, bank_ct.id, account.id, rows)
+            self.stdout.write(f'  done in {time.perf_counter() - started:.1f}s\n')
+
+            base = Transaction.objects.filter(user=user, deleted_at__isnull=True)
+            legacy = base.filter(
+                Q(purpose__icontains=term) | Q(category__name__icontains=term)
+            ).order_by('-datetime_ist')
+            ranked = apply_text_search(base, term, 'purpose').order_by('-search_rank', '-id')
+
+            self._time('Legacy ICONTAINS (first page)', legacy, options['runs'])
+            self._time('Full-text + trigram, ranked (first page)', ranked, options['runs'])
+
+            self.stdout.write('\nQuery plan for ranked search:')
+            self.stdout.write(ranked[:20].explain(analyze=True))
+
+            # Discard the synthetic data
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('\n✓ Benchmark finished, synthetic data rolled back'))
+
+    def _generate(self, user_id, content_type_id, account_id, rows):
+        """Insert rows with a single INSERT ... SELECT over generate_series."""
+        now = datetime.now()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {Transaction._meta.db_table}
+                    (user_id, datetime_ist, transaction_type, amount,
+                     account_content_type_id, account_object_id, method_type,
+                     purpose, fingerprint, created_at, updated_at)
+                SELECT %s,
+                       %s - (i || ' minutes')::interval,
+                       CASE WHEN i %% 10 = 0 THEN 'income' ELSE 'expense' END,
+                       (i %% 5000) + 1,
+                       %s, %s, 'upi',
+                       (%s::text[])[1 + i %% %s] || ' ' || i,
+                       md5(i::text),
+                       %s, %s
+                FROM generate_series(1, %s) AS i
+                """,
+                [user_id, now, content_type_id, account_id, VOCABULARY, len(VOCABULARY), now, now, rows],
+            )
+            cursor.execute(f'ANALYZE {Transaction._meta.db_table}')
+
+    def _time(self, label, queryset, runs):
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            list(queryset[:20])
+            timings.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(
+            f'{label}: median {statistics.median(timings):.1f} ms '
+            f'(min {min(timings):.1f} ms, max {max(timings):.1f} ms)'
+        )
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-19 15:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_debitcard'),
+        ('categories', '0002_category_description_category_icon'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('ledger', '0001_initial'),
+        ('transactions', '0005_alter_transaction_method_type'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='transaction',
+            name='idx_txn_user_time',
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['user', 'datetime_ist', 'id'], name='idx_txn_user_time_id'),
+        ),
+    ]
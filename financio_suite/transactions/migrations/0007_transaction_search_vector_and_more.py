@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-19 15:05
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_debitcard'),
+        ('categories', '0002_category_description_category_icon'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('ledger', '0001_initial'),
+        ('transactions', '0006_remove_transaction_idx_txn_user_time_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='transaction',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('purpose', config='simple'), help_text='tsvector of purpose for full-text search', output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='idx_txn_search_vector'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass('purpose', name='gin_trgm_ops'), name='idx_txn_purpose_trgm'),
+        ),
+    ]
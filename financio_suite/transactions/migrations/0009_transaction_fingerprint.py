@@ -0,0 +1,79 @@
+# Generated by Django 5.2.8 on 2026-10-19 15:24
+
+import hashlib
+import re
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Frozen copy of core.fingerprint at the time of this migration
+FINGERPRINT_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def normalize_text(text):
+    return ' '.join(FINGERPRINT_TOKEN_RE.findall((text or '').lower()))
+
+
+def _digest(*parts):
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _day(occurred_at):
+    return occurred_at.date().isoformat() if hasattr(occurred_at, 'date') else occurred_at.isoformat()
+
+
+def _money(amount):
+    return Decimal(amount).quantize(Decimal('0.01'))
+
+
+def transaction_fingerprint(account_content_type_id, account_object_id, occurred_at,
+                            transaction_type, amount, purpose):
+    signed = _money(amount) if transaction_type == 'income' else -_money(amount)
+    return _digest(
+        'txn', account_content_type_id, account_object_id, _day(occurred_at), signed, normalize_text(purpose),
+    )
+
+
+def backfill_fingerprints(apps, schema_editor):
+    """Fingerprint existing transactions in batches."""
+    Transaction = apps.get_model('transactions', 'Transaction')
+    batch = []
+    for txn in Transaction.objects.only(
+        'account_content_type_id', 'account_object_id', 'datetime_ist', 'transaction_type', 'amount', 'purpose',
+    ).iterator(chunk_size=2000):
+        txn.fingerprint = transaction_fingerprint(
+            txn.account_content_type_id, txn.account_object_id, txn.datetime_ist,
+            txn.transaction_type, txn.amount, txn.purpose,
+        )
+        batch.append(txn)
+        if len(batch) >= 2000:
+            Transaction.objects.bulk_update(batch, ['fingerprint'])
+            batch = []
+    if batch:
+        Transaction.objects.bulk_update(batch, ['fingerprint'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_debitcard'),
+        ('categories', '0002_category_description_category_icon'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('ledger', '0001_initial'),
+        ('transactions', '0008_remove_transaction_idx_txn_user_time_id_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='fingerprint',
+            field=models.CharField(blank=True, default='', editable=False, help_text='SHA-1 of account, date, signed amount and normalized purpose', max_length=40),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['user', 'fingerprint'], name='idx_txn_live_fingerprint'),
+        ),
+    ]
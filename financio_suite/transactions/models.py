@@ -1,9 +1,13 @@
 from django.db import models
+from django.db.models import Q
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
 from categories.models import Category
+from core.fingerprint import transaction_fingerprint
 from ledger.models import JournalEntry
 
 
@@ -134,16 +138,58 @@ class Transaction(models.Model):
         help_text="Soft delete timestamp"
     )
 
+    # Full-text search (maintained by PostgreSQL)
+    search_vector = models.GeneratedField(
+        expression=SearchVector('purpose', config='simple'),
+        output_field=SearchVectorField(),
+        db_persist=True,
+        help_text="tsvector of purpose for full-text search"
+    )
+
+    # Duplicate detection (see core.fingerprint)
+    fingerprint = models.CharField(
+        max_length=40,
+        blank=True,
+        default='',
+        editable=False,
+        help_text="SHA-1 of account, date, signed amount and normalized purpose"
+    )
+
+    # Columns that must match for rows to be near-duplicate candidates
+    NEAR_DUPLICATE_FIELDS = ['account_content_type', 'account_object_id', 'transaction_type', 'amount']
+
     class Meta:
         db_table = 'transactions'
         verbose_name = 'Transaction'
         verbose_name_plural = 'Transactions'
         ordering = ['-datetime_ist']
         indexes = [
-            models.Index(fields=['user', 'datetime_ist'], name='idx_txn_user_time'),
+            # Live rows only (lists, exports and reports all filter deleted_at IS NULL);
+            # (datetime_ist, id) is the keyset pagination key
+            models.Index(
+                fields=['user', 'datetime_ist', 'id'], name='idx_txn_live_user_time',
+                condition=Q(deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=['user', 'category', 'datetime_ist', 'id'], name='idx_txn_live_user_cat_time',
+                condition=Q(deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=['user', 'account_content_type', 'account_object_id', 'datetime_ist', 'id'],
+                name='idx_txn_live_user_acct_time',
+                condition=Q(deleted_at__isnull=True),
+            ),
+            # Exact-duplicate lookups by content fingerprint
+            models.Index(
+                fields=['user', 'fingerprint'], name='idx_txn_live_fingerprint',
+                condition=Q(deleted_at__isnull=True),
+            ),
             models.Index(fields=['user', 'transaction_type'], name='idx_txn_user_type'),
             models.Index(fields=['category'], name='idx_txn_category'),
             models.Index(fields=['account_content_type', 'account_object_id'], name='idx_txn_account'),
+            # Search: full-text on search_vector, trigram for substring/fuzzy matches
+            GinIndex(fields=['search_vector'], name='idx_txn_search_vector'),
+            GinIndex(OpClass('purpose', name='gin_trgm_ops'), name='idx_txn_purpose_trgm'),
         ]
 
     def __str__(self):
@@ -173,8 +219,18 @@ class Transaction(models.Model):
                     'account': 'Account must belong to the transaction owner'
                 })
 
+    def compute_fingerprint(self):
+        """Content fingerprint of this transaction (core.fingerprint.transaction_fingerprint)"""
+        if self.amount is None or self.datetime_ist is None:
+            return ''
+        return transaction_fingerprint(
+            self.account_content_type_id, self.account_object_id, self.datetime_ist,
+            self.transaction_type, self.amount, self.purpose,
+        )
+
     def save(self, skip_validation=False, *args, **kwargs):
-        """Override save to run validation"""
+        """Override save to run validation and refresh the fingerprint"""
+        self.fingerprint = self.compute_fingerprint()
         if not skip_validation:
             self.full_clean()
         super().save(*args, **kwargs)
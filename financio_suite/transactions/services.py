@@ -0,0 +1,259 @@
+from decimal import Decimal
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Max, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from accounts.models import BankAccount
+from core.utils import resolve_generic_accounts
+from ledger.models import ControlAccount, Posting
+from ledger.services import LedgerService
+from reports.models import UserFinancialSummary
+
+from .models import Transaction
+
+
+class TransactionService:
+    """
+    Bulk edit and delete of a user's transactions.
+
+    Each operation runs in one database transaction. Balance changes are
+    summed per account from the ledger postings with one aggregate query and
+    applied with a single LedgerService._update_account_balance() call per
+    account, however many transactions are selected.
+    """
+
+    # Fields bulk_update() can change
+    BULK_FIELDS = ('category', 'account', 'method_type')
+
+    @staticmethod
+    def _lock(user, transaction_ids):
+        """Lock the user's live transactions among transaction_ids, in id order."""
+        return list(
+            Transaction.objects.select_for_update()
+            .filter(user=user, pk__in=transaction_ids, deleted_at__isnull=True)
+            .order_by('pk')
+        )
+
+    @staticmethod
+    def _account_postings(transactions):
+        """Postings of the transactions' journal entries on user accounts (not control accounts)."""
+        return Posting.objects.filter(
+            journal_entry_id__in=[txn.journal_entry_id for txn in transactions if txn.journal_entry_id]
+        ).exclude(account_content_type=ContentType.objects.get_for_model(ControlAccount))
+
+    @staticmethod
+    def _posting_totals(transactions):
+        """
+        Net posting amount per account, with its breakdown per day.
+
+        Returns:
+            dict: {(content_type_id, object_id): (total, last_posting_id, first_day, {day: total})}
+        """
+        rows = (
+            TransactionService._account_postings(transactions)
+            .order_by()
+            .values('account_content_type_id', 'account_object_id', day=TruncDate('journal_entry__occurred_at'))
+            .annotate(total=Sum('amount'), last_posting_id=Max('id'))
+        )
+        totals = {}
+        for row in rows:
+            key = (row['account_content_type_id'], row['account_object_id'])
+            total, last_posting_id, first_day, daily = totals.get(key, (Decimal('0.00'), 0, row['day'], {}))
+            daily[row['day']] = row['total']
+            totals[key] = (
+                total + row['total'],
+                max(last_posting_id, row['last_posting_id']),
+                min(first_day, row['day']),
+                daily,
+            )
+        return totals
+
+    @staticmethod
+    def _apply_deltas(deltas):
+        """
+        Apply {(content_type_id, object_id): (delta, posting_id, first_day, {day: delta})}
+        with one update per account.
+        """
+        for (content_type_id, object_id), (delta, posting_id, first_day, daily) in sorted(deltas.items()):
+            if not delta and not any(daily.values()):
+                continue
+            account_model = ContentType.objects.get_for_id(content_type_id).model_class()
+            account = account_model._base_manager.get(pk=object_id)
+            LedgerService._update_account_balance(account, delta, posting_id, first_day, daily)
+
+    @staticmethod
+    @transaction.atomic
+    def bulk_delete(user, transaction_ids):
+        """
+        Soft delete many transactions and reverse their effect on account balances.
+
+        Args:
+            user: Owner of the transactions
+            transaction_ids: Ids to delete; ids of other users or already
+                deleted transactions are ignored
+
+        Returns:
+            list: The deleted Transaction instances
+        """
+        transactions = TransactionService._lock(user, transaction_ids)
+        if not transactions:
+            return []
+
+        TransactionService._apply_deltas({
+            key: (-total, last_posting_id, first_day, {day: -amount for day, amount in daily.items()})
+            for key, (total, last_posting_id, first_day, daily) in TransactionService._posting_totals(transactions).items()
+        })
+
+        now = timezone.now()
+        Transaction.objects.filter(pk__in=[txn.pk for txn in transactions]).update(
+            deleted_at=now, updated_at=now
+        )
+        for txn in transactions:
+            txn.deleted_at = now
+
+        # QuerySet.update() sends no post_save signals
+        UserFinancialSummary.refresh(user.pk, sections=['monthly'])
+        return transactions
+
+    @staticmethod
+    @transaction.atomic
+    def bulk_update(user, transaction_ids, **changes):
+        """
+        Set the category, account and/or payment method of many transactions.
+
+        Moving transactions to another account re-points their ledger
+        postings and moves the net amount between the two balances.
+
+        Args:
+            user: Owner of the transactions
+            transaction_ids: Ids to update; ids of other users or deleted
+                transactions are ignored
+            **changes: Any of category (Category or None), account
+                (BankAccount or CreditCard) and method_type
+
+        Returns:
+            list: (transaction, changes) pairs for the transactions that
+                changed, with changes in track_model_changes() format
+
+        Raises:
+            ValidationError: If a category doesn't match a transaction type,
+                the account belongs to another user, or a bank account would
+                be overdrawn
+        """
+        unknown = set(changes) - set(TransactionService.BULK_FIELDS)
+        if unknown:
+            raise ValueError(f"Unsupported bulk fields: {', '.join(sorted(unknown))}")
+
+        transactions = TransactionService._lock(user, transaction_ids)
+        if not transactions or not changes:
+            return []
+        resolve_generic_accounts(transactions)
+
+        if changes.get('category') is not None:
+            category = changes['category']
+            if category.user_id != user.pk:
+                raise ValidationError("Category not found.")
+            mismatched = sum(1 for txn in transactions if txn.transaction_type != category.type)
+            if mismatched:
+                raise ValidationError(
+                    f"'{category.name.title()}' is an {category.type} category but {mismatched} "
+                    f"of the selected transactions are not {category.type} transactions."
+                )
+
+        if 'method_type' in changes:
+            valid_methods = dict(Transaction.METHOD_TYPE_CHOICES)
+            if changes['method_type'] not in valid_methods:
+                raise ValidationError("Invalid payment method.")
+
+        if 'account' in changes:
+            TransactionService._move_to_account(user, transactions, changes['account'])
+
+        now = timezone.now()
+        results = []
+        for txn in transactions:
+            txn_changes = {}
+            for field, value in changes.items():
+                before = getattr(txn, field)
+                if before == value:
+                    continue
+                txn_changes[field] = {
+                    'before': str(before) if before is not None else None,
+                    'after': str(value) if value is not None else None,
+                }
+                setattr(txn, field, value)
+            if txn_changes:
+                txn.fingerprint = txn.compute_fingerprint()
+                txn.updated_at = now
+                results.append((txn, txn_changes))
+
+        update_fields = ['updated_at', 'fingerprint']
+        for field in changes:
+            if field == 'account':
+                update_fields += ['account_content_type', 'account_object_id']
+            else:
+                update_fields.append(field)
+        Transaction.objects.bulk_update([txn for txn, _ in results], update_fields, batch_size=500)
+
+        return results
+
+    @staticmethod
+    def _move_to_account(user, transactions, account):
+        """Re-point the postings of transactions to account and move the balances."""
+        if getattr(account, 'user_id', None) != user.pk:
+            raise ValidationError("Account not found.")
+
+        target = (ContentType.objects.get_for_model(account).pk, account.pk)
+        moving = [
+            txn for txn in transactions
+            if (txn.account_content_type_id, txn.account_object_id) != target
+        ]
+        totals = TransactionService._posting_totals(moving)
+        if not totals:
+            return
+
+        incoming = sum((total for total, _, _, _ in totals.values()), Decimal('0.00'))
+        last_posting_id = max(posting_id for _, posting_id, _, _ in totals.values())
+        first_day = min(day for _, _, day, _ in totals.values())
+        incoming_daily = {}
+        for _, _, _, daily in totals.values():
+            for day, amount in daily.items():
+                incoming_daily[day] = incoming_daily.get(day, Decimal('0.00')) + amount
+
+        # Same rule as the transaction form: bank accounts cannot go below zero
+        if account.__class__.__name__ == 'BankAccount':
+            current_balance = account.get_current_balance() or Decimal('0.00')
+            if current_balance + incoming < 0:
+                raise ValidationError(
+                    f"Insufficient balance in {account.name}. "
+                    f"Current balance: ₹{current_balance:,.2f}, "
+                    f"net change: ₹{incoming:,.2f}."
+                )
+        # Moving income off a bank account takes it out of that account too
+        bank_type_id = ContentType.objects.get_for_model(BankAccount).pk
+        outgoing = {
+            object_id: total for (content_type_id, object_id), (total, _, _, _) in totals.items()
+            if content_type_id == bank_type_id and total > 0
+        }
+        if outgoing:
+            for source in BankAccount.objects.filter(user=user, pk__in=outgoing).with_current_balance():
+                if source.current_balance - outgoing[source.pk] < 0:
+                    raise ValidationError(
+                        f"Insufficient balance in {source.name}. "
+                        f"Current balance: ₹{source.current_balance:,.2f}, "
+                        f"net change: ₹{-outgoing[source.pk]:,.2f}."
+                    )
+
+        TransactionService._account_postings(moving).update(
+            account_content_type_id=target[0], account_object_id=target[1]
+        )
+
+        deltas = {
+            key: (-total, posting_id, day, {d: -amount for d, amount in daily.items()})
+            for key, (total, posting_id, day, daily) in totals.items()
+        }
+        deltas[target] = (incoming, last_posting_id, first_day, incoming_daily)
+        TransactionService._apply_deltas(deltas)
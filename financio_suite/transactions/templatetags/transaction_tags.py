@@ -1,82 +1,48 @@
 from django import template
 from django.contrib.contenttypes.models import ContentType
+from core.utils import format_account_display
 
 register = template.Library()
 
 
-@register.filter
-def get_account(transaction):
-    """Get the account name with emoji indicator from a transaction's GenericForeignKey."""
-    if transaction.account_content_type and transaction.account_object_id:
+def _account_display(obj, field):
+    """
+    Display name with emoji for a GenericForeignKey account field.
+
+    Uses the `<field>_display` attribute attached by
+    core.utils.resolve_generic_accounts() when present; otherwise falls back
+    to looking the account up for this row.
+    """
+    display = getattr(obj, f'{field}_display', None)
+    if display is not None:
+        return display
+
+    content_type = getattr(obj, f'{field}_content_type')
+    object_id = getattr(obj, f'{field}_object_id')
+    if content_type and object_id:
         try:
-            account = transaction.account_content_type.get_object_for_this_type(
-                pk=transaction.account_object_id
-            )
-            account_name = account.name if hasattr(account, 'name') else str(account)
-
-            # Add emoji indicator based on account type
-            account_type = account.__class__.__name__
-            if account_type == 'BankAccount':
-                emoji = '🏦'
-            elif account_type == 'CreditCard':
-                emoji = '💳'
-            else:
-                emoji = ''
-
-            return f"{emoji} {account_name}" if emoji else account_name
+            return format_account_display(content_type.get_object_for_this_type(pk=object_id))
         except Exception:
             return "Unknown"
     return "Unknown"
 
 
+@register.filter
+def get_account(transaction):
+    """Get the account name with emoji indicator from a transaction's GenericForeignKey."""
+    return _account_display(transaction, 'account')
+
+
 @register.filter
 def get_transfer_from_account(transfer):
     """Get the from_account name with emoji indicator from a transfer's GenericForeignKey."""
-    if transfer.from_account_content_type and transfer.from_account_object_id:
-        try:
-            account = transfer.from_account_content_type.get_object_for_this_type(
-                pk=transfer.from_account_object_id
-            )
-            account_name = account.name if hasattr(account, 'name') else str(account)
-
-            # Add emoji indicator based on account type
-            account_type = account.__class__.__name__
-            if account_type == 'BankAccount':
-                emoji = '🏦'
-            elif account_type == 'CreditCard':
-                emoji = '💳'
-            else:
-                emoji = ''
-
-            return f"{emoji} {account_name}" if emoji else account_name
-        except Exception:
-            return "Unknown"
-    return "Unknown"
+    return _account_display(transfer, 'from_account')
 
 
 @register.filter
 def get_transfer_to_account(transfer):
     """Get the to_account name with emoji indicator from a transfer's GenericForeignKey."""
-    if transfer.to_account_content_type and transfer.to_account_object_id:
-        try:
-            account = transfer.to_account_content_type.get_object_for_this_type(
-                pk=transfer.to_account_object_id
-            )
-            account_name = account.name if hasattr(account, 'name') else str(account)
-
-            # Add emoji indicator based on account type
-            account_type = account.__class__.__name__
-            if account_type == 'BankAccount':
-                emoji = '🏦'
-            elif account_type == 'CreditCard':
-                emoji = '💳'
-            else:
-                emoji = ''
-
-            return f"{emoji} {account_name}" if emoji else account_name
-        except Exception:
-            return "Unknown"
-    return "Unknown"
+    return _account_display(transfer, 'to_account')
 
 
 @register.filter
@@ -7,6 +7,8 @@ urlpatterns = [
     path('', views.transaction_list, name='transaction_list'),
     path('create/', views.transaction_create, name='transaction_create'),
     path('export/csv/', views.transaction_export_csv, name='transaction_export_csv'),
+    path('bulk/', views.transaction_bulk_action, name='transaction_bulk_action'),
+    path('duplicates/', views.transaction_duplicates, name='transaction_duplicates'),
     path('<int:pk>/edit/', views.transaction_edit, name='transaction_edit'),
     path('<int:pk>/delete/', views.transaction_delete, name='transaction_delete'),
 ]
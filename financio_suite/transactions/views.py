@@ -1,8 +1,10 @@
 import csv
-from django.http import HttpResponse
+import zlib
+from django.http import StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
+from django.core.exceptions import ValidationError
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
 from django.db.models import Q, Sum
 from django.contrib import messages
 from django.utils import timezone
@@ -13,14 +15,20 @@ from operator import attrgetter
 
 from .models import Transaction
 from .forms import TransactionForm
+from .services import TransactionService
 from categories.models import Category
+from categories.rules import RuleMatcher
 from accounts.models import BankAccount
 from creditcards.models import CreditCard
 from transfers.models import Transfer
 from django.contrib.contenttypes.models import ContentType
 from ledger.services import LedgerService
-from activity.utils import log_activity, track_model_changes
-from core.utils import get_all_accounts_with_emoji
+from activity.utils import log_activity, log_activity_bulk, track_model_changes
+from core.choices import get_form_choices
+from core.utils import get_account_from_compound_value, resolve_generic_accounts, filter_date_range
+from core.pagination import KeysetPaginator
+from core.search import apply_text_search
+from core.fingerprint import find_near_duplicates
 
 
 def get_filtered_items(request):
@@ -41,10 +49,10 @@ def get_filtered_items(request):
             'journal_entry'
         ).order_by('-datetime_ist')
 
-        # Search by memo
+        # Search by memo (full-text + trigram, annotated with search_rank)
         search_query = request.GET.get('search', '').strip()
         if search_query:
-            items = items.filter(Q(memo__icontains=search_query))
+            items = apply_text_search(items, search_query, 'memo')
 
         # Filter by from_account
         from_account_id = request.GET.get('from_account', '').strip()
@@ -80,12 +88,16 @@ def get_filtered_items(request):
             'account_content_type'
         ).order_by('-datetime_ist')
 
-        # Search by purpose
+        # Search by purpose or category name (full-text + trigram, annotated with search_rank)
         search_query = request.GET.get('search', '').strip()
         if search_query:
-            items = items.filter(
-                Q(purpose__icontains=search_query) |
-                Q(category__name__icontains=search_query)
+            matching_categories = Category.objects.filter(
+                user=request.user,
+                name__icontains=search_query
+            )
+            items = apply_text_search(
+                items, search_query, 'purpose',
+                extra_q=Q(category__in=matching_categories)
             )
 
         # Filter by transaction type
@@ -127,25 +139,11 @@ def get_filtered_items(request):
             except (ValueError, ContentType.DoesNotExist):
                 pass
 
-    # Generic filters (date range)
-    date_from = request.GET.get('date_from', '').strip()
-    date_to = request.GET.get('date_to', '').strip()
-
-    if date_from:
-        try:
-            from datetime import datetime
-            date_from_obj = datetime.strptime(date_from, '%Y-%m-%d')
-            items = items.filter(datetime_ist__date__gte=date_from_obj.date())
-        except ValueError:
-            pass
-
-    if date_to:
-        try:
-            from datetime import datetime
-            date_to_obj = datetime.strptime(date_to, '%Y-%m-%d')
-            items = items.filter(datetime_ist__date__lte=date_to_obj.date())
-        except ValueError:
-            pass
+    # Generic filters (date range, half-open on the raw column so indexes apply)
+    items = filter_date_range(
+        items, 'datetime_ist',
+        request.GET.get('date_from', ''), request.GET.get('date_to', '')
+    )
 
     return items, view_type
 
@@ -158,12 +156,13 @@ def transaction_list(request):
     """
     items, view_type = get_filtered_items(request)
 
-    # Get search query for context
+    # Get search query for context; search results are ordered by relevance
     search_query = request.GET.get('search', '').strip()
+    order_field = 'search_rank' if search_query else 'datetime_ist'
 
     # Get all active accounts (Bank + Credit Cards) for filter dropdowns
-    accounts_data = get_all_accounts_with_emoji(request.user)
-    accounts = [{'id': val, 'name': name} for obj, name, val in accounts_data]
+    choices = get_form_choices(request.user)
+    accounts = [{'id': val, 'name': name} for val, name in choices['accounts']]
 
     # Date range for context
     date_from = request.GET.get('date_from', '').strip()
@@ -173,10 +172,9 @@ def transaction_list(request):
         from_account_id = request.GET.get('from_account', '').strip()
         to_account_id = request.GET.get('to_account', '').strip()
 
-        # Pagination
-        paginator = Paginator(items, 20)
-        page_number = request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
+        # Keyset pagination on (datetime_ist, id), or on relevance when searching
+        page_obj = KeysetPaginator(items, 20, order_field=order_field).get_page(request.GET)
+        resolve_generic_accounts(page_obj.object_list, ('from_account', 'to_account'))
 
         context = {
             'page_obj': page_obj,
@@ -194,13 +192,12 @@ def transaction_list(request):
         category_id = request.GET.get('category', '').strip()
         account_id = request.GET.get('account', '').strip()
 
-        # Pagination (20 per page)
-        paginator = Paginator(items, 20)
-        page_number = request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
+        # Keyset pagination on (datetime_ist, id), or on relevance when searching, 20 per page
+        page_obj = KeysetPaginator(items, 20, order_field=order_field).get_page(request.GET)
+        resolve_generic_accounts(page_obj.object_list, ('account',))
 
         # Get categories for filter dropdowns
-        categories = Category.objects.filter(user=request.user).order_by('name')
+        categories = choices['categories']
 
         context = {
             'page_obj': page_obj,
@@ -214,15 +211,83 @@ def transaction_list(request):
             'date_to': date_to,
             'view_type': view_type,
             'is_transfer_view': False,
+            'method_choices': Transaction.METHOD_TYPE_CHOICES,
         }
 
     return render(request, 'transactions/transaction_list.html', context)
 
 
+# Rows fetched per server-side cursor round trip during CSV export
+EXPORT_CHUNK_SIZE = 2000
+
+
+class _EchoBuffer:
+    """File-like object whose write() returns the value, so csv.writer yields lines."""
+
+    def write(self, value):
+        return value
+
+
+def _iter_chunks(queryset, chunk_size):
+    """Iterate a queryset through a server-side cursor in lists of chunk_size rows."""
+    chunk = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(obj)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _export_rows(items, view_type, chunk_size):
+    """Yield CSV rows (header first) for the filtered items, resolving accounts per chunk."""
+    if view_type == 'transfers':
+        yield ['Date & Time', 'From Account', 'To Account', 'Method', 'Memo', 'Amount']
+        for chunk in _iter_chunks(items, chunk_size):
+            for transfer in resolve_generic_accounts(chunk, ('from_account', 'to_account')):
+                yield [
+                    transfer.datetime_ist.strftime('%Y-%m-%d %H:%M:%S'),
+                    transfer.from_account.name if transfer.from_account else 'N/A',
+                    transfer.to_account.name if transfer.to_account else 'N/A',
+                    transfer.get_method_type_display(),
+                    transfer.memo,
+                    transfer.amount
+                ]
+    else:
+        yield ['Date & Time', 'Type', 'Category', 'Account', 'Method', 'Purpose', 'Amount']
+        for chunk in _iter_chunks(items, chunk_size):
+            for transaction in resolve_generic_accounts(chunk, ('account',)):
+                yield [
+                    transaction.datetime_ist.strftime('%Y-%m-%d %H:%M:%S'),
+                    transaction.get_transaction_type_display(),
+                    transaction.category.name if transaction.category else 'Uncategorized',
+                    transaction.account.name if transaction.account else 'N/A',
+                    transaction.get_method_type_display(),
+                    transaction.purpose,
+                    transaction.amount
+                ]
+
+
+def _gzip_stream(chunks):
+    """Compress an iterable of str chunks into a gzip byte stream."""
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
 @login_required
 def transaction_export_csv(request):
     """
     Export filtered transactions or transfers to CSV.
+
+    The response is streamed: rows are read through a server-side cursor
+    in chunks of EXPORT_CHUNK_SIZE, with account names resolved once per
+    chunk, so memory stays flat regardless of history size. Pass
+    `compress=gzip` to download a .csv.gz instead.
     """
     items, view_type = get_filtered_items(request)
 
@@ -231,35 +296,15 @@ def transaction_export_csv(request):
     filename_prefix = "Transfers" if view_type == "transfers" else "Transactions"
     filename = f"{filename_prefix}_Download_{now.strftime('%d_%m_%Y_%H_%M_%S')}.csv"
 
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
-
-    writer = csv.writer(response)
+    writer = csv.writer(_EchoBuffer())
+    lines = (writer.writerow(row) for row in _export_rows(items, view_type, EXPORT_CHUNK_SIZE))
 
-    if view_type == 'transfers':
-        writer.writerow(['Date & Time', 'From Account', 'To Account', 'Method', 'Memo', 'Amount'])
-        for transfer in items:
-            writer.writerow([
-                transfer.datetime_ist.strftime('%Y-%m-%d %H:%M:%S'),
-                transfer.from_account.name if transfer.from_account else 'N/A',
-                transfer.to_account.name if transfer.to_account else 'N/A',
-                transfer.get_method_type_display(),
-                transfer.memo,
-                transfer.amount
-            ])
+    if request.GET.get('compress') == 'gzip':
+        response = StreamingHttpResponse(_gzip_stream(lines), content_type='application/gzip')
+        filename += '.gz'
     else:
-        writer.writerow(['Date & Time', 'Type', 'Category', 'Account', 'Method', 'Purpose', 'Amount'])
-        for transaction in items:
-            writer.writerow([
-                transaction.datetime_ist.strftime('%Y-%m-%d %H:%M:%S'),
-                transaction.get_transaction_type_display(),
-                transaction.category.name if transaction.category else 'Uncategorized',
-                transaction.account.name if transaction.account else 'N/A',
-                transaction.get_method_type_display(),
-                transaction.purpose,
-                transaction.amount
-            ])
-
+        response = StreamingHttpResponse(lines, content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
     return response
 
 
@@ -289,6 +334,13 @@ def transaction_create(request):
                 if datetime_ist:
                     transaction.datetime_ist = datetime_ist
 
+                # Fill in the category from the user's rules when none was chosen
+                if transaction.category is None:
+                    transaction.category = RuleMatcher.for_user(request.user).match(
+                        transaction.purpose, transaction.amount, transaction.transaction_type,
+                        transaction.account_content_type_id, transaction.account_object_id,
+                    )
+
                 # Create journal entry using LedgerService
                 ledger_service = LedgerService()
 
@@ -550,3 +602,133 @@ def transaction_delete(request, pk):
     }
 
     return render(request, 'transactions/transaction_confirm_delete.html', context)
+
+
+# Most transactions one bulk action may touch
+BULK_ACTION_LIMIT = 500
+
+
+@login_required
+def transaction_bulk_action(request):
+    """
+    Apply one action to the transactions selected in the list.
+
+    POST fields: transaction_ids (repeated), action ('delete', 'category',
+    'account' or 'method'), the new category/account/method_type value,
+    and query (the list's filters, restored on redirect).
+    """
+    query = request.POST.get('query', '')
+    list_url = reverse('transactions:transaction_list') + (f'?{query}' if query else '')
+    if request.method != 'POST':
+        return redirect(list_url)
+
+    transaction_ids = [value for value in request.POST.getlist('transaction_ids') if value.isdigit()]
+    action = request.POST.get('action', '')
+    if not transaction_ids:
+        messages.error(request, 'Select at least one transaction.')
+        return redirect(list_url)
+    if len(transaction_ids) > BULK_ACTION_LIMIT:
+        messages.error(request, f'Select at most {BULK_ACTION_LIMIT} transactions at a time.')
+        return redirect(list_url)
+
+    try:
+        if action == 'delete':
+            # The activity log commits (or rolls back) with the changes it records
+            with db_transaction.atomic():
+                deleted = TransactionService.bulk_delete(request.user, transaction_ids)
+                log_activity_bulk(
+                    request.user, 'delete',
+                    [
+                        (txn, {
+                            'deleted_at': txn.deleted_at.isoformat(),
+                            'amount': str(txn.amount),
+                            'type': txn.transaction_type,
+                        })
+                        for txn in deleted
+                    ],
+                    request=request,
+                )
+            messages.success(request, f'{len(deleted)} transaction{"s" if len(deleted) != 1 else ""} deleted. Balances updated.')
+            return redirect(list_url)
+
+        if action == 'category':
+            category_id = request.POST.get('category', '')
+            category = None
+            if category_id:
+                category = Category.objects.filter(
+                    pk=int(category_id) if category_id.isdigit() else None, user=request.user
+                ).first()
+                if category is None:
+                    raise ValidationError('Category not found.')
+            changes = {'category': category}
+        elif action == 'account':
+            try:
+                changes = {'account': get_account_from_compound_value(request.POST.get('account', ''), request.user)}
+            except ValueError as e:
+                raise ValidationError(str(e))
+        elif action == 'method':
+            changes = {'method_type': request.POST.get('method_type', '')}
+        else:
+            messages.error(request, 'Choose a bulk action.')
+            return redirect(list_url)
+
+        with db_transaction.atomic():
+            updated = TransactionService.bulk_update(request.user, transaction_ids, **changes)
+            log_activity_bulk(request.user, 'update', updated, request=request)
+        messages.success(request, f'{len(updated)} transaction{"s" if len(updated) != 1 else ""} updated.')
+
+    except ValidationError as e:
+        messages.error(request, ' '.join(e.messages))
+
+    return redirect(list_url)
+
+
+# Maximum gap between two payments that may be the same one recorded twice
+NEAR_DUPLICATE_DAYS = 3
+
+
+def _mark_exact_duplicates(groups):
+    """Flag rows whose fingerprint occurs more than once in their group."""
+    for group in groups:
+        fingerprints = [item.fingerprint for item in group]
+        for item in group:
+            item.is_exact_duplicate = fingerprints.count(item.fingerprint) > 1
+    return groups
+
+
+@login_required
+def transaction_duplicates(request):
+    """
+    List groups of possible duplicate transactions and transfers.
+
+    A group is rows on the same account(s) with the same type and amount,
+    each at most NEAR_DUPLICATE_DAYS after the previous one. Rows that
+    also match on date and description (same fingerprint) are flagged as
+    exact duplicates.
+    """
+    transaction_groups = find_near_duplicates(
+        Transaction.objects.select_related('category'),
+        request.user,
+        Transaction.NEAR_DUPLICATE_FIELDS,
+        days=NEAR_DUPLICATE_DAYS,
+    )
+    resolve_generic_accounts(txn for group in transaction_groups for txn in group)
+
+    transfer_groups = find_near_duplicates(
+        Transfer.objects.all(),
+        request.user,
+        Transfer.NEAR_DUPLICATE_FIELDS,
+        days=NEAR_DUPLICATE_DAYS,
+    )
+    resolve_generic_accounts(
+        (transfer for group in transfer_groups for transfer in group),
+        fields=('from_account', 'to_account'),
+    )
+
+    context = {
+        'transaction_groups': _mark_exact_duplicates(transaction_groups),
+        'transfer_groups': _mark_exact_duplicates(transfer_groups),
+        'window_days': NEAR_DUPLICATE_DAYS,
+        'page_title': 'Possible Duplicates',
+    }
+    return render(request, 'transactions/transaction_duplicates.html', context)
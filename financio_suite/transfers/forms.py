@@ -3,6 +3,7 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from .models import Transfer
 from accounts.models import BankAccount
+from core.fingerprint import transfer_fingerprint
 from core.utils import get_account_choices_for_form, get_account_from_compound_value
 
 
@@ -27,6 +28,8 @@ class TransferForm(forms.Form):
     - Validates bank account has sufficient balance
     - Amount must be > 0
     - Both accounts must belong to same user
+    - Exact duplicates (same accounts, date, amount and memo) are rejected
+      unless allow_duplicate is ticked; pass transfer= when editing
     """
 
     # Date and time fields
@@ -68,9 +71,22 @@ class TransferForm(forms.Form):
         })
     )
 
+    # Shown only after a duplicate was detected
+    allow_duplicate = forms.BooleanField(
+        required=False,
+        widget=forms.CheckboxInput(attrs={
+            'class': 'h-4 w-4 rounded border-gray-300 dark:border-gray-600 text-primary focus:ring-primary'
+        }),
+        help_text="Save even though an identical transfer exists"
+    )
+
     def __init__(self, *args, **kwargs):
         self.user = kwargs.pop('user', None)
+        # Transfer being edited (excluded from the duplicate check)
+        self.transfer = kwargs.pop('transfer', None)
         super().__init__(*args, **kwargs)
+        # Existing transfer this one duplicates (set by clean())
+        self.duplicate_of = None
 
         # Get account choices with emoji indicators
         account_choices = [('', 'Choose an account')]  # Empty choice first
@@ -170,4 +186,27 @@ class TransferForm(forms.Form):
                         f"Please reduce the transfer amount or add funds to the account."
                     )
 
+        # Reject exact duplicates with one lookup on the (user, fingerprint) index
+        memo = cleaned_data.get('memo')
+        if (self.user and from_account and to_account and date and amount and memo
+                and not cleaned_data.get('allow_duplicate')):
+            from django.contrib.contenttypes.models import ContentType
+            fingerprint = transfer_fingerprint(
+                ContentType.objects.get_for_model(from_account).id, from_account.pk,
+                ContentType.objects.get_for_model(to_account).id, to_account.pk,
+                date, amount, memo,
+            )
+            duplicates = Transfer.objects.filter(
+                user=self.user, fingerprint=fingerprint, deleted_at__isnull=True
+            )
+            if self.transfer is not None:
+                duplicates = duplicates.exclude(pk=self.transfer.pk)
+            self.duplicate_of = duplicates.first()
+            if self.duplicate_of:
+                raise ValidationError(
+                    f"An identical transfer of ₹{amount:,.2f} from {from_account.name} to {to_account.name} "
+                    f"already exists on {date:%d %b %Y}. "
+                    f"Tick \"Save anyway\" if this is a separate transfer."
+                )
+
         return cleaned_data
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-19 15:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('ledger', '0001_initial'),
+        ('transfers', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='transfer',
+            name='idx_transfer_user_date',
+        ),
+        migrations.AddIndex(
+            model_name='transfer',
+            index=models.Index(fields=['user', 'datetime_ist', 'id'], name='idx_transfer_user_date_id'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-19 15:05
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('ledger', '0001_initial'),
+        ('transfers', '0002_remove_transfer_idx_transfer_user_date_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='transfer',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('memo', config='simple'), help_text='tsvector of memo for full-text search', output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='transfer',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='idx_transfer_search_vector'),
+        ),
+        migrations.AddIndex(
+            model_name='transfer',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass('memo', name='gin_trgm_ops'), name='idx_transfer_memo_trgm'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-19 15:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('ledger', '0001_initial'),
+        ('transfers', '0003_transfer_search_vector_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='transfer',
+            name='idx_transfer_user_deleted',
+        ),
+        migrations.RemoveIndex(
+            model_name='transfer',
+            name='idx_transfer_user_date_id',
+        ),
+        migrations.AddIndex(
+            model_name='transfer',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['user', 'datetime_ist', 'id'], name='idx_transfer_live_user_time'),
+        ),
+        migrations.AddIndex(
+            model_name='transfer',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['user', 'from_account_content_type', 'from_account_object_id', 'datetime_ist', 'id'], name='idx_transfer_live_from_time'),
+        ),
+        migrations.AddIndex(
+            model_name='transfer',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['user', 'to_account_content_type', 'to_account_object_id', 'datetime_ist', 'id'], name='idx_transfer_live_to_time'),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.8 on 2026-10-19 15:24
+
+import hashlib
+import re
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Frozen copy of core.fingerprint at the time of this migration
+FINGERPRINT_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def normalize_text(text):
+    return ' '.join(FINGERPRINT_TOKEN_RE.findall((text or '').lower()))
+
+
+def _digest(*parts):
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _day(occurred_at):
+    return occurred_at.date().isoformat() if hasattr(occurred_at, 'date') else occurred_at.isoformat()
+
+
+def _money(amount):
+    return Decimal(amount).quantize(Decimal('0.01'))
+
+
+def transfer_fingerprint(from_content_type_id, from_object_id, to_content_type_id, to_object_id,
+                         occurred_at, amount, memo):
+    return _digest(
+        'transfer', from_content_type_id, from_object_id, to_content_type_id, to_object_id,
+        _day(occurred_at), _money(amount), normalize_text(memo),
+    )
+
+
+def backfill_fingerprints(apps, schema_editor):
+    """Fingerprint existing transfers in batches."""
+    Transfer = apps.get_model('transfers', 'Transfer')
+    batch = []
+    for transfer in Transfer.objects.only(
+        'from_account_content_type_id', 'from_account_object_id',
+        'to_account_content_type_id', 'to_account_object_id', 'datetime_ist', 'amount', 'memo',
+    ).iterator(chunk_size=2000):
+        transfer.fingerprint = transfer_fingerprint(
+            transfer.from_account_content_type_id, transfer.from_account_object_id,
+            transfer.to_account_content_type_id, transfer.to_account_object_id,
+            transfer.datetime_ist, transfer.amount, transfer.memo,
+        )
+        batch.append(transfer)
+        if len(batch) >= 2000:
+            Transfer.objects.bulk_update(batch, ['fingerprint'])
+            batch = []
+    if batch:
+        Transfer.objects.bulk_update(batch, ['fingerprint'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('ledger', '0001_initial'),
+        ('transfers', '0004_remove_transfer_idx_transfer_user_deleted_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transfer',
+            name='fingerprint',
+            field=models.CharField(blank=True, default='', editable=False, help_text='SHA-1 of both accounts, date, amount and normalized memo', max_length=40),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='transfer',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['user', 'fingerprint'], name='idx_transfer_live_fingerprint'),
+        ),
+    ]
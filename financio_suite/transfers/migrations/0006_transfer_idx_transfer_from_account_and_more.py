@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-19 15:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('ledger', '0001_initial'),
+        ('transfers', '0005_transfer_fingerprint'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transfer',
+            index=models.Index(fields=['from_account_content_type', 'from_account_object_id'], name='idx_transfer_from_account'),
+        ),
+        migrations.AddIndex(
+            model_name='transfer',
+            index=models.Index(fields=['to_account_content_type', 'to_account_object_id'], name='idx_transfer_to_account'),
+        ),
+    ]
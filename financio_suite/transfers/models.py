@@ -1,9 +1,13 @@
 from django.db import models
+from django.db.models import Q
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
 from django.utils import timezone
+from core.fingerprint import transfer_fingerprint
 from ledger.models import JournalEntry
 
 
@@ -110,14 +114,66 @@ class Transfer(models.Model):
         help_text="When this record was last updated"
     )
 
+    # Full-text search (maintained by PostgreSQL)
+    search_vector = models.GeneratedField(
+        expression=SearchVector('memo', config='simple'),
+        output_field=SearchVectorField(),
+        db_persist=True,
+        help_text="tsvector of memo for full-text search"
+    )
+
+    # Duplicate detection (see core.fingerprint)
+    fingerprint = models.CharField(
+        max_length=40,
+        blank=True,
+        default='',
+        editable=False,
+        help_text="SHA-1 of both accounts, date, amount and normalized memo"
+    )
+
+    # Columns that must match for rows to be near-duplicate candidates
+    NEAR_DUPLICATE_FIELDS = [
+        'from_account_content_type', 'from_account_object_id',
+        'to_account_content_type', 'to_account_object_id', 'amount',
+    ]
+
     class Meta:
         db_table = 'transfers'
         verbose_name = 'Transfer'
         verbose_name_plural = 'Transfers'
         ordering = ['-datetime_ist']
         indexes = [
-            models.Index(fields=['user', 'datetime_ist'], name='idx_transfer_user_date'),
-            models.Index(fields=['user', 'deleted_at'], name='idx_transfer_user_deleted'),
+            # Live rows only (lists, exports and reports all filter deleted_at IS NULL);
+            # (datetime_ist, id) is the keyset pagination key
+            models.Index(
+                fields=['user', 'datetime_ist', 'id'], name='idx_transfer_live_user_time',
+                condition=Q(deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=['user', 'from_account_content_type', 'from_account_object_id', 'datetime_ist', 'id'],
+                name='idx_transfer_live_from_time',
+                condition=Q(deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=['user', 'to_account_content_type', 'to_account_object_id', 'datetime_ist', 'id'],
+                name='idx_transfer_live_to_time',
+                condition=Q(deleted_at__isnull=True),
+            ),
+            # Account activity checks (AccountQuerySet.with_activity_flags)
+            models.Index(
+                fields=['from_account_content_type', 'from_account_object_id'], name='idx_transfer_from_account',
+            ),
+            models.Index(
+                fields=['to_account_content_type', 'to_account_object_id'], name='idx_transfer_to_account',
+            ),
+            # Exact-duplicate lookups by content fingerprint
+            models.Index(
+                fields=['user', 'fingerprint'], name='idx_transfer_live_fingerprint',
+                condition=Q(deleted_at__isnull=True),
+            ),
+            # Search: full-text on search_vector, trigram for substring/fuzzy matches
+            GinIndex(fields=['search_vector'], name='idx_transfer_search_vector'),
+            GinIndex(OpClass('memo', name='gin_trgm_ops'), name='idx_transfer_memo_trgm'),
         ]
 
     def __str__(self):
@@ -144,8 +200,19 @@ class Transfer(models.Model):
                 if self.to_account.user != self.user:
                     raise ValidationError("Destination account does not belong to this user")
 
+    def compute_fingerprint(self):
+        """Content fingerprint of this transfer (core.fingerprint.transfer_fingerprint)"""
+        if self.amount is None or self.datetime_ist is None:
+            return ''
+        return transfer_fingerprint(
+            self.from_account_content_type_id, self.from_account_object_id,
+            self.to_account_content_type_id, self.to_account_object_id,
+            self.datetime_ist, self.amount, self.memo,
+        )
+
     def save(self, *args, **kwargs):
-        """Override save to run validation"""
+        """Override save to run validation and refresh the fingerprint"""
+        self.fingerprint = self.compute_fingerprint()
         # Only run full_clean if skip_validation is not set
         if not kwargs.pop('skip_validation', False):
             self.full_clean()
@@ -1,8 +1,6 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.core.paginator import Paginator
-from django.db.models import Q
 from django.db import transaction as db_transaction
 from django.contrib.contenttypes.models import ContentType
 from .models import Transfer
@@ -10,6 +8,9 @@ from .forms import TransferForm
 from accounts.models import BankAccount
 from ledger.services import LedgerService
 from activity.utils import log_activity, track_model_changes
+from core.pagination import KeysetPaginator
+from core.search import apply_text_search
+from core.utils import resolve_generic_accounts, filter_date_range
 
 
 @login_required
@@ -27,12 +28,10 @@ def transfer_list(request):
         'journal_entry'
     )
 
-    # Search by memo
+    # Search by memo (full-text + trigram, annotated with search_rank)
     search_query = request.GET.get('search', '').strip()
     if search_query:
-        transfers = transfers.filter(
-            Q(memo__icontains=search_query)
-        )
+        transfers = apply_text_search(transfers, search_query, 'memo')
 
     # Filter by from_account
     from_account_id = request.GET.get('from_account', '').strip()
@@ -44,30 +43,16 @@ def transfer_list(request):
     if to_account_id:
         transfers = transfers.filter(to_account_object_id=to_account_id)
 
-    # Filter by date range
+    # Filter by date range (half-open on the raw column so indexes apply)
     date_from = request.GET.get('date_from', '').strip()
     date_to = request.GET.get('date_to', '').strip()
+    transfers = filter_date_range(transfers, 'datetime_ist', date_from, date_to)
 
-    if date_from:
-        try:
-            from datetime import datetime
-            date_from_obj = datetime.strptime(date_from, '%Y-%m-%d')
-            transfers = transfers.filter(datetime_ist__date__gte=date_from_obj.date())
-        except ValueError:
-            pass
-
-    if date_to:
-        try:
-            from datetime import datetime
-            date_to_obj = datetime.strptime(date_to, '%Y-%m-%d')
-            transfers = transfers.filter(datetime_ist__date__lte=date_to_obj.date())
-        except ValueError:
-            pass
-
-    # Pagination (20 per page)
-    paginator = Paginator(transfers, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Keyset pagination on (datetime_ist, id), 20 per page
+    page_obj = KeysetPaginator(
+        transfers, 20, order_field='search_rank' if search_query else 'datetime_ist'
+    ).get_page(request.GET)
+    resolve_generic_accounts(page_obj.object_list, ('from_account', 'to_account'))
 
     # Get accounts for filter dropdowns
     accounts = BankAccount.objects.filter(user=request.user, status='active').order_by('name')
@@ -174,7 +159,7 @@ def transfer_edit(request, pk):
     old_transfer = Transfer.objects.get(pk=transfer.pk)
 
     if request.method == 'POST':
-        form = TransferForm(request.POST, user=request.user)
+        form = TransferForm(request.POST, user=request.user, transfer=transfer)
 
         if form.is_valid():
             try:
@@ -274,7 +259,7 @@ def transfer_edit(request, pk):
             'from_account': f"{transfer.from_account.id}|{transfer.from_account.__class__.__name__.lower()}",
             'to_account': f"{transfer.to_account.id}|{transfer.to_account.__class__.__name__.lower()}"
         }
-        form = TransferForm(initial=initial_data, user=request.user)
+        form = TransferForm(initial=initial_data, user=request.user, transfer=transfer)
 
     context = {
         'form': form,
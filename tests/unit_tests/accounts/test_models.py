@@ -67,6 +67,36 @@ class TestBankAccountModel:
         )
         assert bank_account.can_delete() is False
 
+    def test_with_activity_flags(self, bank_account, credit_card, test_user):
+        from datetime import datetime
+        ct = ContentType.objects.get_for_model(BankAccount)
+        account = BankAccount.objects.with_activity_flags().get(pk=bank_account.pk)
+        assert (account.has_transactions, account.has_transfers, account.txn_count) == (False, False, 0)
+        assert account.last_activity_at is None
+        assert account.can_delete() is True
+
+        for day in (1, 2):
+            Transaction.objects.create(
+                user=test_user, account_content_type=ct, account_object_id=bank_account.id,
+                amount=Decimal('10.00'), transaction_type='expense', datetime_ist=datetime(2025, 4, day),
+                method_type='upi', purpose=f'Test {day}'
+            )
+        Transaction.objects.create(
+            user=test_user, account_content_type=ct, account_object_id=bank_account.id,
+            amount=Decimal('10.00'), transaction_type='expense', datetime_ist=datetime(2025, 6, 1),
+            method_type='upi', purpose='Deleted', deleted_at=datetime(2025, 6, 2)
+        )
+        # Incoming transfer only: the "to" side must be found on its own
+        Transfer.objects.create(
+            user=test_user, amount=Decimal('50.00'), method_type='upi', memo='Refund',
+            from_account=credit_card, to_account=bank_account, datetime_ist=datetime(2025, 5, 1),
+        )
+
+        account = BankAccount.objects.with_activity_flags().get(pk=bank_account.pk)
+        assert (account.has_transactions, account.has_transfers, account.txn_count) == (True, True, 2)
+        assert account.last_activity_at == datetime(2025, 5, 1)
+        assert account.can_delete() is False
+
     def test_archive_activate(self, bank_account):
         bank_account.archive()
         assert bank_account.status == 'archived'
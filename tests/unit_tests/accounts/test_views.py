@@ -2,6 +2,8 @@ import pytest
 from django.urls import reverse
 from accounts.models import BankAccount, BankAccountBalance
 from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 @pytest.mark.django_db
 class TestAccountViews:
@@ -12,6 +14,52 @@ class TestAccountViews:
         assert response.status_code == 200
         assert bank_account.name in response.content.decode()
 
+    def test_account_list_query_count_does_not_grow_with_accounts(self, client, test_user, bank_account):
+        client.force_login(test_user)
+        client.get(reverse('account_list'))  # warm caches (session, content types)
+        with CaptureQueriesContext(connection) as one_account:
+            client.get(reverse('account_list'))
+
+        for i in range(3):
+            BankAccount.objects.create(
+                user=test_user, name=f'Extra {i}', institution=f'Bank {i}', account_number=f'99887766{i}'
+            )
+        with CaptureQueriesContext(connection) as four_accounts:
+            response = client.get(reverse('account_list'))
+
+        assert len(four_accounts.captured_queries) == len(one_account.captured_queries)
+        assert all(hasattr(account, 'has_transfers') for account in response.context['bank_accounts'])
+
+    def test_account_list_totals_match_python_calculation(self, client, test_user, bank_account, credit_card):
+        from datetime import date
+        from creditcards.models import CreditCard, CreditCardBalance
+        # Archived accounts and a bank account without a balance row (opening balance used)
+        BankAccount.objects.create(user=test_user, name='Old', institution='Old Bank', opening_balance=Decimal('70.00'), status='archived')
+        BankAccount.objects.create(user=test_user, name='No Row', institution='New Bank', opening_balance=Decimal('250.00'))
+        CreditCardBalance.objects.filter(account=credit_card).update(balance_amount=Decimal('-5000.00'))
+        overpaid = CreditCard.objects.create(
+            user=test_user, name='Overpaid', institution='Other Bank', card_number='9999888877776666', cvv='123',
+            billing_day=1, due_day=20, expiry_date=date(2030, 1, 1), credit_limit=Decimal('10000.00'),
+        )
+        CreditCardBalance.objects.create(account=overpaid, balance_amount=Decimal('300.00'))
+
+        client.force_login(test_user)
+        context = client.get(reverse('account_list')).context
+
+        active_cards = list(CreditCard.objects.filter(user=test_user, status='active'))
+        assert context['active_banks_count'] == 2
+        assert context['archived_banks_count'] == 1
+        assert context['total_bank_balance'] == Decimal('1250.00')
+        assert context['active_cards_count'] == 2
+        assert context['archived_cards_count'] == 0
+        assert context['total_credit_limit'] == Decimal('60000.00')
+        assert context['total_available_credit'] == sum(card.available_credit() for card in active_cards)
+        assert context['total_amount_owed'] == sum(card.amount_owed() for card in active_cards) == Decimal('5000.00')
+
+        card_context = client.get(reverse('creditcard_list')).context
+        assert card_context['total_owed'] == Decimal('5000.00')
+        assert card_context['total_available_credit'] == Decimal('55300.00')
+
     def test_account_create_view(self, client, test_user):
         client.force_login(test_user)
         url = reverse('account_create')
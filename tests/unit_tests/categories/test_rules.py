@@ -0,0 +1,217 @@
+import pytest
+from collections import OrderedDict
+from datetime import datetime
+from decimal import Decimal
+from io import StringIO
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from categories import rules
+from categories.models import Category, CategoryRule
+from categories.rules import RuleMatcher
+from imports.services import ImportService
+from transactions.models import Transaction
+
+
+@pytest.fixture
+def food(test_user):
+    return Category.objects.create(user=test_user, name='food', type='expense')
+
+
+@pytest.fixture
+def shopping(test_user):
+    return Category.objects.create(user=test_user, name='shopping', type='expense')
+
+
+def _rule(user, category, pattern='', **kwargs):
+    return CategoryRule.objects.create(user=user, category=category, pattern=pattern, **kwargs)
+
+
+def _statement(lines):
+    header = "Date,Narration,Chq./Ref.No.,Value Dt,Withdrawal Amt.,Deposit Amt.,Closing Balance\n"
+    body = ''.join(
+        f"{day:02d}/04/24,{narration},REF{day},{day:02d}/04/24,{debit},{credit},0\n"
+        for day, narration, debit, credit in lines
+    )
+    return SimpleUploadedFile('statement.csv', (header + body).encode())
+
+
+def _txn(user, account, purpose, amount='100.00', transaction_type='expense', category=None):
+    txn = Transaction(
+        user=user, transaction_type=transaction_type, amount=Decimal(amount), account=account,
+        method_type='upi', purpose=purpose, category=category, datetime_ist=datetime(2025, 4, 1, 10),
+    )
+    txn.save(skip_validation=True)
+    return txn
+
+
+@pytest.mark.django_db
+class TestRuleMatcher:
+    def test_priority_case_and_regex(self, test_user, food, shopping):
+        _rule(test_user, shopping, 'amazon', priority=20)
+        _rule(test_user, food, 'amazon fresh', priority=10)
+        _rule(test_user, food, r'swiggy|zomato', match_type='regex', priority=30)
+        matcher = RuleMatcher.for_user(test_user)
+
+        assert matcher.match('UPI/AMAZON FRESH/123', Decimal('100'), 'expense') == food
+        assert matcher.match('Amazon Pay order', Decimal('100'), 'expense') == shopping
+        assert matcher.match('ZOMATO ORDER', Decimal('100'), 'expense') == food
+        assert matcher.match('Rent', Decimal('100'), 'expense') is None
+        # Category type must match the transaction type
+        assert matcher.match('amazon refund', Decimal('100'), 'income') is None
+
+    def test_conditions_fall_through_to_lower_priority_rules(self, test_user, bank_account, credit_card, food, shopping):
+        card_type = ContentType.objects.get_for_model(credit_card)
+        bank_type = ContentType.objects.get_for_model(bank_account)
+        _rule(test_user, food, 'swiggy', max_amount=Decimal('1000'), priority=1)
+        _rule(test_user, shopping, 'swiggy', priority=2,
+              account_content_type=card_type, account_object_id=credit_card.pk)
+        # No pattern: any expense of at least 50,000
+        _rule(test_user, shopping, min_amount=Decimal('50000'), priority=3)
+        # Named group: searched on its own, outside the combined expression
+        _rule(test_user, food, r'ref (?P<number>\d{4})', match_type='regex', priority=4)
+        matcher = RuleMatcher.for_user(test_user)
+
+        assert matcher.match('Swiggy', Decimal('450'), 'expense', bank_type.pk, bank_account.pk) == food
+        assert matcher.match('Swiggy', Decimal('4500'), 'expense', card_type.pk, credit_card.pk) == shopping
+        assert matcher.match('Swiggy', Decimal('4500'), 'expense', bank_type.pk, bank_account.pk) is None
+        assert matcher.match('Laptop', Decimal('60000'), 'expense', bank_type.pk, bank_account.pk) == shopping
+        assert matcher.match('Ref 7777', Decimal('10'), 'expense', bank_type.pk, bank_account.pk) == food
+
+    def test_matcher_is_cached_until_rules_change(self, test_user, food, shopping):
+        rule = _rule(test_user, food, 'swiggy')
+        matcher = RuleMatcher.for_user(test_user)
+        with CaptureQueriesContext(connection) as captured:
+            assert RuleMatcher.for_user(test_user) is matcher
+        # Only the version check
+        assert len(captured.captured_queries) == 1
+
+        rule.category = shopping
+        rule.save()
+        assert RuleMatcher.for_user(test_user).match('SWIGGY', Decimal('1'), 'expense') == shopping
+
+        rule.delete()
+        assert RuleMatcher.for_user(test_user).match('SWIGGY', Decimal('1'), 'expense') is None
+
+    def test_rule_validation(self, test_user, other_user, food):
+        with pytest.raises(ValidationError):
+            _rule(test_user, food, '(unclosed', match_type='regex')
+        with pytest.raises(ValidationError):
+            _rule(test_user, food, min_amount=Decimal('10'), max_amount=Decimal('5'))
+        with pytest.raises(ValidationError):
+            _rule(test_user, food)
+        with pytest.raises(ValidationError):
+            _rule(other_user, food, 'swiggy')
+
+    @pytest.mark.parametrize('pattern', [
+        r'(a+)+$', r'(\w+\s?)*x', r'((ab)*c)+', r'(\d)\1', r'(?P<a>x)(?P=a)', 'a' * 101,
+    ])
+    def test_unsafe_regex_is_refused(self, test_user, food, pattern):
+        with pytest.raises(ValidationError):
+            _rule(test_user, food, pattern, match_type='regex')
+
+    def test_unsafe_regex_saved_earlier_is_skipped(self, test_user, food, shopping):
+        _rule(test_user, food, r'(a+)+$', priority=1)
+        _rule(test_user, shopping, r'aaa', match_type='regex', priority=2)
+        # Saved before the check existed
+        CategoryRule.objects.filter(priority=1).update(match_type='regex')
+
+        matcher = RuleMatcher.for_user(test_user)
+        assert len(matcher) == 1
+        assert matcher.match('a' * 40 + '!', Decimal('1'), 'expense') == shopping
+
+    def test_matcher_cache_is_bounded(self, monkeypatch, test_user, other_user, food):
+        monkeypatch.setattr(rules, 'MAX_CACHED_MATCHERS', 1)
+        monkeypatch.setattr(rules, '_matchers', OrderedDict())
+        _rule(test_user, food, 'swiggy')
+
+        RuleMatcher.for_user(test_user)
+        RuleMatcher.for_user(other_user)
+        assert list(rules._matchers) == [other_user.pk]
+
+
+@pytest.mark.django_db
+class TestRuleApplication:
+    def test_rules_apply_on_create_unless_category_chosen(self, client, test_user, bank_account, food, shopping):
+        _rule(test_user, food, 'swiggy')
+        client.force_login(test_user)
+        for purpose, category in (('SWIGGY order', ''), ('Swiggy gift card', shopping.pk)):
+            client.post(reverse('transactions:transaction_create'), {
+                'transaction_type': 'expense',
+                'amount': '100.00',
+                'method_type': 'upi',
+                'purpose': purpose,
+                'category': category,
+                'account': f"{bank_account.id}|bankaccount",
+                'date': timezone.now().date().isoformat(),
+            })
+
+        assert Transaction.objects.get(purpose='SWIGGY order').category == food
+        assert Transaction.objects.get(purpose='Swiggy gift card').category == shopping
+
+    def test_rules_apply_on_import(self, test_user, bank_account, food, shopping):
+        _rule(test_user, food, 'swiggy')
+        _rule(test_user, shopping, 'amazon')
+        statement_import = ImportService.stage(test_user, bank_account, _statement([
+            (1, 'UPI-SWIGGY-1', '250.00', ''),
+            (2, 'AMAZON PAY', '999.00', ''),
+            (3, 'AMAZON REFUND', '', '999.00'),
+        ]))
+        rows = list(statement_import.rows.order_by('line_number'))
+        assert [row.category for row in rows] == [food, shopping, None]
+
+        ImportService.commit(statement_import)
+        assert Transaction.objects.get(purpose='UPI-SWIGGY-1').category == food
+
+    def test_backfill_command_in_chunks(self, test_user, other_user, bank_account, food, shopping):
+        _rule(test_user, food, 'swiggy')
+        swiggy = [_txn(test_user, bank_account, f'SWIGGY {i}') for i in range(5)]
+        already = _txn(test_user, bank_account, 'Swiggy voucher', category=shopping)
+        unmatched = _txn(test_user, bank_account, 'Rent')
+        other = _txn(other_user, bank_account, 'SWIGGY')
+
+        out = StringIO()
+        call_command('apply_category_rules', '--dry-run', stdout=out)
+        assert 'Categorized 5 of 6' in out.getvalue()
+        assert not Transaction.objects.filter(category=food).exists()
+
+        call_command('apply_category_rules', '--chunk-size', '2', stdout=StringIO())
+        assert set(Transaction.objects.filter(category=food).values_list('pk', flat=True)) == {
+            txn.pk for txn in swiggy
+        }
+        assert Transaction.objects.get(pk=already.pk).category == shopping
+        assert Transaction.objects.get(pk=unmatched.pk).category is None
+        assert Transaction.objects.get(pk=other.pk).category is None
+
+        call_command('apply_category_rules', '--user', test_user.username, '--overwrite', stdout=StringIO())
+        assert Transaction.objects.get(pk=already.pk).category == food
+
+    def test_rule_views(self, client, test_user, other_user, bank_account, food):
+        client.force_login(test_user)
+        response = client.post(reverse('category_rule_create'), {
+            'category': food.pk,
+            'match_type': 'contains',
+            'pattern': '  Swiggy ',
+            'account': f"{bank_account.id}|bankaccount",
+            'priority': 10,
+            'is_active': 'on',
+        })
+        assert response.status_code == 302
+        rule = CategoryRule.objects.get(user=test_user)
+        assert rule.pattern == 'Swiggy'
+        assert rule.account == bank_account
+
+        response = client.get(reverse('category_rule_list'))
+        assert 'Swiggy' in response.content.decode()
+
+        client.force_login(other_user)
+        assert client.post(reverse('category_rule_delete', args=[rule.pk])).status_code == 404
+        client.force_login(test_user)
+        client.post(reverse('category_rule_delete', args=[rule.pk]))
+        assert not CategoryRule.objects.filter(pk=rule.pk).exists()
@@ -0,0 +1,158 @@
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from django.db import DatabaseError
+from django.urls import reverse
+
+from accounts.models import DebitCard
+from activity.models import ActivityLog
+from core.services import AccountStatusService
+from creditcards.models import CreditCard
+from fds.models import FixedDeposit
+from imports.models import StatementImport
+from investments.models import Broker, Investment
+from reports.models import UserFinancialSummary
+
+
+@pytest.fixture
+def debit_card(test_user, bank_account):
+    return DebitCard.objects.create(
+        user=test_user, bank_account=bank_account, name='Test Debit Card',
+        card_number='1234567890123456', cvv='123', expiry_date=date(2030, 12, 31),
+    )
+
+
+@pytest.fixture
+def fd(test_user):
+    return FixedDeposit.objects.create(
+        user=test_user, name='Matured FD', institution='SBI',
+        principal_amount=Decimal('10000.00'), interest_rate=Decimal('5.00'),
+        maturity_amount=Decimal('11000.00'), tenure_days=365,
+        opened_on=date.today() - timedelta(days=400), maturity_date=date.today() - timedelta(days=35),
+    )
+
+
+@pytest.mark.django_db
+class TestAccountStatusService:
+    def test_archive_many_in_constant_queries(
+        self, test_user, other_user, bank_account, credit_card, debit_card, fd,
+        django_assert_max_num_queries,
+    ):
+        idle_broker = Broker.objects.create(user=test_user, name='Idle Broker')
+        busy_broker = Broker.objects.create(user=test_user, name='Busy Broker')
+        Investment.objects.create(user=test_user, broker=busy_broker, name='Active Stock', status='active')
+        staged_card = CreditCard.objects.create(
+            user=test_user, name='Staged Card', institution='Test Bank', card_number='9876543210987', cvv='321',
+            billing_day=1, due_day=20, expiry_date=date.today() + timedelta(days=365),
+            credit_limit=Decimal('1000.00'), opening_balance=Decimal('0.00'),
+        )
+        StatementImport.objects.create(
+            user=test_user, account=staged_card, original_filename='statement.csv', parser='generic',
+        )
+        foreign = Broker.objects.create(user=other_user, name='Not Mine')
+        UserFinancialSummary.refresh(test_user)
+
+        items = [
+            ('bankaccount', bank_account.pk),
+            ('creditcard', credit_card.pk),
+            ('creditcard', staged_card.pk),
+            ('fixeddeposit', fd.pk),
+            ('broker', idle_broker.pk),
+            ('broker', busy_broker.pk),
+            ('broker', foreign.pk),
+        ]
+        with django_assert_max_num_queries(20):
+            results = AccountStatusService.change_status(test_user, 'archive', items)
+
+        assert [result['outcome'] for result in results] == [
+            'archived', 'archived', 'blocked', 'archived', 'archived', 'blocked', 'not_found',
+        ]
+        assert results[0]['cascaded'] == [debit_card]
+        assert results[0]['warnings'] and not results[1]['warnings']
+        assert 'staged statement import' in results[2]['reasons'][0]
+        assert '1 active investment(s)' in results[5]['reasons'][0]
+
+        debit_card.refresh_from_db()
+        staged_card.refresh_from_db()
+        busy_broker.refresh_from_db()
+        assert debit_card.status == 'archived'
+        assert staged_card.status == 'active'
+        assert busy_broker.status == 'active'
+        summary = UserFinancialSummary.objects.get(user=test_user)
+        assert summary.total_banks == 0
+
+    def test_activate(self, test_user, bank_account, debit_card, fd):
+        AccountStatusService.change_status(test_user, 'archive', [
+            ('bankaccount', bank_account.pk), ('fixeddeposit', fd.pk),
+        ])
+
+        results = AccountStatusService.change_status(test_user, 'activate', [
+            ('debitcard', debit_card.pk), ('fixeddeposit', fd.pk),
+        ])
+        assert [result['outcome'] for result in results] == ['blocked', 'blocked']
+        assert 'bank account is archived' in results[0]['reasons'][0]
+
+        # The bank account is processed before its debit cards
+        results = AccountStatusService.change_status(test_user, 'activate', [
+            ('debitcard', debit_card.pk), ('bankaccount', bank_account.pk), ('bankaccount', bank_account.pk),
+        ])
+        assert [result['outcome'] for result in results] == ['activated', 'activated', 'activated']
+        debit_card.refresh_from_db()
+        assert debit_card.status == 'active'
+
+        results = AccountStatusService.change_status(test_user, 'activate', [('bankaccount', bank_account.pk)])
+        assert results[0]['outcome'] == 'unchanged'
+
+
+@pytest.mark.django_db
+class TestBulkStatusView:
+    def test_bulk_status(self, client, test_user, bank_account, debit_card, credit_card):
+        client.force_login(test_user)
+        url = reverse('bulk_status')
+
+        response = client.post(url, {
+            'action': 'archive',
+            'items': [f'{bank_account.pk}|bankaccount', f'{credit_card.pk}|creditcard', '999|broker'],
+        })
+        assert response.status_code == 200
+        data = response.json()
+        assert data['counts'] == {'archived': 2, 'not_found': 1}
+        assert data['results'][0] == {
+            'item': f'{bank_account.pk}|bankaccount',
+            'name': 'Test Bank',
+            'outcome': 'archived',
+            'reasons': [],
+            'warnings': ['Its balance of ₹1,000.00 is left out of net worth while archived.'],
+            'cascaded': [f'{debit_card.pk}|debitcard'],
+        }
+        assert ActivityLog.objects.filter(user=test_user, action='archive').count() == 3
+
+        for params in (
+            {'action': 'delete', 'items': [f'{bank_account.pk}|bankaccount']},
+            {'action': 'archive', 'items': ['abc|bankaccount']},
+            {'action': 'archive', 'items': [f'{bank_account.pk}|transaction']},
+            {'action': 'archive'},
+        ):
+            assert client.post(url, params).status_code == 400
+        assert client.get(url).status_code == 405
+
+    def test_rolls_back_when_logging_fails(self, client, monkeypatch, test_user, bank_account, debit_card):
+        def failing_log(*args, **kwargs):
+            raise DatabaseError('activity_logs is unavailable')
+
+        monkeypatch.setattr('core.views.log_activity_bulk', failing_log)
+        client.force_login(test_user)
+        with pytest.raises(DatabaseError):
+            client.post(reverse('bulk_status'), {'action': 'archive', 'items': [f'{bank_account.pk}|bankaccount']})
+
+        bank_account.refresh_from_db()
+        debit_card.refresh_from_db()
+        assert bank_account.status == debit_card.status == 'active'
+
+    def test_toggle_archives_debit_cards(self, client, test_user, bank_account, debit_card):
+        client.force_login(test_user)
+        response = client.post(reverse('account_toggle_status', kwargs={'pk': bank_account.pk}), follow=True)
+
+        debit_card.refresh_from_db()
+        assert debit_card.status == 'archived'
+        assert 'archived along with 1 debit card.' in response.content.decode()
@@ -0,0 +1,87 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import BankAccount, DebitCard
+from categories.models import Category
+from core.choices import get_form_choices
+from transactions.forms import TransactionForm
+from transfers.forms import TransferForm
+
+
+@pytest.fixture
+def debit_card(test_user, bank_account):
+    return DebitCard.objects.create(
+        user=test_user, bank_account=bank_account, name='Daily Card',
+        card_number='1234567890123456', cvv='123', expiry_date=date(2030, 12, 31),
+    )
+
+
+@pytest.fixture
+def food(test_user):
+    return Category.objects.create(user=test_user, name='food', type='expense')
+
+
+@pytest.mark.django_db
+class TestFormChoices:
+    def test_forms_render_without_queries_on_warm_cache(self, test_user, bank_account, credit_card, debit_card, food):
+        get_form_choices(test_user)
+
+        with CaptureQueriesContext(connection) as captured:
+            form = TransactionForm(user=test_user)
+            html = str(form['account']) + str(form['debit_card']) + str(form['category'])
+            transfer_form = TransferForm(user=test_user)
+            html += str(transfer_form['from_account']) + str(transfer_form['to_account'])
+        assert len(captured.captured_queries) == 0
+
+        assert f'{bank_account.pk}|bankaccount' in html
+        assert f'{credit_card.pk}|creditcard' in html
+        assert 'Daily Card' in html
+        assert f'value="{food.pk}" data-type="expense"' in html
+
+    def test_changes_invalidate_choices(self, test_user, other_user, bank_account, debit_card, food):
+        assert [value for value, _ in get_form_choices(test_user)['accounts']] == [f'{bank_account.pk}|bankaccount']
+
+        savings = BankAccount.objects.create(user=test_user, name='Another Bank', account_type='savings')
+        bank_account.archive()
+        assert [value for value, _ in get_form_choices(test_user)['accounts']] == [f'{savings.pk}|bankaccount']
+
+        debit_card.archive()
+        assert get_form_choices(test_user)['debit_cards'] == []
+
+        food.name = 'groceries'
+        food.save()
+        assert [c['name'] for c in get_form_choices(test_user)['categories']] == ['groceries']
+        food.delete()
+        assert get_form_choices(test_user)['categories'] == []
+
+        # Other users' changes leave the entry alone
+        get_form_choices(test_user)
+        Category.objects.create(user=other_user, name='rent', type='expense')
+        with CaptureQueriesContext(connection) as captured:
+            get_form_choices(test_user)
+        assert len(captured.captured_queries) == 0
+
+    def test_submitted_values_are_still_validated(self, test_user, other_user, bank_account):
+        other_bank = BankAccount.objects.create(user=other_user, name='Other', account_type='savings')
+        other_card = DebitCard.objects.create(
+            user=other_user, bank_account=other_bank, name='Other Card',
+            card_number='9999888877776666', cvv='321', expiry_date=date(2030, 12, 31),
+        )
+        form = TransactionForm(user=test_user, data={
+            'transaction_type': 'expense', 'amount': '10.00', 'method_type': 'card',
+            'debit_card': other_card.pk, 'purpose': 'Coffee',
+            'account': f'{other_bank.pk}|bankaccount', 'date': date.today().isoformat(),
+        })
+        assert not form.is_valid()
+        assert 'debit_card' in form.errors
+        assert 'account' in form.errors
+
+    def test_transaction_list_filters(self, client, test_user, bank_account, food):
+        client.force_login(test_user)
+        content = client.get(reverse('transactions:transaction_list')).content.decode()
+        assert f'value="{bank_account.pk}|bankaccount"' in content
+        assert f'value="{food.pk}"' in content
@@ -0,0 +1,88 @@
+import pickle
+import pytest
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+import core.fields
+from accounts.models import BankAccount
+from core.fields import EncryptedValue
+from creditcards.models import CreditCard
+
+
+def _stored(table, column, pk):
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT {column} FROM {table} WHERE id = %s', [pk])
+        return cursor.fetchone()[0]
+
+
+@pytest.fixture
+def decryptions():
+    with mock.patch.object(core.fields, 'decrypt_str', wraps=core.fields.decrypt_str) as wrapped:
+        yield wrapped
+
+
+@pytest.mark.django_db
+class TestLazyEncryptedCharField:
+    def test_decrypts_on_first_access_only(self, test_user, decryptions):
+        account = BankAccount.objects.create(user=test_user, name='Savings', account_number='5010 0000 1234')
+        assert account.account_number_last4 == '1234'
+        assert _stored('bank_accounts', 'account_number', account.pk).startswith('gAAAA')
+
+        loaded = BankAccount.objects.with_encrypted().get(pk=account.pk)
+        assert decryptions.call_count == 0
+        assert loaded.account_number == '5010 0000 1234'
+        assert loaded.account_number == '5010 0000 1234'
+        assert decryptions.call_count == 1
+
+        # values() rows hold the lazy value; it behaves like the plaintext
+        value = BankAccount.objects.values_list('account_number', flat=True).get(pk=account.pk)
+        assert isinstance(value, EncryptedValue)
+        assert value == '5010 0000 1234' and str(value)[-4:] == '1234'
+        assert pickle.loads(pickle.dumps(value)) == value
+
+    def test_unchanged_value_is_saved_without_reencrypting(self, test_user, credit_card):
+        token = _stored('credit_cards', 'card_number', credit_card.pk)
+
+        loaded = CreditCard.objects.with_encrypted().get(pk=credit_card.pk)
+        loaded.name = 'Renamed'
+        loaded.save()
+        assert _stored('credit_cards', 'card_number', credit_card.pk) == token
+
+        loaded.card_number = '4111111111119999'
+        loaded.save()
+        loaded = CreditCard.objects.with_encrypted().get(pk=credit_card.pk)
+        assert _stored('credit_cards', 'card_number', credit_card.pk) != token
+        assert loaded.card_number == '4111111111119999'
+        assert loaded.card_number_last4 == '9999'
+
+
+@pytest.mark.django_db
+class TestEncryptedColumnDeferral:
+    def test_default_manager_defers_encrypted_columns(self, test_user, credit_card):
+        account = BankAccount.objects.create(user=test_user, name='Savings', account_number='501000001234')
+
+        with CaptureQueriesContext(connection) as captured:
+            cards = list(CreditCard.objects.filter(user=test_user))
+        assert 'card_number"' not in captured.captured_queries[0]['sql']
+        assert cards[0].get_deferred_fields() == {'card_number', 'cvv'}
+        # Still available, with one extra query
+        assert cards[0].cvv == '123'
+
+        assert BankAccount.objects.with_encrypted().get(pk=account.pk).get_deferred_fields() == set()
+        assert BankAccount.objects.get(pk=account.pk).account_number == '501000001234'
+
+    def test_detail_page_shows_full_number(self, client, test_user):
+        account = BankAccount.objects.create(user=test_user, name='Savings', account_number='501000001234')
+        client.force_login(test_user)
+        response = client.get(reverse('account_detail', args=[account.pk]))
+        assert response.context['full_account_number'] == '501000001234'
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_account_lists', '--accounts', '2', '--runs', '1', stdout=out)
+        assert 'Deferred columns' in out.getvalue()
+        assert not BankAccount.objects.exists()
@@ -0,0 +1,109 @@
+import importlib
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.fingerprint import find_near_duplicates, normalize_text, transaction_fingerprint, transfer_fingerprint
+from transactions.models import Transaction
+from transfers.models import Transfer
+
+
+def _txn(user, account, amount, when, purpose='Swiggy order', transaction_type='expense'):
+    txn = Transaction(
+        user=user, transaction_type=transaction_type, amount=Decimal(amount), account=account,
+        method_type='upi', purpose=purpose, datetime_ist=when,
+    )
+    txn.save(skip_validation=True)
+    return txn
+
+
+class TestFingerprint:
+    def test_normalization_ignores_case_punctuation_and_time(self):
+        assert normalize_text('  UPI/DR - Swiggy #42 ') == 'upi dr swiggy 42'
+        morning = transaction_fingerprint(7, 1, datetime(2025, 4, 1, 9), 'expense', Decimal('450'), 'SWIGGY  Order #42')
+        evening = transaction_fingerprint(7, 1, datetime(2025, 4, 1, 21), 'expense', '450.00', 'swiggy order 42')
+        assert morning == evening
+        assert len(morning) == 40
+
+    def test_type_account_and_date_change_the_fingerprint(self):
+        base = transaction_fingerprint(7, 1, datetime(2025, 4, 1), 'expense', '450', 'Swiggy')
+        assert base != transaction_fingerprint(7, 1, datetime(2025, 4, 1), 'income', '450', 'Swiggy')
+        assert base != transaction_fingerprint(7, 2, datetime(2025, 4, 1), 'expense', '450', 'Swiggy')
+        assert base != transaction_fingerprint(7, 1, datetime(2025, 4, 2), 'expense', '450', 'Swiggy')
+
+    def test_migration_backfills_match_current_fingerprints(self):
+        transactions = importlib.import_module('transactions.migrations.0009_transaction_fingerprint')
+        transfers = importlib.import_module('transfers.migrations.0005_transfer_fingerprint')
+        when = datetime(2025, 4, 1, 9)
+
+        assert transactions.transaction_fingerprint(7, 1, when, 'expense', '450', 'UPI/Swiggy #42') == (
+            transaction_fingerprint(7, 1, when, 'expense', '450', 'UPI/Swiggy #42')
+        )
+        assert transfers.transfer_fingerprint(7, 1, 8, 2, when, '1000', 'Card bill') == (
+            transfer_fingerprint(7, 1, 8, 2, when, '1000', 'Card bill')
+        )
+
+
+@pytest.mark.django_db
+class TestNearDuplicates:
+    def test_save_maintains_fingerprint(self, test_user, bank_account):
+        txn = _txn(test_user, bank_account, '450.00', datetime(2025, 4, 1, 9))
+        assert txn.fingerprint == txn.compute_fingerprint() != ''
+        txn.amount = Decimal('460.00')
+        txn.save()
+        txn.refresh_from_db()
+        assert txn.fingerprint == transaction_fingerprint(
+            txn.account_content_type_id, bank_account.pk, txn.datetime_ist, 'expense', '460', 'swiggy order'
+        )
+
+    def test_groups_same_account_and_amount_within_window(self, test_user, other_user, bank_account, credit_card):
+        first = _txn(test_user, bank_account, '450.00', datetime(2025, 4, 1, 9))
+        second = _txn(test_user, bank_account, '450.00', datetime(2025, 4, 3, 20), purpose='Dinner')
+        # Chained: within 3 days of the previous row of the group
+        third = _txn(test_user, bank_account, '450.00', datetime(2025, 4, 6, 8))
+        # Outside the window, different amount, account or type, deleted, other user
+        _txn(test_user, bank_account, '450.00', datetime(2025, 5, 1))
+        _txn(test_user, bank_account, '451.00', datetime(2025, 4, 1))
+        _txn(test_user, credit_card, '450.00', datetime(2025, 4, 1))
+        _txn(test_user, bank_account, '450.00', datetime(2025, 4, 2), transaction_type='income')
+        _txn(test_user, bank_account, '450.00', datetime(2025, 4, 2)).delete()
+        _txn(other_user, bank_account, '450.00', datetime(2025, 4, 2))
+        newer_a = _txn(test_user, credit_card, '99.00', datetime(2025, 6, 1))
+        newer_b = _txn(test_user, credit_card, '99.00', datetime(2025, 6, 1))
+
+        with CaptureQueriesContext(connection) as captured:
+            groups = find_near_duplicates(
+                Transaction.objects.all(), test_user, Transaction.NEAR_DUPLICATE_FIELDS, days=3
+            )
+
+        # One grouping query plus one to load the rows
+        assert len(captured.captured_queries) == 2
+        assert groups == [[newer_a, newer_b], [first, second, third]]
+
+        assert find_near_duplicates(
+            Transaction.objects.all(), test_user, Transaction.NEAR_DUPLICATE_FIELDS, max_groups=1
+        ) == [[newer_a, newer_b]]
+
+    def test_transfer_groups_and_duplicates_page(self, client, test_user, bank_account, credit_card):
+        for day in (1, 2):
+            Transfer.objects.create(
+                user=test_user, amount=Decimal('300.00'), method_type='upi', memo='Card bill',
+                from_account=bank_account, to_account=credit_card, datetime_ist=datetime(2025, 4, day, 9),
+            )
+        _txn(test_user, bank_account, '450.00', datetime(2025, 4, 1, 9))
+        _txn(test_user, bank_account, '450.00', datetime(2025, 4, 1, 18))
+
+        client.force_login(test_user)
+        response = client.get(reverse('transactions:transaction_duplicates'))
+        assert response.status_code == 200
+        transaction_groups = response.context['transaction_groups']
+        assert len(transaction_groups) == 1
+        assert all(txn.is_exact_duplicate for txn in transaction_groups[0])
+        transfer_groups = response.context['transfer_groups']
+        assert len(transfer_groups) == 1
+        # Different days: a near duplicate but not an exact one
+        assert not any(transfer.is_exact_duplicate for transfer in transfer_groups[0])
+        assert 'Card bill' in response.content.decode()
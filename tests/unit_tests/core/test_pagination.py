@@ -0,0 +1,111 @@
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from django.http import QueryDict
+from django.urls import reverse
+from core.pagination import KeysetPaginator, decode_cursor
+from transactions.models import Transaction
+
+
+def _params(query):
+    return QueryDict(query)
+
+
+@pytest.mark.django_db
+class TestKeysetPaginator:
+    @pytest.fixture
+    def transactions(self, test_user, bank_account):
+        base = datetime(2025, 1, 1, 10, 0)
+        items = []
+        for i in range(45):
+            # Pairs share a timestamp so the id tie-breaker matters
+            items.append(Transaction.objects.create(
+                user=test_user,
+                account=bank_account,
+                transaction_type='expense',
+                amount=Decimal('10.00'),
+                datetime_ist=base + timedelta(hours=i // 2),
+                purpose=f'Txn {i}',
+            ))
+        return items
+
+    def test_walks_all_pages_in_order(self, transactions, django_assert_num_queries):
+        queryset = Transaction.objects.all()
+        expected = [t.pk for t in sorted(transactions, key=lambda t: (t.datetime_ist, t.pk), reverse=True)]
+
+        seen = []
+        params = _params('view=transactions')
+        pages = 0
+        while True:
+            paginator = KeysetPaginator(queryset, 20, count=None)
+            with django_assert_num_queries(1):
+                page = paginator.get_page(params)
+            seen += [t.pk for t in page]
+            pages += 1
+            if not page.has_next():
+                break
+            params = _params(page.next_query)
+            assert params['view'] == 'transactions'
+
+        assert pages == 3
+        assert seen == expected
+
+        # Going back from the last page returns the previous 20 rows
+        previous = KeysetPaginator(queryset, 20).get_page(_params(page.previous_query))
+        assert [t.pk for t in previous] == expected[20:40]
+        assert previous.has_next() and previous.has_previous()
+
+        last = KeysetPaginator(queryset, 20).get_page(_params(page.last_query))
+        assert [t.pk for t in last] == expected[-20:]
+        assert not last.has_next()
+
+    def test_count_modes_and_bad_cursor(self, transactions):
+        queryset = Transaction.objects.all()
+        page = KeysetPaginator(queryset, 20, count='exact').get_page(_params('cursor=garbage'))
+        assert not page.has_previous()
+        assert page.count == 45
+
+        # Everything fits on one page: exact count without an extra query
+        page = KeysetPaginator(queryset, 50).get_page(_params(''))
+        assert page.count == 45
+        assert not page.count_is_estimate
+
+        # Otherwise the planner estimate is used instead of COUNT(*)
+        page = KeysetPaginator(queryset, 20).get_page(_params(''))
+        assert page.count_is_estimate
+        assert isinstance(page.count, int)
+
+        direction, key = decode_cursor(_params(
+            KeysetPaginator(queryset, 20).get_page(_params('')).next_query
+        )['cursor'])
+        assert direction == 'next'
+        assert key[1] == sorted(transactions, key=lambda t: (t.datetime_ist, t.pk), reverse=True)[19].pk
+
+    def test_transaction_list_uses_cursor(self, client, test_user, transactions):
+        client.force_login(test_user)
+        url = reverse('transactions:transaction_list')
+        first = client.get(url)
+        assert first.status_code == 200
+        second = client.get(url + '?' + first.context['page_obj'].next_query)
+        assert second.status_code == 200
+        assert second.context['page_obj'][0].pk not in [t.pk for t in first.context['page_obj']]
+
+    def test_search_pages_through_tied_ranks(self, client, test_user, bank_account):
+        for i in range(45):
+            Transaction.objects.create(
+                user=test_user, account=bank_account, transaction_type='expense', amount=Decimal('10.00'),
+                datetime_ist=datetime(2025, 1, 1, 10, 0) + timedelta(hours=i), purpose='swiggy dinner',
+            )
+        client.force_login(test_user)
+        url = reverse('transactions:transaction_list')
+
+        seen = []
+        query = 'search=swiggy'
+        for _ in range(4):
+            page = client.get(f'{url}?{query}').context['page_obj']
+            seen += [t.pk for t in page]
+            if not page.has_next():
+                break
+            query = page.next_query
+        assert len(seen) == 45
+        assert len(set(seen)) == 45
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import pytest
+from io import StringIO
+from cryptography.fernet import Fernet, MultiFernet
+from encrypted_model_fields import fields as encrypted_fields
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+
+from accounts.models import BankAccount
+
+NEW_KEY = Fernet.generate_key().decode()
+
+
+def _stored(table, column, pk):
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT {column} FROM {table} WHERE id = %s', [pk])
+        return cursor.fetchone()[0]
+
+
+def _rotate(tmp_path, *args):
+    out = StringIO()
+    with override_settings(FIELD_ENCRYPTION_KEY=[NEW_KEY, *settings.FIELD_ENCRYPTION_KEY]):
+        call_command(
+            'rotate_encryption_key', '--checkpoint', str(tmp_path / 'checkpoint.json'), *args, stdout=out
+        )
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+class TestRotateEncryptionKey:
+    def test_reencrypts_every_encrypted_column(self, tmp_path, test_user, credit_card):
+        accounts = [
+            BankAccount.objects.create(user=test_user, name=f'Bank {i}', account_number=f'50100000000{i}')
+            for i in range(5)
+        ]
+
+        output = _rotate(tmp_path, '--chunk-size', '2', '--workers', '2')
+
+        new = Fernet(NEW_KEY)
+        for account in accounts:
+            assert new.decrypt(_stored('bank_accounts', 'account_number', account.pk).encode()).decode() == (
+                account.account_number
+            )
+        assert new.decrypt(_stored('credit_cards', 'cvv', credit_card.pk).encode()) == b'123'
+        assert 'rows/s' in output
+        assert not (tmp_path / 'checkpoint.json').exists()
+
+        # Values under the new key are left alone on a second run
+        token = _stored('bank_accounts', 'account_number', accounts[0].pk)
+        assert 'Re-encrypted 0 values' in _rotate(tmp_path, '--workers', '1')
+        assert _stored('bank_accounts', 'account_number', accounts[0].pk) == token
+
+    def test_resumes_from_checkpoint(self, tmp_path, test_user):
+        first, second = [
+            BankAccount.objects.create(user=test_user, name=f'Bank {i}', account_number=f'50100000000{i}')
+            for i in range(2)
+        ]
+        old_token = _stored('bank_accounts', 'account_number', first.pk)
+        (tmp_path / 'checkpoint.json').write_text(json.dumps({
+            'key_id': hashlib.sha256(NEW_KEY.encode()).hexdigest()[:16],
+            'models': {'accounts.BankAccount': {'last_pk': first.pk, 'done': False}},
+        }))
+
+        _rotate(tmp_path, '--workers', '1')
+        assert _stored('bank_accounts', 'account_number', first.pk) == old_token
+        assert _stored('bank_accounts', 'account_number', second.pk) != old_token
+
+        _rotate(tmp_path, '--workers', '1', '--restart')
+        assert _stored('bank_accounts', 'account_number', first.pk) != old_token
+
+    def test_instance_loaded_before_rotation(self, tmp_path, monkeypatch, test_user):
+        account = BankAccount.objects.create(user=test_user, name='Bank', account_number='501000000001')
+        stale = BankAccount.objects.with_encrypted().get(pk=account.pk)
+
+        # The app restarted with FIELD_ENCRYPTION_KEY=new,old while stale was loaded
+        keys = [NEW_KEY, *settings.FIELD_ENCRYPTION_KEY]
+        monkeypatch.setattr(encrypted_fields, 'CRYPTER', MultiFernet([Fernet(key) for key in keys]))
+        _rotate(tmp_path, '--workers', '1')
+
+        with override_settings(FIELD_ENCRYPTION_KEY=keys):
+            stale.name = 'Renamed'
+            stale.save()
+        token = _stored('bank_accounts', 'account_number', account.pk)
+        assert Fernet(NEW_KEY).decrypt(token.encode()) == b'501000000001'
+
+        # Ciphertext under the primary key is written back as it is
+        with override_settings(FIELD_ENCRYPTION_KEY=keys):
+            BankAccount.objects.with_encrypted().get(pk=account.pk).save()
+        assert _stored('bank_accounts', 'account_number', account.pk) == token
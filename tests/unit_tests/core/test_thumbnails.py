@@ -0,0 +1,104 @@
+import io
+import os
+import pytest
+from io import StringIO
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import RequestFactory
+from django.urls import reverse
+from PIL import Image
+
+from accounts.models import BankAccount
+from core.thumbnails import THUMBNAIL_SIZES, thumbnail_name, thumbnail_names
+from core.views import serve_thumbnail
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def _image(name='photo.jpg', size=(1600, 1200), mode='RGB'):
+    """A noisy image, which compresses about as badly as a real photo."""
+    image = Image.frombytes(mode, size, os.urandom(size[0] * size[1] * len(mode)))
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG' if name.endswith('.png') else 'JPEG', quality=90)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+@pytest.mark.django_db
+class TestAccountPictureThumbnails:
+    def test_upload_stores_hashed_picture_and_thumbnails(self, test_user, bank_account):
+        bank_account.picture = _image()
+        bank_account.save()
+
+        name = BankAccount.objects.get(pk=bank_account.pk).picture.name
+        assert name.startswith('account_pictures/') and name.endswith('.jpg')
+        names = thumbnail_names(name)
+        assert len(names) == 2 * len(THUMBNAIL_SIZES)
+        for thumbnail in names:
+            assert default_storage.exists(thumbnail)
+        with default_storage.open(thumbnail_name(name, 'sm', 'webp')) as file, Image.open(file) as image:
+            assert image.format == 'WEBP'
+            assert image.size == (THUMBNAIL_SIZES['sm'], THUMBNAIL_SIZES['sm'])
+
+        # The same content uploaded again reuses the stored file
+        other = BankAccount.objects.create(user=test_user, name='Other', account_type='savings')
+        other.picture = SimpleUploadedFile('copy.jpg', default_storage.open(name).read())
+        other.save()
+        assert other.picture.name == name
+        assert len(os.listdir(default_storage.path('account_pictures'))) == 1
+
+    def test_transparent_pictures_fall_back_to_png(self, bank_account):
+        bank_account.picture = _image('logo.png', size=(300, 200), mode='RGBA')
+        bank_account.save()
+        name = bank_account.picture.name
+        assert name.endswith('.png')
+        with default_storage.open(thumbnail_name(name, 'md', 'png')) as file, Image.open(file) as image:
+            assert image.mode == 'RGBA'
+            assert image.size == (128, 128)
+
+    def test_list_serves_thumbnails(self, client, test_user, bank_account):
+        bank_account.picture = _image()
+        bank_account.save()
+        name = bank_account.picture.name
+
+        client.force_login(test_user)
+        content = client.get(reverse('account_list')).content.decode()
+        webp = thumbnail_name(name, 'sm', 'webp')
+        assert f'/media/{webp}' in content
+        assert f'/media/{thumbnail_name(name, "sm", "jpg")}' in content
+        assert f'/media/{name}"' not in content
+        # The icon is more than an order of magnitude lighter than the upload
+        assert default_storage.size(webp) * 10 < default_storage.size(name)
+
+        request = RequestFactory().get(f'/media/{webp}')
+        response = serve_thumbnail(request, webp.split('/', 1)[1])
+        assert response.status_code == 200
+        assert response['Cache-Control'] == 'public, max-age=31536000, immutable'
+
+    def test_backfill_command(self, client, test_user, bank_account):
+        legacy = default_storage.save('account_pictures/logo.jpg', ContentFile(_image().read()))
+        BankAccount.objects.filter(pk=bank_account.pk).update(picture=legacy)
+
+        # Shown full size until the thumbnails exist
+        client.force_login(test_user)
+        assert f'/media/{legacy}"' in client.get(reverse('account_list')).content.decode()
+
+        out = StringIO()
+        call_command('generate_account_thumbnails', stdout=out)
+        assert 'Processed 1 pictures' in out.getvalue()
+        assert '1 renamed' in out.getvalue()
+
+        name = BankAccount.objects.get(pk=bank_account.pk).picture.name
+        assert name != legacy
+        for thumbnail in thumbnail_names(name):
+            assert default_storage.exists(thumbnail)
+
+        out = StringIO()
+        call_command('generate_account_thumbnails', stdout=out)
+        assert '0 renamed' in out.getvalue()
+        assert 'thumbnails written' not in out.getvalue()
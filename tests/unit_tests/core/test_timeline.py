@@ -0,0 +1,123 @@
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from django.db import connection
+from django.http import QueryDict
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import BankAccountBalance
+from categories.models import Category
+from core.timeline import AccountActivityPaginator
+from transactions.models import Transaction
+from transfers.models import Transfer
+
+
+@pytest.mark.django_db
+class TestAccountActivity:
+    @pytest.fixture
+    def history(self, test_user, bank_account, credit_card):
+        """Opening 1000, +500 salary, -200 food, -300 card payment, +50 refund → 1050."""
+        category = Category.objects.create(user=test_user, name='Food', type='expense')
+        rows = [
+            ('income', '500.00', datetime(2025, 1, 1, 9), None),
+            ('expense', '200.00', datetime(2025, 1, 2, 9), category),
+        ]
+        for transaction_type, amount, when, cat in rows:
+            Transaction.objects.create(
+                user=test_user, transaction_type=transaction_type, amount=Decimal(amount),
+                account=bank_account, method_type='upi', purpose=f'{transaction_type} row',
+                category=cat, datetime_ist=when,
+            )
+        Transfer.objects.create(
+            user=test_user, amount=Decimal('300.00'), method_type='upi', memo='Card payment',
+            from_account=bank_account, to_account=credit_card, datetime_ist=datetime(2025, 1, 3, 9),
+        )
+        Transfer.objects.create(
+            user=test_user, amount=Decimal('50.00'), method_type='upi', memo='Refund',
+            from_account=credit_card, to_account=bank_account, datetime_ist=datetime(2025, 1, 4, 9),
+        )
+        BankAccountBalance.objects.filter(account=bank_account).update(balance_amount=Decimal('1050.00'))
+
+    def test_running_balance_anchored_to_materialized_balance(self, bank_account, history):
+        page = AccountActivityPaginator(bank_account).get_page(QueryDict())
+
+        assert [entry['description'] for entry in page] == ['Refund', 'Card payment', 'expense row', 'income row']
+        assert [entry['balance_after'] for entry in page] == [
+            Decimal('1050.00'), Decimal('1000.00'), Decimal('1300.00'), Decimal('1500.00'),
+        ]
+        assert page[0]['entry_type'] == 'incoming'
+        assert page[0]['counterparty_display'] == '💳 Test Card'
+        assert page[2]['category_name'] == 'food'
+
+    def test_keyset_pages_keep_running_balance(self, bank_account, history):
+        paginator = AccountActivityPaginator(bank_account, per_page=3)
+        first = paginator.get_page(QueryDict())
+        assert first.has_next()
+
+        second = paginator.get_page(QueryDict(first.next_query))
+        assert [entry['description'] for entry in second] == ['income row']
+        assert second[0]['balance_after'] == Decimal('1500.00')
+        assert not second.has_next()
+
+        back = paginator.get_page(QueryDict(second.previous_query))
+        assert [entry['id'] for entry in back] == [entry['id'] for entry in first]
+
+    def test_account_detail_fetches_feed_in_one_query(self, client, test_user, bank_account, history):
+        client.force_login(test_user)
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(reverse('account_detail', args=[bank_account.pk]))
+        assert response.status_code == 200
+        assert len(response.context['activity']) == 4
+        feed_queries = [q for q in captured.captured_queries if 'UNION ALL' in q['sql']]
+        assert len(feed_queries) == 1
+        assert not [q for q in captured.captured_queries
+                    if 'FROM "transactions"' in q['sql'] or 'FROM "transfers"' in q['sql']]
+
+    def test_every_direction_matches_single_page(self, test_user, bank_account, credit_card, history):
+        for day in range(5, 25):
+            Transaction.objects.create(
+                user=test_user, transaction_type='expense' if day % 3 else 'income', amount=Decimal(day),
+                account=bank_account, method_type='upi', purpose=f'row {day}', datetime_ist=datetime(2025, 1, day, 9),
+            )
+            Transfer.objects.create(
+                user=test_user, amount=Decimal('7.00'), method_type='upi', memo=f'transfer {day}',
+                from_account=bank_account, to_account=credit_card, datetime_ist=datetime(2025, 1, day, 9),
+            )
+        bank_account.refresh_from_db()
+        expected = [
+            (entry['sort_id'], entry['balance_after'])
+            for entry in AccountActivityPaginator(bank_account, per_page=100).get_page(QueryDict())
+        ]
+        assert expected[0][1] == bank_account.get_current_balance()
+
+        paginator = AccountActivityPaginator(bank_account, per_page=6)
+        pages = [paginator.get_page(QueryDict())]
+        while pages[-1].has_next():
+            pages.append(paginator.get_page(QueryDict(pages[-1].next_query)))
+        assert [(entry['sort_id'], entry['balance_after']) for page in pages for entry in page] == expected
+
+        back = paginator.get_page(QueryDict(pages[-1].previous_query))
+        assert [(entry['sort_id'], entry['balance_after']) for entry in back] == [
+            (entry['sort_id'], entry['balance_after']) for entry in pages[-2]
+        ]
+
+        last = paginator.get_page(QueryDict(pages[0].last_query))
+        assert [(entry['sort_id'], entry['balance_after']) for entry in last] == expected[-6:]
+
+    def test_cursor_stays_correct_after_older_rows_change(self, test_user, bank_account, history):
+        paginator = AccountActivityPaginator(bank_account, per_page=2)
+        next_query = paginator.get_page(QueryDict()).next_query
+
+        # Backdated after the cursor was handed out: every later balance moves
+        Transaction.objects.create(
+            user=test_user, transaction_type='income', amount=Decimal('25.00'), account=bank_account,
+            method_type='upi', purpose='backdated row', datetime_ist=datetime(2024, 12, 31, 9),
+        )
+        second = paginator.get_page(QueryDict(next_query))
+        assert [entry['description'] for entry in second] == ['expense row', 'income row']
+        assert [entry['balance_after'] for entry in second] == [
+            entry['balance_after']
+            for entry in AccountActivityPaginator(bank_account, per_page=100).get_page(QueryDict())
+            if entry['description'] in ('expense row', 'income row')
+        ]
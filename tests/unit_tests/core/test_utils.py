@@ -68,3 +68,36 @@ class TestCoreUtils:
         assert isinstance(choices[0], tuple)
         assert '|bankaccount' in choices[0][0]
         assert '🏦 Bank' in choices[0][1]
+
+    def test_resolve_generic_accounts(self, test_user, bank_account, credit_card, django_assert_num_queries):
+        from django.contrib.contenttypes.models import ContentType
+        from django.utils import timezone
+        from core.utils import resolve_generic_accounts
+        from transactions.templatetags.transaction_tags import get_transfer_from_account, get_transfer_to_account
+        from transfers.models import Transfer
+
+        bank_ct = ContentType.objects.get_for_model(bank_account)
+        card_ct = ContentType.objects.get_for_model(credit_card)
+        for i in range(5):
+            Transfer.objects.create(
+                user=test_user,
+                datetime_ist=timezone.now(),
+                amount=Decimal('100.00'),
+                from_account_content_type=bank_ct,
+                from_account_object_id=bank_account.id,
+                to_account_content_type=card_ct,
+                to_account_object_id=credit_card.id,
+                method_type='upi',
+                memo=f'Card payment {i}'
+            )
+
+        # One query for the transfers plus one per account model
+        with django_assert_num_queries(3):
+            transfers = resolve_generic_accounts(
+                Transfer.objects.filter(user=test_user), ('from_account', 'to_account')
+            )
+            names = [(t.from_account.name, t.to_account.name) for t in transfers]
+            displays = [(get_transfer_from_account(t), get_transfer_to_account(t)) for t in transfers]
+
+        assert names == [('Test Bank', 'Test Card')] * 5
+        assert displays == [('🏦 Test Bank', '💳 Test Card')] * 5
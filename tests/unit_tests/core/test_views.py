@@ -31,3 +31,20 @@ class TestCoreViews:
         assert 'stats' in response.context
         assert response.context['stats']['net_worth'] == Decimal('5000.00')
         assert response.context['stats']['total_banks'] == 1
+
+    def test_dashboard_query_count_is_constant(self, client, test_user):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        client.force_login(test_user)
+        url = reverse('dashboard')
+
+        def query_count():
+            with CaptureQueriesContext(connection) as ctx:
+                assert client.get(url).status_code == 200
+            return len(ctx.captured_queries)
+
+        BankAccount.objects.create(user=test_user, name='Bank 0', opening_balance=Decimal('100.00'))
+        baseline = query_count()
+        for i in range(1, 6):
+            BankAccount.objects.create(user=test_user, name=f'Bank {i}', opening_balance=Decimal('100.00'))
+        assert query_count() == baseline
@@ -0,0 +1,133 @@
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.urls import reverse
+
+from creditcards.models import CreditCard, CreditCardBalance
+from creditcards.services import StatementService
+from ledger.services import LedgerService
+from transactions.models import Transaction
+from transactions.services import TransactionService
+from transfers.models import Transfer
+
+
+def _expense(user, card, amount, when):
+    journal_entry = LedgerService.create_simple_entry(
+        user=user, transaction_type='expense', account=card,
+        amount=Decimal(amount), occurred_at=when, memo=f'expense {amount}',
+    )
+    txn = Transaction(
+        user=user, transaction_type='expense', amount=Decimal(amount), account=card,
+        method_type='card', purpose=f'Purchase {amount}', datetime_ist=when, journal_entry=journal_entry,
+    )
+    txn.save(skip_validation=True)
+    return txn
+
+
+def _payment(user, bank_account, card, amount, when):
+    journal_entry, _, _ = LedgerService.create_transfer_entry(
+        user=user, occurred_at=when, amount=Decimal(amount),
+        from_account=bank_account, to_account=card, memo='Card bill',
+    )
+    return Transfer.objects.create(
+        user=user, amount=Decimal(amount), method_type='upi', memo='Card bill',
+        from_account=bank_account, to_account=card, datetime_ist=when, journal_entry=journal_entry,
+    )
+
+
+class TestBillingCycles:
+    def test_cycle_bounds_clamp_to_short_months(self):
+        card = CreditCard(billing_day=31, due_day=30)
+        assert StatementService.cycle_start(card, date(2025, 3, 15)) == date(2025, 2, 28)
+        assert StatementService.next_cycle_start(card, date(2025, 2, 28)) == date(2025, 3, 31)
+        assert StatementService.due_date(card, date(2025, 3, 30)) == date(2025, 4, 30)
+        assert StatementService.due_date(card, date(2025, 1, 30)) == date(2025, 2, 28)
+
+        card = CreditCard(billing_day=5, due_day=25)
+        assert StatementService.cycle_start(card, date(2025, 1, 4)) == date(2024, 12, 5)
+        assert StatementService.due_date(card, date(2025, 2, 4)) == date(2025, 2, 25)
+
+    def test_minimum_due(self):
+        assert StatementService.minimum_due(Decimal('50.00')) == Decimal('0.00')
+        assert StatementService.minimum_due(Decimal('-150.00')) == Decimal('150.00')
+        assert StatementService.minimum_due(Decimal('-1000.00')) == Decimal('200.00')
+        assert StatementService.minimum_due(Decimal('-10000.00')) == Decimal('500.00')
+
+
+@pytest.mark.django_db
+class TestStatements:
+    @pytest.fixture
+    def card(self, credit_card):
+        credit_card.billing_day = 5
+        credit_card.due_day = 25
+        credit_card.save()
+        return credit_card
+
+    def test_statements_follow_postings(self, test_user, bank_account, card):
+        _expense(test_user, card, '1000.00', datetime(2025, 4, 10, 12))
+        april_refund = _expense(test_user, card, '300.00', datetime(2025, 4, 20, 9))
+        # Statement date 4 May: still the April cycle
+        _expense(test_user, card, '500.00', datetime(2025, 5, 4, 23))
+        _payment(test_user, bank_account, card, '1200.00', datetime(2025, 5, 15, 10))
+        _expense(test_user, card, '10000.00', datetime(2025, 5, 20, 10))
+
+        # Balance updates mark the statements stale from the posting date
+        assert CreditCardBalance.objects.get(account=card).statements_stale_from == date(2025, 4, 10)
+
+        april = StatementService.get_statement(card, date(2025, 4, 30))
+        assert (april.period_start, april.period_end, april.due_date) == (
+            date(2025, 4, 5), date(2025, 5, 4), date(2025, 5, 25)
+        )
+        assert april.opening_balance == Decimal('0.00')
+        assert april.purchases == Decimal('1800.00') and april.payments == Decimal('0.00')
+        assert april.closing_balance == Decimal('-1800.00')
+        assert april.minimum_due == Decimal('200.00')
+        assert april.transaction_count == 3
+        assert CreditCardBalance.objects.get(account=card).statements_stale_from is None
+
+        may = StatementService.get_statement(card, date(2025, 5, 5))
+        assert may.opening_balance == april.closing_balance
+        assert may.payments == Decimal('1200.00')
+        assert may.closing_balance == Decimal('-10600.00')
+        assert may.minimum_due == Decimal('530.00')
+
+        # The newest statement is the current cycle, and it matches the balance
+        statements = list(StatementService.get_statements(card))
+        assert statements[0].period_start <= date.today() <= statements[0].period_end
+        assert statements[0].closing_balance == CreditCardBalance.objects.get(account=card).balance_amount
+        assert [s.period_start for s in statements] == sorted((s.period_start for s in statements), reverse=True)
+
+        # Deleting a transaction only recalculates from its cycle on
+        unchanged = set(card.statements.filter(period_end__lt=date(2025, 4, 5)).values_list('pk', flat=True))
+        TransactionService.bulk_delete(test_user, [april_refund.pk])
+        assert CreditCardBalance.objects.get(account=card).statements_stale_from == date(2025, 4, 20)
+        april = StatementService.get_statement(card, date(2025, 4, 30))
+        assert april.purchases == Decimal('1500.00')
+        assert StatementService.get_statements(card)[0].closing_balance == Decimal('-10300.00')
+        assert set(card.statements.filter(period_end__lt=date(2025, 4, 5)).values_list('pk', flat=True)) == unchanged
+
+    def test_billing_day_change_rebuilds_statements(self, test_user, card):
+        _expense(test_user, card, '400.00', datetime(2025, 4, 10, 12))
+        assert StatementService.get_statement(card, date(2025, 4, 10)).period_start == date(2025, 4, 5)
+
+        card.billing_day = 15
+        card.save()
+        assert not card.statements.exists()
+        statement = StatementService.get_statement(card, date(2025, 4, 10))
+        assert statement.period_start == date(2025, 3, 15)
+        assert statement.purchases == Decimal('400.00')
+
+    def test_backfill_command_and_detail_page(self, client, test_user, card):
+        _expense(test_user, card, '250.00', datetime(2025, 6, 6, 12))
+        out = StringIO()
+        call_command('backfill_card_statements', '--user', test_user.username, stdout=out)
+        assert 'Built' in out.getvalue()
+        assert card.statements.get(period_start=date(2025, 6, 5)).purchases == Decimal('250.00')
+        assert CreditCardBalance.objects.get(account=card).statements_stale_from is None
+
+        client.force_login(test_user)
+        response = client.get(reverse('creditcard_detail', args=[card.pk]))
+        assert response.status_code == 200
+        assert len(response.context['statements']) == 12
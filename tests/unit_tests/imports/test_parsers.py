@@ -0,0 +1,92 @@
+import io
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from imports.parsers import PARSERS, detect_parser, guess_method_type
+
+
+HDFC_CSV = """HDFC BANK Ltd.,,,,,,
+Account No :,50100012345678,,,,,
+Date,Narration,Chq./Ref.No.,Value Dt,Withdrawal Amt.,Deposit Amt.,Closing Balance
+01/04/24,UPI-SWIGGY-12345,0000412345,01/04/24,450.00,,"1,04,550.00"
+02/04/24,NEFT CR-ACME CORP SALARY,N123456,02/04/24,,"85,000.00","1,89,550.00"
+*****,,,,,,
+"""
+
+OFX_SGML = """OFXHEADER:100
+DATA:OFXSGML
+<OFX>
+<BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20240405120000[+5:30:IST]
+<TRNAMT>-1200.50
+<FITID>FIT001
+<NAME>ELECTRICITY BILL
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20240406
+<TRNAMT>300.00
+<FITID>FIT002
+<NAME>REFUND
+<MEMO>Amazon
+</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1>
+</OFX>
+"""
+
+
+class TestStatementParsers:
+    def test_hdfc_csv_skips_preamble_and_footer(self):
+        parser = detect_parser(SimpleUploadedFile('statement.csv', HDFC_CSV.encode()))
+        assert parser.key == 'hdfc'
+
+        rows = list(parser.parse(io.StringIO(HDFC_CSV)))
+        assert len(rows) == 2
+        assert rows[0]['line_number'] == 4
+        assert rows[0]['datetime_ist'] == datetime(2024, 4, 1)
+        assert rows[0]['transaction_type'] == 'expense'
+        assert rows[0]['amount'] == Decimal('450.00')
+        assert rows[0]['reference'] == '0000412345'
+        assert rows[1]['transaction_type'] == 'income'
+        assert rows[1]['amount'] == Decimal('85000.00')
+
+    def test_kotak_amount_with_dr_cr_indicator(self):
+        content = (
+            "Sl. No.,Transaction Date,Value Date,Description,Chq / Ref No.,Amount,Dr / Cr,Balance\n"
+            "1,05-04-2024,05-04-2024,POS AMAZON,REF1,\"2,499.00\",DR,10000.00\n"
+            "2,06-04-2024,06-04-2024,INTEREST,,12.00,CR,10012.00\n"
+        )
+        parser = detect_parser(SimpleUploadedFile('kotak.csv', content.encode()))
+        assert parser.key == 'kotak'
+        rows = list(parser.parse(io.StringIO(content)))
+        assert [(row['transaction_type'], row['amount']) for row in rows] == [
+            ('expense', Decimal('2499.00')), ('income', Decimal('12.00')),
+        ]
+
+    def test_ofx_sgml(self):
+        parser = detect_parser(SimpleUploadedFile('statement.ofx', OFX_SGML.encode()))
+        assert parser.key == 'ofx'
+        rows = list(parser.parse(io.StringIO(OFX_SGML)))
+        assert rows[0]['datetime_ist'] == datetime(2024, 4, 5, 12, 0)
+        assert rows[0]['transaction_type'] == 'expense'
+        assert rows[0]['amount'] == Decimal('1200.50')
+        assert rows[0]['reference'] == 'FIT001'
+        assert rows[1]['description'] == 'REFUND Amazon'
+        assert rows[1]['transaction_type'] == 'income'
+
+    def test_unrecognized_file(self):
+        with pytest.raises(ValidationError):
+            detect_parser(SimpleUploadedFile('notes.csv', b'foo,bar\n1,2\n'))
+        with pytest.raises(ValidationError):
+            list(PARSERS['hdfc'].parse(io.StringIO('foo,bar\n1,2\n')))
+
+    def test_guess_method_type(self):
+        assert guess_method_type('UPI-SWIGGY-12345') == 'upi'
+        assert guess_method_type('NEFT CR-ACME CORP') == 'imps_neft_rtgs'
+        assert guess_method_type('Interest credit') is None
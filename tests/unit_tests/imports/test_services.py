@@ -0,0 +1,104 @@
+from decimal import Decimal
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from imports.models import StatementImport
+from imports.services import ImportService
+from ledger.models import JournalEntry, Posting
+from transactions.models import Transaction
+
+
+def _statement(lines):
+    header = "Date,Narration,Chq./Ref.No.,Value Dt,Withdrawal Amt.,Deposit Amt.,Closing Balance\n"
+    body = ''.join(
+        f"{day:02d}/04/24,{narration},REF{i},{day:02d}/04/24,{debit},{credit},0\n"
+        for i, (day, narration, debit, credit) in enumerate(lines)
+    )
+    return SimpleUploadedFile('statement.csv', (header + body).encode())
+
+
+@pytest.mark.django_db
+class TestImportService:
+    def test_stage_and_commit_large_statement_in_batches(self, test_user, bank_account):
+        # 5,000 lines: 2,500 debits of 10.00 and 2,500 credits of 30.00 → net +50,000
+        lines = [
+            (1 + i % 28, f'UPI-MERCHANT-{i}', '10.00', '') if i % 2 == 0 else (1 + i % 28, f'NEFT CR-{i}', '', '30.00')
+            for i in range(5000)
+        ]
+        statement_import = ImportService.stage(test_user, bank_account, _statement(lines))
+        assert statement_import.row_count == 5000
+        assert statement_import.status == 'staged'
+
+        statement_import.rows.filter(line_number=2).update(include=False)  # first debit
+
+        with CaptureQueriesContext(connection) as captured:
+            statement_import = ImportService.commit(statement_import)
+
+        assert statement_import.status == 'committed'
+        assert statement_import.committed_count == 4999
+        assert Transaction.objects.filter(user=test_user).count() == 4999
+        assert JournalEntry.objects.filter(user=test_user).count() == 4999
+        assert Posting.objects.filter(account_object_id=bank_account.pk).count() >= 4999
+
+        bank_account.refresh_from_db()
+        assert bank_account.get_current_balance() == Decimal('1000.00') + Decimal('50010.00')
+
+        # Batched writes: no per-row statements, a single balance update
+        balance_updates = [q for q in captured.captured_queries if q['sql'].startswith('UPDATE "bank_account_balances"')]
+        assert len(balance_updates) == 1
+        assert len(captured.captured_queries) < 60
+
+        upi = Transaction.objects.filter(user=test_user, purpose='UPI-MERCHANT-2').get()
+        assert upi.method_type == 'upi'
+        assert upi.journal_entry.postings.count() == 2
+        upi.journal_entry.validate_balanced()
+
+    def test_commit_twice_and_cancel(self, test_user, bank_account):
+        statement_import = ImportService.stage(test_user, bank_account, _statement([(1, 'Coffee', '100.00', '')]))
+        ImportService.commit(statement_import)
+        with pytest.raises(ValidationError):
+            ImportService.commit(statement_import)
+
+        other = ImportService.stage(test_user, bank_account, _statement([(2, 'Tea', '50.00', '')]))
+        ImportService.cancel(other)
+        other.refresh_from_db()
+        assert other.status == 'cancelled'
+        assert not other.rows.exists()
+
+    def test_empty_statement_is_rejected(self, test_user, bank_account):
+        with pytest.raises(ValidationError):
+            ImportService.stage(test_user, bank_account, _statement([]))
+        assert not StatementImport.objects.exists()
+
+    def test_reimport_skips_lines_already_in_ledger(self, test_user, bank_account):
+        first = ImportService.stage(test_user, bank_account, _statement([
+            (1, 'Coffee', '100.00', ''),
+            (2, 'Salary', '', '500.00'),
+        ]))
+        ImportService.commit(first)
+
+        # Overlapping statement: both old lines, plus a second identical coffee and a new line
+        lines = [
+            (1, 'COFFEE', '100.00', ''),
+            (1, 'Coffee', '100.00', ''),
+            (2, 'Salary', '', '500.00'),
+            (3, 'Rent', '300.00', ''),
+        ]
+        with CaptureQueriesContext(connection) as captured:
+            second = ImportService.stage(test_user, bank_account, _statement(lines))
+        lookups = [q for q in captured.captured_queries if 'FROM "transactions"' in q['sql']]
+        assert len(lookups) == 1
+
+        rows = list(second.rows.order_by('line_number'))
+        assert [row.is_duplicate for row in rows] == [True, False, True, False]
+        assert [row.include for row in rows] == [False, True, False, True]
+
+        ImportService.commit(second)
+        assert Transaction.objects.filter(user=test_user, purpose__iexact='coffee').count() == 2
+        assert Transaction.objects.filter(user=test_user, purpose='Salary').count() == 1
+        committed = Transaction.objects.get(user=test_user, purpose='Rent')
+        assert committed.fingerprint == committed.compute_fingerprint()
@@ -0,0 +1,63 @@
+import pytest
+from decimal import Decimal
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+
+from categories.models import Category
+from imports.models import StatementImport
+from transactions.models import Transaction
+
+
+CSV = (
+    "Date,Description,Amount\n"
+    "2024-04-01,Groceries,-250.00\n"
+    "2024-04-02,Cashback,25.00\n"
+)
+
+
+@pytest.mark.django_db
+class TestImportViews:
+    def test_upload_review_and_commit(self, client, test_user, bank_account):
+        client.force_login(test_user)
+        category = Category.objects.create(user=test_user, name='Food', type='expense')
+
+        response = client.post(reverse('imports:import_upload'), {
+            'account': f'{bank_account.id}|bankaccount',
+            'statement_file': SimpleUploadedFile('export.csv', CSV.encode()),
+            'parser': '',
+        })
+        statement_import = StatementImport.objects.get(user=test_user)
+        assert response.status_code == 302
+        assert response.url == reverse('imports:import_review', args=[statement_import.pk])
+        assert statement_import.parser == 'generic'
+
+        response = client.get(response.url)
+        assert response.status_code == 200
+        rows = list(response.context['page_obj'])
+        assert len(rows) == 2
+
+        groceries, cashback = rows
+        response = client.post(reverse('imports:import_review', args=[statement_import.pk]), {
+            'action': 'commit',
+            'row_ids': [groceries.id, cashback.id],
+            f'include_{groceries.id}': 'on',
+            f'category_{groceries.id}': category.id,
+        })
+        assert response.status_code == 302
+
+        imported = Transaction.objects.get(user=test_user)
+        assert imported.purpose == 'Groceries'
+        assert imported.category == category
+        assert imported.amount == Decimal('250.00')
+        bank_account.refresh_from_db()
+        assert bank_account.get_current_balance() == Decimal('750.00')
+
+    def test_review_is_private(self, client, test_user, other_user, bank_account):
+        from imports.services import ImportService
+
+        statement_import = ImportService.stage(
+            test_user, bank_account, SimpleUploadedFile('export.csv', CSV.encode())
+        )
+        client.force_login(other_user)
+        response = client.get(reverse('imports:import_review', args=[statement_import.pk]))
+        assert response.status_code == 404
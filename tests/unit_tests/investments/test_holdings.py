@@ -0,0 +1,142 @@
+import importlib
+import pytest
+from datetime import date
+from django.apps import apps
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.urls import reverse
+
+from investments.models import Broker, Investment, InvestmentHolding, InvestmentTransaction
+from reports.models import UserFinancialSummary
+
+
+@pytest.fixture
+def investment(test_user):
+    broker = Broker.objects.create(user=test_user, name='Zerodha')
+    return Investment.objects.create(
+        user=test_user, broker=broker, name='TCS', symbol='TCS', current_price=Decimal('3500.00')
+    )
+
+
+def _trade(investment, transaction_type, quantity, price, day, fees='0.00'):
+    return InvestmentTransaction.objects.create(
+        investment=investment, transaction_type=transaction_type, date=day,
+        quantity=Decimal(quantity), price_per_unit=Decimal(price), fees=Decimal(fees),
+    )
+
+
+def _row(investment):
+    holding = InvestmentHolding.objects.get(investment=investment)
+    return holding.quantity, holding.cost_basis, holding.realized_pnl, holding.last_transaction_id
+
+
+def _rebuilt(investment):
+    InvestmentHolding.rebuild(investment)
+    return _row(investment)
+
+
+@pytest.mark.django_db
+class TestInvestmentHolding:
+    def test_transactions_keep_holding_current(self, investment):
+        _trade(investment, 'buy', '10', '3000.00', date(2025, 1, 10), fees='50.00')
+        _trade(investment, 'buy', '5', '3200.00', date(2025, 2, 10), fees='25.00')
+        sell = _trade(investment, 'sell', '5', '3400.00', date(2025, 3, 10), fees='20.00')
+
+        quantity, cost_basis, realized_pnl, last_transaction_id = _row(investment)
+        assert quantity == Decimal('10.00')
+        # 46075 - 46075 / 15 * 5
+        assert cost_basis == Decimal('30716.666667')
+        # 16980 proceeds - 15358.333333 average cost
+        assert realized_pnl == Decimal('1621.666667')
+        assert last_transaction_id == sell.pk
+        assert _row(investment) == _rebuilt(investment)
+
+        # Backdated buy, edit and delete replay the transactions
+        backdated = _trade(investment, 'buy', '2', '2900.00', date(2025, 1, 1))
+        assert _row(investment) == _rebuilt(investment)
+        assert _row(investment)[0] == Decimal('12.00')
+
+        backdated.quantity = Decimal('4')
+        backdated.save()
+        assert _row(investment)[0] == Decimal('14.00')
+        assert _row(investment) == _rebuilt(investment)
+
+        sell.delete()
+        assert _row(investment) == _rebuilt(investment)
+        assert _row(investment)[:3] == (Decimal('19.00'), Decimal('57675.000000'), Decimal('0'))
+        assert investment.total_quantity == Decimal('19.00')
+
+    def test_properties_read_the_row(self, investment, django_assert_num_queries):
+        _trade(investment, 'buy', '10', '3000.00', date(2025, 1, 10), fees='50.00')
+
+        investment = Investment.objects.select_related('holding').get(pk=investment.pk)
+        with django_assert_num_queries(0):
+            assert investment.total_quantity == Decimal('10.00')
+            assert investment.average_buy_price == Decimal('3005.00')
+            assert investment.total_invested == Decimal('30050.00')
+            assert investment.current_value == Decimal('35000.00')
+            assert investment.unrealized_pnl == Decimal('4950.00')
+            assert investment.realized_pnl == Decimal('0')
+
+    def test_missing_rows_are_read_without_saving(self, investment):
+        _trade(investment, 'buy', '10', '3000.00', date(2025, 1, 10))
+        InvestmentHolding.objects.all().delete()
+
+        holdings = Investment.bulk_holdings_data(Investment.objects.filter(pk=investment.pk))
+        assert holdings[investment.pk]['quantity'] == Decimal('10.00')
+        assert Investment.objects.get(pk=investment.pk).total_quantity == Decimal('10.00')
+        assert not InvestmentHolding.objects.exists()
+
+    def test_trade_without_row_yet(self, investment):
+        _trade(investment, 'buy', '10', '3000.00', date(2025, 1, 10))
+        InvestmentHolding.objects.all().delete()
+
+        _trade(investment, 'buy', '10', '3100.00', date(2025, 1, 11))
+        assert _row(investment)[0] == Decimal('20.00')
+        assert _row(investment) == _rebuilt(investment)
+
+    def test_summary_follows_trades(self, test_user, investment):
+        investment.current_price = Decimal('120.00')
+        investment.save()
+
+        _trade(investment, 'buy', '10', '100.00', date(2025, 1, 10))
+        assert UserFinancialSummary.objects.get(user=test_user).investment_value == Decimal('1200.00')
+
+        sell = _trade(investment, 'sell', '4', '110.00', date(2025, 1, 11))
+        assert UserFinancialSummary.objects.get(user=test_user).investment_value == Decimal('720.00')
+
+        sell.delete()
+        assert UserFinancialSummary.objects.get(user=test_user).investment_value == Decimal('1200.00')
+
+    def test_migration_backfill(self, investment):
+        _trade(investment, 'buy', '15', '3000.00', date(2025, 1, 10), fees='75.00')
+        _trade(investment, 'sell', '5', '3400.00', date(2025, 3, 10), fees='20.00')
+        expected = _row(investment)
+        InvestmentHolding.objects.all().delete()
+
+        migration = importlib.import_module('investments.migrations.0006_investmentholding')
+        migration.backfill_holdings(apps, None)
+        assert _row(investment) == expected
+
+    def test_rebuild_command(self, investment):
+        _trade(investment, 'buy', '10', '3000.00', date(2025, 1, 10))
+        InvestmentHolding.objects.filter(investment=investment).update(quantity=Decimal('3.00'))
+
+        out = StringIO()
+        call_command('rebuild_investment_holdings', user='testuser', stdout=out)
+        assert 'quantity 3.00 -> 10.00' in out.getvalue()
+        assert 'Rebuilt 1 holdings' in out.getvalue()
+        assert _row(investment)[0] == Decimal('10.00')
+
+    def test_list_queries_do_not_grow(self, client, test_user, investment, django_assert_max_num_queries):
+        for number in range(5):
+            other = Investment.objects.create(
+                user=test_user, broker=investment.broker, name=f'Stock {number}', current_price=Decimal('10.00')
+            )
+            _trade(other, 'buy', '1', '9.00', date(2025, 1, 10))
+        client.force_login(test_user)
+
+        with django_assert_max_num_queries(12):
+            response = client.get(reverse('investments:investment_list'))
+        assert response.status_code == 200
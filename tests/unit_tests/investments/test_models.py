@@ -116,3 +116,25 @@ class TestInvestmentModels:
             txn.full_clean()
         assert 'quantity' in excinfo.value.message_dict
         assert 'Cannot sell' in excinfo.value.message_dict['quantity'][0]
+
+
+@pytest.mark.django_db
+def test_import_investment_prices_command(tmp_path):
+    from django.core.management import call_command
+    from investments.models import InvestmentPrice
+
+    csv_path = tmp_path / 'prices.csv'
+    csv_path.write_text(
+        'symbol,date,price\n'
+        'infy,2025-01-31,1850.50\n'
+        'INFY,28/02/2025,"1,910.00"\n'
+        'TCS,not-a-date,4000\n'
+    )
+    call_command('import_investment_prices', str(csv_path))
+    assert InvestmentPrice.objects.count() == 2
+
+    # Re-importing overwrites prices instead of duplicating rows
+    csv_path.write_text('symbol,date,price\nINFY,2025-01-31,1900.00\n')
+    call_command('import_investment_prices', str(csv_path))
+    assert InvestmentPrice.objects.count() == 2
+    assert InvestmentPrice.objects.get(symbol='INFY', date='2025-01-31').price == Decimal('1900.00')
@@ -0,0 +1,196 @@
+import pytest
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.urls import reverse
+
+from ledger.models import AccountDailyBalance
+from ledger.services import BalanceHistoryService, LedgerService
+from transactions.models import Transaction
+from transactions.services import TransactionService
+from transfers.models import Transfer
+
+
+def _transaction(user, account, transaction_type, amount, when):
+    journal_entry = LedgerService.create_simple_entry(
+        user=user, transaction_type=transaction_type, account=account,
+        amount=Decimal(amount), occurred_at=when, memo=f'{transaction_type} {amount}',
+    )
+    txn = Transaction(
+        user=user, transaction_type=transaction_type, amount=Decimal(amount), account=account,
+        method_type='upi', purpose=f'{transaction_type} {amount}', datetime_ist=when,
+        journal_entry=journal_entry,
+    )
+    txn.save(skip_validation=True)
+    return txn
+
+
+def _transfer(user, from_account, to_account, amount, when):
+    journal_entry, _, _ = LedgerService.create_transfer_entry(
+        user=user, occurred_at=when, amount=Decimal(amount),
+        from_account=from_account, to_account=to_account, memo='Card bill',
+    )
+    return Transfer.objects.create(
+        user=user, amount=Decimal(amount), method_type='upi', memo='Card bill',
+        from_account=from_account, to_account=to_account, datetime_ist=when, journal_entry=journal_entry,
+    )
+
+
+def _history(account):
+    return list(
+        AccountDailyBalance.objects.for_account(account).order_by('date').values_list('date', 'closing_balance')
+    )
+
+
+def _rebuilt(account):
+    BalanceHistoryService.rebuild(account)
+    return _history(account)
+
+
+@pytest.mark.django_db
+class TestBalanceHistory:
+    def test_first_change_builds_history_on_commit(
+        self, test_user, bank_account, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            _transaction(test_user, bank_account, 'income', '500.00', datetime(2025, 3, 10, 9, 0))
+
+        assert _history(bank_account) == [(date(2025, 3, 10), Decimal('1500.00'))]
+
+    def test_changes_update_existing_rows(self, test_user, bank_account, credit_card):
+        _transaction(test_user, bank_account, 'income', '500.00', datetime(2025, 3, 10, 9, 0))
+        _transaction(test_user, credit_card, 'expense', '100.00', datetime(2025, 3, 12, 9, 0))
+        BalanceHistoryService.rebuild(bank_account)
+        BalanceHistoryService.rebuild(credit_card)
+
+        # Same day, a later day, a backdated day between rows and one before every row
+        _transaction(test_user, bank_account, 'expense', '50.00', datetime(2025, 3, 10, 18, 0))
+        _transaction(test_user, bank_account, 'expense', '200.00', datetime(2025, 3, 20, 9, 0))
+        _transaction(test_user, bank_account, 'income', '75.00', datetime(2025, 3, 15, 9, 0))
+        _transaction(test_user, bank_account, 'expense', '25.00', datetime(2025, 3, 1, 9, 0))
+        _transaction(test_user, credit_card, 'expense', '40.00', datetime(2025, 3, 11, 9, 0))
+        _transfer(test_user, bank_account, credit_card, '100.00', datetime(2025, 3, 14, 9, 0))
+
+        assert _history(bank_account) == [
+            (date(2025, 3, 1), Decimal('975.00')),
+            (date(2025, 3, 10), Decimal('1425.00')),
+            (date(2025, 3, 14), Decimal('1325.00')),
+            (date(2025, 3, 15), Decimal('1400.00')),
+            (date(2025, 3, 20), Decimal('1200.00')),
+        ]
+        assert _history(bank_account) == _rebuilt(bank_account)
+        card_history = _history(credit_card)
+        assert card_history == _rebuilt(credit_card)
+        assert card_history[-1] == (date(2025, 3, 14), Decimal('-40.00'))
+
+    def test_bulk_paths_match_rebuild(
+        self, test_user, bank_account, credit_card, django_capture_on_commit_callbacks
+    ):
+        transactions = [
+            _transaction(test_user, bank_account, 'income', '300.00', datetime(2025, 4, day, 9, 0))
+            for day in (1, 5, 9)
+        ]
+        BalanceHistoryService.rebuild(bank_account)
+
+        imported = [
+            {'transaction_type': 'expense', 'amount': Decimal('20.00'),
+             'occurred_at': datetime(2025, 4, day, 12, 0), 'memo': f'Import {day}'}
+            for day in (3, 5, 5, 12)
+        ]
+        journal_entries = LedgerService.create_simple_entries_bulk(test_user, bank_account, imported)
+        for journal_entry, entry in zip(journal_entries, imported):
+            Transaction(
+                user=test_user, transaction_type='expense', amount=entry['amount'], account=bank_account,
+                method_type='upi', purpose=entry['memo'], datetime_ist=entry['occurred_at'],
+                journal_entry=journal_entry,
+            ).save(skip_validation=True)
+        assert _history(bank_account) == _rebuilt(bank_account)
+
+        TransactionService.bulk_delete(test_user, [transactions[1].pk])
+        assert _history(bank_account) == _rebuilt(bank_account)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            TransactionService.bulk_update(test_user, [transactions[0].pk], account=credit_card)
+        # April 1st had no other postings: its row stays, with the closing balance of the day before
+        start, end = date(2025, 3, 1), date(2025, 4, 30)
+        series = BalanceHistoryService.get_series(bank_account, start, end)
+        BalanceHistoryService.rebuild(bank_account)
+        assert series == BalanceHistoryService.get_series(bank_account, start, end)
+        assert _history(credit_card) == _rebuilt(credit_card)
+        assert _history(credit_card) == [(date(2025, 4, 1), Decimal('300.00'))]
+
+    def test_series_downsampling(self, test_user, bank_account):
+        _transaction(test_user, bank_account, 'income', '500.00', datetime(2024, 6, 1, 9, 0))
+        _transaction(test_user, bank_account, 'expense', '100.00', datetime(2025, 1, 15, 9, 0))
+
+        start, end = date(2024, 1, 1), date(2025, 12, 31)
+        daily = BalanceHistoryService.get_series(bank_account, start, end)
+        assert len(daily) == (end - start).days + 1
+        assert daily[0] == (start, Decimal('1000.00'))
+        assert dict(daily)[date(2024, 6, 1)] == Decimal('1500.00')
+        assert daily[-1] == (end, Decimal('1400.00'))
+
+        sampled = BalanceHistoryService.get_series(bank_account, start, end, points=100)
+        assert len(sampled) <= 100
+        assert sampled[-1] == (end, Decimal('1400.00'))
+        assert all(balance == dict(daily)[day] for day, balance in sampled)
+        assert len({later - earlier for (earlier, _), (later, _) in zip(sampled, sampled[1:])}) == 1
+
+    def test_series_at_the_calendar_edges(self, test_user, bank_account):
+        start = date.max - timedelta(days=9)
+        assert BalanceHistoryService.get_series(bank_account, start, date.max, points=4)[-1] == (
+            date.max, Decimal('1000.00')
+        )
+        assert len(BalanceHistoryService.get_series(bank_account, start, date.max)) == 10
+        assert len(BalanceHistoryService.get_series(bank_account, date.min, date.min + timedelta(days=2))) == 3
+
+
+@pytest.mark.django_db
+class TestBalanceHistoryViews:
+    def test_api(self, client, test_user, other_user, bank_account):
+        _transaction(test_user, bank_account, 'expense', '100.00', datetime(2025, 2, 2, 9, 0))
+        client.force_login(test_user)
+        url = reverse('reports:balance_history_api')
+
+        response = client.get(url, {
+            'account': f'{bank_account.pk}|bankaccount', 'start': '2025-02-01', 'end': '2025-02-03',
+        })
+        assert response.status_code == 200
+        assert response.json() == {
+            'start': '2025-02-01',
+            'end': '2025-02-03',
+            'labels': ['2025-02-01', '2025-02-02', '2025-02-03'],
+            'data': [1000.0, 900.0, 900.0],
+        }
+
+        for params in (
+            {'account': 'nope'},
+            {'account': f'{bank_account.pk}|bankaccount', 'start': '2025-13-01'},
+            {'account': f'{bank_account.pk}|bankaccount', 'start': '2025-02-03', 'end': '2025-02-01'},
+            {'account': f'{bank_account.pk}|bankaccount', 'start': '0001-01-01', 'end': '9999-12-31'},
+        ):
+            assert client.get(url, params).status_code == 400
+
+        # Default ranges near the ends of the calendar
+        data = client.get(url, {'account': f'{bank_account.pk}|bankaccount', 'end': '9999-12-31'}).json()
+        assert (data['start'], data['labels'][-1]) == ('9999-01-01', '9999-12-31')
+        data = client.get(url, {'account': f'{bank_account.pk}|bankaccount', 'end': '0001-01-05'}).json()
+        assert (data['start'], data['labels']) == ('0001-01-01', [f'0001-01-0{day}' for day in range(1, 6)])
+
+        client.force_login(other_user)
+        assert client.get(url, {'account': f'{bank_account.pk}|bankaccount'}).status_code == 404
+
+    def test_backfill_command_and_detail_page(self, client, test_user, bank_account, credit_card):
+        _transaction(test_user, bank_account, 'income', '100.00', datetime.now() - timedelta(days=3))
+        _transaction(test_user, credit_card, 'expense', '60.00', datetime.now())
+
+        out = StringIO()
+        call_command('backfill_balance_history', user='testuser', stdout=out)
+        assert 'Built 2 daily balances for 2 accounts' in out.getvalue()
+        assert _history(credit_card) == [(date.today(), Decimal('-60.00'))]
+
+        client.force_login(test_user)
+        response = client.get(reverse('account_detail', args=[bank_account.pk]))
+        assert response.status_code == 200
+        assert b'balanceHistoryChart' in response.content
@@ -0,0 +1,81 @@
+import pytest
+from decimal import Decimal
+from datetime import date, timedelta
+from django.core.management import call_command
+from django.utils import timezone
+from accounts.models import BankAccountBalance
+from fds.models import FixedDeposit
+from ledger.services import LedgerService
+from reports.models import UserFinancialSummary
+from transactions.models import Transaction
+
+
+@pytest.mark.django_db
+class TestUserFinancialSummary:
+    def test_summary_follows_ledger_and_fd_changes(self, test_user, bank_account, credit_card):
+        summary = UserFinancialSummary.objects.get(user=test_user)
+        assert summary.bank_balance == Decimal('1000.00')
+        assert summary.total_banks == 1
+        assert summary.total_cards == 1
+
+        txn = Transaction.objects.create(
+            user=test_user,
+            account=bank_account,
+            transaction_type='expense',
+            amount=Decimal('200.00'),
+            datetime_ist=timezone.now(),
+            purpose='Groceries',
+        )
+        LedgerService().create_simple_entry(
+            user=test_user,
+            transaction_type='expense',
+            account=bank_account,
+            amount=txn.amount,
+            occurred_at=txn.datetime_ist,
+            memo='Groceries'
+        )
+        fd = FixedDeposit.objects.create(
+            user=test_user,
+            name='FD 1',
+            institution='HDFC Bank',
+            principal_amount=Decimal('5000.00'),
+            interest_rate=Decimal('7.50'),
+            maturity_amount=Decimal('5500.00'),
+            tenure_days=365,
+            opened_on=date.today(),
+            maturity_date=date.today() + timedelta(days=365),
+        )
+
+        summary.refresh_from_db()
+        assert summary.bank_balance == Decimal('800.00')
+        assert summary.monthly_expense == Decimal('200.00')
+        assert summary.total_fds == 1
+        assert summary.net_worth == Decimal('6300.00')
+
+        fd.status = 'archived'
+        fd.save()
+        credit_card.delete()
+        summary.refresh_from_db()
+        assert summary.total_fds == 0
+        assert summary.total_cards == 0
+        assert summary.net_worth == Decimal('800.00')
+
+    def test_for_user_is_single_read(self, test_user, bank_account, django_assert_num_queries):
+        UserFinancialSummary.refresh(test_user)
+        with django_assert_num_queries(1):
+            stats = UserFinancialSummary.for_user(test_user).as_stats()
+        assert stats['net_worth'] == Decimal('1000.00')
+
+    def test_reconcile_command_fixes_drift(self, test_user, bank_account):
+        # Bulk update bypasses the signals
+        BankAccountBalance.objects.filter(account=bank_account).update(balance_amount=Decimal('2500.00'))
+        summary = UserFinancialSummary.objects.get(user=test_user)
+        assert summary.bank_balance == Decimal('1000.00')
+
+        call_command('reconcile_financial_summaries', dry_run=True)
+        summary.refresh_from_db()
+        assert summary.bank_balance == Decimal('1000.00')
+
+        call_command('reconcile_financial_summaries')
+        summary.refresh_from_db()
+        assert summary.bank_balance == Decimal('2500.00')
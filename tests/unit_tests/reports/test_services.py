@@ -140,7 +140,7 @@ class TestReportService:
             principal_amount=Decimal('5000.00'),
             interest_rate=Decimal('7.50'),
             maturity_amount=Decimal('5500.00'),
-            tenure_months=12,
+            tenure_days=365,
             opened_on=date.today(),
             maturity_date=date.today() + timedelta(days=365),
             status='active'
@@ -168,3 +168,127 @@ class TestReportService:
         report = ReportService.get_net_worth_trend(test_user, months_count=1)
         
         assert report['data'][0] == 8000.0
+
+    def test_get_net_worth_trend_uses_price_history(self, test_user, django_assert_num_queries):
+        from investments.models import Broker, InvestmentPrice
+        today = date.today()
+        last_month_end = today.replace(day=1) - timedelta(days=1)
+        two_months_ago_end = last_month_end.replace(day=1) - timedelta(days=1)
+
+        broker = Broker.objects.create(user=test_user, name='Zerodha')
+        inv = Investment.objects.create(
+            user=test_user, broker=broker, name='Infosys', symbol='infy', current_price=Decimal('150.00')
+        )
+        InvestmentTransaction.objects.create(
+            investment=inv, transaction_type='buy', quantity=Decimal('10'),
+            price_per_unit=Decimal('90.00'), date=two_months_ago_end.replace(day=1)
+        )
+        InvestmentTransaction.objects.create(
+            investment=inv, transaction_type='sell', quantity=Decimal('4'),
+            price_per_unit=Decimal('110.00'), date=last_month_end.replace(day=1)
+        )
+        InvestmentPrice.objects.create(symbol='INFY', date=two_months_ago_end - timedelta(days=3), price=Decimal('100.00'))
+        InvestmentPrice.objects.create(symbol='INFY', date=last_month_end, price=Decimal('120.00'))
+
+        with django_assert_num_queries(7):
+            report = ReportService.get_net_worth_trend(test_user, months_count=3)
+
+        # 10 units @ 100, then 6 units @ 120, then 6 units @ current 150
+        assert report['data'] == [1000.0, 720.0, 900.0]
+
+    def test_get_category_rollup(self, test_user, django_assert_num_queries):
+        food = Category.objects.create(user=test_user, name='Food', type='expense')
+        dining = Category.objects.create(user=test_user, name='Dining', type='expense', parent=food)
+        swiggy = Category.objects.create(user=test_user, name='Swiggy', type='expense', parent=dining)
+        groceries = Category.objects.create(user=test_user, name='Groceries', type='expense', parent=food)
+        travel = Category.objects.create(user=test_user, name='Travel', type='expense')
+
+        bank = BankAccount.objects.create(user=test_user, name='Bank', institution='SBI', status='active')
+        ct = ContentType.objects.get_for_model(bank)
+
+        now = timezone.now()
+        for category, amount in [
+            (swiggy, '300.00'),
+            (dining, '200.00'),
+            (groceries, '500.00'),
+            (travel, '100.00'),
+            (None, '50.00'),
+        ]:
+            Transaction.objects.create(
+                user=test_user,
+                datetime_ist=now,
+                transaction_type='expense',
+                amount=Decimal(amount),
+                category=category,
+                account_content_type=ct,
+                account_object_id=bank.id,
+                method_type='upi',
+                purpose='Test'
+            )
+
+        # Ancestor mapping + one aggregate pass, regardless of depth
+        with django_assert_num_queries(2):
+            report = ReportService.get_category_rollup(test_user)
+
+        assert report['total'] == 1150.0
+        assert report['uncategorized'] == 50.0
+
+        food_node, travel_node = report['tree']
+        assert food_node['name'] == 'Food'
+        assert food_node['total'] == 1000.0
+        assert food_node['own_total'] == 0.0
+        assert travel_node['total'] == 100.0
+
+        # Drill-down level 2 and 3
+        dining_node, groceries_node = sorted(food_node['children'], key=lambda n: n['name'])
+        assert dining_node['level'] == 2
+        assert dining_node['total'] == 500.0
+        assert dining_node['own_total'] == 200.0
+        assert groceries_node['total'] == 500.0
+        assert dining_node['children'][0]['name'] == 'Swiggy'
+        assert dining_node['children'][0]['level'] == 3
+        assert dining_node['children'][0]['total'] == 300.0
+
+    def test_get_dashboard_stats_constant_queries(self, test_user, django_assert_num_queries):
+        from investments.models import Broker
+        broker = Broker.objects.create(user=test_user, name='Zerodha')
+
+        def add_holdings(n):
+            for i in range(n):
+                BankAccount.objects.create(
+                    user=test_user, name=f'Bank {i}', opening_balance=Decimal('1000.00'), status='active'
+                )
+                FixedDeposit.objects.create(
+                    user=test_user,
+                    name=f'FD {i}',
+                    institution='HDFC Bank',
+                    principal_amount=Decimal('5000.00'),
+                    interest_rate=Decimal('7.50'),
+                    maturity_amount=Decimal('5500.00'),
+                    tenure_days=365,
+                    opened_on=date.today(),
+                    maturity_date=date.today() + timedelta(days=365),
+                )
+                inv = Investment.objects.create(
+                    user=test_user, broker=broker, name=f'Stock {i}', current_price=Decimal('100.00')
+                )
+                InvestmentTransaction.objects.create(
+                    investment=inv, transaction_type='buy', quantity=Decimal('10'), price_per_unit=Decimal('90.00')
+                )
+                InvestmentTransaction.objects.create(
+                    investment=inv, transaction_type='sell', quantity=Decimal('4'), price_per_unit=Decimal('95.00')
+                )
+
+        add_holdings(1)
+        with django_assert_num_queries(7):
+            stats = ReportService.get_dashboard_stats(test_user)
+        # Bank 1000 + FD 5500 + 6 units * 100
+        assert stats['net_worth'] == Decimal('7100.00')
+
+        add_holdings(4)
+        with django_assert_num_queries(7):
+            stats = ReportService.get_dashboard_stats(test_user)
+        assert stats['net_worth'] == Decimal('35500.00')
+        assert stats['total_banks'] == 5
+        assert stats['total_fds'] == 5
+        assert stats['total_investments'] == 5
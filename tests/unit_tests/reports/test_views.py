@@ -0,0 +1,121 @@
+import pytest
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from categories.models import Category
+from investments.models import Broker, Investment
+from transactions.models import Transaction
+
+
+@pytest.mark.django_db
+class TestReportEndpoints:
+    def test_requires_login(self, client):
+        response = client.get(reverse('reports:cashflow_api'))
+        assert response.status_code == 302
+
+    def test_cashflow_api_returns_json_with_etag(self, client, test_user):
+        client.force_login(test_user)
+        response = client.get(reverse('reports:cashflow_api'), {'months': 3})
+
+        assert response.status_code == 200
+        assert response['ETag'].startswith('W/"')
+        assert 'private' in response['Cache-Control']
+        assert 'no-cache' in response['Cache-Control']
+        assert len(response.json()['labels']) == 3
+
+    def test_etag_revalidation(self, client, test_user, bank_account):
+        client.force_login(test_user)
+        url = reverse('reports:expense_breakdown_api')
+
+        etag = client.get(url)['ETag']
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+
+        # Any change to the underlying data invalidates the ETag
+        Transaction.objects.create(
+            user=test_user,
+            account=bank_account,
+            transaction_type='expense',
+            amount=Decimal('250.00'),
+            datetime_ist=timezone.now(),
+            purpose='Groceries',
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+        assert response.json()['data'] == [250.0]
+
+    def test_price_import_invalidates_net_worth_etag(self, client, test_user, other_user, tmp_path):
+        broker = Broker.objects.create(user=test_user, name='Zerodha')
+        Investment.objects.create(user=test_user, broker=broker, name='Infosys', symbol='INFY')
+        client.force_login(test_user)
+        url = reverse('reports:net_worth_trend_api')
+
+        def import_prices(rows):
+            path = tmp_path / 'prices.csv'
+            path.write_text('symbol,date,price\n' + ''.join(f'{row}\n' for row in rows))
+            call_command('import_investment_prices', str(path), stdout=StringIO())
+
+        etag = client.get(url)['ETag']
+        import_prices(['TCS,2025-01-31,3500.00'])
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        import_prices(['INFY,2025-01-31,1500.00'])
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        etag = response['ETag']
+
+        # A corrected price overwrites the row in place
+        import_prices(['INFY,2025-01-31,1550.00'])
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_etag_is_per_endpoint(self, client, test_user):
+        client.force_login(test_user)
+        cashflow = client.get(reverse('reports:cashflow_api'))
+        trend = client.get(reverse('reports:net_worth_trend_api'))
+        assert cashflow['ETag'] != trend['ETag']
+
+    def test_category_rollup_drill_down(self, client, test_user, other_user, bank_account):
+        food = Category.objects.create(user=test_user, name='Food', type='expense', color='#ff0000')
+        dining = Category.objects.create(user=test_user, name='Dining', type='expense', parent=food)
+        swiggy = Category.objects.create(user=test_user, name='Swiggy', type='expense', parent=dining)
+        groceries = Category.objects.create(user=test_user, name='Groceries', type='expense', parent=food)
+        for category, amount in [(swiggy, '300.00'), (dining, '200.00'), (groceries, '400.00'), (None, '50.00')]:
+            Transaction.objects.create(
+                user=test_user, account=bank_account, transaction_type='expense', amount=Decimal(amount),
+                category=category, datetime_ist=timezone.now(), purpose='Test',
+            )
+        client.force_login(test_user)
+        url = reverse('reports:category_rollup_api')
+
+        data = client.get(url).json()
+        assert data['category'] is None
+        assert data['ids'] == [food.pk, None]
+        assert data['labels'] == ['Food', 'Uncategorized']
+        assert data['data'] == [900.0, 50.0]
+        assert data['colors'][0] == '#ff0000'
+        assert data['drillable'] == [True, False]
+
+        data = client.get(url, {'category': food.pk}).json()
+        assert data['category'] == {'id': food.pk, 'name': 'Food'}
+        assert data['parent_id'] is None
+        assert data['ids'] == [dining.pk, groceries.pk]
+        assert data['data'] == [500.0, 400.0]
+
+        # Amounts booked on Dining itself sit next to its subcategories
+        data = client.get(url, {'category': dining.pk}).json()
+        assert data['parent_id'] == food.pk
+        assert data['labels'] == ['Swiggy', 'Dining (other)']
+        assert data['data'] == [300.0, 200.0]
+        assert data['drillable'] == [False, False]
+        assert data['total'] == 500.0
+
+        assert client.get(url, {'category': 'abc'}).status_code == 400
+        assert client.get(url, {'type': 'transfer'}).status_code == 400
+        assert client.get(url, {'type': 'income'}).json()['data'] == []
+        other = Category.objects.create(user=other_user, name='Theirs', type='expense')
+        assert client.get(url, {'category': other.pk}).status_code == 404
+
+        assert reverse('reports:category_rollup_api') in client.get(reverse('dashboard')).content.decode()
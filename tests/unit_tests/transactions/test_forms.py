@@ -53,3 +53,33 @@ class TestTransactionForm:
         }
         form = TransactionForm(data=form_data, user=test_user)
         assert form.is_valid() # Credit cards are exempt from balance check in form
+
+    def test_exact_duplicate_is_rejected_unless_confirmed(self, test_user, bank_account):
+        form_data = {
+            'transaction_type': 'expense',
+            'amount': Decimal('50.00'),
+            'method_type': 'upi',
+            'purpose': 'Lunch',
+            'account': f"{bank_account.id}|bankaccount",
+            'date': timezone.now().date().isoformat(),
+        }
+        form = TransactionForm(data=form_data, user=test_user)
+        assert form.is_valid(), form.errors
+        existing = form.save(commit=False)
+        existing.user = test_user
+        existing.datetime_ist = form.cleaned_data['datetime_ist']
+        existing.account = bank_account
+        existing.save(skip_validation=True)
+
+        # Same account, day, amount and purpose (modulo case/punctuation)
+        duplicate = TransactionForm(data={**form_data, 'purpose': 'LUNCH!'}, user=test_user)
+        assert not duplicate.is_valid()
+        assert duplicate.duplicate_of == existing
+        assert 'identical transaction' in duplicate.non_field_errors()[0]
+
+        confirmed = TransactionForm(data={**form_data, 'allow_duplicate': 'on'}, user=test_user)
+        assert confirmed.is_valid()
+
+        # Editing the existing transaction is not a duplicate of itself
+        edit = TransactionForm(data=form_data, instance=existing, user=test_user)
+        assert edit.is_valid(), edit.errors
@@ -0,0 +1,96 @@
+import re
+
+import pytest
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from categories.models import Category
+from transactions.models import Transaction
+
+
+def _transaction_queries(captured):
+    """SQL of captured queries that read live (non-deleted) transactions."""
+    return [
+        query['sql'] for query in captured.captured_queries
+        if 'FROM "transactions"' in query['sql']
+        and '"transactions"."deleted_at" IS NULL' in query['sql']
+        and not query['sql'].startswith('EXPLAIN')
+    ]
+
+
+def _plan(sql):
+    """EXPLAIN a statement with sequential scans disabled (the test tables are tiny)."""
+    with connection.cursor() as cursor:
+        cursor.execute('SET LOCAL enable_seqscan = off')
+        cursor.execute(f'EXPLAIN {sql}')
+        plan = '\n'.join(row[0] for row in cursor.fetchall())
+        cursor.execute('RESET enable_seqscan')
+    return plan
+
+
+@pytest.mark.django_db
+class TestTransactionQueryPlans:
+    @pytest.fixture
+    def data(self, test_user, bank_account):
+        category = Category.objects.create(user=test_user, name='Food', type='expense')
+        for i in range(5):
+            Transaction.objects.create(
+                user=test_user, transaction_type='expense', amount=Decimal('10.00'),
+                account=bank_account, method_type='upi', purpose=f'Lunch {i}',
+                category=category, datetime_ist=timezone.now(),
+            )
+        return category
+
+    def _assert_live_index_used(self, client, url, params=None, index_prefix='idx_txn_live_'):
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(url, params or {})
+            if response.streaming:
+                b''.join(response.streaming_content)
+        assert response.status_code == 200
+        queries = _transaction_queries(captured)
+        assert queries
+        for sql in queries:
+            plan = _plan(sql)
+            assert re.search(rf'Index (Only )?Scan.* (using|on) {index_prefix}', plan), plan
+
+    def test_list_with_date_range_uses_live_index(self, client, test_user, data):
+        client.force_login(test_user)
+        today = timezone.now().date().isoformat()
+        self._assert_live_index_used(
+            client, reverse('transactions:transaction_list'),
+            {'date_from': today, 'date_to': today},
+        )
+
+    def test_list_by_category_uses_category_index(self, client, test_user, data):
+        client.force_login(test_user)
+        self._assert_live_index_used(
+            client, reverse('transactions:transaction_list'),
+            {'category': data.id}, index_prefix='idx_txn_live_user_cat_time',
+        )
+
+    def test_export_and_reports_use_live_index(self, client, test_user, data):
+        client.force_login(test_user)
+        today = timezone.now().date().isoformat()
+        self._assert_live_index_used(
+            client, reverse('transactions:transaction_export_csv'), {'date_from': today},
+        )
+        self._assert_live_index_used(client, reverse('reports:cashflow_api'))
+        self._assert_live_index_used(client, reverse('reports:expense_breakdown_api'))
+
+    def test_date_range_is_half_open(self, client, test_user, bank_account):
+        client.force_login(test_user)
+        for moment in ['2025-03-01 00:00:00', '2025-03-31 23:59:59.999999', '2025-04-01 00:00:00']:
+            Transaction.objects.create(
+                user=test_user, transaction_type='expense', amount=Decimal('1.00'),
+                account=bank_account, method_type='upi', purpose=moment,
+                datetime_ist=timezone.datetime.fromisoformat(moment),
+            )
+        response = client.get(
+            reverse('transactions:transaction_list'),
+            {'date_from': '2025-03-01', 'date_to': '2025-03-31'},
+        )
+        purposes = sorted(t.purpose for t in response.context['page_obj'])
+        assert purposes == ['2025-03-01 00:00:00', '2025-03-31 23:59:59.999999']
@@ -0,0 +1,174 @@
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from activity.models import ActivityLog
+from categories.models import Category
+from ledger.models import Posting
+from ledger.services import LedgerService
+from transactions.models import Transaction
+from transactions.services import TransactionService
+
+
+def _record(user, account, transaction_type, amount, day=1, category=None):
+    """Create a transaction the way transaction_create does (journal entry + balance update)."""
+    when = datetime(2025, 4, day, 10)
+    journal_entry = LedgerService.create_simple_entry(
+        user=user, transaction_type=transaction_type, account=account,
+        amount=Decimal(amount), occurred_at=when, memo=f'{transaction_type} {amount}',
+    )
+    txn = Transaction(
+        user=user, transaction_type=transaction_type, amount=Decimal(amount), account=account,
+        method_type='upi', purpose=f'{transaction_type} {amount} on {day}', category=category,
+        datetime_ist=when, journal_entry=journal_entry,
+    )
+    txn.save(skip_validation=True)
+    return txn
+
+
+def _balance(account):
+    """Current balance read fresh from the database (the balance relation is cached)."""
+    return type(account).objects.get(pk=account.pk).get_current_balance()
+
+
+def _balance_updates(captured, table):
+    return [q for q in captured.captured_queries if q['sql'].startswith(f'UPDATE "{table}"')]
+
+
+@pytest.mark.django_db
+class TestTransactionBulkService:
+    def test_bulk_delete_nets_one_balance_update_per_account(self, test_user, bank_account, credit_card):
+        # Bank: 1000 opening, -100 -200 +50; card: -300
+        bank_rows = [
+            _record(test_user, bank_account, 'expense', '100.00', 1),
+            _record(test_user, bank_account, 'expense', '200.00', 2),
+            _record(test_user, bank_account, 'income', '50.00', 3),
+        ]
+        card_row = _record(test_user, credit_card, 'expense', '300.00', 4)
+        kept = _record(test_user, bank_account, 'expense', '10.00', 5)
+        assert _balance(bank_account) == Decimal('740.00')
+
+        ids = [txn.pk for txn in bank_rows] + [card_row.pk]
+        with CaptureQueriesContext(connection) as captured:
+            deleted = TransactionService.bulk_delete(test_user, ids)
+
+        assert len(deleted) == 4
+        assert len(_balance_updates(captured, 'bank_account_balances')) == 1
+        assert len(_balance_updates(captured, 'credit_card_balances')) == 1
+        assert _balance(bank_account) == Decimal('990.00')
+        assert _balance(credit_card) == credit_card.opening_balance
+        assert set(Transaction.objects.filter(deleted_at__isnull=True).values_list('pk', flat=True)) == {kept.pk}
+
+        # Materialized balances still agree with the ledger
+        results = LedgerService.recalculate_user_balances(test_user)
+        assert results['banks_fixed'] == 0 and results['cards_fixed'] == 0
+
+        # Already deleted rows and other users' rows are ignored
+        assert TransactionService.bulk_delete(test_user, ids) == []
+
+    def test_bulk_move_to_account_repoints_postings(self, test_user, bank_account, credit_card):
+        rows = [
+            _record(test_user, bank_account, 'expense', '100.00', 1),
+            _record(test_user, bank_account, 'expense', '150.00', 2),
+        ]
+        already_on_card = _record(test_user, credit_card, 'expense', '40.00', 3)
+
+        updated = TransactionService.bulk_update(
+            test_user, [txn.pk for txn in rows] + [already_on_card.pk], account=credit_card
+        )
+
+        assert [txn.pk for txn, _ in updated] == [txn.pk for txn in rows]
+        assert _balance(bank_account) == Decimal('1000.00')
+        assert _balance(credit_card) == credit_card.opening_balance - Decimal('290.00')
+        for txn in rows:
+            txn.refresh_from_db()
+            assert txn.account == credit_card
+            assert txn.fingerprint == txn.compute_fingerprint()
+            assert Posting.objects.filter(
+                journal_entry=txn.journal_entry, account_object_id=credit_card.pk, amount=-txn.amount
+            ).exists()
+        results = LedgerService.recalculate_user_balances(test_user)
+        assert results['banks_fixed'] == 0 and results['cards_fixed'] == 0
+
+    def test_bulk_move_cannot_overdraw_bank_account(self, test_user, bank_account, credit_card):
+        row = _record(test_user, credit_card, 'expense', '5000.00', 1)
+        with pytest.raises(ValidationError):
+            TransactionService.bulk_update(test_user, [row.pk], account=bank_account)
+        row.refresh_from_db()
+        assert row.account == credit_card
+
+    def test_bulk_move_cannot_overdraw_source_bank_account(self, test_user, bank_account, credit_card):
+        # Opening 1000 + 300 income - 1200 expense leaves 100
+        income = _record(test_user, bank_account, 'income', '300.00', 1)
+        _record(test_user, bank_account, 'expense', '1200.00', 2)
+        with pytest.raises(ValidationError, match='Insufficient balance in Test Bank'):
+            TransactionService.bulk_update(test_user, [income.pk], account=credit_card)
+        income.refresh_from_db()
+        assert income.account == bank_account
+        assert _balance(bank_account) == Decimal('100.00')
+
+    def test_bulk_category_must_match_type(self, test_user, bank_account):
+        food = Category.objects.create(user=test_user, name='food', type='expense')
+        expense = _record(test_user, bank_account, 'expense', '100.00', 1)
+        income = _record(test_user, bank_account, 'income', '100.00', 2)
+
+        with pytest.raises(ValidationError):
+            TransactionService.bulk_update(test_user, [expense.pk, income.pk], category=food)
+
+        updated = TransactionService.bulk_update(test_user, [expense.pk], category=food, method_type='card')
+        assert updated[0][1] == {
+            'category': {'before': None, 'after': str(food)},
+            'method_type': {'before': 'upi', 'after': 'card'},
+        }
+        expense.refresh_from_db()
+        assert expense.category == food and expense.method_type == 'card'
+
+
+@pytest.mark.django_db
+class TestTransactionBulkView:
+    def test_bulk_delete_logs_activity_in_one_insert(self, client, test_user, other_user, bank_account):
+        rows = [_record(test_user, bank_account, 'expense', '10.00', day) for day in range(1, 6)]
+        client.force_login(test_user)
+
+        with CaptureQueriesContext(connection) as captured:
+            response = client.post(reverse('transactions:transaction_bulk_action'), {
+                'action': 'delete',
+                'transaction_ids': [txn.pk for txn in rows],
+                'query': 'type=expense',
+            })
+
+        assert response.status_code == 302
+        assert response['Location'] == reverse('transactions:transaction_list') + '?type=expense'
+        assert not Transaction.objects.filter(deleted_at__isnull=True).exists()
+        assert ActivityLog.objects.filter(user=test_user, action='delete').count() == 5
+        activity_inserts = [q for q in captured.captured_queries if q['sql'].startswith('INSERT INTO "activity_logs"')]
+        assert len(activity_inserts) == 1
+
+        # Another user's selection changes nothing
+        client.force_login(other_user)
+        client.post(reverse('transactions:transaction_bulk_action'), {
+            'action': 'method', 'method_type': 'card', 'transaction_ids': [rows[0].pk],
+        })
+        assert Transaction.objects.get(pk=rows[0].pk).method_type == 'upi'
+
+    def test_bulk_action_rolls_back_when_logging_fails(self, client, monkeypatch, test_user, bank_account):
+        rows = [_record(test_user, bank_account, 'expense', '10.00', day) for day in range(1, 3)]
+        balance = _balance(bank_account)
+        client.force_login(test_user)
+
+        def failing_log(*args, **kwargs):
+            raise DatabaseError('activity_logs is unavailable')
+
+        monkeypatch.setattr('transactions.views.log_activity_bulk', failing_log)
+        for params in ({'action': 'delete'}, {'action': 'method', 'method_type': 'card'}):
+            with pytest.raises(DatabaseError):
+                client.post(reverse('transactions:transaction_bulk_action'), {
+                    **params, 'transaction_ids': [txn.pk for txn in rows],
+                })
+
+        assert Transaction.objects.filter(deleted_at__isnull=True, method_type='upi').count() == 2
+        assert _balance(bank_account) == balance
@@ -113,3 +113,74 @@ class TestTransactionViews:
         transaction.refresh_from_db()
         assert transaction.purpose == 'Lunch Updated'
         assert transaction.amount == Decimal('250.00')
+
+    def _make_transactions(self, user, account, purposes, category=None):
+        for purpose in purposes:
+            Transaction.objects.create(
+                user=user, transaction_type='expense', amount=Decimal('100.00'),
+                account=account, method_type='upi', purpose=purpose, category=category,
+                datetime_ist=timezone.now(),
+            )
+
+    def test_transaction_list_search_prefix_typo_and_rank(self, client, test_user, bank_account):
+        client.force_login(test_user)
+        self._make_transactions(test_user, bank_account, ['Swiggy dinner', 'Swiggy', 'Electricity bill'])
+        url = reverse('transactions:transaction_list')
+
+        # Prefix of a word still being typed
+        response = client.get(url, {'search': 'swig'})
+        purposes = [t.purpose for t in response.context['page_obj']]
+        assert set(purposes) == {'Swiggy dinner', 'Swiggy'}
+
+        # Typo tolerated, exact match ranked first
+        response = client.get(url, {'search': 'swigy'})
+        purposes = [t.purpose for t in response.context['page_obj']]
+        assert purposes[0] == 'Swiggy'
+        assert 'Electricity bill' not in purposes
+
+    def test_transaction_list_search_matches_category(self, client, test_user, bank_account):
+        client.force_login(test_user)
+        category = Category.objects.create(user=test_user, name='Groceries', type='expense')
+        self._make_transactions(test_user, bank_account, ['Weekly shop'], category=category)
+        self._make_transactions(test_user, bank_account, ['Cinema'])
+
+        response = client.get(reverse('transactions:transaction_list'), {'search': 'grocer'})
+        assert [t.purpose for t in response.context['page_obj']] == ['Weekly shop']
+
+    def test_benchmark_search_command_rolls_back(self, test_user):
+        from io import StringIO
+        from django.core.management import call_command
+
+        before = Transaction.objects.count()
+        out = StringIO()
+        call_command('benchmark_search', rows=200, runs=1, stdout=out)
+        assert 'Full-text + trigram' in out.getvalue()
+        assert Transaction.objects.count() == before
+
+    def test_export_csv_streams_in_chunks(self, client, test_user, bank_account, monkeypatch):
+        import csv
+        import gzip
+        import io
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from transactions import views
+
+        client.force_login(test_user)
+        self._make_transactions(test_user, bank_account, [f'Item {i}' for i in range(5)])
+        monkeypatch.setattr(views, 'EXPORT_CHUNK_SIZE', 2)
+        url = reverse('transactions:transaction_export_csv')
+
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(url)
+            body = b''.join(response.streaming_content).decode()
+        rows = list(csv.reader(io.StringIO(body)))
+        assert rows[0][0] == 'Date & Time'
+        assert sorted(row[5] for row in rows[1:]) == [f'Item {i}' for i in range(5)]
+        assert all(row[3] == bank_account.name for row in rows[1:])
+        # Account names are resolved with one query per chunk, never per row
+        account_queries = [q for q in captured.captured_queries if 'FROM "bank_accounts"' in q['sql']]
+        assert len(account_queries) == 3
+
+        response = client.get(url, {'compress': 'gzip'})
+        assert response['Content-Disposition'].endswith('.csv.gz"')
+        assert gzip.decompress(b''.join(response.streaming_content)).decode() == body
@@ -85,3 +85,14 @@ class TestTransferViews:
         credit_card.refresh_from_db()
         assert bank_account.get_current_balance() == Decimal('1000.00')
         assert credit_card.get_current_balance() == Decimal('0.00')
+
+    def test_transfer_list_search_by_memo(self, client, test_user, bank_account, credit_card):
+        client.force_login(test_user)
+        for memo in ['Card bill payment', 'Rent to landlord']:
+            Transfer.objects.create(
+                user=test_user, amount=Decimal('100.00'), method_type='upi', memo=memo,
+                from_account=bank_account, to_account=credit_card, datetime_ist=timezone.now(),
+            )
+
+        response = client.get(reverse('transfers:transfer_list'), {'search': 'payme'})
+        assert [t.memo for t in response.context['page_obj']] == ['Card bill payment']